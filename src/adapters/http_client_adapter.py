@@ -0,0 +1,187 @@
+import asyncio
+import importlib.util
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from utils.deadline import DeadlineExceeded as RequestDeadlineExceeded
+from utils.deadline import remaining
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.retry import RetryPolicy
+
+logger = get_logger()
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class HttpClientException(Exception):
+    """Exception raised for outbound HTTP configuration and capacity errors."""
+
+
+class DeadlineExceeded(HttpClientException, RequestDeadlineExceeded):
+    """The request deadline left no time for the call."""
+
+
+class BulkheadFull(HttpClientException):
+    """Every slot of the provider is busy and none freed up before the deadline."""
+
+
+@dataclass(frozen=True)
+class HttpProvider:
+    """An external provider reached over HTTP and the limits its calls run under."""
+
+    name: str
+    base_url: str
+    timeout: float = 2.0  # per attempt, shortened by the request deadline
+    max_concurrency: int = 20  # bulkhead: calls in flight to this provider
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+
+
+class HttpClientAdapter:
+    """Shared outbound HTTP client for the provider adapters.
+
+    Each provider gets its own ``httpx.AsyncClient``, i.e. a keep-alive connection pool
+    per host, speaking HTTP/2 when the ``h2`` package is installed. Calls run inside a
+    per-provider bulkhead, each attempt is bounded by the provider timeout and what is
+    left of the request deadline, and transient failures are retried with full jitter
+    while the deadline allows. Non-idempotent requests are only retried when the
+    connection failed before anything was sent.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        providers: Iterable[HttpProvider] = (),
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and importlib.util.find_spec('h2') is not None
+        self.transport = transport
+        self.providers: dict[str, HttpProvider] = {}
+        self._bulkheads: dict[str, asyncio.Semaphore] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider: HttpProvider) -> None:
+        if provider.name in self.providers:
+            raise HttpClientException(f"provider {provider.name} already registered")
+        self.providers[provider.name] = provider
+        self._bulkheads[provider.name] = asyncio.Semaphore(provider.max_concurrency)
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """The provider's client, created on first use."""
+        if (client := self._clients.get(name)) is None:
+            provider = self._provider(name)
+            client = httpx.AsyncClient(
+                base_url=provider.base_url,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+            self._clients[name] = client
+        return client
+
+    def _provider(self, name: str) -> HttpProvider:
+        try:
+            return self.providers[name]
+        except KeyError as exc:
+            raise HttpClientException(f"unknown provider {name}") from exc
+
+    async def request(
+        self,
+        provider_name: str,
+        method: str,
+        url: str,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request to a provider; ``kwargs`` go to ``httpx.AsyncClient.request``."""
+        provider = self._provider(provider_name)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if (budget := remaining()) is not None and budget <= 0:
+            metrics.increment(
+                'http_client_requests_total', provider=provider.name, outcome='deadline'
+            )
+            raise DeadlineExceeded(f"no time left to call {provider.name}")
+        bulkhead = self._bulkheads[provider.name]
+        try:
+            async with asyncio.timeout(budget):
+                await bulkhead.acquire()
+        except TimeoutError as exc:
+            metrics.increment('http_client_rejected_total', provider=provider.name)
+            raise BulkheadFull(f"{provider.name} has no free slot") from exc
+        try:
+            return await self._send(provider, method, url, idempotent, kwargs)
+        finally:
+            bulkhead.release()
+
+    async def _send(
+        self,
+        provider: HttpProvider,
+        method: str,
+        url: str,
+        idempotent: bool,
+        kwargs: dict[str, Any],
+    ) -> httpx.Response:
+        client = self.client(provider.name)
+        attempt = 1
+        while True:
+            budget = min(provider.timeout, remaining(provider.timeout))
+            if budget <= 0:
+                metrics.increment(
+                    'http_client_requests_total', provider=provider.name, outcome='deadline'
+                )
+                raise DeadlineExceeded(f"no time left to call {provider.name}")
+            started = asyncio.get_running_loop().time()
+            try:
+                response = await client.request(method, url, timeout=budget, **kwargs)
+            except httpx.TransportError as exc:
+                self._record(provider, type(exc).__name__, started)
+                # nothing reached the provider when connecting failed, so any request may retry
+                retriable = idempotent or isinstance(exc, httpx.ConnectError)
+                if (delay := self._retry_delay(provider, attempt, retriable)) is None:
+                    raise
+            else:
+                self._record(provider, str(response.status_code), started)
+                retriable = idempotent and response.status_code in RETRY_STATUSES
+                if (delay := self._retry_delay(provider, attempt, retriable)) is None:
+                    return response
+                await response.aclose()
+            metrics.increment('http_client_retries_total', provider=provider.name)
+            await logger.warning('Retrying provider call', provider=provider.name, attempt=attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_delay(provider: HttpProvider, attempt: int, retriable: bool) -> float | None:
+        """Backoff before the next attempt, or None when the call must not be retried."""
+        if not retriable or attempt >= provider.retry.attempts:
+            return None
+        delay = provider.retry.delay(attempt)
+        if (left := remaining()) is not None and delay >= left:
+            return None
+        return delay
+
+    @staticmethod
+    def _record(provider: HttpProvider, outcome: str, started: float) -> None:
+        elapsed = asyncio.get_running_loop().time() - started
+        metrics.observe('http_client_request_seconds', elapsed, provider=provider.name)
+        metrics.increment('http_client_requests_total', provider=provider.name, outcome=outcome)
+
+    async def close(self) -> None:
+        """Close every pool; clients are created again on the next call."""
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients))
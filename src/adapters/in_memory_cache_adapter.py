@@ -0,0 +1,48 @@
+import json
+import time
+from typing import Any
+
+from ports.cache_interface import CacheInterface
+
+
+class InMemoryCacheAdapter(CacheInterface):
+    """Process-local cache adapter keeping serialized values with expiry, like Redis."""
+
+    def __init__(self, silent_mode: bool = False) -> None:
+        super().__init__(silent_mode=silent_mode)
+        self.values: dict[str, tuple[str, float]] = {}
+
+    def _read(self, key: str) -> str | None:
+        entry = self.values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+    def _write(self, key: str, value: str, ttl: int) -> None:
+        self.values[key] = (value, time.monotonic() + ttl)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        data = self._read(key)
+        return json.loads(data) if data else None
+
+    async def set(self, key: str, data: dict[str, Any], ttl: int = 300) -> None:
+        self._write(key, json.dumps(data, default=str), ttl)
+
+    async def add(self, key: str, data: dict[str, Any], ttl: int = 300) -> bool:
+        if self._read(key) is not None:
+            return False
+        self._write(key, json.dumps(data, default=str), ttl)
+        return True
+
+    async def get_raw(self, key: str) -> str | None:
+        return self._read(key)
+
+    async def set_raw(self, key: str, value: str, ttl: int = 300) -> None:
+        self._write(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
@@ -1,69 +1,331 @@
 import asyncio
-from collections.abc import AsyncGenerator
+import importlib.util
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
 
-import motor.motor_asyncio
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from bson.timestamp import Timestamp
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorClientSession,
+    AsyncIOMotorDatabase,
+)
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
+from pymongo.write_concern import WriteConcern
 
 from utils.logger import get_logger
 
 logger = get_logger()
 
+T = TypeVar('T')
+
+# module each wire compressor needs; zlib ships with Python
+COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+# labels of errors a transaction is retried on
+TRANSACTION_ERROR_LABELS = ('TransientTransactionError', 'UnknownTransactionCommitResult')
+
+READ_PREFERENCES: dict[str, type[_ServerMode]] = {
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest,
+}
+
 
 class MongoDBAdapterException(Exception):
     """Exception raised for MongoDB adapter related errors."""
 
 
+@dataclass
+class MongoTransaction:
+    """Session of the running transaction and the work deferred until it commits."""
+
+    session: AsyncIOMotorClientSession
+    after_commit: list[Callable[[], Awaitable[None]]] = field(default_factory=list)
+
+
+_transaction: ContextVar[MongoTransaction | None] = ContextVar('mongo_transaction', default=None)
+_causal: ContextVar[AsyncIOMotorClientSession | None] = ContextVar(
+    'mongo_causal_session', default=None
+)
+
+
+def current_session() -> AsyncIOMotorClientSession | None:
+    """Session to pass to every operation: the running transaction's, else the causal one."""
+    transaction = _transaction.get()
+    return transaction.session if transaction else _causal.get()
+
+
+def make_read_preference(mode: str, max_staleness: int = -1) -> _ServerMode:
+    """Read preference by its connection string name; ``-1`` puts no bound on staleness."""
+    if mode == 'primary':
+        return Primary()
+    try:
+        return READ_PREFERENCES[mode](max_staleness=max_staleness)
+    except KeyError as exc:
+        raise MongoDBAdapterException(f"unknown read preference {mode}") from exc
+
+
+def operation_token(session: AsyncIOMotorClientSession) -> str | None:
+    """Opaque token of the last operation of a causal session, to read after it later."""
+    # motor declares the property as a method
+    if (operation_time := cast(Timestamp | None, session.operation_time)) is None:
+        return None
+    return f"{operation_time.time}.{operation_time.inc}"
+
+
+def _operation_time(token: str) -> Timestamp | None:
+    try:
+        time, inc = token.split('.')
+        return Timestamp(int(time), int(inc))
+    except (TypeError, ValueError):
+        return None  # a malformed token only loses the read-your-writes guarantee
+
+
+async def after_commit(callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` now, or once the surrounding transaction has committed.
+
+    Side effects outside Mongo (cache writes, subscribers) must not observe writes a
+    retried or aborted transaction may still discard.
+    """
+    if (transaction := _transaction.get()) is None:
+        await callback()
+    else:
+        transaction.after_commit.append(callback)
+
+
+def available_compressors(names: Iterable[str]) -> list[str]:
+    """The given wire compressors, in order, without those whose library is missing."""
+    available = []
+    for name in names:
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None or importlib.util.find_spec(module) is not None:
+            available.append(name)
+    return available
+
+
+class MongoClientPool:
+    """One motor client, i.e. one connection pool, per connection string.
+
+    Connectors reaching the same deployment share its client. The application opens
+    the clients it needs at startup, pinging each so the first requests find
+    connections ready, and closes them all at shutdown.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        compressors: Iterable[str] = ('zstd', 'snappy'),
+        connect_timeout: int = 5_000,
+        server_timeout: int = 15_000,
+    ) -> None:
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self.compressors = available_compressors(compressors)
+        self.connect_timeout = connect_timeout
+        self.server_timeout = server_timeout
+        self.clients: dict[str, AsyncIOMotorClient] = {}
+
+    def client(self, connection_str: str) -> AsyncIOMotorClient:
+        """The client of a connection string, created on first use."""
+        if (client := self.clients.get(connection_str)) is None:
+            options: dict[str, Any] = (
+                {'compressors': ','.join(self.compressors)} if self.compressors else {}
+            )
+            client = AsyncIOMotorClient(
+                connection_str,
+                maxPoolSize=self.max_pool_size,
+                minPoolSize=self.min_pool_size,
+                connectTimeoutMS=self.connect_timeout,
+                serverSelectionTimeoutMS=self.server_timeout,
+                uuidRepresentation='standard',
+                **options,
+            )
+            self.clients[connection_str] = client
+        return client
+
+    async def open(self, connection_strs: Iterable[str], warmup: bool = True) -> None:
+        """Create the clients of ``connection_strs`` and, with ``warmup``, ping each.
+
+        A failed ping is only logged: the driver keeps connecting in the background and
+        requests fail on their own until the deployment is reachable.
+        """
+        clients = {
+            connection_str: self.client(connection_str) for connection_str in connection_strs
+        }
+        if not warmup:
+            return
+        outcomes = await asyncio.gather(
+            *(client.admin.command('ping') for client in clients.values()),
+            return_exceptions=True,
+        )
+        for client, outcome in zip(clients.values(), outcomes):
+            if isinstance(outcome, Exception):
+                await logger.warning(
+                    'MongoDB warmup failed', nodes=str(client.nodes), error=type(outcome).__name__
+                )
+
+    def close(self) -> None:
+        """Close every client, at shutdown once no connector is used any more."""
+        clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            client.close()
+
+
 class AsyncMongoDBConnectorAdapter:
-    def __init__(
+    """Database of a deployment, reached through the client its pool holds for it.
+
+    ``get_connection`` is the write handle and always reaches the primary;
+    ``read_connection`` is the handle for queries, following ``read_preference``
+    (e.g. ``secondaryPreferred`` bounded by ``max_staleness`` seconds). Without a
+    ``pool`` the connector opens a private one, closed by ``close``.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
         self,
         connection_str: str,
         database_name: str,
-        server_timeout: int = 15_000,
+        pool: MongoClientPool | None = None,
         client: AsyncIOMotorClient | None = None,
+        read_preference: str = 'primary',
+        max_staleness: int = -1,
     ):
         self.connection_str = connection_str
         self.database_name = database_name
-        self.server_timeout = server_timeout
+        self.owns_pool = pool is None
+        self.pool = pool or MongoClientPool()
+        self.read_preference = make_read_preference(read_preference, max_staleness)
         self._client: AsyncIOMotorClient | None = client
         self._database: AsyncIOMotorDatabase | None = client[database_name] if client else None
+        self._read_database: AsyncIOMotorDatabase | None = None
 
-    def _ensure_connection(self) -> None:
+    def _ensure_connection(self) -> AsyncIOMotorClient:
+        """The client, taken from the pool on first use."""
         if self._client is None:
-            self._client = motor.motor_asyncio.AsyncIOMotorClient(
-                self.connection_str,
-                serverSelectionTimeoutMS=self.server_timeout,
-                uuidRepresentation='standard',
-            )
+            self._client = self.pool.client(self.connection_str)
             self._database = self._client[self.database_name]
+        if self._read_database is None:
+            self._read_database = self._client.get_database(
+                self.database_name, read_preference=self.read_preference
+            )
+        return self._client
 
-    async def _reset_connection(self) -> None:
-        if self._client:
-            await self._client.close()
+    async def close(self) -> None:
+        if self.owns_pool:
+            self.pool.close()
         self._client = None
         self._database = None
+        self._read_database = None
 
-    async def close(self) -> None:
-        await self._reset_connection()
+    def shares_cluster_with(self, other: 'AsyncMongoDBConnectorAdapter') -> bool:
+        """Whether both adapters reach the same deployment, so one session spans them."""
+        return self.connection_str == other.connection_str
+
+    async def run_in_transaction(self, callback: Callable[[], Awaitable[T]]) -> T:
+        """Await ``callback`` inside a multi-document transaction and return its result.
+
+        Every adapter's ``get_connection`` yields databases bound to this client while the
+        transaction runs, and repositories pass ``current_session()`` to their operations.
+        The driver re-runs ``callback`` on TransientTransactionError and retries the commit
+        on UnknownTransactionCommitResult; ``after_commit`` work only runs once it commits.
+        """
+        client = self._ensure_connection()
+        # a causal session opened on this client carries the transaction, so that reads
+        # after it see the commit
+        if (causal := _causal.get()) is not None and causal.client is client:
+            transaction = MongoTransaction(causal)
+            result = await self._transaction(transaction, callback)
+        else:
+            async with await client.start_session() as session:
+                transaction = MongoTransaction(session)
+                result = await self._transaction(transaction, callback)
+
+        for callback_after_commit in transaction.after_commit:
+            await callback_after_commit()
+        return result
+
+    async def _transaction(
+        self, transaction: MongoTransaction, callback: Callable[[], Awaitable[T]]
+    ) -> T:
+        async def attempt(_: AsyncIOMotorClientSession) -> T:
+            transaction.after_commit.clear()  # drop work queued by an aborted attempt
+            return await callback()
+
+        token = _transaction.set(transaction)
+        try:
+            return await transaction.session.with_transaction(
+                attempt,
+                read_concern=ReadConcern('snapshot'),
+                write_concern=WriteConcern('majority'),
+            )
+        finally:
+            _transaction.reset(token)
+
+    @asynccontextmanager
+    async def causal_session(
+        self, after: str | None = None
+    ) -> AsyncGenerator[AsyncIOMotorClientSession, None]:
+        """Causally consistent session for the enclosed operations of every connector.
+
+        Reads in it see its earlier writes, on secondaries too, and with ``after`` (an
+        ``operation_token`` of an earlier session) the writes that session had made. The
+        connectors used inside must share this client, i.e. this connection string.
+        Nested calls join the outer session.
+        """
+        if (session := _causal.get()) is not None:
+            yield session
+            return
+        client = self._ensure_connection()
+        async with await client.start_session(causal_consistency=True) as session:
+            if after and (operation_time := _operation_time(after)) is not None:
+                session.advance_operation_time(operation_time)
+            token = _causal.set(session)
+            try:
+                yield session
+            finally:
+                _causal.reset(token)
 
     @asynccontextmanager
     async def get_connection(self) -> AsyncGenerator[AsyncIOMotorDatabase, None]:
+        """Write handle: the database on the primary."""
+        async with self._connection(read=False) as database:
+            yield database
+
+    @asynccontextmanager
+    async def read_connection(self) -> AsyncGenerator[AsyncIOMotorDatabase, None]:
+        """Read handle for queries, following the read preference outside transactions."""
+        async with self._connection(read=True) as database:
+            yield database
+
+    @asynccontextmanager
+    async def _connection(self, read: bool) -> AsyncGenerator[AsyncIOMotorDatabase, None]:
         try:
             self._ensure_connection()
-            yield self._database
+            # inside a transaction, operations must go through the client owning the session
+            if transaction := _transaction.get():
+                yield transaction.session.client[self.database_name]
+            elif (database := self._read_database if read else self._database) is None:
+                raise MongoDBAdapterException(f'MongoDB is not connected for {self.database_name}.')
+            else:
+                yield database
         except (ServerSelectionTimeoutError, ConnectionFailure) as exc:
+            if any(exc.has_error_label(label) for label in TRANSACTION_ERROR_LABELS):
+                raise  # with_transaction retries on the label, so it must reach it unchanged
+            # the client is shared and reconnects on its own, so it is kept
             await logger.exception('MongoDB connection failed')
-            await self._reset_connection()
             raise MongoDBAdapterException(
-                f'MongoDB connection failed for {self.database_name} and has been reset.'
+                f'MongoDB connection failed for {self.database_name}.'
             ) from exc
-
-    def __del__(self) -> None:
-        if self._client:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.close())
-            except RuntimeError:
-                pass
@@ -0,0 +1,147 @@
+import asyncio
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+from adapters.mongo_db_connector_adapter import (
+    AsyncMongoDBConnectorAdapter,
+    MongoDBAdapterException,
+)
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# plan stages that read documents without an index or sort them in memory
+UNINDEXED_STAGES = frozenset({'COLLSCAN', 'SORT'})
+
+
+@dataclass(frozen=True)
+class MongoIndex:
+    """An index a repository's queries rely on."""
+
+    name: str
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+
+    def model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, unique=self.unique)
+
+    def matches(self, info: Mapping[str, Any]) -> bool:
+        """Whether an entry of ``index_information()`` is this index, whatever its name."""
+        return list(info['key']) == list(self.keys) and info.get('unique', False) == self.unique
+
+
+class IndexedRepository(Protocol):
+    """A repository declaring the indexes of its collection."""
+
+    INDEXES: Sequence[MongoIndex]
+    db_connection: AsyncMongoDBConnectorAdapter
+    collection_name: str
+
+
+@dataclass
+class IndexReport:
+    """What applying the declared indexes of one collection did."""
+
+    collection: str
+    created: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    replaced: list[str] = field(default_factory=list)
+    conflicting: list[str] = field(default_factory=list)  # same name, other definition
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicting and self.error is None
+
+
+async def ensure_indexes(
+    collection: AsyncIOMotorCollection, indexes: Iterable[MongoIndex], replace: bool = False
+) -> IndexReport:
+    """Create the missing ``indexes`` of a collection; existing ones are left alone.
+
+    An index existing under its name with another definition is a conflict: it is only
+    dropped and rebuilt with ``replace``, since queries relying on it scan meanwhile.
+    The missing indexes are built together by one ``createIndexes`` command; the server
+    builds them without blocking reads and writes but for short locks at start and end.
+    """
+    report = IndexReport(collection=f"{collection.database.name}.{collection.name}")
+    existing = await collection.index_information()
+    missing = []
+    for index in indexes:
+        if (current := existing.get(index.name)) is None:
+            if any(index.matches(info) for info in existing.values()):
+                report.unchanged.append(index.name)  # created under another name
+            else:
+                missing.append(index)
+        elif index.matches(current):
+            report.unchanged.append(index.name)
+        elif replace:
+            await collection.drop_index(index.name)
+            report.replaced.append(index.name)
+            missing.append(index)
+        else:
+            report.conflicting.append(index.name)
+    if missing:
+        await collection.create_indexes([index.model() for index in missing])
+        report.created.extend(index.name for index in missing if index.name not in report.replaced)
+    return report
+
+
+class MongoIndexRegistry:
+    """The declared indexes of every repository, applied at startup or from the CLI.
+
+    Applying is idempotent: an up-to-date deployment only answers one
+    ``listIndexes`` per collection.
+    """
+
+    def __init__(self, repositories: Iterable[IndexedRepository]) -> None:
+        self.repositories = [repository for repository in repositories if repository.INDEXES]
+
+    async def apply(self, replace: bool = False) -> list[IndexReport]:
+        """Apply the declared indexes of every collection; failures end up in the reports."""
+        reports = await asyncio.gather(
+            *(self._apply(repository, replace) for repository in self.repositories)
+        )
+        for report in reports:
+            if report.ok:
+                await logger.info('MongoDB indexes applied', **vars(report))
+            else:
+                await logger.warning('MongoDB indexes not applied', **vars(report))
+        return list(reports)
+
+    @staticmethod
+    async def _apply(repository: IndexedRepository, replace: bool) -> IndexReport:
+        try:
+            async with repository.db_connection.get_connection() as connection:
+                return await ensure_indexes(
+                    connection[repository.collection_name], repository.INDEXES, replace
+                )
+        except (PyMongoError, MongoDBAdapterException) as exc:
+            name = f"{repository.db_connection.database_name}.{repository.collection_name}"
+            return IndexReport(collection=name, error=f"{type(exc).__name__}: {exc}")
+
+
+def plan_stages(explain: Mapping[str, Any]) -> list[str]:
+    """Stage names of the winning plan of an ``explain`` result, from the root down."""
+    if 'queryPlanner' not in explain and 'stages' in explain:
+        explain = explain['stages'][0]['$cursor']  # aggregation: the initial query
+    plan = explain['queryPlanner']['winningPlan']
+    plan = plan.get('queryPlan', plan)  # the slot based engine wraps the tree
+    stages, pending = [], [plan]
+    while pending:
+        stage = pending.pop(0)
+        stages.append(stage['stage'])
+        if 'inputStage' in stage:
+            pending.append(stage['inputStage'])
+        pending.extend(stage.get('inputStages', ()))
+    return stages
+
+
+def index_served(explain: Mapping[str, Any]) -> bool:
+    """Whether a query neither scans its collection nor sorts in memory."""
+    return not UNINDEXED_STAGES.intersection(plan_stages(explain))
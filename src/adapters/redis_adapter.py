@@ -69,6 +69,18 @@ class RedisAdapter(CacheInterface):
     async def set(self, key: str, data: dict[str, Any], ttl: int = 300) -> None:
         await self.client.set(key, json.dumps(data, default=str), ex=ttl)
 
+    @silent_mode_wrapper
+    async def add(self, key: str, data: dict[str, Any], ttl: int = 300) -> bool:
+        return bool(await self.client.set(key, json.dumps(data, default=str), ex=ttl, nx=True))
+
+    @silent_mode_wrapper
+    async def get_raw(self, key: str) -> str | None:
+        return await self.client.get(key)
+
+    @silent_mode_wrapper
+    async def set_raw(self, key: str, value: str, ttl: int = 300) -> None:
+        await self.client.set(key, value, ex=ttl)
+
     @silent_mode_wrapper
     async def delete(self, key: str) -> None:
         await self.client.delete(key)
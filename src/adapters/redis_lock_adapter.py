@@ -0,0 +1,97 @@
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from adapters.redis_adapter import RedisAdapter
+from adapters.striped_lock_adapter import StripedLockAdapter
+from exceptions import LockUnavailable
+from ports.lock_interface import LockInterface
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# delete the lease only while it still holds our token
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# extend the lease only while it still holds our token
+EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLockAdapter(LockInterface):
+    """Keyed locks shared across workers through Redis leases (SET NX PX).
+
+    Waiters of the same process queue on a local stripe first, so only one
+    coroutine per worker polls Redis for a given key. Leases expire after
+    ``lease_ttl`` seconds in case the holder dies, and are extended every third of
+    it while the lock is held, so a slow command keeps its lock however long it runs.
+
+    The adapter talks to ``redis.client`` directly rather than through the cache
+    methods on purpose: those swallow errors in silent mode, and a lock must fail
+    loudly (the command is not run) rather than pass as acquired when Redis is down.
+    """
+
+    def __init__(
+        self,
+        redis: RedisAdapter,
+        lease_ttl: float = 10.0,
+        acquire_timeout: float = 5.0,
+        retry_interval: float = 0.01,
+        local: StripedLockAdapter | None = None,
+    ) -> None:
+        self.redis = redis
+        self.lease_ttl = lease_ttl
+        self.acquire_timeout = acquire_timeout
+        self.retry_interval = retry_interval
+        self.local = local or StripedLockAdapter()
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"lock:{key}"
+
+    async def _acquire(self, key: str, token: str) -> None:
+        deadline = time.monotonic() + self.acquire_timeout
+        lease_ms = int(self.lease_ttl * 1000)
+        while not await self.redis.client.set(key, token, px=lease_ms, nx=True):
+            if time.monotonic() >= deadline:
+                raise LockUnavailable(detail=f"could not acquire lock for '{key}'")
+            await asyncio.sleep(self.retry_interval)
+
+    async def _renew(self, key: str, token: str) -> None:
+        lease_ms = int(self.lease_ttl * 1000)
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                extended = await self.redis.client.eval(EXTEND_SCRIPT, 1, key, token, lease_ms)
+            except Exception as exc:
+                await logger.warning('Lock lease renewal failed', key=key, error=type(exc).__name__)
+                continue
+            if not extended:
+                await logger.warning('Lock lease lost while held', key=key)
+                return
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self.local.lock(key):
+            lease_key, token = self._key(key), uuid.uuid4().hex
+            await self._acquire(lease_key, token)
+            renewal = asyncio.create_task(self._renew(lease_key, token))
+            try:
+                yield
+            finally:
+                renewal.cancel()
+                await asyncio.gather(renewal, return_exceptions=True)
+                released = await self.redis.client.eval(RELEASE_SCRIPT, 1, lease_key, token)
+                if not released:
+                    await logger.warning('Lock lease expired before release', key=lease_key)
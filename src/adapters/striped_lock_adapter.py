@@ -0,0 +1,26 @@
+import asyncio
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from ports.lock_interface import LockInterface
+
+
+class StripedLockAdapter(LockInterface):
+    """In-process keyed locks backed by a fixed pool of asyncio locks.
+
+    Keys are hashed onto ``stripes`` locks, so memory stays bounded no matter how
+    many aggregates are touched; unrelated keys rarely share a stripe.
+    """
+
+    def __init__(self, stripes: int = 1024) -> None:
+        self.stripes = [asyncio.Lock() for _ in range(max(1, stripes))]
+
+    def stripe(self, key: str) -> asyncio.Lock:
+        """Return the lock guarding ``key``."""
+        return self.stripes[zlib.crc32(key.encode()) % len(self.stripes)]
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self.stripe(key):
+            yield
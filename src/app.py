@@ -1,9 +1,22 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination
 
 from containers import AppContainer
 from rest import init_middlewares, init_routes
-from settings import APPLICATION_NAME
+from settings import (
+    APPLICATION_NAME,
+    DELIVERY_PLANNING,
+    MONGO_ENSURE_INDEXES,
+    MONGO_WARMUP,
+    ORDER_ASYNC_PAYMENTS,
+    ORDER_EVENT_STORE_CONNECTION,
+    ORDER_REPOSITORY_CONNECTION,
+    PRODUCT_CATALOG_BACKEND,
+    PRODUCT_CATALOG_CONNECTION,
+)
 
 
 def create_app() -> FastAPI:
@@ -11,10 +24,38 @@ def create_app() -> FastAPI:
     container.init_resources()
     container.wire(modules=[__name__])
 
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        mongo_clients = container.mongo_clients()
+        connections = [ORDER_REPOSITORY_CONNECTION, ORDER_EVENT_STORE_CONNECTION]
+        if PRODUCT_CATALOG_BACKEND == 'mongo':
+            connections.append(PRODUCT_CATALOG_CONNECTION)
+        await mongo_clients.open(connections, warmup=MONGO_WARMUP)
+        if MONGO_ENSURE_INDEXES:
+            await container.mongo_indexes().apply()
+        # background workers live as long as the application
+        background = []
+        if PRODUCT_CATALOG_BACKEND == 'mongo':
+            background.append(container.product_catalog())
+        if ORDER_ASYNC_PAYMENTS:
+            background.append(container.payment_process_manager())
+        if DELIVERY_PLANNING:
+            background.append(container.delivery_planner())
+        for service in background:
+            await service.start()
+        try:
+            yield
+        finally:
+            for service in reversed(background):
+                await service.stop()
+            await container.http_client().close()
+            mongo_clients.close()
+
     # Creation of the FastAPI application instance
     app = FastAPI(
         title=APPLICATION_NAME,
         description='FastAPI application using cqrs architecture',
+        lifespan=lifespan,
     )
 
     # Initialization of middlewares and routes
@@ -23,6 +64,8 @@ def create_app() -> FastAPI:
         app,
         [
             container.order_controller(),
+            container.order_statistics_controller(),
+            container.quote_controller(),
         ],
     )
 
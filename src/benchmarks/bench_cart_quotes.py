@@ -0,0 +1,110 @@
+"""Quoting a partner batch of carts: per-cart scalar path vs vectorized CartQuoteService.
+
+Run from ``src``: ``python -m benchmarks.bench_cart_quotes``
+"""
+
+import asyncio
+import random
+import time
+
+from domain.base.value_object import Money
+from domain.delivery.adapters.cost_calculator_adapter import DeliveryCostCalculatorAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+from domain.order.model.value_objects import Cart, CartQuote, OrderItem
+from domain.order.services.cart_quote_service import CartQuoteService
+from domain.product.adapters.mongo_product_catalog_adapter import MongoProductCatalogAdapter
+
+CARTS = 5_000
+PRODUCTS = 2_000
+DESTINATIONS = 500
+ROUNDS = 5
+
+
+class InstantMaps(MapsAdapterInterface):
+    """Distances without I/O, so only pricing and tier computation are measured."""
+
+    async def calculate_distance_from_warehouses(self, destination: Address) -> float:
+        return float(destination.house_number) / 7
+
+
+def build_catalog(generator: random.Random) -> MongoProductCatalogAdapter:
+    catalog = MongoProductCatalogAdapter(db_connection=None, collection_name='products')
+    catalog.index = {
+        f"product_{index}": Money(generator.randint(1, 99_999)) for index in range(PRODUCTS)
+    }
+    return catalog
+
+
+def build_carts(generator: random.Random) -> list[Cart]:
+    destinations = [
+        Address(
+            house_number=generator.randint(1, 600),
+            road='Rua A',
+            sub_district='Bairro X',
+            district='Cidade Y',
+            state=StatesEnum.RS,
+            postcode='12345-678',
+            country='Brasil',
+        )
+        for _ in range(DESTINATIONS)
+    ]
+    return [
+        Cart(
+            items=tuple(
+                OrderItem(
+                    product_id=f"product_{generator.randrange(PRODUCTS)}",
+                    amount=generator.randint(1, 20),
+                )
+                for _ in range(generator.randint(1, 12))
+            ),
+            destination=generator.choice(destinations),
+        )
+        for _ in range(CARTS)
+    ]
+
+
+async def scalar_quotes(
+    catalog: MongoProductCatalogAdapter, delivery: DeliveryCostCalculatorAdapter, carts: list[Cart]
+) -> list[CartQuote]:
+    """What quoting looks like through the order-creation path, one cart at a time."""
+    quotes = []
+    for cart in carts:
+        product_cost = await catalog.total_price(
+            [(item.product_id, item.amount) for item in cart.items]
+        )
+        delivery_cost = await delivery.calculate_cost(product_cost, cart.destination)
+        quotes.append(CartQuote(product_cost=product_cost, delivery_cost=delivery_cost))
+    return quotes
+
+
+async def run() -> None:
+    generator = random.Random(42)
+    catalog = build_catalog(generator)
+    delivery = DeliveryCostCalculatorAdapter(InstantMaps())
+    service = CartQuoteService(catalog, delivery)
+    carts = build_carts(generator)
+
+    scalar, vectorized = [], []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        expected = await scalar_quotes(catalog, delivery, carts)
+        scalar.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        quotes = await service.quote(carts)
+        vectorized.append(time.perf_counter() - started)
+        assert quotes == expected, 'vectorized quotes differ from the scalar path'
+
+    items = sum(len(cart.items) for cart in carts)
+    print(f"{CARTS} carts, {items} items, {PRODUCTS} products, {DESTINATIONS} destinations")
+    print(f"scalar path     {min(scalar) * 1e3:8.1f} ms")
+    print(f"vectorized      {min(vectorized) * 1e3:8.1f} ms")
+    print(f"speedup         {min(scalar) / min(vectorized):8.1f}x  (identical quotes)")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Delivery cost per order: precomputed tariff table vs live local distance.
+
+Run from ``src``: ``python -m benchmarks.bench_delivery_tariffs``
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from domain.base.value_object import Money
+from domain.delivery.adapters.cost_calculator_adapter import DeliveryCostCalculatorAdapter
+from domain.delivery.services.tariff_compiler import compile_from_maps
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+
+POSTCODES = 200_000
+WAREHOUSES = 60
+ORDERS = 20_000
+ROUNDS = 5
+
+
+def address(postcode: str) -> Address:
+    return Address(
+        house_number='1',
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state=StatesEnum.RS,
+        postcode=postcode,
+        country='Brasil',
+    )
+
+
+async def run() -> None:
+    generator = np.random.default_rng(42)
+    # postcodes numbered along a line of latitude, so neighbouring codes are neighbours
+    latitudes = np.linspace(-33.7, -19.0, POSTCODES)
+    coordinates = np.column_stack((latitudes, generator.uniform(-53.0, -51.0, POSTCODES)))
+    warehouses = coordinates[generator.choice(POSTCODES, WAREHOUSES, replace=False)]
+    postcodes = [f"{code * 400:08d}" for code in range(POSTCODES)]
+    maps = LocalMapsAdapter(postcodes, coordinates, warehouses)
+
+    started = time.perf_counter()
+    tariffs = compile_from_maps(maps)
+    compile_time = time.perf_counter() - started
+
+    live = DeliveryCostCalculatorAdapter(maps)
+    tabled = DeliveryCostCalculatorAdapter(maps, tariffs)
+    orders = [
+        (Money(int(total)), address(postcodes[row]))
+        for total, row in zip(
+            generator.integers(1_000, 100_000, ORDERS), generator.choice(POSTCODES, ORDERS)
+        )
+    ]
+    timings: dict[str, list[float]] = {'live distance': [], 'tariff table': []}
+    for _ in range(ROUNDS):
+        results = []
+        for name, adapter in (('live distance', live), ('tariff table', tabled)):
+            started = time.perf_counter()
+            results.append([await adapter.calculate_cost(total, where) for total, where in orders])
+            timings[name].append(time.perf_counter() - started)
+        assert results[0] == results[1], 'tariffs differ from the live calculation'
+
+    print(
+        f"{POSTCODES} postcodes compiled in {compile_time:.2f} s into "
+        f"{len(tariffs.small)} small-order and {len(tariffs.large)} large-order entries"
+    )
+    for name, timing in timings.items():
+        print(f"{name:14} {min(timing) / ORDERS * 1e6:8.2f} us/order")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Commands racing on one hot order: optimistic retries vs per-aggregate locks.
+
+Run from ``src``: ``python -m benchmarks.bench_hot_aggregate_contention``
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from pymongo.errors import DuplicateKeyError
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+from adapters.striped_lock_adapter import StripedLockAdapter
+from domain.base.bus import CommandBus, LockMiddleware, Middleware, RetryMiddleware
+from domain.base.message import Command
+from domain.order.exceptions.order_exceptions import EntityOutdated
+from domain.order.model.entities import Order
+from domain.order.model.value_objects import OrderId
+from domain.order.repositories.order_repository import OrderRepository
+from utils.retry import RetryPolicy
+
+COMMANDS = 400
+CONCURRENCY = 50
+RETRY_ATTEMPTS = 3
+STORE_LATENCY = 0.001  # seconds per Mongo round trip
+
+
+@dataclass(frozen=True, slots=True)
+class TouchOrder(Command):
+    order_id: OrderId
+
+
+class SlowCollection:
+    """Mongo collection stand-in adding a fixed latency to each round trip."""
+
+    def __init__(self) -> None:
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.round_trips = 0
+
+    async def find_one(self, query: dict[str, Any], **_: Any) -> dict[str, Any] | None:
+        self.round_trips += 1
+        await asyncio.sleep(STORE_LATENCY)
+        return self.documents.get(query['_id'])
+
+    async def replace_one(self, query: dict[str, Any], document: dict[str, Any], **_: Any) -> None:
+        """Conditional upsert: a filter missing an existing ``_id`` collides on insert."""
+        self.round_trips += 1
+        await asyncio.sleep(STORE_LATENCY)
+        current = self.documents.get(query['_id'])
+        if current and current['version'] != query['version']:
+            raise DuplicateKeyError('E11000 duplicate key error')
+        self.documents[query['_id']] = document
+
+
+class SlowConnection:
+    def __init__(self, collection: SlowCollection) -> None:
+        self.collection = collection
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator[dict[str, SlowCollection]]:
+        yield {'orders': self.collection}
+
+
+class TouchOrderHandler:
+    """Load, mutate and save the aggregate like PayOrder/CancelOrder do."""
+
+    def __init__(self, repository: OrderRepository) -> None:
+        self.repository = repository
+
+    async def __call__(self, command: TouchOrder) -> None:
+        order = await self.repository.from_id(command.order_id)
+        await asyncio.sleep(STORE_LATENCY)  # e.g. payment verification
+        await self.repository.save(order)
+
+
+async def run(with_lock: bool) -> dict[str, float]:
+    collection = SlowCollection()
+    repository = OrderRepository(InMemoryCacheAdapter(), SlowConnection(collection), 'orders')
+    order = Order(
+        buyer_id='buyer_1', items=[], product_cost=10, delivery_cost=1, payment_id='payment_1'
+    )
+    await repository.save(order)
+    repository.cache_adapter.values.clear()  # start cold
+
+    middlewares: list[Middleware] = []
+    if with_lock:
+        middlewares.append(
+            LockMiddleware(StripedLockAdapter(), key_of=lambda command: str(command.order_id))
+        )
+    middlewares.append(RetryMiddleware((EntityOutdated,), RetryPolicy(attempts=RETRY_ATTEMPTS)))
+    bus = CommandBus()
+    bus.register(TouchOrder, TouchOrderHandler(repository), middlewares=middlewares)
+
+    failures = 0
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def send() -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                await bus.dispatch(TouchOrder(order_id=OrderId(order.id)))
+            except EntityOutdated:
+                failures += 1
+
+    collection.round_trips = 0
+    initial_version = order.version
+    started = time.perf_counter()
+    await asyncio.gather(*(send() for _ in range(COMMANDS)))
+    elapsed = time.perf_counter() - started
+    # every applied save bumps the version once; reported successes beyond that were lost
+    applied = (await repository.from_id(order.id)).version - initial_version
+    return {
+        'applied': applied / elapsed,
+        'failures': failures,
+        'lost': COMMANDS - failures - applied,
+        'round_trips': collection.round_trips / max(1, applied),
+    }
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)  # silence the per-retry warnings
+    print(f"{COMMANDS} commands on one order, {CONCURRENCY} in flight, {RETRY_ATTEMPTS} attempts")
+    for name, with_lock in (('optimistic retries', False), ('per-aggregate lock', True)):
+        result = asyncio.run(run(with_lock))
+        print(
+            f"{name:20s} {result['applied']:7.1f} applied/s  "
+            f"{result['failures']:4.0f} EntityOutdated  {result['lost']:4.0f} lost updates  "
+            f"{result['round_trips']:5.1f} round trips per applied update"
+        )
+
+
+if __name__ == '__main__':
+    main()
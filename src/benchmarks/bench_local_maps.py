@@ -0,0 +1,86 @@
+"""Nearest-warehouse lookups: k-d tree walk, NumPy pass per query, one batch matrix.
+
+Run from ``src``: ``python -m benchmarks.bench_local_maps``
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from domain.maps.adapters.local_maps_adapter import EARTH_RADIUS_KM, LocalMapsAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+
+POSTCODES = 200_000
+WAREHOUSES = 60
+LOOKUPS = 20_000
+ROUNDS = 5
+
+
+def haversine_to_all(latitude: float, longitude: float, warehouses: np.ndarray) -> np.ndarray:
+    latitude, longitude = np.radians(latitude), np.radians(longitude)
+    latitudes, longitudes = np.radians(warehouses[:, 0]), np.radians(warehouses[:, 1])
+    latitude_term = np.sin((latitudes - latitude) / 2) ** 2
+    longitude_term = np.sin((longitudes - longitude) / 2) ** 2
+    hav = latitude_term + np.cos(latitude) * np.cos(latitudes) * longitude_term
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(hav))
+
+
+def address(postcode: str) -> Address:
+    return Address(
+        house_number='1',
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state=StatesEnum.RS,
+        postcode=postcode,
+        country='Brasil',
+    )
+
+
+async def run() -> None:
+    generator = np.random.default_rng(42)
+    # roughly the south and south-east of Brazil
+    coordinates = np.column_stack(
+        (generator.uniform(-33.7, -19.0, POSTCODES), generator.uniform(-57.6, -39.7, POSTCODES))
+    )
+    warehouses = coordinates[generator.choice(POSTCODES, WAREHOUSES, replace=False)]
+    postcodes = [f"{code:08d}" for code in range(POSTCODES)]
+
+    started = time.perf_counter()
+    adapter = LocalMapsAdapter(postcodes, coordinates, warehouses)
+    load = time.perf_counter() - started
+
+    rows = generator.choice(POSTCODES, LOOKUPS)
+    destinations = [address(postcodes[row]) for row in rows]
+    tree, brute, batch = [], [], []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        distances = [
+            await adapter.calculate_distance_from_warehouses(item) for item in destinations
+        ]
+        tree.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        expected = []
+        for row in rows:
+            lat, lon = coordinates[row]
+            expected.append(haversine_to_all(lat, lon, warehouses).min())
+        brute.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        batched = await adapter.calculate_distances(destinations)
+        batch.append(time.perf_counter() - started)
+        assert np.allclose(distances, expected), 'tree and brute force disagree'
+        assert np.allclose(batched, expected), 'batch and brute force disagree'
+
+    print(f"{POSTCODES} postcodes, {WAREHOUSES} warehouses, index built in {load * 1e3:.0f} ms")
+    print(f"k-d tree        {min(tree) / LOOKUPS * 1e6:8.2f} us/lookup")
+    print(f"numpy per query {min(brute) / LOOKUPS * 1e6:8.2f} us/lookup")
+    print(f"batch matrix    {min(batch) / LOOKUPS * 1e6:8.2f} us/lookup")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Order create/get with Decimal amounts vs integer-cent Money.
+
+Create prices the items, builds the aggregate and encodes it for Mongo (BSON) and
+Redis (JSON); get decodes the BSON document and renders the ``OrderDetail`` view.
+
+Run from ``src``: ``python -m benchmarks.bench_money``
+"""
+
+import json
+import random
+import time
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any
+
+import bson
+from pydantic import computed_field
+
+from domain.base.value_object import Money
+from domain.order.dtos.order_dtos import OrderDetail
+from domain.order.model.entities import Order
+from domain.order.model.value_objects import OrderItem
+
+ORDERS = 2_000
+ITEMS = 5
+PRODUCTS = 500
+ROUNDS = 15
+
+
+class DecimalOrderItem(OrderItem):
+    amount: Decimal  # type: ignore[assignment]
+
+
+class DecimalOrder(Order):
+    """The aggregate as it was before amounts were kept in cents."""
+
+    items: Sequence[DecimalOrderItem]  # type: ignore[assignment]
+    product_cost: Decimal  # type: ignore[assignment]
+    delivery_cost: Decimal  # type: ignore[assignment]
+
+
+class DecimalOrderDetail(OrderDetail):
+    items: Sequence[DecimalOrderItem]  # type: ignore[assignment]
+    product_cost: Decimal  # type: ignore[assignment]
+    delivery_cost: Decimal  # type: ignore[assignment]
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def total_cost(self) -> Decimal:  # type: ignore[override]
+        return self.product_cost + self.delivery_cost
+
+
+Cart = list[tuple[str, int]]
+
+
+def build_carts(generator: random.Random) -> list[Cart]:
+    return [
+        [
+            (f"product_{generator.randrange(PRODUCTS)}", generator.randint(1, 20))
+            for _ in range(ITEMS)
+        ]
+        for _ in range(ORDERS)
+    ]
+
+
+def price_decimal(prices: dict[str, Decimal], cart: Cart) -> Decimal:
+    return sum((prices[product_id] * count for product_id, count in cart), Decimal(0))
+
+
+def price_money(prices: dict[str, Money], cart: Cart) -> Money:
+    return Money(sum(prices[product_id] * count for product_id, count in cart))
+
+
+def create_decimal(prices: dict[str, Decimal], cart: Cart) -> Order:
+    return DecimalOrder(
+        buyer_id='buyer',
+        items=[DecimalOrderItem(product_id=product_id, amount=count) for product_id, count in cart],
+        product_cost=price_decimal(prices, cart),
+        delivery_cost=float(50.0 + 15.0 * 2.3456),
+        payment_id='payment',
+    )
+
+
+def create_money(prices: dict[str, Money], cart: Cart) -> Order:
+    return Order(
+        buyer_id='buyer',
+        items=[OrderItem(product_id=product_id, amount=count) for product_id, count in cart],
+        product_cost=price_money(prices, cart),
+        delivery_cost=Money(5_000 + Money.from_cents(1_500 * 2.3456)),
+        payment_id='payment',
+    )
+
+
+def encode(order: Order) -> tuple[bytes, str]:
+    document = order.model_dump(mode='json')
+    return bson.encode({'_id': order.id, **document}), json.dumps(document, default=str)
+
+
+def get(order_type: type[Order], detail_type: type[OrderDetail], raw: bytes) -> str:
+    order = order_type.model_validate(bson.decode(raw))
+    return detail_type.model_validate(order.model_dump()).model_dump_json()
+
+
+def run() -> None:
+    generator = random.Random(42)
+    cents = {f"product_{index}": generator.randint(1, 99_999) for index in range(PRODUCTS)}
+    decimal_prices = {product_id: Decimal(price).scaleb(-2) for product_id, price in cents.items()}
+    money_prices = {product_id: Money(price) for product_id, price in cents.items()}
+    carts = build_carts(generator)
+
+    variants: dict[str, tuple[Any, ...]] = {
+        'Decimal': (
+            decimal_prices,
+            price_decimal,
+            create_decimal,
+            DecimalOrder,
+            DecimalOrderDetail,
+        ),
+        'Money': (money_prices, price_money, create_money, Order, OrderDetail),
+    }
+    encoded = {
+        name: [encode(create(prices, cart)) for cart in carts]
+        for name, (prices, _, create, _, _) in variants.items()
+    }
+    timings: dict[str, list[list[float]]] = {name: [[], [], []] for name in variants}
+    # rounds alternate between variants so load drift hits both alike
+    for _ in range(ROUNDS):
+        for name, (prices, price, create, order_type, detail_type) in variants.items():
+            steps = (
+                lambda: [price(prices, cart) for cart in carts],
+                lambda: [encode(create(prices, cart)) for cart in carts],
+                lambda: [get(order_type, detail_type, raw) for raw, _ in encoded[name]],
+            )
+            for timing, step in zip(timings[name], steps):
+                started = time.perf_counter()
+                step()
+                timing.append(time.perf_counter() - started)
+
+    print(f"{ORDERS} orders of {ITEMS} items, best of {ROUNDS} rounds (orders/s)")
+    print(f"{'':8} {'price':>10} {'create':>10} {'get':>10} {'BSON B':>8} {'JSON B':>8}")
+    for name, (price_time, create_time, get_time) in timings.items():
+        bson_size = sum(len(raw) for raw, _ in encoded[name]) / ORDERS
+        json_size = sum(len(text) for _, text in encoded[name]) / ORDERS
+        print(
+            f"{name:8} {ORDERS / min(price_time):10.0f} {ORDERS / min(create_time):10.0f}"
+            f" {ORDERS / min(get_time):10.0f} {bson_size:8.0f} {json_size:8.0f}"
+        )
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == '__main__':
+    main()
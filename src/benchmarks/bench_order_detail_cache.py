@@ -0,0 +1,104 @@
+"""CPU cost of GET /core/v1/orders/{id}: model rebuild vs pre-serialized view.
+
+Run from ``src``: ``python -m benchmarks.bench_order_detail_cache``
+"""
+
+import asyncio
+import json
+import time
+from typing import Annotated
+from unittest.mock import MagicMock
+
+import httpx
+from fastapi import FastAPI
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+from domain.order.controllers.order_controller import OrderController
+from domain.order.dtos.order_dtos import OrderDetail
+from domain.order.handlers.bus import build_order_command_bus, build_order_query_bus
+from domain.order.model.entities import Order
+from domain.order.model.value_objects import OrderId, OrderItem
+from domain.order.repositories.order_repository import OrderRepository
+from ports.cache_interface import CacheInterface
+
+REQUESTS = 500
+ROUNDS = 10
+
+
+class LegacyOrderController(OrderController):
+    """GET handler as it was before views were cached."""
+
+    def __init__(self, command_bus, query_bus, repository: OrderRepository) -> None:
+        super().__init__(command_bus, query_bus)
+        self.repository = repository
+
+    async def get_order(  # type: ignore[override]
+        self, order_id: Annotated[str, OrderId]
+    ) -> OrderDetail:
+        order = await self.repository.from_id(order_id)
+        return OrderDetail.from_order(order)
+
+
+def build_app(controller_class: type[OrderController], cache: CacheInterface) -> FastAPI:
+    repository = OrderRepository(cache, MagicMock(), 'orders')
+    command_bus = build_order_command_bus(MagicMock())
+    query_bus = build_order_query_bus(repository, MagicMock())
+    if controller_class is LegacyOrderController:
+        controller = LegacyOrderController(command_bus, query_bus, repository)
+    else:
+        controller = controller_class(command_bus, query_bus)
+    app = FastAPI()
+    app.include_router(controller.router)
+    return app
+
+
+async def measure(apps: dict[str, FastAPI], url: str) -> dict[str, float]:
+    """Best CPU time per request of each app; rounds alternate to spread machine noise."""
+    clients = {
+        # in-loop ASGI transport: TestClient's thread hand-off would dominate the numbers
+        name: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench')
+        for name, app in apps.items()
+    }
+    timings: dict[str, list[float]] = {name: [] for name in apps}
+    for client in clients.values():
+        await client.get(url)  # warm up caches
+    for _ in range(ROUNDS):
+        for name, client in clients.items():
+            started = time.process_time()
+            for _ in range(REQUESTS):
+                await client.get(url)
+            timings[name].append((time.process_time() - started) / REQUESTS * 1e6)
+    for client in clients.values():
+        await client.aclose()
+    return {name: min(values) for name, values in timings.items()}
+
+
+def main() -> None:
+    order = Order(
+        buyer_id='buyer_1',
+        items=[OrderItem(product_id=f"product_{i}", amount=i + 1) for i in range(10)],
+        product_cost='424.20',
+        delivery_cost='42.42',
+        payment_id='payment_1',
+        version=3,
+    )
+    cache = InMemoryCacheAdapter()
+    cache.values[order.id] = (json.dumps(order.model_dump(mode='json')), float('inf'))
+    cache.values[f"{order.id}:version"] = (json.dumps({'version': order.version}), float('inf'))
+    url = f"/core/v1/orders/{order.id}"
+
+    apps = {
+        'legacy': build_app(LegacyOrderController, cache),
+        'cached': build_app(OrderController, cache),
+    }
+    results = asyncio.run(measure(apps, url))
+    legacy, cached = results['legacy'], results['cached']
+
+    print(f"best of {ROUNDS} rounds of {REQUESTS} requests")
+    print(f"rebuild + response_model: {legacy:8.1f} us CPU/request")
+    print(f"pre-serialized view:      {cached:8.1f} us CPU/request")
+    print(f"saving:                   {legacy - cached:8.1f} us ({1 - cached / legacy:.0%})")
+
+
+if __name__ == '__main__':
+    main()
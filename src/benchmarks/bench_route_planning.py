@@ -0,0 +1,68 @@
+"""Route planning for one window of paid orders: sweep + nearest neighbour vs + 2-opt.
+
+Two synthetic datasets of 100k stops around 60 warehouses: stops spread uniformly,
+and stops clustered around cities as real orders are.
+
+Run from ``src``: ``python -m benchmarks.bench_route_planning``
+"""
+
+import time
+
+import numpy as np
+
+from domain.delivery.services.route_planner import plan_routes
+from domain.maps.adapters.local_maps_adapter import unit_vectors
+
+STOPS = 100_000
+WAREHOUSES = 60
+CITIES = 300
+MAX_STOPS = 40
+TIME_BUDGET = 10.0
+
+
+def uniform(generator: np.random.Generator) -> np.ndarray:
+    # roughly the south and south-east of Brazil
+    return np.column_stack(
+        (generator.uniform(-33.7, -19.0, STOPS), generator.uniform(-57.6, -39.7, STOPS))
+    )
+
+
+def clustered(generator: np.random.Generator) -> np.ndarray:
+    cities = uniform(generator)[:CITIES]
+    sizes = generator.zipf(1.6, CITIES).astype(np.float64)
+    city = generator.choice(CITIES, STOPS, p=sizes / sizes.sum())
+    return cities[city] + generator.normal(0.0, 0.08, (STOPS, 2))
+
+
+def run() -> None:
+    generator = np.random.default_rng(42)
+    print(f"{STOPS} stops, {WAREHOUSES} warehouses, up to {MAX_STOPS} stops per route")
+    print(
+        f"{'':10} {'routes':>7} {'NN s':>7} {'NN km':>11} {'2-opt s':>8} {'2-opt km':>11}"
+        f" {'gain':>6}"
+    )
+    for name, make in (('uniform', uniform), ('clustered', clustered)):
+        coordinates = make(generator)
+        stops = unit_vectors(coordinates[:, 0], coordinates[:, 1])
+        warehouses = stops[generator.choice(STOPS, WAREHOUSES, replace=False)]
+        results = []
+        for budget in (0.0, TIME_BUDGET):
+            started = time.perf_counter()
+            plans = plan_routes(warehouses, stops, MAX_STOPS, budget)
+            elapsed = time.perf_counter() - started
+            visited = np.concatenate([plan.stops for plan in plans])
+            assert len(visited) == STOPS and len(np.unique(visited)) == STOPS, 'stop lost'
+            results.append((elapsed, sum(plan.distance for plan in plans), len(plans)))
+        (nn_time, nn_km, routes), (opt_time, opt_km, _) = results
+        print(
+            f"{name:10} {routes:7} {nn_time:7.2f} {nn_km:11.0f} {opt_time:8.2f} {opt_km:11.0f}"
+            f" {1 - opt_km / nn_km:6.1%}"
+        )
+
+
+def main() -> None:
+    run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+from collections.abc import Callable, Coroutine, Sequence
+from typing import Any
+
+import settings
+from containers import AppContainer
+from domain.delivery.services.tariff_compiler import compile_from_maps
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from utils.logger import get_logger
+
+logger = get_logger()
+
+Command = Callable[[AppContainer, argparse.Namespace], Coroutine[Any, Any, None]]
+
+
+async def rebuild_order_statistics(container: AppContainer, _: argparse.Namespace) -> None:
+    """Recompute the order statistics read model from the event store."""
+    statistics_repository = container.order_statistics_repository()
+    await statistics_repository.rebuild(container.order_event_store_repository())
+
+
+async def compile_delivery_tariffs(_: AppContainer, args: argparse.Namespace) -> None:
+    """Precompute delivery costs per postcode region from the local maps data."""
+    maps = LocalMapsAdapter.from_files(settings.MAPS_POSTCODES_FILE, settings.MAPS_WAREHOUSES_FILE)
+    tariffs = compile_from_maps(maps, min_prefix=args.min_prefix)
+    tariffs.save(args.output)
+    await logger.info(
+        'Delivery tariffs compiled',
+        output=args.output,
+        small_entries=len(tariffs.small),
+        large_entries=len(tariffs.large),
+    )
+
+
+async def reconcile_payments(container: AppContainer, args: argparse.Namespace) -> None:
+    """Pay the waiting orders whose payment the provider reports as completed."""
+    if settings.MONGO_ENSURE_INDEXES:
+        await container.mongo_indexes().apply()
+    reconciler = container.payment_reconciler(
+        chunk_size=args.chunk_size, concurrency=args.concurrency
+    )
+    await reconciler.run()
+
+
+async def ensure_indexes(container: AppContainer, args: argparse.Namespace) -> None:
+    """Create the declared MongoDB indexes, replacing conflicting ones on request."""
+    reports = await container.mongo_indexes().apply(replace=args.replace)
+    if failed := [report.collection for report in reports if not report.ok]:
+        raise SystemExit(f"indexes not applied on: {', '.join(failed)}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one sub-command per operational task."""
+    parser = argparse.ArgumentParser(description='Ordering service operational commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser(
+        'rebuild-order-statistics', help='recompute the order statistics read model'
+    )
+    rebuild.set_defaults(handler=rebuild_order_statistics)
+
+    tariffs = commands.add_parser(
+        'compile-delivery-tariffs', help='precompute delivery costs per postcode region'
+    )
+    tariffs.add_argument('--output', default=settings.DELIVERY_TARIFFS_FILE or 'tariffs.npz')
+    tariffs.add_argument('--min-prefix', type=int, default=settings.DELIVERY_TARIFF_MIN_PREFIX)
+    tariffs.set_defaults(handler=compile_delivery_tariffs)
+
+    reconcile = commands.add_parser(
+        'reconcile-payments', help='pay waiting orders whose payment went through'
+    )
+    reconcile.add_argument('--chunk-size', type=int, default=settings.PAYMENT_RECONCILE_CHUNK_SIZE)
+    reconcile.add_argument(
+        '--concurrency', type=int, default=settings.PAYMENT_RECONCILE_CONCURRENCY
+    )
+    reconcile.set_defaults(handler=reconcile_payments)
+
+    indexes = commands.add_parser('ensure-indexes', help='create the declared MongoDB indexes')
+    indexes.add_argument(
+        '--replace',
+        action='store_true',
+        help='drop and rebuild indexes whose definition changed',
+    )
+    indexes.set_defaults(handler=ensure_indexes)
+
+    return parser
+
+
+async def run(handler: Command, container: AppContainer, args: argparse.Namespace) -> None:
+    """Run a command, then close the database clients it opened."""
+    try:
+        await handler(container, args)
+    finally:
+        container.mongo_clients().close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Parse the command line and run the selected command."""
+    args = build_parser().parse_args(argv)
+    asyncio.run(run(args.handler, AppContainer(), args))
+
+
+if __name__ == '__main__':
+    main()
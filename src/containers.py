@@ -1,50 +1,257 @@
 from dependency_injector import containers, providers
 
 import settings
-from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from adapters.http_client_adapter import HttpClientAdapter, HttpProvider
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter, MongoClientPool
+from adapters.mongo_index_adapter import MongoIndexRegistry
 from adapters.redis_adapter import RedisAdapter
+from adapters.redis_lock_adapter import RedisLockAdapter
+from adapters.striped_lock_adapter import StripedLockAdapter
+from domain.base.idempotency import IdempotencyMiddleware
+from domain.base.resilience import CircuitBreaker, Resilience
 from domain.delivery.adapters.cost_calculator_adapter import (
     DeliveryCostCalculatorAdapter,
 )
+from domain.delivery.model.tariffs import DeliveryTariffs
+from domain.delivery.repositories.route_repository import DeliveryRouteRepository
+from domain.delivery.services.delivery_planner import DeliveryPlanner
+from domain.maps.adapters.cached_maps_adapter import CachedMapsAdapter
 from domain.maps.adapters.google_maps_adapter import GoogleMapsAdapter
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.adapters.resilient_maps_adapter import ResilientMapsAdapter
+from domain.maps.exceptions.maps_exceptions import DestinationNotFound
 from domain.order.controllers.order_controller import OrderController
+from domain.order.controllers.order_statistics_controller import (
+    OrderStatisticsController,
+)
+from domain.order.controllers.quote_controller import QuoteController
+from domain.order.handlers.bus import build_order_command_bus, build_order_query_bus
+from domain.order.model.commands import (
+    CancelOrder,
+    CompleteOrderPayment,
+    PayOrder,
+    RequestOrderPayment,
+)
 from domain.order.repositories.order_event_store_repository import (
     OrderEventStoreRepository,
 )
 from domain.order.repositories.order_repository import (
     OrderRepository,
 )
+from domain.order.repositories.order_statistics_repository import (
+    OrderStatisticsRepository,
+)
+from domain.order.services.cart_quote_service import CartQuoteService
 from domain.order.services.order_service import OrderService
+from domain.order.services.payment_process_manager import (
+    PaymentProcessManager,
+    PaymentRequestQueue,
+)
+from domain.order.services.payment_reconciler import PaymentReconciler
 from domain.payment.adapters.paypal_adapter import PayPalPaymentAdapter
+from domain.payment.adapters.resilient_payment_adapter import ResilientPaymentAdapter
+from domain.payment.adapters.stub_payment_adapter import StubPaymentAdapter
+from domain.product.adapters.mongo_product_catalog_adapter import MongoProductCatalogAdapter
 from domain.product.adapters.product_adapter import ProductAdapter
+from domain.product.adapters.resilient_product_adapter import ResilientProductAdapter
+from domain.product.exceptions.product_exceptions import ProductNotFound
 from utils.logger import configure_logger
+from utils.retry import RetryPolicy
 
 configure_logger()
 
+# a causal session spans the connectors a command writes through, so they must share a client
+CAUSAL_ORDER_READS = settings.MONGO_CAUSAL_READS and (
+    settings.ORDER_REPOSITORY_CONNECTION == settings.ORDER_EVENT_STORE_CONNECTION
+)
+
 
 class AppContainer(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(modules=[__name__])
     config = providers.Configuration()
 
     cache_adapter = providers.Singleton(RedisAdapter, silent_mode=settings.CACHE_SILENT_MODE)
-    maps_adapter = providers.Singleton(GoogleMapsAdapter)
+
+    http_retry_policy = providers.Singleton(
+        RetryPolicy,
+        attempts=settings.HTTP_RETRY_ATTEMPTS,
+        backoff=settings.HTTP_RETRY_BACKOFF,
+        max_backoff=settings.HTTP_RETRY_MAX_BACKOFF,
+    )
+    # closed by the application lifespan
+    http_client = providers.Singleton(
+        HttpClientAdapter,
+        providers=providers.List(
+            providers.Factory(
+                HttpProvider,
+                name='product',
+                base_url=settings.PRODUCT_PROVIDER_URL,
+                timeout=settings.PRODUCT_SERVICE_TIMEOUT,
+                max_concurrency=settings.PRODUCT_PROVIDER_CONCURRENCY,
+                retry=http_retry_policy,
+            ),
+            providers.Factory(
+                HttpProvider,
+                name='payment',
+                base_url=settings.PAYMENT_PROVIDER_URL,
+                timeout=settings.PAYMENT_SERVICE_TIMEOUT,
+                max_concurrency=settings.PAYMENT_PROVIDER_CONCURRENCY,
+                retry=http_retry_policy,
+            ),
+            providers.Factory(
+                HttpProvider,
+                name='maps',
+                base_url=settings.MAPS_PROVIDER_URL,
+                timeout=settings.DELIVERY_SERVICE_TIMEOUT,
+                max_concurrency=settings.MAPS_PROVIDER_CONCURRENCY,
+                retry=http_retry_policy,
+            ),
+        ),
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http2=settings.HTTP2_ENABLED,
+    )
+    # one circuit breaker per external dependency, shared by every call to it
+    product_resilience = providers.Singleton(
+        Resilience,
+        name='product',
+        breaker=providers.Factory(
+            CircuitBreaker,
+            name='product',
+            failure_threshold=settings.DEPENDENCY_BREAKER_FAILURES,
+            reset_timeout=settings.DEPENDENCY_BREAKER_RESET,
+        ),
+        hedge_quantile=settings.DEPENDENCY_HEDGE_QUANTILE,
+        hedge_min_delay=settings.DEPENDENCY_HEDGE_MIN_DELAY,
+        timeout=settings.PRODUCT_SERVICE_TIMEOUT,
+        ignore=(ProductNotFound,),
+    )
+    payment_resilience = providers.Singleton(
+        Resilience,
+        name='payment',
+        breaker=providers.Factory(
+            CircuitBreaker,
+            name='payment',
+            failure_threshold=settings.DEPENDENCY_BREAKER_FAILURES,
+            reset_timeout=settings.DEPENDENCY_BREAKER_RESET,
+        ),
+        hedge_quantile=settings.DEPENDENCY_HEDGE_QUANTILE,
+        hedge_min_delay=settings.DEPENDENCY_HEDGE_MIN_DELAY,
+        timeout=settings.PAYMENT_SERVICE_TIMEOUT,
+    )
+    maps_resilience = providers.Singleton(
+        Resilience,
+        name='maps',
+        breaker=providers.Factory(
+            CircuitBreaker,
+            name='maps',
+            failure_threshold=settings.DEPENDENCY_BREAKER_FAILURES,
+            reset_timeout=settings.DEPENDENCY_BREAKER_RESET,
+        ),
+        hedge_quantile=settings.DEPENDENCY_HEDGE_QUANTILE,
+        hedge_min_delay=settings.DEPENDENCY_HEDGE_MIN_DELAY,
+        timeout=settings.DELIVERY_SERVICE_TIMEOUT,
+        ignore=(DestinationNotFound,),
+    )
+
+    local_maps_adapter = providers.Singleton(
+        LocalMapsAdapter.from_files,
+        postcodes_path=settings.MAPS_POSTCODES_FILE,
+        warehouses_path=settings.MAPS_WAREHOUSES_FILE,
+    )
+    maps_fallback = providers.Selector(
+        providers.Object(settings.MAPS_FALLBACK_BACKEND),
+        local=local_maps_adapter,
+        none=providers.Object(None),
+    )
+    # local distances take microseconds; only remote lookups are worth caching. The
+    # cache coalesces concurrent lookups, so hedging would only join the same load.
+    maps_adapter = providers.Selector(
+        providers.Object(settings.MAPS_BACKEND),
+        google=providers.Singleton(
+            ResilientMapsAdapter,
+            maps_service=providers.Singleton(
+                CachedMapsAdapter,
+                maps_service=providers.Singleton(GoogleMapsAdapter),
+                cache_adapter=cache_adapter,
+                max_entries=settings.MAPS_DISTANCE_CACHE_SIZE,
+                ttl=settings.MAPS_DISTANCE_CACHE_TTL,
+            ),
+            resilience=maps_resilience,
+            fallback=maps_fallback,
+            hedge=False,
+        ),
+        local=local_maps_adapter,
+    )
+
+    # opened and closed by the application lifespan
+    mongo_clients = providers.Singleton(
+        MongoClientPool,
+        max_pool_size=settings.MONGO_MAX_POOL_SIZE,
+        min_pool_size=settings.MONGO_MIN_POOL_SIZE,
+        compressors=settings.MONGO_COMPRESSORS,
+        connect_timeout=settings.MONGO_CONNECT_TIMEOUT_MS,
+        server_timeout=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    )
 
     order_event_store_connection = providers.Singleton(
         AsyncMongoDBConnectorAdapter,
         connection_str=settings.ORDER_EVENT_STORE_CONNECTION,
         database_name=settings.ORDER_EVENT_STORE_DATABASE_NAME,
+        pool=mongo_clients,
+        read_preference=settings.MONGO_READ_PREFERENCE,
+        max_staleness=settings.MONGO_MAX_STALENESS_SECONDS,
     )
 
     order_repository_connection = providers.Singleton(
         AsyncMongoDBConnectorAdapter,
         connection_str=settings.ORDER_REPOSITORY_CONNECTION,
         database_name=settings.ORDER_REPOSITORY_DATABASE_NAME,
+        pool=mongo_clients,
+        read_preference=settings.MONGO_READ_PREFERENCE,
+        max_staleness=settings.MONGO_MAX_STALENESS_SECONDS,
+    )
+    order_sessions = providers.Selector(
+        providers.Object('causal' if CAUSAL_ORDER_READS else 'none'),
+        causal=order_repository_connection,
+        none=providers.Object(None),
     )
 
+    product_catalog_connection = providers.Singleton(
+        AsyncMongoDBConnectorAdapter,
+        connection_str=settings.PRODUCT_CATALOG_CONNECTION,
+        database_name=settings.PRODUCT_CATALOG_DATABASE_NAME,
+        pool=mongo_clients,
+    )
+
+    product_catalog = providers.Selector(
+        providers.Object(settings.PRODUCT_CATALOG_BACKEND),
+        stub=providers.Singleton(ProductAdapter),
+        mongo=providers.Singleton(
+            MongoProductCatalogAdapter,
+            db_connection=product_catalog_connection,
+            collection_name=settings.PRODUCT_CATALOG_COLLECTION_NAME,
+            refresh_interval=settings.PRODUCT_CATALOG_REFRESH_INTERVAL,
+        ),
+    )
+    product_adapter = providers.Singleton(
+        ResilientProductAdapter, product_service=product_catalog, resilience=product_resilience
+    )
+
+    order_statistics_repository = providers.Factory(
+        OrderStatisticsRepository,
+        db_connection=order_event_store_connection,
+        collection_name=settings.ORDER_STATISTICS_COLLECTION_NAME,
+    )
+
+    payment_requests = providers.Singleton(PaymentRequestQueue)
+
     order_event_store_repository = providers.Factory(
         OrderEventStoreRepository,
         db_connection=order_event_store_connection,
         collection_name=settings.ORDER_EVENT_STORE_COLLECTION_NAME,
+        subscribers=providers.List(order_statistics_repository, payment_requests),
     )
 
     order_repository = providers.Factory(
@@ -54,17 +261,180 @@ class AppContainer(containers.DeclarativeContainer):
         collection_name=settings.ORDER_REPOSITORY_COLLECTION_NAME,
     )
 
+    order_query_repository = providers.Factory(
+        OrderRepository,
+        cache_adapter=cache_adapter,
+        db_connection=order_repository_connection,
+        collection_name=settings.ORDER_REPOSITORY_COLLECTION_NAME,
+        query_reads=True,
+    )
+
+    delivery_tariffs = providers.Selector(
+        providers.Object('file' if settings.DELIVERY_TARIFFS_FILE else 'none'),
+        file=providers.Singleton(DeliveryTariffs.load, settings.DELIVERY_TARIFFS_FILE),
+        none=providers.Object(None),
+    )
+    # tariffs are compiled from local distances, so the destinations they miss are priced
+    # from the same distances whatever MAPS_BACKEND is; prices never depend on a hit
+    delivery_maps = providers.Selector(
+        providers.Object('file' if settings.DELIVERY_TARIFFS_FILE else 'none'),
+        file=local_maps_adapter,
+        none=maps_adapter,
+    )
+
     delivery_cost_calculator = providers.Singleton(
-        DeliveryCostCalculatorAdapter, maps_service=maps_adapter
+        DeliveryCostCalculatorAdapter, maps_service=delivery_maps, tariffs=delivery_tariffs
+    )
+
+    payment_provider = providers.Selector(
+        providers.Object(settings.PAYMENT_BACKEND),
+        paypal=providers.Singleton(PayPalPaymentAdapter),
+        stub=providers.Singleton(StubPaymentAdapter),
+    )
+    payment_adapter = providers.Singleton(
+        ResilientPaymentAdapter, payment_service=payment_provider, resilience=payment_resilience
     )
 
     order_service = providers.Factory(
         OrderService,
         repository=order_repository,
-        payment_service=providers.Singleton(PayPalPaymentAdapter),
-        product_service=providers.Singleton(ProductAdapter),
+        payment_service=payment_adapter,
+        product_service=product_adapter,
         delivery_service=delivery_cost_calculator,
         event_store=order_event_store_repository,
+        product_timeout=settings.PRODUCT_SERVICE_TIMEOUT,
+        payment_timeout=settings.PAYMENT_SERVICE_TIMEOUT,
+        delivery_timeout=settings.DELIVERY_SERVICE_TIMEOUT,
+        transactional=settings.ORDER_WRITE_TRANSACTIONS,
+    )
+
+    idempotency_middleware = providers.Singleton(
+        IdempotencyMiddleware,
+        cache=cache_adapter,
+        ttl=settings.IDEMPOTENCY_TTL,
+        lock_ttl=settings.IDEMPOTENCY_LOCK_TTL,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+    )
+
+    local_lock = providers.Singleton(StripedLockAdapter, stripes=settings.ORDER_LOCK_STRIPES)
+
+    order_lock = providers.Selector(
+        providers.Object(settings.ORDER_LOCK_BACKEND),
+        local=local_lock,
+        redis=providers.Singleton(
+            RedisLockAdapter,
+            redis=cache_adapter,
+            lease_ttl=settings.ORDER_LOCK_LEASE_TTL,
+            acquire_timeout=settings.ORDER_LOCK_ACQUIRE_TIMEOUT,
+            local=local_lock,
+        ),
+    )
+
+    command_bus = providers.Singleton(
+        build_order_command_bus,
+        order_service=order_service,
+        idempotency=idempotency_middleware,
+        lock=order_lock,
+        retry_policies=providers.Dict(
+            {
+                PayOrder: providers.Factory(
+                    RetryPolicy,
+                    attempts=settings.ORDER_PAY_RETRY_ATTEMPTS,
+                    backoff=settings.ORDER_COMMAND_RETRY_BACKOFF,
+                    max_backoff=settings.ORDER_COMMAND_RETRY_MAX_BACKOFF,
+                ),
+                RequestOrderPayment: providers.Factory(
+                    RetryPolicy,
+                    attempts=settings.ORDER_PAY_RETRY_ATTEMPTS,
+                    backoff=settings.ORDER_COMMAND_RETRY_BACKOFF,
+                    max_backoff=settings.ORDER_COMMAND_RETRY_MAX_BACKOFF,
+                ),
+                CompleteOrderPayment: providers.Factory(
+                    RetryPolicy,
+                    attempts=settings.ORDER_PAY_RETRY_ATTEMPTS,
+                    backoff=settings.ORDER_COMMAND_RETRY_BACKOFF,
+                    max_backoff=settings.ORDER_COMMAND_RETRY_MAX_BACKOFF,
+                ),
+                CancelOrder: providers.Factory(
+                    RetryPolicy,
+                    attempts=settings.ORDER_CANCEL_RETRY_ATTEMPTS,
+                    backoff=settings.ORDER_COMMAND_RETRY_BACKOFF,
+                    max_backoff=settings.ORDER_COMMAND_RETRY_MAX_BACKOFF,
+                ),
+            }
+        ),
+    )
+
+    cart_quote_service = providers.Singleton(
+        CartQuoteService,
+        product_service=product_adapter,
+        delivery_service=delivery_cost_calculator,
+    )
+
+    query_bus = providers.Singleton(
+        build_order_query_bus,
+        repository=order_query_repository,
+        statistics_repository=order_statistics_repository,
+        quote_service=cart_quote_service,
     )
 
-    order_controller = providers.Factory(OrderController, order_service=order_service)
+    payment_process_manager = providers.Singleton(
+        PaymentProcessManager,
+        requests=payment_requests,
+        command_bus=command_bus,
+        payment_service=payment_adapter,
+        repository=order_repository,
+        workers=settings.PAYMENT_WORKERS,
+        batch_size=settings.PAYMENT_BATCH_SIZE,
+        batch_wait=settings.PAYMENT_BATCH_WAIT,
+        verify_timeout=settings.PAYMENT_SERVICE_TIMEOUT,
+        retry_delay=settings.PAYMENT_RETRY_DELAY,
+        claim_ttl=settings.PAYMENT_CLAIM_TTL,
+    )
+
+    payment_reconciler = providers.Factory(
+        PaymentReconciler,
+        repository=order_repository,
+        event_store=order_event_store_repository,
+        payment_service=payment_adapter,
+        chunk_size=settings.PAYMENT_RECONCILE_CHUNK_SIZE,
+        concurrency=settings.PAYMENT_RECONCILE_CONCURRENCY,
+        verify_timeout=settings.PAYMENT_SERVICE_TIMEOUT,
+        transactional=settings.ORDER_WRITE_TRANSACTIONS,
+    )
+
+    delivery_route_repository = providers.Factory(
+        DeliveryRouteRepository,
+        db_connection=order_repository_connection,
+        collection_name=settings.DELIVERY_ROUTE_COLLECTION_NAME,
+    )
+
+    mongo_indexes = providers.Singleton(
+        MongoIndexRegistry,
+        repositories=providers.List(
+            order_repository, order_event_store_repository, delivery_route_repository
+        ),
+    )
+
+    delivery_planner = providers.Singleton(
+        DeliveryPlanner,
+        events=order_event_store_repository,
+        maps=local_maps_adapter,
+        repository=delivery_route_repository,
+        window=settings.DELIVERY_PLANNING_WINDOW,
+        max_stops=settings.DELIVERY_ROUTE_MAX_STOPS,
+        time_budget=settings.DELIVERY_PLANNING_TIME_BUDGET,
+        poll_interval=settings.DELIVERY_PLANNING_POLL_INTERVAL,
+    )
+
+    order_controller = providers.Factory(
+        OrderController,
+        command_bus=command_bus,
+        query_bus=query_bus,
+        async_payments=settings.ORDER_ASYNC_PAYMENTS,
+        sessions=order_sessions,
+    )
+
+    order_statistics_controller = providers.Factory(OrderStatisticsController, query_bus=query_bus)
+
+    quote_controller = providers.Factory(QuoteController, query_bus=query_bus)
@@ -0,0 +1,131 @@
+import abc
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+from domain.base.message import Command, Message, Query
+from ports.lock_interface import LockInterface
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.retry import RetryPolicy
+
+logger = get_logger()
+
+MessageType = TypeVar('MessageType', bound=Message)
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+class MessageBusException(Exception):
+    """Exception raised for message bus configuration errors."""
+
+
+class Middleware(abc.ABC):
+    """A step of a handler pipeline wrapping the next step."""
+
+    @abc.abstractmethod
+    async def __call__(self, message: Message, call_next: Handler) -> Any:
+        """Process the message, usually delegating to ``call_next``."""
+        raise NotImplementedError()
+
+
+class TimingMiddleware(Middleware):
+    """Record how long each message takes to be handled."""
+
+    def __init__(self, metric_name: str) -> None:
+        self.metric_name = metric_name
+
+    async def __call__(self, message: Message, call_next: Handler) -> Any:
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = await call_next(message)
+            outcome = 'ok'
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.observe(self.metric_name, elapsed, message=message.message_name())
+            metrics.increment(
+                f"{self.metric_name}_total", message=message.message_name(), outcome=outcome
+            )
+
+
+class RetryMiddleware(Middleware):
+    """Re-run the rest of the pipeline when it raises one of ``retry_on``."""
+
+    def __init__(
+        self, retry_on: tuple[type[Exception], ...], policy: RetryPolicy = RetryPolicy()
+    ) -> None:
+        self.retry_on = retry_on
+        self.policy = policy
+
+    async def __call__(self, message: Message, call_next: Handler) -> Any:
+        attempt = 1
+        while True:
+            try:
+                return await call_next(message)
+            except self.retry_on as exc:
+                labels = {'message': message.message_name(), 'error': type(exc).__name__}
+                if attempt >= self.policy.attempts:
+                    metrics.increment('message_retries_exhausted_total', **labels)
+                    raise
+                metrics.increment('message_retries_total', **labels)
+                delay = self.policy.delay(attempt)
+                await logger.warning('Retrying message', attempt=attempt, delay=delay, **labels)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+class LockMiddleware(Middleware):
+    """Serialize messages sharing a key (e.g. one aggregate) so they queue instead of colliding."""
+
+    def __init__(self, lock: LockInterface, key_of: Callable[[Any], str]) -> None:
+        self.lock = lock
+        self.key_of = key_of
+
+    async def __call__(self, message: Message, call_next: Handler) -> Any:
+        async with self.lock.lock(self.key_of(message)):
+            return await call_next(message)
+
+
+class MessageBus(Generic[MessageType]):
+    """Route each message type to exactly one handler wrapped in its middleware pipeline."""
+
+    def __init__(self, middlewares: Sequence[Middleware] = ()) -> None:
+        self.middlewares = tuple(middlewares)
+        self._pipelines: dict[type[MessageType], Handler] = {}
+
+    def register(
+        self,
+        message_type: type[MessageType],
+        handler: Handler,
+        middlewares: Sequence[Middleware] = (),
+    ) -> None:
+        """Register a handler; bus-wide middlewares run before handler-specific ones."""
+        if message_type in self._pipelines:
+            raise MessageBusException(f"handler already registered for {message_type.__name__}")
+
+        pipeline = handler
+        for middleware in reversed((*self.middlewares, *middlewares)):
+            pipeline = partial(middleware, call_next=pipeline)
+        self._pipelines[message_type] = pipeline
+
+    async def dispatch(self, message: MessageType) -> Any:
+        """Run the pipeline registered for the message type and return the handler result."""
+        try:
+            pipeline = self._pipelines[type(message)]
+        except KeyError as exc:
+            raise MessageBusException(
+                f"no handler registered for {message.message_name()}"
+            ) from exc
+        return await pipeline(message)
+
+
+class CommandBus(MessageBus[Command]):
+    """Bus for commands (write side)."""
+
+
+class QueryBus(MessageBus[Query]):
+    """Bus for queries (read side)."""
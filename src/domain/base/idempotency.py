@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import fields
+from typing import Any
+
+from pydantic import BaseModel
+
+from domain.base.bus import Handler, Middleware
+from domain.base.message import Command, Message
+from exceptions import IdempotencyKeyInProgress, IdempotencyKeyReused
+from ports.cache_interface import CacheInterface
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger()
+
+IN_PROGRESS = 'in_progress'
+COMPLETED = 'completed'
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    return str(value)
+
+
+def command_fingerprint(command: Command) -> str:
+    """Hash the command payload, ignoring its idempotency key."""
+    payload = {
+        item.name: getattr(command, item.name)
+        for item in fields(command)
+        if item.name != 'idempotency_key'
+    }
+    encoded = json.dumps(
+        [command.message_name(), payload], sort_keys=True, default=_encode
+    ).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class IdempotencyMiddleware(Middleware):
+    """Run a command once per idempotency key and replay its stored result on duplicates.
+
+    The first request claims the key with an in-progress record (``add``, i.e. SET NX)
+    that expires after ``lock_ttl`` in case the worker dies, and is refreshed every
+    third of it while the command runs; concurrent duplicates poll until the result is
+    stored for ``ttl`` seconds. Failed commands release the key.
+
+    When the cache is unavailable (it raises, or a silent adapter answers ``False``)
+    commands run without deduplication rather than waiting for a record that cannot
+    be written.
+    """
+
+    def __init__(
+        self,
+        cache: CacheInterface,
+        ttl: int = 86400,
+        lock_ttl: int = 30,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.cache = cache
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def cache_key(command: Command) -> str:
+        """Namespace the client key by command type."""
+        return f"idempotency:{command.message_name()}:{command.idempotency_key}"
+
+    async def __call__(self, message: Message, call_next: Handler) -> Any:
+        if not isinstance(message, Command) or not message.idempotency_key:
+            return await call_next(message)
+
+        key = self.cache_key(message)
+        fingerprint = command_fingerprint(message)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                claimed = await self.cache.add(
+                    key, {'status': IN_PROGRESS, 'fingerprint': fingerprint}, ttl=self.lock_ttl
+                )
+                record = None if claimed else await self.cache.get(key)
+            except Exception:
+                claimed, record = False, False
+            if claimed:
+                return await self._run(key, fingerprint, message, call_next)
+            if record is False:
+                metrics.increment('idempotency_bypassed_total', message=message.message_name())
+                await logger.warning(
+                    'Idempotency cache unavailable, running without it',
+                    message=message.message_name(),
+                )
+                return await call_next(message)
+
+            if record and record.get('fingerprint') != fingerprint:
+                raise IdempotencyKeyReused()
+            if record and record.get('status') == COMPLETED:
+                metrics.increment('idempotent_replays_total', message=message.message_name())
+                await logger.info('Idempotent replay', message=message.message_name())
+                return record.get('result')
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress()
+            if record is not None:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, key: str, fingerprint: str, message: Command, call_next: Handler) -> Any:
+        try:
+            async with self._refreshed(key, {'status': IN_PROGRESS, 'fingerprint': fingerprint}):
+                result = await call_next(message)
+        except BaseException:
+            await self.cache.delete(key)
+            raise
+        await self.cache.set(
+            key, {'status': COMPLETED, 'fingerprint': fingerprint, 'result': result}, ttl=self.ttl
+        )
+        return result
+
+    @asynccontextmanager
+    async def _refreshed(self, key: str, record: dict[str, Any]) -> AsyncIterator[None]:
+        """Keep the in-progress ``record`` from expiring while a slow command runs."""
+
+        async def refresh() -> None:
+            while True:
+                await asyncio.sleep(self.lock_ttl / 3)
+                try:
+                    await self.cache.set(key, record, ttl=self.lock_ttl)
+                except Exception:
+                    await logger.warning('Idempotency key refresh failed', key=key)
+
+        task = asyncio.create_task(refresh())
+        try:
+            yield
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    """Base class for messages dispatched through a bus.
+
+    Messages are built from already validated DTOs, so they are plain frozen
+    dataclasses instead of pydantic models to avoid validating twice.
+    """
+
+    @classmethod
+    def message_name(cls) -> str:
+        """Return the message name (defaults to class name)."""
+        return cls.__name__
+
+
+@dataclass(frozen=True, slots=True)
+class Command(Message):
+    """Base class for messages that change state.
+
+    ``idempotency_key`` is set by clients that may retry the same command.
+    """
+
+    idempotency_key: str | None = field(default=None, kw_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Query(Message):
+    """Base class for messages that read state."""
@@ -0,0 +1,243 @@
+import asyncio
+import enum
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from exceptions import DependencyUnavailable
+from utils.deadline import DeadlineExceeded, remaining
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger()
+
+T = TypeVar('T')
+
+# attempts between two refreshes of the hedge delay
+HEDGE_DELAY_REFRESH = 64
+
+
+class BreakerState(enum.IntEnum):
+    """Circuit breaker states; the values are what the state gauge reports."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """Stop calling a dependency after ``failure_threshold`` failures in a row.
+
+    An open breaker rejects calls for ``reset_timeout`` seconds, then half-opens and
+    lets ``half_open_calls`` probes through: a successful probe closes it again, a
+    failed one opens it for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.state = BreakerState.CLOSED
+        metrics.set('circuit_breaker_state', self.state, dependency=name)
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; every allowed call must be recorded."""
+        if self.state == BreakerState.OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self._transition(BreakerState.HALF_OPEN)
+        if self.state == BreakerState.HALF_OPEN:
+            if self.probes >= self.half_open_calls:
+                return False
+            self.probes += 1
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state == BreakerState.HALF_OPEN:
+            self._transition(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self._transition(BreakerState.OPEN)
+
+    def release(self) -> None:
+        """Forget an allowed call that ended without an outcome (it was cancelled)."""
+        if self.state == BreakerState.HALF_OPEN:
+            self.probes = max(0, self.probes - 1)
+
+    def _transition(self, state: BreakerState) -> None:
+        self.state = state
+        self.probes = 0
+        metrics.set('circuit_breaker_state', state, dependency=self.name)
+        metrics.increment(
+            'circuit_breaker_transitions_total', dependency=self.name, state=state.name.lower()
+        )
+
+
+def _consume(task: asyncio.Task[Any]) -> None:
+    """Retrieve a losing hedge's outcome so it is not reported as never retrieved."""
+    if not task.cancelled():
+        task.exception()
+
+
+class Resilience:
+    """Calls to one external dependency, behind its circuit breaker.
+
+    Hedged calls (idempotent reads only) send a second attempt once the first has taken
+    longer than the ``hedge_quantile`` of recent attempts and return whichever answers
+    first, which trims the latency tail to roughly that quantile plus one attempt. A
+    ``fallback`` with the call's arguments answers instead when the breaker is open or
+    the call fails. Exceptions in ``ignore`` are answers of the dependency (e.g. an
+    unknown address) and neither trip the breaker nor fall back. Calls are bounded by
+    the request deadline and ``timeout``. A dependency that outlasts its own ``timeout``
+    counts as failed rather than leaving the caller's timeout to cancel it unnoticed; a
+    call cut short by the request deadline, or made once it has passed, raises
+    ``DeadlineExceeded`` without counting against the breaker, since a short deadline says
+    nothing about the dependency.
+
+    ``dependency_attempt_seconds`` records single attempts and
+    ``dependency_call_seconds`` what callers waited, so their p99 show the gain.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        name: str,
+        breaker: CircuitBreaker | None = None,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 0.005,
+        timeout: float | None = None,
+        ignore: tuple[type[Exception], ...] = (),
+    ) -> None:
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.timeout = timeout
+        self.ignore = ignore
+        self.attempts = 0
+        self._hedge_delay: float | None = None
+        self._hedge_delay_at = 0
+
+    async def call(
+        self,
+        call: Callable[..., Awaitable[T]],
+        *args: Any,
+        hedge: bool = False,
+        fallback: Callable[..., Awaitable[T]] | None = None,
+    ) -> T:
+        if (budget := remaining(self.timeout)) is not None and budget <= 0:
+            metrics.increment('dependency_calls_total', dependency=self.name, outcome='deadline')
+            raise DeadlineExceeded(f"no time left to call {self.name}")
+        if not self.breaker.allow():
+            metrics.increment('dependency_calls_total', dependency=self.name, outcome='rejected')
+            if fallback is None:
+                raise DependencyUnavailable(detail=f"{self.name} is unavailable")
+            return await self._fall_back(fallback, args, 'open')
+        started = time.perf_counter()
+        scope = asyncio.timeout(budget)
+        try:
+            async with scope:
+                result = await (self._hedged(call, args) if hedge else self._attempt(call, args))
+        except self.ignore:
+            self.breaker.record_success()
+            raise
+        except Exception as exc:
+            if scope.expired() and budget != self.timeout:
+                # the request deadline, not the dependency's own timeout, cut the call short
+                self.breaker.release()
+                metrics.increment(
+                    'dependency_calls_total', dependency=self.name, outcome='deadline'
+                )
+                raise DeadlineExceeded(f"deadline passed while calling {self.name}") from exc
+            self.breaker.record_failure()
+            metrics.increment('dependency_calls_total', dependency=self.name, outcome='error')
+            if fallback is None:
+                raise
+            await logger.warning(
+                'Dependency call failed', dependency=self.name, error=type(exc).__name__
+            )
+            return await self._fall_back(fallback, args, 'error')
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        metrics.increment('dependency_calls_total', dependency=self.name, outcome='ok')
+        metrics.observe(
+            'dependency_call_seconds', time.perf_counter() - started, dependency=self.name
+        )
+        return result
+
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a hedge is sent, None until enough attempts were seen."""
+        if self._hedge_delay is None or self.attempts - self._hedge_delay_at >= HEDGE_DELAY_REFRESH:
+            if self.attempts < self.hedge_min_samples:
+                return None
+            quantile = metrics.percentile(
+                'dependency_attempt_seconds', self.hedge_quantile, dependency=self.name
+            )
+            if quantile is None:
+                return None
+            self._hedge_delay = max(self.hedge_min_delay, quantile)
+            self._hedge_delay_at = self.attempts
+        return self._hedge_delay
+
+    async def _attempt(self, call: Callable[..., Awaitable[T]], args: tuple[Any, ...]) -> T:
+        started = time.perf_counter()
+        result = await call(*args)
+        self.attempts += 1
+        metrics.observe(
+            'dependency_attempt_seconds', time.perf_counter() - started, dependency=self.name
+        )
+        return result
+
+    async def _hedged(self, call: Callable[..., Awaitable[T]], args: tuple[Any, ...]) -> T:
+        if (delay := self.hedge_delay()) is None:
+            return await self._attempt(call, args)
+        first = asyncio.create_task(self._attempt(call, args))
+        first.add_done_callback(_consume)
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            metrics.increment('dependency_hedges_total', dependency=self.name)
+            hedge = asyncio.create_task(self._attempt(call, args))
+            hedge.add_done_callback(_consume)
+            tasks.add(hedge)
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if (exc := task.exception()) is None:
+                        if task is hedge:
+                            metrics.increment('dependency_hedges_won_total', dependency=self.name)
+                        return task.result()
+                    error = error or exc
+            assert error is not None  # both attempts failed
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fall_back(
+        self, fallback: Callable[..., Awaitable[T]], args: tuple[Any, ...], reason: str
+    ) -> T:
+        metrics.increment('dependency_fallbacks_total', dependency=self.name, reason=reason)
+        return await fallback(*args)
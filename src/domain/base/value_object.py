@@ -1,6 +1,17 @@
-from typing import Any, TypeVar
+import math
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Annotated, Any, TypeVar
 
-from pydantic import BaseModel, ConfigDict, GetCoreSchemaHandler
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    PlainSerializer,
+    WithJsonSchema,
+)
+from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import CoreSchema, core_schema
 
 ImplementationType = TypeVar('ImplementationType', bound='ValueObject')
@@ -37,3 +48,81 @@ class StrIdValueObject(str):
             handler(str),
             field_name=handler.field_name,
         )
+
+
+class Money(int):
+    """Amount of money as an integer number of cents.
+
+    Arithmetic is plain (exact) ``int`` arithmetic, so totals are wrapped back into
+    ``Money`` where they leave a calculation; amounts are stored as plain integers.
+    Only integers (cents) validate: amounts in units go through ``from_decimal``, so no
+    value is read in the wrong unit by accident. See ``StoredMoney`` and ``MoneyUnits``
+    for the formats kept for stored documents and the API.
+    """
+
+    __slots__ = ()
+
+    CENTS = 100
+
+    @classmethod
+    def from_decimal(cls, value: Decimal | str | float) -> 'Money':
+        """Amount of ``value`` units, rounded half up to the cent."""
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation as exc:
+            raise ValueError(f"expected an amount, got {value!r}") from exc
+        if not number.is_finite():
+            raise ValueError(f"expected a finite amount, got {value}")
+        return cls((number * cls.CENTS).to_integral_value(ROUND_HALF_UP))
+
+    @classmethod
+    def from_cents(cls, cents: float) -> 'Money':
+        """Round a fractional number of cents half up, like ``np.floor(cents + 0.5)``."""
+        return cls(math.floor(cents + 0.5))
+
+    def to_decimal(self) -> Decimal:
+        """Amount in units, e.g. ``Decimal('19.99')`` for ``Money(1999)``."""
+        return Decimal(int(self)).scaleb(-2)
+
+    def __repr__(self) -> str:
+        return f"Money({int(self)})"
+
+    @classmethod
+    def validate(cls, __input_value: Any) -> 'Money':
+        if isinstance(__input_value, cls):
+            return __input_value
+        if isinstance(__input_value, bool):
+            raise ValueError('expected an amount, got bool')
+        if isinstance(__input_value, int):
+            return cls(__input_value)
+        raise ValueError(f"expected an amount in cents, got {type(__input_value).__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.simple_ser_schema('int'),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, _: CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return handler(core_schema.int_schema())
+
+
+def _stored_units(value: Any) -> Any:
+    return Money.from_decimal(value) if isinstance(value, str) else value
+
+
+# documents written before amounts were kept in cents hold decimal strings of units
+StoredMoney = Annotated[Money, BeforeValidator(_stored_units)]
+
+# the API returns amounts as decimal strings of units, like the statistics revenue
+MoneyUnits = Annotated[
+    Money,
+    PlainSerializer(Money.to_decimal, return_type=Decimal),
+    WithJsonSchema({'type': 'string', 'format': 'decimal'}, mode='serialization'),
+]
@@ -1,39 +1,112 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from domain.base.value_object import Money
+from domain.delivery.model.tariffs import DeliveryTariffs
 from domain.delivery.ports.cost_calculator_interface import DeliveryCostCalculatorAdapterInterface
 from domain.maps.model.value_objects import Address
 from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+from utils.metrics import metrics
 
-ORDER_PRICE_THRESHOLD: float = 500.0
+ORDER_PRICE_THRESHOLD = Money(50_000)
 FREE_DISTANCE_THRESHOLD: float = 30.0
-FREE: float = 0.0
-FLAT_PRICE: float = 50.0
-BASE_PRICE: float = 50.0
-PRICE_PER_EXTRA_DISTANCE: float = 15.0
+FREE = Money(0)
+FLAT_PRICE = Money(5_000)
+BASE_PRICE = Money(5_000)
+PRICE_PER_EXTRA_DISTANCE = Money(1_500)
+
+
+def delivery_costs(total_product_costs: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_cost`` over many orders at once.
+
+    ``total_product_costs`` are in cents and so are the returned costs; the distance
+    charge is rounded with the same float64 operations as ``Money.from_cents``, so every
+    result equals its scalar twin.
+    """
+    near = distances <= FREE_DISTANCE_THRESHOLD
+    large = np.where(near, FREE, FLAT_PRICE)
+    extra = np.floor(PRICE_PER_EXTRA_DISTANCE * (distances - FREE_DISTANCE_THRESHOLD) + 0.5)
+    small = np.where(near, BASE_PRICE, BASE_PRICE + extra.astype(np.int64))
+    return np.where(total_product_costs >= ORDER_PRICE_THRESHOLD, large, small)
 
 
 class DeliveryCostCalculatorAdapter(DeliveryCostCalculatorAdapterInterface):
-    """Delivery cost calculator using distance and product cost thresholds."""
+    """Delivery cost calculator using distance and product cost thresholds.
+
+    With precomputed ``tariffs`` a destination whose postcode region is in the table is
+    priced by a binary search; only the others need a distance from ``maps_service``.
+    """
 
-    def __init__(self, maps_service: MapsAdapterInterface) -> None:
+    def __init__(
+        self, maps_service: MapsAdapterInterface, tariffs: DeliveryTariffs | None = None
+    ) -> None:
         self.maps_service = maps_service
+        self.tariffs = tariffs
 
-    async def calculate_cost(self, total_product_cost: float, destination: Address) -> float:
+    def _tariff(self, total_product_cost: Money, destination: Address) -> Money | None:
+        if self.tariffs is None:
+            return None
+        return self.tariffs.lookup(
+            destination.postcode, large=total_product_cost >= ORDER_PRICE_THRESHOLD
+        )
+
+    async def calculate_cost(self, total_product_cost: Money, destination: Address) -> Money:
         """Decide whether to calculate cost as a large or small delivery."""
+        if (cost := self._tariff(total_product_cost, destination)) is not None:
+            metrics.increment('delivery_tariff_lookups_total', result='hit')
+            return cost
+        if self.tariffs is not None:
+            metrics.increment('delivery_tariff_lookups_total', result='miss')
         if total_product_cost >= ORDER_PRICE_THRESHOLD:
             return await self._large_delivery_calculate_cost(destination)
         return await self._small_delivery_calculate_cost(destination)
 
-    async def _large_delivery_calculate_cost(self, destination: Address) -> float:
+    async def calculate_costs(
+        self, total_product_costs: Sequence[Money], destinations: Sequence[Address]
+    ) -> list[Money]:
+        """Price from the tariffs where possible, then fetch the distinct remaining
+        destinations in one batch and apply the cost tiers with array operations."""
+        costs: np.ndarray = np.zeros(len(destinations), dtype=np.int64)
+        live: list[int] = []
+        for index, (total, destination) in enumerate(zip(total_product_costs, destinations)):
+            if (cost := self._tariff(total, destination)) is not None:
+                costs[index] = cost
+            else:
+                live.append(index)
+        if self.tariffs is not None:
+            metrics.increment(
+                'delivery_tariff_lookups_total', len(destinations) - len(live), result='hit'
+            )
+            metrics.increment('delivery_tariff_lookups_total', len(live), result='miss')
+        if live:
+            # value objects compare through model_dump; their field values hash much faster
+            keys = [tuple(destinations[index].__dict__.values()) for index in live]
+            positions: dict[tuple, int] = {}
+            distinct: list[Address] = []
+            for index, key in zip(live, keys):
+                if key not in positions:
+                    positions[key] = len(distinct)
+                    distinct.append(destinations[index])
+            distances = np.asarray(
+                await self.maps_service.calculate_distances(distinct), dtype=np.float64
+            )
+            totals = np.asarray(total_product_costs, dtype=np.int64)
+            costs[live] = delivery_costs(totals[live], distances[[positions[key] for key in keys]])
+        return [Money(cost) for cost in costs.tolist()]
+
+    async def _large_delivery_calculate_cost(self, destination: Address) -> Money:
         """Calculate delivery cost for large orders."""
         distance = await self.maps_service.calculate_distance_from_warehouses(destination)
         if distance <= FREE_DISTANCE_THRESHOLD:
             return FREE
         return FLAT_PRICE
 
-    async def _small_delivery_calculate_cost(self, destination: Address) -> float:
+    async def _small_delivery_calculate_cost(self, destination: Address) -> Money:
         """Calculate delivery cost for small orders."""
         distance = await self.maps_service.calculate_distance_from_warehouses(destination)
         if distance <= FREE_DISTANCE_THRESHOLD:
             return BASE_PRICE
 
         distance_extra = distance - FREE_DISTANCE_THRESHOLD
-        return BASE_PRICE + PRICE_PER_EXTRA_DISTANCE * distance_extra
+        return Money(BASE_PRICE + Money.from_cents(PRICE_PER_EXTRA_DISTANCE * distance_extra))
@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from domain.base.value_object import ValueObject
+
+
+class DeliveryRoute(ValueObject):
+    """Paid orders delivered by one vehicle leaving a warehouse and returning to it."""
+
+    warehouse: int  # row of the warehouse in the maps warehouses file
+    window_start: datetime
+    order_ids: tuple[str, ...]  # in visiting order
+    distance: float  # km, including the way back
@@ -0,0 +1,64 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from domain.base.value_object import Money
+from domain.maps.model.value_objects import normalize_postcode
+
+# terminates entries holding one whole postcode, so no entry is a prefix of another
+END = '$'
+
+
+class TariffTable:
+    """Delivery cost of one order-size tier by postcode prefix.
+
+    Prefixes are sorted and prefix-free, so the only entry that can match a postcode
+    is the greatest one not above it: a lookup is a single binary search.
+    """
+
+    def __init__(self, prefixes: Sequence[str], costs: Sequence[int]) -> None:
+        if len(prefixes) != len(costs):
+            raise ValueError('expected one cost per prefix')
+        order = sorted(range(len(prefixes)), key=prefixes.__getitem__)
+        self.prefixes = [prefixes[index] for index in order]
+        self.costs = [Money(costs[index]) for index in order]
+
+    def __len__(self) -> int:
+        return len(self.prefixes)
+
+    def lookup(self, postcode: str) -> Money | None:
+        key = normalize_postcode(postcode) + END
+        index = bisect_right(self.prefixes, key) - 1
+        if index >= 0 and key.startswith(self.prefixes[index]):
+            return self.costs[index]
+        return None
+
+
+class DeliveryTariffs:
+    """Precomputed delivery costs for small and large orders, saved as one ``.npz`` file."""
+
+    def __init__(self, small: TariffTable, large: TariffTable) -> None:
+        self.small = small
+        self.large = large
+
+    def lookup(self, postcode: str, large: bool) -> Money | None:
+        return (self.large if large else self.small).lookup(postcode)
+
+    def save(self, path: str | Path) -> None:
+        arrays = {}
+        for tier, table in (('small', self.small), ('large', self.large)):
+            arrays[f"{tier}_prefixes"] = np.array(table.prefixes, dtype=np.str_)
+            arrays[f"{tier}_costs"] = np.array(table.costs, dtype=np.int64)
+        with Path(path).open('wb') as file:
+            np.savez_compressed(file, **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'DeliveryTariffs':
+        with np.load(path, allow_pickle=False) as arrays:
+            small, large = (
+                TariffTable(arrays[f"{tier}_prefixes"].tolist(), arrays[f"{tier}_costs"].tolist())
+                for tier in ('small', 'large')
+            )
+        return cls(small, large)
@@ -1,5 +1,7 @@
 import abc
+from collections.abc import Sequence
 
+from domain.base.value_object import Money
 from domain.maps.model.value_objects import Address
 from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
 
@@ -11,16 +13,23 @@ class DeliveryCostCalculatorAdapterInterface(abc.ABC):
         self.maps_service = maps_service
 
     @abc.abstractmethod
-    async def calculate_cost(self, total_product_cost: float, destination: Address) -> float:
+    async def calculate_cost(self, total_product_cost: Money, destination: Address) -> Money:
         """Calculate the delivery cost based on product cost and destination."""
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def _large_delivery_calculate_cost(self, destination: Address) -> float:
+    async def calculate_costs(
+        self, total_product_costs: Sequence[Money], destinations: Sequence[Address]
+    ) -> list[Money]:
+        """Calculate the delivery costs of many orders at once, in order."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _large_delivery_calculate_cost(self, destination: Address) -> Money:
         """Specialized calculation for large deliveries."""
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def _small_delivery_calculate_cost(self, destination: Address) -> float:
+    async def _small_delivery_calculate_cost(self, destination: Address) -> Money:
         """Specialized calculation for small deliveries."""
         raise NotImplementedError()
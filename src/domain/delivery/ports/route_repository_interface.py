@@ -0,0 +1,34 @@
+import abc
+from collections.abc import Sequence
+from datetime import datetime
+
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from domain.delivery.model.routes import DeliveryRoute
+
+
+class DeliveryRouteRepositoryInterface(abc.ABC):
+    """Port for the planned delivery routes."""
+
+    def __init__(self, db_connection: AsyncMongoDBConnectorAdapter, collection_name: str):
+        self.db_connection = db_connection
+        self.collection_name = collection_name
+
+    @abc.abstractmethod
+    async def save(self, routes: Sequence[DeliveryRoute]) -> None:
+        """Store the routes planned for a window."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def from_window(self, window_start: datetime) -> list[DeliveryRoute]:
+        """Routes planned for the window starting at ``window_start``."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def routed_order_ids(self, start: datetime, end: datetime) -> set[str]:
+        """Orders on the routes of the windows starting between ``start`` and ``end``."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def last_window_start(self) -> datetime | None:
+        """Start of the latest window routes were planned for, None before the first."""
+        raise NotImplementedError()
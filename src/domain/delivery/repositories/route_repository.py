@@ -0,0 +1,49 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING
+
+from adapters.mongo_index_adapter import MongoIndex
+from domain.delivery.model.routes import DeliveryRoute
+from domain.delivery.ports.route_repository_interface import DeliveryRouteRepositoryInterface
+
+
+class DeliveryRouteRepository(DeliveryRouteRepositoryInterface):
+    """Delivery routes stored one document each in MongoDB."""
+
+    INDEXES = (MongoIndex('window_start', (('window_start', ASCENDING),)),)
+
+    async def save(self, routes: Sequence[DeliveryRoute]) -> None:
+        if not routes:
+            return
+        async with self.db_connection.get_connection() as connection:
+            await connection[self.collection_name].insert_many(
+                [route.model_dump() for route in routes], ordered=False
+            )
+
+    async def from_window(self, window_start: datetime) -> list[DeliveryRoute]:
+        async with self.db_connection.get_connection() as connection:
+            cursor = connection[self.collection_name].find(
+                {'window_start': window_start}, {'_id': False}
+            )
+            return [
+                DeliveryRoute.model_validate(document) for document in await cursor.to_list(None)
+            ]
+
+    async def routed_order_ids(self, start: datetime, end: datetime) -> set[str]:
+        async with self.db_connection.get_connection() as connection:
+            cursor = connection[self.collection_name].find(
+                {'window_start': {'$gte': start, '$lt': end}}, {'_id': False, 'order_ids': True}
+            )
+            return {
+                order_id
+                for document in await cursor.to_list(None)
+                for order_id in document['order_ids']
+            }
+
+    async def last_window_start(self) -> datetime | None:
+        async with self.db_connection.get_connection() as connection:
+            document = await connection[self.collection_name].find_one(
+                {}, {'_id': False, 'window_start': True}, sort=[('window_start', DESCENDING)]
+            )
+            return document['window_start'] if document else None
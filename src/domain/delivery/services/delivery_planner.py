@@ -0,0 +1,162 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from domain.delivery.model.routes import DeliveryRoute
+from domain.delivery.ports.route_repository_interface import DeliveryRouteRepositoryInterface
+from domain.delivery.services.route_planner import plan_routes
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.exceptions.maps_exceptions import DestinationNotFound
+from domain.maps.model.value_objects import Address
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderEventName
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class PaidOrder:
+    """Order waiting to be put on a delivery route."""
+
+    order_id: str
+    destination: Address
+    paid_at: datetime
+
+
+class DeliveryPlanner:
+    """Batch paid orders into delivery routes per warehouse and time window.
+
+    Orders are bucketed by the ``window`` seconds their payment fell in. The planner
+    works from the event store rather than from events seen by its own process, so
+    orders paid by any worker or by the reconciliation command are planned too, and a
+    restart loses nothing. Every ``poll_interval`` seconds it reads the OrderPaid events
+    of the windows closed since the last poll, leaves out the orders already on a saved
+    route and plans the rest: stops go to their nearest warehouse and are routed with
+    sweep + 2-opt in a worker thread within ``time_budget`` seconds. Closed windows are
+    read again for ``lookback`` seconds (one window by default), so events stored late
+    get routes of their own. Run it in one process only.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        events: OrderEventStoreRepositoryInterface,
+        maps: LocalMapsAdapter,
+        repository: DeliveryRouteRepositoryInterface,
+        window: float = 1_800.0,
+        max_stops: int = 40,
+        time_budget: float = 10.0,
+        poll_interval: float = 5.0,
+        lookback: float | None = None,
+    ) -> None:
+        self.events = events
+        self.maps = maps
+        self.repository = repository
+        self.window = window
+        self.max_stops = max_stops
+        self.time_budget = time_budget
+        self.poll_interval = poll_interval
+        self.lookback = timedelta(seconds=window if lookback is None else lookback)
+        self.since: datetime | None = None
+        self.unroutable: set[str] = set()  # not retried on every poll
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Resume from the last planned window, then start polling."""
+        self.since = await self.repository.last_window_start()
+        self._task = asyncio.create_task(self._work(), name='delivery-planner')
+        await logger.info('Delivery planner started', window=self.window)
+
+    async def stop(self) -> None:
+        """Stop polling; windows still open are planned from the event store later."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def window_start(self, moment: datetime) -> datetime:
+        timestamp = moment.timestamp()
+        return datetime.fromtimestamp(timestamp - timestamp % self.window, moment.tzinfo)
+
+    async def flush(self, now: datetime) -> list[DeliveryRoute]:
+        """Plan and save the paid orders not yet routed of the windows closed by ``now``."""
+        end = self.window_start(now)
+        start = end - self.lookback if self.since is None else min(self.since, end)
+        routes = []
+        for window_start, orders in sorted((await self.unrouted(start, end)).items()):
+            planned = await self.plan(window_start, orders)
+            await self.repository.save(planned)
+            routes.extend(planned)
+        # a failed window is read again on the next poll, its routed orders left out
+        self.since = max(start, end - self.lookback)
+        return routes
+
+    async def unrouted(self, start: datetime, end: datetime) -> dict[datetime, list[PaidOrder]]:
+        """Orders paid between ``start`` and ``end`` not on a route yet, per window."""
+        routed = await self.repository.routed_order_ids(start, end)
+        windows: defaultdict[datetime, list[PaidOrder]] = defaultdict(list)
+        async for event in self.events.get_events_between(OrderEventName.PAID, start, end):
+            order = Order.model_validate(event.aggregate)
+            if order.id in routed or order.id in self.unroutable:
+                continue
+            if order.destination is None:
+                self.unroutable.add(order.id)
+                metrics.increment('delivery_orders_unroutable_total', reason='no_destination')
+                continue
+            paid = PaidOrder(order.id, order.destination, event.datetime)
+            windows[self.window_start(event.datetime)].append(paid)
+        return windows
+
+    async def plan(self, window_start: datetime, orders: list[PaidOrder]) -> list[DeliveryRoute]:
+        """Routes covering the orders of one window."""
+        located, vectors = [], []
+        for order in orders:
+            try:
+                vectors.append(self.maps.locate(order.destination))
+            except DestinationNotFound:
+                self.unroutable.add(order.order_id)
+                metrics.increment('delivery_orders_unroutable_total', reason='unknown_postcode')
+                await logger.warning('Paid order not routable', order_id=order.order_id)
+                continue
+            located.append(order)
+        if not located:
+            return []
+        plans = await asyncio.to_thread(
+            plan_routes,
+            self.maps.warehouses.points,
+            np.array(vectors),
+            self.max_stops,
+            self.time_budget,
+        )
+        routes = [
+            DeliveryRoute(
+                warehouse=plan.warehouse,
+                window_start=window_start,
+                order_ids=tuple(located[index].order_id for index in plan.stops.tolist()),
+                distance=plan.distance,
+            )
+            for plan in plans
+        ]
+        metrics.increment('delivery_routes_planned_total', len(routes))
+        await logger.info(
+            'Delivery window planned',
+            window_start=window_start.isoformat(),
+            orders=len(located),
+            routes=len(routes),
+        )
+        return routes
+
+    async def _work(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.flush(datetime.now())
+            except Exception:
+                await logger.exception('Delivery planning failed')
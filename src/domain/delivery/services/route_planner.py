@@ -0,0 +1,123 @@
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from domain.maps.adapters.local_maps_adapter import chords_to_km
+
+# reversals gaining less than this (km) are rounding noise
+MIN_GAIN = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class RoutePlan:
+    """Stops visited by one vehicle leaving a warehouse and returning to it."""
+
+    warehouse: int
+    stops: np.ndarray  # indices into the planned stops, in visiting order
+    distance: float  # km, including the way back
+
+
+def distance_matrix(vectors: np.ndarray) -> np.ndarray:
+    """Great-circle km between every pair of unit vectors."""
+    return chords_to_km(np.linalg.norm(vectors[:, None, :] - vectors[None, :, :], axis=2))
+
+
+def sweep(depot: np.ndarray, stops: np.ndarray, max_stops: int) -> list[np.ndarray]:
+    """Split stops into groups of at most ``max_stops`` by their bearing from the depot.
+
+    Stops are projected on the plane tangent to the sphere at the depot and ordered by
+    polar angle; the sweep starts after the widest empty sector so that no group spans
+    it, and groups are cut to even sizes.
+    """
+    if not len(stops):
+        return []
+    east = np.cross((0.0, 0.0, 1.0), depot)
+    norm = np.linalg.norm(east)
+    east = east / norm if norm > 1e-12 else np.array([1.0, 0.0, 0.0])  # depot on a pole
+    north = np.cross(depot, east)
+    angles = np.arctan2(stops @ north, stops @ east)
+    order = np.argsort(angles, kind='stable')
+    ordered = angles[order]
+    gaps = np.diff(ordered, append=ordered[0] + 2 * math.pi)
+    order = np.roll(order, -(int(np.argmax(gaps)) + 1))
+    return np.array_split(order, -(-len(order) // max_stops))
+
+
+def nearest_neighbour_tour(distances: np.ndarray) -> np.ndarray:
+    """Closed tour from node 0 that always moves on to the closest unvisited node."""
+    size = len(distances)
+    tour: np.ndarray = np.zeros(size, dtype=np.intp)
+    visited: np.ndarray = np.zeros(size, dtype=bool)
+    visited[0] = True
+    current = 0
+    for position in range(1, size):
+        current = int(np.argmin(np.where(visited, np.inf, distances[current])))
+        tour[position] = current
+        visited[current] = True
+    return tour
+
+
+def two_opt(distances: np.ndarray, tour: np.ndarray, deadline: float = math.inf) -> np.ndarray:
+    """Shorten a closed tour by reversing segments, keeping node 0 first.
+
+    Each pass scores every reversal at once as a matrix of gains and applies the best
+    one; it stops at a local optimum or once ``time.perf_counter()`` reaches ``deadline``.
+    """
+    tour = tour.copy()
+    size = len(tour)
+    if size < 4:
+        return tour
+    # reversing tour[i + 1 : j + 1] swaps edges i and j; they must not share a node
+    candidates: np.ndarray = np.triu(np.ones((size, size), dtype=bool), k=2)
+    candidates[0, size - 1] = False
+    while time.perf_counter() < deadline:
+        following = np.roll(tour, -1)
+        edges = distances[tour, following]
+        removed = edges[:, None] + edges[None, :]
+        added = distances[tour[:, None], tour[None, :]] + distances[following[:, None], following]
+        gains = np.where(candidates, removed - added, 0.0)
+        i, j = divmod(int(np.argmax(gains)), size)
+        if gains[i, j] <= MIN_GAIN:
+            break
+        tour[i + 1 : j + 1] = tour[i + 1 : j + 1][::-1].copy()
+    return tour
+
+
+def route(
+    depot: np.ndarray, stops: np.ndarray, deadline: float = math.inf
+) -> tuple[np.ndarray, float]:
+    """Visiting order of ``stops`` from and back to ``depot``, and its length in km."""
+    distances = distance_matrix(np.vstack((depot, stops)))
+    tour = nearest_neighbour_tour(distances)
+    if time.perf_counter() < deadline:
+        tour = two_opt(distances, tour, deadline)
+    length = float(distances[tour, np.roll(tour, -1)].sum())
+    return tour[1:] - 1, length
+
+
+def plan_routes(
+    warehouses: np.ndarray, stops: np.ndarray, max_stops: int, time_budget: float
+) -> list[RoutePlan]:
+    """Cover every stop once with routes from its nearest warehouse.
+
+    Stops and warehouses are unit vectors. Routes are built with the sweep, ordered
+    nearest-neighbour first and then improved with 2-opt while ``time_budget`` seconds
+    last; routes reached after that keep their nearest-neighbour order, so the run time
+    stays bounded by a pass linear in the number of stops.
+    """
+    deadline = time.perf_counter() + time_budget
+    if not len(stops):
+        return []
+    # on the unit sphere the largest dot product is the nearest point
+    nearest = np.argmax(stops @ warehouses.T, axis=1)
+    plans = []
+    for warehouse in np.unique(nearest).tolist():
+        assigned = np.flatnonzero(nearest == warehouse)
+        depot = warehouses[warehouse]
+        for group in sweep(depot, stops[assigned], max_stops):
+            members = assigned[group]
+            order, length = route(depot, stops[members], deadline)
+            plans.append(RoutePlan(warehouse, members[order], length))
+    return plans
@@ -0,0 +1,64 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from domain.delivery.adapters.cost_calculator_adapter import ORDER_PRICE_THRESHOLD, delivery_costs
+from domain.delivery.model.tariffs import END, DeliveryTariffs, TariffTable
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.model.value_objects import normalize_postcode
+
+
+def compile_table(postcodes: Sequence[str], costs: np.ndarray, min_prefix: int = 5) -> TariffTable:
+    """Collapse per-postcode costs into the shortest prefixes sharing one cost.
+
+    ``postcodes`` must be normalized, unique and sorted, with ``costs`` in the same
+    order. A prefix of at least ``min_prefix`` characters whose postcodes all cost
+    the same becomes one entry (covering the whole region, including postcodes not
+    in the data); otherwise its postcodes are split by their next character.
+    """
+    prefixes: list[str] = []
+    prefix_costs: list[int] = []
+    pending = [(0, len(postcodes), 0)]
+    while pending:
+        low, high, depth = pending.pop()
+        if low == high:
+            continue
+        if depth >= min_prefix and (costs[low:high] == costs[low]).all():
+            prefixes.append(postcodes[low][:depth])
+            prefix_costs.append(int(costs[low]))
+            continue
+        # postcodes ending here sort first in their range
+        while low < high and len(postcodes[low]) == depth:
+            prefixes.append(postcodes[low] + END)
+            prefix_costs.append(int(costs[low]))
+            low += 1
+        start = low
+        while start < high:
+            end = start + 1
+            while end < high and postcodes[end][depth] == postcodes[start][depth]:
+                end += 1
+            pending.append((start, end, depth + 1))
+            start = end
+    return TariffTable(prefixes, prefix_costs)
+
+
+def compile_tariffs(
+    postcodes: Sequence[str], distances: Sequence[float], min_prefix: int = 5
+) -> DeliveryTariffs:
+    """Precompute both order-size tiers from each postcode's warehouse distance."""
+    by_postcode = dict(zip((normalize_postcode(postcode) for postcode in postcodes), distances))
+    keys = sorted(by_postcode)
+    distance_array = np.array([by_postcode[key] for key in keys], dtype=np.float64)
+    small = delivery_costs(np.zeros(len(keys), dtype=np.int64), distance_array)
+    large = delivery_costs(
+        np.full(len(keys), ORDER_PRICE_THRESHOLD, dtype=np.int64), distance_array
+    )
+    return DeliveryTariffs(
+        small=compile_table(keys, small, min_prefix), large=compile_table(keys, large, min_prefix)
+    )
+
+
+def compile_from_maps(maps: LocalMapsAdapter, min_prefix: int = 5) -> DeliveryTariffs:
+    """Tariffs for every postcode the local maps adapter knows."""
+    postcodes, distances = maps.postcode_distances()
+    return compile_tariffs(postcodes, distances.tolist(), min_prefix)
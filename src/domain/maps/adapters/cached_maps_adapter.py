@@ -0,0 +1,160 @@
+import asyncio
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from domain.maps.model.value_objects import Address, normalize_postcode
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+from ports.cache_interface import CacheInterface
+from utils.metrics import metrics
+
+
+def _fold(text: str) -> str:
+    """Casefold, drop accents and collapse whitespace."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ' '.join(''.join(char for char in decomposed if not unicodedata.combining(char)).split())
+
+
+def address_key(address: Address) -> str:
+    """Key of the addresses sharing one distance: postcode, state, road and building.
+
+    Postcodes keep only their digits and the house number drops anything after a
+    ``/`` (the unit inside the building), so ``'91755-720'`` and ``'91755720'`` or
+    ``'70/101'`` and ``'70'`` hit the same entry.
+    """
+    postcode = normalize_postcode(address.postcode)
+    house_number = str(address.house_number or '').split('/', maxsplit=1)[0]
+    state = getattr(address.state, 'value', address.state)
+    return f"{postcode}|{_fold(state)}|{_fold(address.road)}|{_fold(house_number)}"
+
+
+class CachedMapsAdapter(MapsAdapterInterface):
+    """Memoize another maps adapter's distances by normalized address.
+
+    Lookups go to a bounded in-process LRU first, then to the shared cache (Redis)
+    where distances live for ``ttl`` seconds, and only then to ``maps_service``.
+    Concurrent lookups of the same address share a single load, and the misses of a
+    batch reach ``maps_service`` as one ``calculate_distances`` call.
+    """
+
+    def __init__(
+        self,
+        maps_service: MapsAdapterInterface,
+        cache_adapter: CacheInterface,
+        max_entries: int = 10_000,
+        ttl: int = 2_592_000,
+    ) -> None:
+        self.maps_service = maps_service
+        self.cache_adapter = cache_adapter
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.distances: OrderedDict[str, float] = OrderedDict()
+        self._loading: dict[str, asyncio.Future[float]] = {}
+        self._batches: set[asyncio.Task[None]] = set()
+
+    def _cache_key(self, key: str) -> str:
+        return f"distance:{key}"
+
+    async def calculate_distance_from_warehouses(self, destination: Address) -> float:
+        key = address_key(destination)
+        if (distance := self.distances.get(key)) is not None:
+            self.distances.move_to_end(key)
+            metrics.increment('maps_distance_lookups_total', source='memory')
+            return distance
+        if (task := self._loading.get(key)) is None:
+            task = asyncio.create_task(self._load(key, destination))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        else:
+            metrics.increment('maps_distance_lookups_total', source='coalesced')
+        # a cancelled caller must not cancel the load other callers are waiting for
+        return await asyncio.shield(task)
+
+    async def calculate_distances(self, destinations: Sequence[Address]) -> list[float]:
+        keys = [address_key(destination) for destination in destinations]
+        found: dict[str, float] = {}
+        pending: dict[str, asyncio.Future[float]] = {}
+        missing: dict[str, Address] = {}
+        for key, destination in zip(keys, destinations):
+            if key in found or key in pending or key in missing:
+                continue
+            if (distance := self.distances.get(key)) is not None:
+                self.distances.move_to_end(key)
+                metrics.increment('maps_distance_lookups_total', source='memory')
+                found[key] = distance
+            elif (future := self._loading.get(key)) is not None:
+                metrics.increment('maps_distance_lookups_total', source='coalesced')
+                pending[key] = future
+            else:
+                missing[key] = destination
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._loading.update(futures)
+            pending.update(futures)
+            batch = asyncio.create_task(self._load_many(missing, futures))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+        if pending:
+            distances = await asyncio.shield(asyncio.gather(*pending.values()))
+            found.update(zip(pending, distances))
+        return [found[key] for key in keys]
+
+    async def _load_many(
+        self, destinations: dict[str, Address], futures: dict[str, asyncio.Future[float]]
+    ) -> None:
+        try:
+            cached = await asyncio.gather(
+                *(self.cache_adapter.get(key=self._cache_key(key)) for key in destinations)
+            )
+            distances = {
+                key: float(hit['distance']) for key, hit in zip(destinations, cached) if hit
+            }
+            metrics.increment('maps_distance_lookups_total', len(distances), source='cache')
+            if missing := [key for key in destinations if key not in distances]:
+                fetched = await self.maps_service.calculate_distances(
+                    [destinations[key] for key in missing]
+                )
+                metrics.increment('maps_distance_lookups_total', len(missing), source='maps')
+                distances.update(zip(missing, fetched))
+                await asyncio.gather(
+                    *(
+                        self.cache_adapter.set(
+                            key=self._cache_key(key),
+                            data={'distance': distances[key]},
+                            ttl=self.ttl,
+                        )
+                        for key in missing
+                    )
+                )
+            for key, distance in distances.items():
+                self._remember(key, distance)
+                futures[key].set_result(distance)
+        except Exception as exc:  # handed to every waiting caller
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            for key, future in futures.items():
+                future.cancel()  # no-op once resolved
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+
+    async def _load(self, key: str, destination: Address) -> float:
+        if cached := await self.cache_adapter.get(key=self._cache_key(key)):
+            distance = float(cached['distance'])
+            metrics.increment('maps_distance_lookups_total', source='cache')
+        else:
+            distance = await self.maps_service.calculate_distance_from_warehouses(destination)
+            metrics.increment('maps_distance_lookups_total', source='maps')
+            await self.cache_adapter.set(
+                key=self._cache_key(key), data={'distance': distance}, ttl=self.ttl
+            )
+        self._remember(key, distance)
+        return distance
+
+    def _remember(self, key: str, distance: float) -> None:
+        self.distances[key] = distance
+        self.distances.move_to_end(key)
+        while len(self.distances) > self.max_entries:
+            self.distances.popitem(last=False)
@@ -0,0 +1,129 @@
+import csv
+import math
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from domain.maps.exceptions.maps_exceptions import DestinationNotFound
+from domain.maps.model.value_objects import Address, normalize_postcode
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+from utils.kd_tree import KDTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+Coordinate = tuple[float, float]
+
+
+def unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere for degrees of latitude/longitude, one row each."""
+    latitudes, longitudes = np.radians(latitudes), np.radians(longitudes)
+    cos_latitudes = np.cos(latitudes)
+    return np.column_stack(
+        (cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes), np.sin(latitudes))
+    )
+
+
+def chord_to_km(chord: float) -> float:
+    """Great-circle distance for a straight-line distance between unit vectors.
+
+    Half the chord is the square root of the haversine of the central angle, so this
+    is the haversine formula without recomputing the trigonometry per query.
+    """
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def chords_to_km(chords: np.ndarray) -> np.ndarray:
+    """``chord_to_km`` over an array of chords."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, chords / 2))
+
+
+def _read_coordinates(path: Path, key: str) -> tuple[list[str], np.ndarray]:
+    with path.open(newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    keys = [row[key] for row in rows]
+    coordinates = np.array(
+        [(float(row['latitude']), float(row['longitude'])) for row in rows], dtype=np.float64
+    ).reshape(-1, 2)
+    return keys, coordinates
+
+
+class LocalMapsAdapter(MapsAdapterInterface):
+    """Distances to the nearest warehouse computed in-process from coordinate tables.
+
+    Destinations are located by postcode. All coordinates are converted to unit
+    vectors once with NumPy; warehouses go into a k-d tree, where the nearest one in
+    straight-line distance is also the nearest along the Earth's surface. A lookup is a
+    dict access plus a tree walk over the warehouses, answered in microseconds.
+    """
+
+    def __init__(
+        self,
+        postcodes: Sequence[str],
+        postcode_coordinates: np.ndarray,
+        warehouse_coordinates: np.ndarray,
+    ) -> None:
+        self.postcode_index = {
+            normalize_postcode(postcode): row for row, postcode in enumerate(postcodes)
+        }
+        coordinates = np.asarray(postcode_coordinates, dtype=np.float64).reshape(-1, 2)
+        self.postcode_vectors = unit_vectors(coordinates[:, 0], coordinates[:, 1])
+        warehouses = np.asarray(warehouse_coordinates, dtype=np.float64).reshape(-1, 2)
+        self.warehouses = KDTree(unit_vectors(warehouses[:, 0], warehouses[:, 1]))
+
+    @classmethod
+    def from_files(
+        cls, postcodes_path: str | Path, warehouses_path: str | Path
+    ) -> 'LocalMapsAdapter':
+        """Load ``postcode,latitude,longitude`` and ``warehouse_id,latitude,longitude`` CSVs."""
+        postcodes, postcode_coordinates = _read_coordinates(Path(postcodes_path), 'postcode')
+        _, warehouse_coordinates = _read_coordinates(Path(warehouses_path), 'warehouse_id')
+        return cls(postcodes, postcode_coordinates, warehouse_coordinates)
+
+    @classmethod
+    def from_coordinates(
+        cls, postcodes: dict[str, Coordinate], warehouses: Iterable[Coordinate]
+    ) -> 'LocalMapsAdapter':
+        return cls(list(postcodes), np.array(list(postcodes.values())), np.array(list(warehouses)))
+
+    def _row(self, destination: Address) -> int:
+        row = self.postcode_index.get(normalize_postcode(destination.postcode))
+        if row is None:
+            raise DestinationNotFound(detail=f"unknown postcode {destination.postcode}")
+        return row
+
+    def locate(self, destination: Address) -> list[float]:
+        """Unit vector of the destination's postcode."""
+        return self.postcode_vectors[self._row(destination)].tolist()
+
+    def distance_matrix(self, destinations: Sequence[Address]) -> np.ndarray:
+        """Great-circle km from every destination (rows) to every warehouse (columns)."""
+        rows = [self._row(destination) for destination in destinations]
+        return self._distances_to_warehouses(self.postcode_vectors[rows])
+
+    def postcode_distances(self, chunk_size: int = 8192) -> tuple[list[str], np.ndarray]:
+        """Nearest-warehouse distance of every known postcode, computed in chunks."""
+        postcodes = list(self.postcode_index)
+        rows = np.fromiter(self.postcode_index.values(), dtype=np.intp, count=len(postcodes))
+        distances: np.ndarray = np.empty(len(postcodes), dtype=np.float64)
+        for start in range(0, len(rows), chunk_size):
+            vectors = self.postcode_vectors[rows[start : start + chunk_size]]
+            distances[start : start + chunk_size] = self._distances_to_warehouses(vectors).min(
+                axis=1
+            )
+        return postcodes, distances
+
+    def _distances_to_warehouses(self, vectors: np.ndarray) -> np.ndarray:
+        chords = np.linalg.norm(vectors[:, None, :] - self.warehouses.points[None, :, :], axis=2)
+        return chords_to_km(chords)
+
+    async def calculate_distance_from_warehouses(self, destination: Address) -> float:
+        """Great-circle distance in km to the nearest warehouse."""
+        _, chord = self.warehouses.nearest(self.locate(destination))
+        return chord_to_km(chord)
+
+    async def calculate_distances(self, destinations: Sequence[Address]) -> list[float]:
+        """Nearest-warehouse distances of many destinations in one matrix pass."""
+        if not destinations:
+            return []
+        return self.distance_matrix(destinations).min(axis=1).tolist()
@@ -0,0 +1,43 @@
+from collections.abc import Sequence
+
+from domain.base.resilience import Resilience
+from domain.maps.model.value_objects import Address
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+
+
+class ResilientMapsAdapter(MapsAdapterInterface):
+    """Call another maps adapter behind a circuit breaker.
+
+    Distance lookups are hedged unless ``hedge`` is off, which suits a caching adapter
+    whose concurrent lookups of an address already share one load. When the breaker is
+    open or a lookup fails, ``fallback`` (e.g. the offline maps adapter) answers if
+    given; keep it outside any cache so that its estimates are not stored as distances.
+    """
+
+    def __init__(
+        self,
+        maps_service: MapsAdapterInterface,
+        resilience: Resilience,
+        fallback: MapsAdapterInterface | None = None,
+        hedge: bool = True,
+    ) -> None:
+        self.maps_service = maps_service
+        self.resilience = resilience
+        self.fallback = fallback
+        self.hedge = hedge
+
+    async def calculate_distance_from_warehouses(self, destination: Address) -> float:
+        return await self.resilience.call(
+            self.maps_service.calculate_distance_from_warehouses,
+            destination,
+            hedge=self.hedge,
+            fallback=self.fallback.calculate_distance_from_warehouses if self.fallback else None,
+        )
+
+    async def calculate_distances(self, destinations: Sequence[Address]) -> list[float]:
+        return await self.resilience.call(
+            self.maps_service.calculate_distances,
+            destinations,
+            hedge=self.hedge,
+            fallback=self.fallback.calculate_distances if self.fallback else None,
+        )
@@ -0,0 +1,11 @@
+from fastapi import status
+
+from exceptions import OrderingServiceException
+
+
+class DestinationNotFound(OrderingServiceException):
+    """Raised when a destination cannot be located to measure its distance."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    name = 'DESTINATION_NOT_FOUND'
+    message = 'destination not found'
@@ -14,6 +14,11 @@ class StatesEnum(str, Enum):
         return value in (member.value for member in cls)
 
 
+def normalize_postcode(postcode: str) -> str:
+    """Postcode without separators, e.g. ``'91755720'`` for ``'91755-720'``."""
+    return ''.join(char for char in postcode if char.isalnum()).upper()
+
+
 class Address(ValueObject):
     """Value object representing a postal address."""
 
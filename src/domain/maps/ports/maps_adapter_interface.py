@@ -1,4 +1,6 @@
 import abc
+import asyncio
+from collections.abc import Sequence
 
 from domain.maps.model.value_objects import Address
 
@@ -10,3 +12,14 @@ class MapsAdapterInterface(abc.ABC):
     async def calculate_distance_from_warehouses(self, destination: Address) -> float:
         """Calculate the distance from available warehouses to a destination address."""
         raise NotImplementedError()
+
+    async def calculate_distances(self, destinations: Sequence[Address]) -> list[float]:
+        """Distances for many destinations, in order; adapters that can batch override this."""
+        return list(
+            await asyncio.gather(
+                *(
+                    self.calculate_distance_from_warehouses(destination)
+                    for destination in destinations
+                )
+            )
+        )
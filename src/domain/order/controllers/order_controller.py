@@ -1,7 +1,13 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Header, Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter, operation_token
+from domain.base.bus import CommandBus, QueryBus
 from domain.order.dtos.order_dtos import (
     OrderCreateRequest,
     OrderCreateResponse,
@@ -13,6 +19,7 @@ from domain.order.dtos.order_dtos import (
 from domain.order.exceptions.order_exceptions import (
     CannotCancelAlreadyCancelled,
     CannotCancelAlreadyPaid,
+    CannotCancelPaymentPending,
     CannotPayAlreadyPaid,
     CannotPayCancelled,
     CannotUpdateToStatus,
@@ -20,19 +27,41 @@ from domain.order.exceptions.order_exceptions import (
     OrderAlreadyPaidException,
     OrderIdRequired,
     OrderNotFound,
+    OrderPaymentPendingException,
     PaymentNotVerifiedException,
     PaymentVerificationFailed,
 )
+from domain.order.model.commands import CancelOrder, CreateOrder, PayOrder, RequestOrderPayment
+from domain.order.model.queries import GetOrder, GetOrderVersion
 from domain.order.model.value_objects import BuyerId, OrderId
-from domain.order.ports.order_service_interface import OrderServiceInterface
+from utils.etag import etag_matches, make_etag
+
+READ_AFTER_HEADER = 'X-Read-After'
 
 
 class OrderController:
     """HTTP controller for Order resource."""
 
-    def __init__(self, order_service: OrderServiceInterface) -> None:
-        """Bind routes and dependencies."""
-        self.order_service = order_service
+    def __init__(
+        self,
+        command_bus: CommandBus,
+        query_bus: QueryBus,
+        async_payments: bool = False,
+        sessions: AsyncMongoDBConnectorAdapter | None = None,
+    ) -> None:
+        """Bind routes and dependencies.
+
+        With ``async_payments`` paying an order answers 202 right away and the payment is
+        verified in the background; clients poll the order until it leaves payment_pending.
+
+        With ``sessions`` commands run in a causally consistent session and answer with an
+        ``X-Read-After`` token; a GET sending it back reads the order at least as of that
+        command, even from a secondary.
+        """
+        self.command_bus = command_bus
+        self.query_bus = query_bus
+        self.async_payments = async_payments
+        self.sessions = sessions
         self.router = APIRouter(tags=['Order'], prefix='/core/v1/orders')
         self.router.add_api_route(
             '/', self.create_order, methods=['POST'], response_model=OrderCreateResponse
@@ -48,48 +77,113 @@ class OrderController:
         )
 
     async def create_order(
-        self, request: Request, order: OrderCreateRequest
-    ) -> OrderCreateResponse:
-        """Create a new order."""
-        buyer_id = BuyerId(order.buyer_id)
-        order_id = await self.order_service.create_new_order(
-            buyer_id, order.items, order.destination
-        )
-        return OrderCreateResponse(order_id=str(order_id))
+        self,
+        request: Request,
+        order: OrderCreateRequest,
+        idempotency_key: Annotated[str | None, Header(alias='Idempotency-Key')] = None,
+    ) -> OrderCreateResponse | Response:
+        """Create a new order; retries with the same Idempotency-Key replay the first result."""
+        async with self._causal_session() as headers:
+            order_id = await self.command_bus.dispatch(
+                CreateOrder(
+                    buyer_id=BuyerId(order.buyer_id),
+                    items=order.items,
+                    destination=order.destination,
+                    idempotency_key=idempotency_key,
+                )
+            )
+        return with_headers(OrderCreateResponse(order_id=str(order_id)), headers)
 
-    async def get_order(self, request: Request, order_id: Annotated[str, OrderId]) -> OrderDetail:
-        """Retrieve order by id."""
-        order = await self.order_service.get_order_from_id(order_id=order_id)
-        if not order:
+    async def get_order(
+        self,
+        request: Request,
+        order_id: Annotated[str, OrderId],
+        if_none_match: Annotated[str | None, Header()] = None,
+        read_after: Annotated[str | None, Header(alias=READ_AFTER_HEADER)] = None,
+    ) -> Response:
+        """Retrieve order by id as cached JSON, answering If-None-Match from the version."""
+        async with self._causal_session(read_after) if read_after else _no_session():
+            version = await self.query_bus.dispatch(GetOrderVersion(order_id=OrderId(order_id)))
+            if version is None:
+                raise OrderNotFound(detail=f"Order '{order_id}' not found")
+
+            etag = make_etag(order_id, version)
+            if if_none_match and etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+            detail = await self.query_bus.dispatch(
+                GetOrder(order_id=OrderId(order_id), version=version)
+            )
+        if not detail:
             raise OrderNotFound(detail=f"Order '{order_id}' not found")
-        return OrderDetail.from_order(order)
+        return Response(
+            content=detail.content,
+            media_type='application/json',
+            headers={'ETag': make_etag(order_id, detail.version)},
+        )
 
     async def update_order(
         self,
         request: Request,
         order_id: Annotated[str, OrderId],
         order_update: OrderUpdateStatusRequest,
-    ) -> OrderUpdateStatusResponse:
+        idempotency_key: Annotated[str | None, Header(alias='Idempotency-Key')] = None,
+    ) -> OrderUpdateStatusResponse | Response:
         """Update order status."""
+        async with self._causal_session() as headers:
+            result = await self._update_status(order_id, order_update, idempotency_key)
+        return with_headers(result, headers)
+
+    @asynccontextmanager
+    async def _causal_session(self, after: str | None = None) -> AsyncIterator[dict[str, str]]:
+        """Run the enclosed work in a causal session, then fill in its read-after token."""
+        headers: dict[str, str] = {}
+        if self.sessions is None:
+            yield headers
+            return
+        async with self.sessions.causal_session(after) as session:
+            yield headers
+        if token := operation_token(session):
+            headers[READ_AFTER_HEADER] = token
+
+    async def _update_status(
+        self,
+        order_id: Annotated[str, OrderId],
+        order_update: OrderUpdateStatusRequest,
+        idempotency_key: str | None,
+    ) -> OrderUpdateStatusResponse | Response:
         if not order_id or not str(order_id).strip():
             raise OrderIdRequired(errors=['blank'])
 
         order_status = order_update.status
 
+        if order_status is OrderStatusEnum.PAID and self.async_payments:
+            await self._request_payment(order_id, idempotency_key)
+            accepted = OrderUpdateStatusResponse(order_id=str(order_id), status='payment_pending')
+            return JSONResponse(
+                content=accepted.model_dump(mode='json'),
+                status_code=status.HTTP_202_ACCEPTED,
+                headers={'Location': f"{self.router.prefix}/{order_id}"},
+            )
+
         if order_status is OrderStatusEnum.PAID:
-            await self._pay_order(order_id)
+            await self._pay_order(order_id, idempotency_key)
             return OrderUpdateStatusResponse(order_id=str(order_id), status='paid')
 
         if order_status is OrderStatusEnum.CANCELLED:
-            await self._cancel_order(order_id)
+            await self._cancel_order(order_id, idempotency_key)
             return OrderUpdateStatusResponse(order_id=str(order_id), status='cancelled')
 
         raise CannotUpdateToStatus(detail=f"Cannot update Order's status to {order_status}")
 
-    async def _pay_order(self, order_id: Annotated[str, OrderId]) -> None:
+    async def _pay_order(
+        self, order_id: Annotated[str, OrderId], idempotency_key: str | None = None
+    ) -> None:
         """Apply payment transition."""
         try:
-            await self.order_service.pay_order(order_id)
+            await self.command_bus.dispatch(
+                PayOrder(order_id=OrderId(order_id), idempotency_key=idempotency_key)
+            )
         except OrderAlreadyCancelledException as e:
             raise CannotPayCancelled() from e
         except OrderAlreadyPaidException as e:
@@ -97,11 +191,43 @@ class OrderController:
         except PaymentNotVerifiedException as e:
             raise PaymentVerificationFailed() from e
 
-    async def _cancel_order(self, order_id: OrderId) -> None:
+    async def _request_payment(
+        self, order_id: Annotated[str, OrderId], idempotency_key: str | None = None
+    ) -> None:
+        """Queue the payment for background verification."""
+        try:
+            await self.command_bus.dispatch(
+                RequestOrderPayment(order_id=OrderId(order_id), idempotency_key=idempotency_key)
+            )
+        except OrderAlreadyCancelledException as e:
+            raise CannotPayCancelled() from e
+        except OrderAlreadyPaidException as e:
+            raise CannotPayAlreadyPaid() from e
+
+    async def _cancel_order(self, order_id: OrderId, idempotency_key: str | None = None) -> None:
         """Apply cancel transition."""
         try:
-            await self.order_service.cancel_order(order_id)
+            await self.command_bus.dispatch(
+                CancelOrder(order_id=OrderId(order_id), idempotency_key=idempotency_key)
+            )
         except OrderAlreadyCancelledException as e:
             raise CannotCancelAlreadyCancelled() from e
         except OrderAlreadyPaidException as e:
             raise CannotCancelAlreadyPaid() from e
+        except OrderPaymentPendingException as e:
+            raise CannotCancelPaymentPending() from e
+
+
+@asynccontextmanager
+async def _no_session() -> AsyncIterator[dict[str, str]]:
+    yield {}
+
+
+def with_headers(result: BaseModel | Response, headers: dict[str, str]) -> BaseModel | Response:
+    """Add ``headers`` to an endpoint result, rendering a model as JSON when needed."""
+    if not headers:
+        return result
+    if isinstance(result, Response):
+        result.headers.update(headers)
+        return result
+    return JSONResponse(content=result.model_dump(mode='json'), headers=headers)
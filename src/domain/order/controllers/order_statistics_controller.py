@@ -0,0 +1,29 @@
+from datetime import date
+
+from fastapi import APIRouter, Request
+
+from domain.base.bus import QueryBus
+from domain.order.dtos.order_dtos import OrderStatisticsDetail
+from domain.order.model.queries import GetOrderStatistics
+from domain.order.model.value_objects import BuyerId
+
+
+class OrderStatisticsController:
+    """HTTP controller for the order statistics read model."""
+
+    def __init__(self, query_bus: QueryBus) -> None:
+        """Bind routes and dependencies."""
+        self.query_bus = query_bus
+        self.router = APIRouter(tags=['Order statistics'], prefix='/core/v1/statistics/orders')
+        self.router.add_api_route(
+            '/', self.get_statistics, methods=['GET'], response_model=OrderStatisticsDetail
+        )
+
+    async def get_statistics(
+        self, request: Request, day: date | None = None, buyer_id: str | None = None
+    ) -> OrderStatisticsDetail:
+        """Retrieve status counters and the optional per-day and per-buyer slices."""
+        statistics = await self.query_bus.dispatch(
+            GetOrderStatistics(day=day, buyer_id=BuyerId(buyer_id) if buyer_id else None)
+        )
+        return OrderStatisticsDetail.from_statistics(statistics)
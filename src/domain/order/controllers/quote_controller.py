@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Request
+
+from domain.base.bus import QueryBus
+from domain.order.dtos.quote_dtos import CartQuoteDetail, CartQuotesRequest, CartQuotesResponse
+from domain.order.model.queries import QuoteCarts
+
+
+class QuoteController:
+    """HTTP controller quoting carts before they become orders."""
+
+    def __init__(self, query_bus: QueryBus) -> None:
+        """Bind routes and dependencies."""
+        self.query_bus = query_bus
+        self.router = APIRouter(tags=['Quote'], prefix='/core/v1/quotes')
+        self.router.add_api_route(
+            '/', self.quote_carts, methods=['POST'], response_model=CartQuotesResponse
+        )
+
+    async def quote_carts(
+        self, request: Request, quote_request: CartQuotesRequest
+    ) -> CartQuotesResponse:
+        """Quote product and delivery cost of every cart, in request order."""
+        quotes = await self.query_bus.dispatch(
+            QuoteCarts(carts=[cart.to_cart() for cart in quote_request.carts])
+        )
+        return CartQuotesResponse(quotes=[CartQuoteDetail.from_quote(quote) for quote in quotes])
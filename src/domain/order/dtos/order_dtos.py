@@ -1,13 +1,21 @@
 import uuid
 from collections.abc import Sequence
-from decimal import Decimal
 
 from bson import ObjectId
 from pydantic import ConfigDict, Field, computed_field
 
 from domain.base.dto import DataTransferObject
+from domain.base.value_object import Money, MoneyUnits
 from domain.order.model.entities import Order
-from domain.order.model.value_objects import BuyerId, OrderId, OrderItem, OrderStatusEnum
+from domain.order.model.value_objects import (
+    BuyerId,
+    OrderId,
+    OrderItem,
+    OrderRevenueCounters,
+    OrderStatistics,
+    OrderStatusCounters,
+    OrderStatusEnum,
+)
 from domain.payment.model.value_objects import PaymentId
 
 
@@ -106,8 +114,8 @@ class OrderDetail(DataTransferObject):
     buyer_id: BuyerId
     payment_id: PaymentId
     items: Sequence[OrderItem]
-    product_cost: Decimal
-    delivery_cost: Decimal
+    product_cost: MoneyUnits
+    delivery_cost: MoneyUnits
     status: OrderStatusEnum
 
     model_config = ConfigDict(
@@ -127,11 +135,41 @@ class OrderDetail(DataTransferObject):
 
     @computed_field  # type: ignore[misc]
     @property
-    def total_cost(self) -> Decimal:
+    def total_cost(self) -> MoneyUnits:
         """Computed total (products + delivery)."""
-        return self.product_cost + self.delivery_cost
+        return Money(self.product_cost + self.delivery_cost)
 
     @classmethod
     def from_order(cls, order: Order) -> 'OrderDetail':
         """Factory from aggregate."""
         return cls.model_validate(order.model_dump())
+
+
+class SerializedOrderDetail(DataTransferObject):
+    """Order detail view of one aggregate version, already encoded as JSON."""
+
+    version: int
+    content: str
+
+
+class OrderStatisticsDetail(DataTransferObject):
+    """Order statistics view."""
+
+    status: OrderStatusCounters
+    day: OrderRevenueCounters | None = None
+    buyer: OrderRevenueCounters | None = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'status': {'waiting': 12, 'paid': 40, 'cancelled': 3},
+                'day': {'orders': 9, 'paid': 7, 'cancelled': 1, 'revenue': '3265.34'},
+                'buyer': {'orders': 2, 'paid': 2, 'cancelled': 0, 'revenue': '933.24'},
+            }
+        }
+    )
+
+    @classmethod
+    def from_statistics(cls, statistics: OrderStatistics) -> 'OrderStatisticsDetail':
+        """Factory from read model."""
+        return cls.model_validate(statistics.model_dump())
@@ -0,0 +1,75 @@
+from collections.abc import Sequence
+
+from pydantic import ConfigDict, Field, computed_field
+
+from domain.base.dto import DataTransferObject
+from domain.base.value_object import Money, MoneyUnits
+from domain.maps.model.value_objects import Address
+from domain.order.model.value_objects import Cart, CartQuote, OrderItem
+from settings import QUOTE_MAX_CARTS
+
+CART_EXAMPLE = {
+    'items': [{'product_id': 'product-1', 'amount': 2}, {'product_id': 'product-2', 'amount': 1}],
+    'destination': {
+        'house_number': '70',
+        'road': 'Rua Padre Emilio Hartmann',
+        'sub_district': 'Hípica',
+        'district': 'Porto Alegre',
+        'state': 'Rio Grande do Sul',
+        'postcode': '91755720',
+        'country': 'Brazil',
+    },
+}
+
+
+class CartRequest(DataTransferObject):
+    """One cart to quote."""
+
+    items: Sequence[OrderItem]
+    destination: Address
+
+    def to_cart(self) -> Cart:
+        """Domain value object for this cart."""
+        return Cart(items=tuple(self.items), destination=self.destination)
+
+
+class CartQuotesRequest(DataTransferObject):
+    """Quote-carts request payload."""
+
+    carts: Sequence[CartRequest] = Field(min_length=1, max_length=QUOTE_MAX_CARTS)
+
+    model_config = ConfigDict(json_schema_extra={'example': {'carts': [CART_EXAMPLE]}})
+
+
+class CartQuoteDetail(DataTransferObject):
+    """Quote of one cart, in request order."""
+
+    product_cost: MoneyUnits
+    delivery_cost: MoneyUnits
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def total_cost(self) -> MoneyUnits:
+        """Computed total (products + delivery)."""
+        return Money(self.product_cost + self.delivery_cost)
+
+    @classmethod
+    def from_quote(cls, quote: CartQuote) -> 'CartQuoteDetail':
+        """Factory from value object."""
+        return cls.model_validate(quote.model_dump())
+
+
+class CartQuotesResponse(DataTransferObject):
+    """Quote-carts response payload."""
+
+    quotes: Sequence[CartQuoteDetail]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'quotes': [
+                    {'product_cost': '24.00', 'delivery_cost': '50.00', 'total_cost': '74.00'}
+                ]
+            }
+        }
+    )
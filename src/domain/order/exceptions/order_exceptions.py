@@ -19,6 +19,14 @@ class OrderAlreadyPaidException(OrderingServiceException):
     message = 'order is already paid'
 
 
+class OrderPaymentPendingException(OrderingServiceException):
+    """Raised when trying to act on an order whose payment is being verified."""
+
+    status_code = status.HTTP_409_CONFLICT
+    name = 'ORDER_PAYMENT_PENDING'
+    message = 'order payment is being verified'
+
+
 class PaymentNotVerifiedException(OrderingServiceException):
     """Raised when a payment verification precondition fails."""
 
@@ -51,6 +59,14 @@ class PersistenceError(OrderingServiceException):
     message = 'persistence error'
 
 
+class ExternalServiceTimeout(OrderingServiceException):
+    """Raised when an external service does not answer in time."""
+
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    name = 'EXTERNAL_SERVICE_TIMEOUT'
+    message = 'external service timed out'
+
+
 class OrderIdRequired(OrderingServiceException):
     """Raised when order_id is missing or blank."""
 
@@ -137,3 +153,11 @@ class CannotCancelAlreadyPaid(OrderingServiceException):
     status_code = status.HTTP_409_CONFLICT
     name = 'CANNOT_CANCEL_ALREADY_PAID'
     message = "cannot cancel order when it's already paid"
+
+
+class CannotCancelPaymentPending(OrderingServiceException):
+    """Raised when attempting to cancel an order whose payment is being verified."""
+
+    status_code = status.HTTP_409_CONFLICT
+    name = 'CANNOT_CANCEL_PAYMENT_PENDING'
+    message = 'cannot cancel order while its payment is being verified'
@@ -0,0 +1,98 @@
+from collections.abc import Mapping
+
+from domain.base.bus import (
+    CommandBus,
+    LockMiddleware,
+    Middleware,
+    QueryBus,
+    RetryMiddleware,
+    TimingMiddleware,
+)
+from domain.base.idempotency import IdempotencyMiddleware
+from domain.base.message import Command
+from domain.order.exceptions.order_exceptions import EntityOutdated
+from domain.order.handlers.command_handlers import (
+    CancelOrderHandler,
+    CompleteOrderPaymentHandler,
+    CreateOrderHandler,
+    PayOrderHandler,
+    RequestOrderPaymentHandler,
+)
+from domain.order.handlers.query_handlers import (
+    GetOrderHandler,
+    GetOrderStatisticsHandler,
+    GetOrderVersionHandler,
+    QuoteCartsHandler,
+)
+from domain.order.model.commands import (
+    CancelOrder,
+    CompleteOrderPayment,
+    CreateOrder,
+    PayOrder,
+    RequestOrderPayment,
+)
+from domain.order.model.queries import GetOrder, GetOrderStatistics, GetOrderVersion, QuoteCarts
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+from domain.order.ports.order_service_interface import OrderServiceInterface
+from domain.order.ports.order_statistics_repository_interface import (
+    OrderStatisticsRepositoryInterface,
+)
+from domain.order.services.cart_quote_service import CartQuoteService
+from ports.lock_interface import LockInterface
+from utils.retry import RetryPolicy
+
+
+def order_lock_key(
+    command: PayOrder | RequestOrderPayment | CompleteOrderPayment | CancelOrder,
+) -> str:
+    """Lock key of the aggregate a command mutates."""
+    return f"order:{command.order_id}"
+
+
+def build_order_command_bus(
+    order_service: OrderServiceInterface,
+    idempotency: IdempotencyMiddleware | None = None,
+    lock: LockInterface | None = None,
+    retry_policies: Mapping[type[Command], RetryPolicy] | None = None,
+) -> CommandBus:
+    """Command side: handlers write through the order service to the event store.
+
+    Commands on an existing aggregate hold its lock around the retry loop, so
+    concurrent commands for one order queue instead of failing with EntityOutdated.
+    Each retry reloads the aggregate and re-runs the domain method.
+    """
+    middlewares: list[Middleware] = [TimingMiddleware('order_command_seconds')]
+    if idempotency:
+        middlewares.append(idempotency)
+    bus = CommandBus(middlewares=middlewares)
+    bus.register(CreateOrder, CreateOrderHandler(order_service))
+
+    retry_policies = retry_policies or {}
+    for command_type, handler in (
+        (PayOrder, PayOrderHandler(order_service)),
+        (RequestOrderPayment, RequestOrderPaymentHandler(order_service)),
+        (CompleteOrderPayment, CompleteOrderPaymentHandler(order_service)),
+        (CancelOrder, CancelOrderHandler(order_service)),
+    ):
+        aggregate_middlewares: list[Middleware] = []
+        if lock:
+            aggregate_middlewares.append(LockMiddleware(lock, key_of=order_lock_key))
+        policy = retry_policies.get(command_type, RetryPolicy())
+        aggregate_middlewares.append(RetryMiddleware(retry_on=(EntityOutdated,), policy=policy))
+        bus.register(command_type, handler, middlewares=aggregate_middlewares)
+    return bus
+
+
+def build_order_query_bus(
+    repository: OrderRepositoryInterface,
+    statistics_repository: OrderStatisticsRepositoryInterface,
+    quote_service: CartQuoteService | None = None,
+) -> QueryBus:
+    """Query side: handlers read from the cached aggregate store and projections."""
+    bus = QueryBus(middlewares=[TimingMiddleware('order_query_seconds')])
+    bus.register(GetOrderVersion, GetOrderVersionHandler(repository))
+    bus.register(GetOrder, GetOrderHandler(repository))
+    bus.register(GetOrderStatistics, GetOrderStatisticsHandler(statistics_repository))
+    if quote_service:
+        bus.register(QuoteCarts, QuoteCartsHandler(quote_service))
+    return bus
@@ -0,0 +1,61 @@
+from domain.order.model.commands import (
+    CancelOrder,
+    CompleteOrderPayment,
+    CreateOrder,
+    PayOrder,
+    RequestOrderPayment,
+)
+from domain.order.model.value_objects import OrderId
+from domain.order.ports.order_service_interface import OrderServiceInterface
+
+
+class CreateOrderHandler:
+    """Handle ``CreateOrder`` through the order service (aggregate store + event store)."""
+
+    def __init__(self, order_service: OrderServiceInterface) -> None:
+        self.order_service = order_service
+
+    async def __call__(self, command: CreateOrder) -> OrderId:
+        return await self.order_service.create_new_order(
+            command.buyer_id, list(command.items), command.destination
+        )
+
+
+class PayOrderHandler:
+    """Handle ``PayOrder`` through the order service."""
+
+    def __init__(self, order_service: OrderServiceInterface) -> None:
+        self.order_service = order_service
+
+    async def __call__(self, command: PayOrder) -> None:
+        await self.order_service.pay_order(command.order_id)
+
+
+class RequestOrderPaymentHandler:
+    """Handle ``RequestOrderPayment`` through the order service."""
+
+    def __init__(self, order_service: OrderServiceInterface) -> None:
+        self.order_service = order_service
+
+    async def __call__(self, command: RequestOrderPayment) -> None:
+        await self.order_service.request_payment(command.order_id)
+
+
+class CompleteOrderPaymentHandler:
+    """Handle ``CompleteOrderPayment`` through the order service."""
+
+    def __init__(self, order_service: OrderServiceInterface) -> None:
+        self.order_service = order_service
+
+    async def __call__(self, command: CompleteOrderPayment) -> None:
+        await self.order_service.complete_payment(command.order_id, command.payment_verified)
+
+
+class CancelOrderHandler:
+    """Handle ``CancelOrder`` through the order service."""
+
+    def __init__(self, order_service: OrderServiceInterface) -> None:
+        self.order_service = order_service
+
+    async def __call__(self, command: CancelOrder) -> None:
+        await self.order_service.cancel_order(command.order_id)
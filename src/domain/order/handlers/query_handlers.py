@@ -0,0 +1,64 @@
+from domain.order.dtos.order_dtos import OrderDetail, SerializedOrderDetail
+from domain.order.model.queries import GetOrder, GetOrderStatistics, GetOrderVersion, QuoteCarts
+from domain.order.model.value_objects import CartQuote, OrderStatistics
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+from domain.order.ports.order_statistics_repository_interface import (
+    OrderStatisticsRepositoryInterface,
+)
+from domain.order.services.cart_quote_service import CartQuoteService
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class GetOrderVersionHandler:
+    """Answer ``GetOrderVersion`` from the version-only lookup of the read store."""
+
+    def __init__(self, repository: OrderRepositoryInterface) -> None:
+        self.repository = repository
+
+    async def __call__(self, query: GetOrderVersion) -> int | None:
+        return await self.repository.version_from_id(query.order_id)
+
+
+class GetOrderHandler:
+    """Answer ``GetOrder`` from cached serialized views, rendering them on a miss."""
+
+    def __init__(self, repository: OrderRepositoryInterface) -> None:
+        self.repository = repository
+
+    async def __call__(self, query: GetOrder) -> SerializedOrderDetail | None:
+        if query.version is not None:
+            if content := await self.repository.view_from_id(query.order_id, query.version):
+                return SerializedOrderDetail(version=query.version, content=content)
+
+        order = await self.repository.from_id(query.order_id)
+        if not order:
+            return None
+
+        content = OrderDetail.from_order(order).model_dump_json()
+        await self.repository.save_view(order.id, order.version, content)
+        await logger.info('Order retrieved', order_id=str(query.order_id))
+        return SerializedOrderDetail(version=order.version, content=content)
+
+
+class GetOrderStatisticsHandler:
+    """Answer ``GetOrderStatistics`` from the statistics projection."""
+
+    def __init__(self, statistics_repository: OrderStatisticsRepositoryInterface) -> None:
+        self.statistics_repository = statistics_repository
+
+    async def __call__(self, query: GetOrderStatistics) -> OrderStatistics:
+        return await self.statistics_repository.get_statistics(
+            day=query.day, buyer_id=query.buyer_id
+        )
+
+
+class QuoteCartsHandler:
+    """Answer ``QuoteCarts`` with the vectorized quote service."""
+
+    def __init__(self, quote_service: CartQuoteService) -> None:
+        self.quote_service = quote_service
+
+    async def __call__(self, query: QuoteCarts) -> list[CartQuote]:
+        return await self.quote_service.quote(query.carts)
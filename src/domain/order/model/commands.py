@@ -0,0 +1,44 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from domain.base.message import Command
+from domain.maps.model.value_objects import Address
+from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
+
+
+@dataclass(frozen=True, slots=True)
+class CreateOrder(Command):
+    """Command to place a new order."""
+
+    buyer_id: BuyerId
+    items: Sequence[OrderItem]
+    destination: Address
+
+
+@dataclass(frozen=True, slots=True)
+class PayOrder(Command):
+    """Command to verify the payment of an order and mark it as paid."""
+
+    order_id: OrderId
+
+
+@dataclass(frozen=True, slots=True)
+class RequestOrderPayment(Command):
+    """Command to mark an order payment-pending and verify it in the background."""
+
+    order_id: OrderId
+
+
+@dataclass(frozen=True, slots=True)
+class CompleteOrderPayment(Command):
+    """Command to apply the outcome of a background payment verification."""
+
+    order_id: OrderId
+    payment_verified: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CancelOrder(Command):
+    """Command to cancel an order."""
+
+    order_id: OrderId
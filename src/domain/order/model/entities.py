@@ -1,12 +1,14 @@
 from collections.abc import Sequence
-from decimal import Decimal
 
 from pydantic import Field
 
 from domain.base.entity import AggregateRoot
+from domain.base.value_object import Money, StoredMoney
+from domain.maps.model.value_objects import Address
 from domain.order.exceptions.order_exceptions import (
     OrderAlreadyCancelledException,
     OrderAlreadyPaidException,
+    OrderPaymentPendingException,
     PaymentNotVerifiedException,
 )
 from domain.order.model.value_objects import BuyerId, OrderId, OrderItem, OrderStatusEnum
@@ -20,9 +22,11 @@ class Order(AggregateRoot):
     id: OrderId = Field(default_factory=make_id_generator('order'))
     buyer_id: BuyerId
     items: Sequence[OrderItem]
-    product_cost: Decimal
-    delivery_cost: Decimal
+    product_cost: StoredMoney
+    delivery_cost: StoredMoney
     payment_id: PaymentId
+    # orders stored before destinations were kept have none and are not routed
+    destination: Address | None = None
     status: OrderStatusEnum = OrderStatusEnum.WAITING
 
     def pay(self, is_payment_verified: bool) -> None:
@@ -34,16 +38,34 @@ class Order(AggregateRoot):
             raise PaymentNotVerifiedException(detail=f"payment {self.payment_id} not verified")
         self.status = OrderStatusEnum.PAID
 
+    def request_payment(self) -> None:
+        """Leave the payment to be verified in the background."""
+        if self.is_cancelled():
+            raise OrderAlreadyCancelledException(detail='order already cancelled')
+        if self.is_paid():
+            raise OrderAlreadyPaidException(detail='order already paid')
+        self.status = OrderStatusEnum.PAYMENT_PENDING
+
+    def reject_payment(self) -> None:
+        """Return a pending order to waiting after its payment failed verification."""
+        self.status = OrderStatusEnum.WAITING
+
     def cancel(self) -> None:
         if self.is_cancelled():
             raise OrderAlreadyCancelledException(detail='order already cancelled')
         if self.is_paid():
             raise OrderAlreadyPaidException(detail='order already paid')
+        if self.is_payment_pending():
+            # the provider may still capture the payment; cancel once it was rejected
+            raise OrderPaymentPendingException(detail='order payment is being verified')
         self.status = OrderStatusEnum.CANCELLED
 
     def is_waiting(self) -> bool:
         return self.status is OrderStatusEnum.WAITING
 
+    def is_payment_pending(self) -> bool:
+        return self.status is OrderStatusEnum.PAYMENT_PENDING
+
     def is_paid(self) -> bool:
         return self.status is OrderStatusEnum.PAID
 
@@ -51,5 +73,5 @@ class Order(AggregateRoot):
         return self.status is OrderStatusEnum.CANCELLED
 
     @property
-    def total_cost(self) -> Decimal:
-        return self.product_cost + self.delivery_cost
+    def total_cost(self) -> Money:
+        return Money(self.product_cost + self.delivery_cost)
@@ -9,6 +9,8 @@ class OrderEventName(str, Enum):
     CREATED = 'payment_order_created'
     CANCELLED = 'payment_order_cancelled'
     PAID = 'payment_order_paid'
+    PAYMENT_REQUESTED = 'payment_order_payment_requested'
+    PAYMENT_REJECTED = 'payment_order_payment_rejected'
 
     def __str__(self) -> str:
         return self.value
@@ -30,3 +32,15 @@ class OrderCancelled(DomainEvent):
     """Event emitted when an order is cancelled."""
 
     event_name: str = OrderEventName.CANCELLED.value
+
+
+class OrderPaymentRequested(DomainEvent):
+    """Event emitted when an order's payment is left to background verification."""
+
+    event_name: str = OrderEventName.PAYMENT_REQUESTED.value
+
+
+class OrderPaymentRejected(DomainEvent):
+    """Event emitted when a pending payment fails verification."""
+
+    event_name: str = OrderEventName.PAYMENT_REJECTED.value
@@ -0,0 +1,39 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from domain.base.message import Query
+from domain.order.model.value_objects import BuyerId, Cart, OrderId
+
+
+@dataclass(frozen=True, slots=True)
+class GetOrderVersion(Query):
+    """Query for the current version of an order."""
+
+    order_id: OrderId
+
+
+@dataclass(frozen=True, slots=True)
+class GetOrder(Query):
+    """Query for the serialized detail view of an order.
+
+    ``version`` is the version the caller already knows about, used to look up a cached view.
+    """
+
+    order_id: OrderId
+    version: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class GetOrderStatistics(Query):
+    """Query for the order statistics read model."""
+
+    day: date | None = None
+    buyer_id: BuyerId | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteCarts(Query):
+    """Query for the product and delivery cost of many carts."""
+
+    carts: Sequence[Cart]
@@ -4,7 +4,8 @@ from typing import Annotated
 
 from pydantic import ValidationInfo, field_validator
 
-from domain.base.value_object import StrIdValueObject, ValueObject
+from domain.base.value_object import Money, StrIdValueObject, ValueObject
+from domain.maps.model.value_objects import Address
 from domain.product.model.value_objects import ProductId
 
 
@@ -12,6 +13,7 @@ class OrderStatusEnum(str, Enum):
     """Enumeration of possible order statuses."""
 
     WAITING = 'waiting'
+    PAYMENT_PENDING = 'payment_pending'
     PAID = 'paid'
     CANCELLED = 'cancelled'
 
@@ -32,15 +34,58 @@ class OrderItem(ValueObject):
     """Value object representing an item in an order."""
 
     product_id: Annotated[str, ProductId]
-    amount: Decimal
+    amount: int
 
     @field_validator('amount')
     @classmethod
-    def validate_amount(cls, value: Decimal, info: ValidationInfo) -> Decimal:
+    def validate_amount(cls, value: int, info: ValidationInfo) -> int:
         if value < 0:
             raise ValueError(f"Expected Order.amount >= 0, got {value}")
         return value
 
 
+class Cart(ValueObject):
+    """Value object representing the items and destination of an order being quoted."""
+
+    items: tuple[OrderItem, ...]
+    destination: Address
+
+
+class CartQuote(ValueObject):
+    """Value object holding the product and delivery cost of a cart."""
+
+    product_cost: Money
+    delivery_cost: Money
+
+    @property
+    def total_cost(self) -> Money:
+        return Money(self.product_cost + self.delivery_cost)
+
+
 class OrderId(StrIdValueObject):
     """Value object representing an order identifier."""
+
+
+class OrderStatusCounters(ValueObject):
+    """Value object holding the number of orders in each status."""
+
+    waiting: int = 0
+    paid: int = 0
+    cancelled: int = 0
+
+
+class OrderRevenueCounters(ValueObject):
+    """Value object holding order counters and paid revenue for a slice of orders."""
+
+    orders: int = 0
+    paid: int = 0
+    cancelled: int = 0
+    revenue: Decimal = Decimal(0)
+
+
+class OrderStatistics(ValueObject):
+    """Value object representing the order statistics read model."""
+
+    status: OrderStatusCounters = OrderStatusCounters()
+    day: OrderRevenueCounters | None = None
+    buyer: OrderRevenueCounters | None = None
@@ -1,7 +1,10 @@
 import abc
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
 from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
 from domain.base.event import DomainEvent
+from domain.base.ports.event_adapter_interface import DomainEventPublisher
 from domain.order.model.entities import Order
 from domain.order.model.value_objects import OrderId
 
@@ -13,9 +16,11 @@ class OrderEventStoreRepositoryInterface(abc.ABC):
         self,
         db_connection: AsyncMongoDBConnectorAdapter,
         collection_name: str,
+        subscribers: Sequence[DomainEventPublisher] = (),
     ):
         self.db_connection = db_connection
         self.collection_name = collection_name
+        self.subscribers = tuple(subscribers)
 
     @abc.abstractmethod
     async def from_id(self, order_id: OrderId) -> list[DomainEvent] | None:
@@ -27,11 +32,28 @@ class OrderEventStoreRepositoryInterface(abc.ABC):
         """Persist a domain event with optimistic concurrency guarantees."""
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def save_many(self, events: Sequence[DomainEvent]) -> None:
+        """Persist the events of distinct aggregates at once."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def get_all_events_by_tracker_id(self, tracker_id: str) -> list[DomainEvent]:
         """Return all events correlated by a tracker id."""
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def get_all_events(self) -> AsyncIterator[DomainEvent]:
+        """Stream every stored event, used to rebuild projections."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_events_between(
+        self, event_name: str, start: datetime, end: datetime
+    ) -> AsyncIterator[DomainEvent]:
+        """Stream the events named ``event_name`` that happened between ``start`` and ``end``."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def get_last_event_version_from_entity(self, order_id: OrderId) -> DomainEvent | None:
         """Return the most recent event for a given aggregate id, or None if not found."""
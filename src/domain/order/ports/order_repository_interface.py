@@ -1,33 +1,70 @@
 import abc
+from collections.abc import AsyncIterator, Sequence
 from typing import Annotated
 
 from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
 from domain.order.model.entities import Order
-from domain.order.model.value_objects import OrderId
+from domain.order.model.value_objects import OrderId, OrderStatusEnum
 from ports.cache_interface import CacheInterface
 
 
 class OrderRepositoryInterface(abc.ABC):
-    """Interface for managing order aggregates."""
+    """Interface for managing order aggregates.
+
+    Lookups of a repository with ``query_reads`` go through the connection's read handle,
+    possibly to a secondary, so it only serves queries; commands load the aggregates they
+    change from the primary.
+    """
 
     def __init__(
         self,
         cache_adapter: CacheInterface,
         db_connection: AsyncMongoDBConnectorAdapter,
         collection_name: str,
+        query_reads: bool = False,
     ):
         self.cache_adapter = cache_adapter
         self.db_connection = db_connection
         self.collection_name = collection_name
+        self.query_reads = query_reads
 
     @abc.abstractmethod
     async def from_id(self, order_id: Annotated[str, OrderId]) -> Order | None:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def version_from_id(self, order_id: Annotated[str, OrderId]) -> int | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def view_from_id(self, order_id: Annotated[str, OrderId], version: int) -> str | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def save_view(self, order_id: Annotated[str, OrderId], version: int, view: str) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def from_status(self, status: OrderStatusEnum, page_size: int = 1_000) -> AsyncIterator[Order]:
+        """Stream the orders currently in ``status``, bypassing the cache."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def save(self, order: Order) -> None:
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def save_many(self, orders: Sequence[Order]) -> list[Order]:
+        """Persist many aggregates at once, returning those that were not outdated."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def claim_payments(
+        self, order_ids: Sequence[OrderId], claimant: str, ttl: float
+    ) -> dict[str, str]:
+        """Claim the payment verification of pending orders; returns who holds each claim."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def delete(self, order_id: Annotated[str, OrderId]) -> None:
         raise NotImplementedError()
@@ -5,7 +5,6 @@ from domain.delivery.ports.cost_calculator_interface import (  # noqa: E501
     DeliveryCostCalculatorAdapterInterface,
 )
 from domain.maps.model.value_objects import Address
-from domain.order.model.entities import Order
 from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
 from domain.order.ports.order_event_store_repository_interface import (
     OrderEventStoreRepositoryInterface,
@@ -13,6 +12,7 @@ from domain.order.ports.order_event_store_repository_interface import (
 from domain.order.ports.order_repository_interface import (
     OrderRepositoryInterface,
 )
+from domain.order.ports.order_unit_of_work_interface import OrderUnitOfWorkInterface
 from domain.payment.ports.payment_adapter_interface import (  # noqa: E501
     PaymentAdapterInterface,
 )
@@ -31,13 +31,25 @@ class OrderServiceInterface(abc.ABC):
         product_service: ProductAdapterInterface,
         delivery_service: DeliveryCostCalculatorAdapterInterface,
         event_store: OrderEventStoreRepositoryInterface,
+        product_timeout: float = 2.0,
+        payment_timeout: float = 5.0,
+        delivery_timeout: float = 2.0,
+        transactional: bool = False,
     ) -> None:
-        """Initialize dependencies for the order service."""
+        """Initialize dependencies and per-call timeouts (seconds) for the order service.
+
+        ``transactional`` commits each command's aggregate and event writes in one Mongo
+        transaction.
+        """
         self.repository = repository
         self.payment_service = payment_service
         self.product_service = product_service
         self.delivery_service = delivery_service
         self.event_store = event_store
+        self.product_timeout = product_timeout
+        self.payment_timeout = payment_timeout
+        self.delivery_timeout = delivery_timeout
+        self.transactional = transactional
 
     @abc.abstractmethod
     async def create_new_order(
@@ -45,7 +57,7 @@ class OrderServiceInterface(abc.ABC):
         buyer_id: Annotated[str, BuyerId],
         items: list[OrderItem],
         destination: Address,
-    ) -> None:
+    ) -> OrderId:
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -53,15 +65,28 @@ class OrderServiceInterface(abc.ABC):
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def cancel_order(self, order_id: Annotated[str, OrderId]) -> None:
+    async def request_payment(self, order_id: Annotated[str, OrderId]) -> None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def _pay_order_tnx(
+    async def complete_payment(
         self, order_id: Annotated[str, OrderId], is_payment_verified: bool
     ) -> None:
         raise NotImplementedError()
 
     @abc.abstractmethod
-    async def get_order_from_id(self, order_id: Annotated[str, OrderId]) -> Order:
+    async def cancel_order(self, order_id: Annotated[str, OrderId]) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def unit_of_work(self) -> OrderUnitOfWorkInterface:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def _pay_order_tnx(
+        self,
+        unit_of_work: OrderUnitOfWorkInterface,
+        order_id: Annotated[str, OrderId],
+        is_payment_verified: bool,
+    ) -> None:
         raise NotImplementedError()
@@ -0,0 +1,33 @@
+import abc
+from datetime import date
+
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from domain.base.ports.event_adapter_interface import DomainEventPublisher
+from domain.order.model.value_objects import BuyerId, OrderStatistics
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+
+
+class OrderStatisticsRepositoryInterface(DomainEventPublisher):
+    """Port for the incrementally maintained order statistics read model."""
+
+    def __init__(
+        self,
+        db_connection: AsyncMongoDBConnectorAdapter,
+        collection_name: str,
+    ):
+        self.db_connection = db_connection
+        self.collection_name = collection_name
+
+    @abc.abstractmethod
+    async def get_statistics(
+        self, day: date | None = None, buyer_id: BuyerId | None = None
+    ) -> OrderStatistics:
+        """Return status counters plus the optional day and buyer slices."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def rebuild(self, event_store: OrderEventStoreRepositoryInterface) -> int:
+        """Recompute the read model from the event store, returning the events applied."""
+        raise NotImplementedError()
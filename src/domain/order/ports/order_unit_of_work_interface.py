@@ -0,0 +1,59 @@
+import abc
+from types import TracebackType
+from typing import Annotated, Self
+
+from domain.base.event import DomainEvent
+from domain.order.model.entities import Order
+from domain.order.model.value_objects import OrderId
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+
+
+class OrderUnitOfWorkInterface(abc.ABC):
+    """Port for a command-scoped unit of work over order aggregates and their events."""
+
+    def __init__(
+        self,
+        repository: OrderRepositoryInterface,
+        event_store: OrderEventStoreRepositoryInterface,
+    ) -> None:
+        self.repository = repository
+        self.event_store = event_store
+
+    @abc.abstractmethod
+    async def get(self, order_id: Annotated[str, OrderId]) -> Order | None:
+        """Return the aggregate, loading it at most once per unit of work."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add(self, order: Order) -> None:
+        """Track a new or changed aggregate to be written at commit."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def record(self, event: DomainEvent) -> None:
+        """Queue an event to be appended at commit, after its aggregate is written."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def commit(self) -> None:
+        """Flush tracked aggregates, then their events."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def rollback(self) -> None:
+        """Discard tracked changes and pending events."""
+        raise NotImplementedError()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.rollback()
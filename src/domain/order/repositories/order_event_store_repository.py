@@ -1,6 +1,15 @@
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime
+from functools import partial
+from typing import Any
+from uuid import UUID
+
 from pydantic import ValidationError
-from pymongo.errors import DuplicateKeyError
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
+from adapters.mongo_db_connector_adapter import after_commit, current_session
+from adapters.mongo_index_adapter import MongoIndex
 from domain.base.event import DomainEvent
 from domain.order.exceptions.order_exceptions import EntityOutdated, PersistenceError
 from domain.order.model.entities import Order
@@ -12,10 +21,27 @@ from utils.logger import get_logger
 
 logger = get_logger()
 
+VERSION_INDEX = 'aggregate_id_version'
+
+
+def _version_taken(error: Mapping[str, Any]) -> bool:
+    """Whether a duplicate key error comes from a concurrent event taking the same version."""
+    return VERSION_INDEX in error.get('errmsg', '')
+
 
 class OrderEventStoreRepository(OrderEventStoreRepositoryInterface):
     """Repository for storing and retrieving order domain events using event sourcing."""
 
+    # the aggregate's events, and its latest one by walking the index backwards; unique,
+    # so of two writers numbering an event from the same latest one only the first stores it
+    INDEXES = (
+        MongoIndex(
+            VERSION_INDEX, (('aggregate.id', ASCENDING), ('version', ASCENDING)), unique=True
+        ),
+        MongoIndex('tracker_id', (('tracker_id', ASCENDING),)),
+        MongoIndex('event_name_datetime', (('event_name', ASCENDING), ('datetime', ASCENDING))),
+    )
+
     async def from_id(self, order_id: OrderId) -> list[DomainEvent] | None:
         """Load all domain events for a given aggregate id."""
         async with self.db_connection.get_connection() as connection:
@@ -48,8 +74,14 @@ class OrderEventStoreRepository(OrderEventStoreRepositoryInterface):
 
         async with self.db_connection.get_connection() as connection:
             try:
-                await connection[self.collection_name].insert_one(event.model_dump(mode='json'))
+                await connection[self.collection_name].insert_one(
+                    event.model_dump(mode='json'), session=current_session()
+                )
             except DuplicateKeyError as exc:
+                if _version_taken(exc.details or {}):
+                    raise EntityOutdated(
+                        detail=f"event version {event.version} of {order.id} already stored"
+                    ) from exc
                 await logger.exception(
                     'Duplicate event detected',
                     event_id=str(event.id),
@@ -57,6 +89,88 @@ class OrderEventStoreRepository(OrderEventStoreRepositoryInterface):
                 )
                 raise PersistenceError(detail=f"duplicate event id {event.id}") from exc
 
+        await after_commit(partial(self._notify_subscribers, event))
+
+    async def save_many(self, events: Sequence[DomainEvent]) -> None:
+        """Persist the events of distinct aggregates in one insert, with the checks of ``save``.
+
+        The latest stored event of every aggregate is read in one aggregation instead of
+        one query per event.
+        """
+        if not events:
+            return
+        order_ids = [str(event.aggregate.id) for event in events]
+        async with self.db_connection.get_connection() as connection:
+            collection = connection[self.collection_name]
+            cursor = collection.aggregate(
+                [
+                    {'$match': {'aggregate.id': {'$in': order_ids}}},
+                    {'$sort': {'version': -1}},
+                    {
+                        '$group': {
+                            '_id': '$aggregate.id',
+                            'version': {'$first': '$version'},
+                            'tracker_id': {'$first': '$tracker_id'},
+                            'aggregate_version': {'$first': '$aggregate.version'},
+                        }
+                    },
+                ],
+                session=current_session(),
+            )
+            latest = {document['_id']: document for document in await cursor.to_list(None)}
+
+            stored = []
+            for order_id, event in zip(order_ids, events):
+                if (last := latest.get(order_id)) is None:
+                    stored.append(event.model_copy(update={'version': 1}))
+                    continue
+                if last['aggregate_version'] > event.aggregate.version:
+                    raise EntityOutdated(
+                        detail=f"incoming version {event.aggregate.version} "
+                        f"is behind current {last['aggregate_version']}"
+                    )
+                stored.append(
+                    event.model_copy(
+                        update={
+                            'version': last['version'] + 1,
+                            'tracker_id': UUID(str(last['tracker_id'])),
+                        }
+                    )
+                )
+
+            try:
+                await collection.insert_many(
+                    [event.model_dump(mode='json') for event in stored],
+                    ordered=False,
+                    session=current_session(),
+                )
+            except BulkWriteError as exc:
+                if any(_version_taken(error) for error in exc.details.get('writeErrors', ())):
+                    raise EntityOutdated(detail='event versions already stored') from exc
+                await logger.exception('Duplicate events detected', collection=self.collection_name)
+                raise PersistenceError(detail='duplicate event ids') from exc
+
+        async def notify_subscribers() -> None:
+            for event in stored:
+                await self._notify_subscribers(event)
+
+        await after_commit(notify_subscribers)
+
+    async def _notify_subscribers(self, event: DomainEvent) -> None:
+        """Forward a stored (and committed) event to subscribers.
+
+        Projections are rebuildable, so failures are only logged.
+        """
+        for subscriber in self.subscribers:
+            try:
+                await subscriber.publish(event)
+            except Exception:
+                await logger.exception(
+                    'Event subscriber failed',
+                    event_id=str(event.id),
+                    subscriber=type(subscriber).__name__,
+                )
+
     async def get_all_events_by_tracker_id(self, tracker_id: str) -> list[DomainEvent]:
         """Retrieve all events correlated by a tracker id."""
         async with self.db_connection.get_connection() as connection:
@@ -64,6 +178,29 @@ class OrderEventStoreRepository(OrderEventStoreRepositoryInterface):
             events_list = await cursor.to_list(length=None)
             return [DomainEvent.parse_obj(event) for event in events_list] if events_list else []
 
+    async def get_all_events(self) -> AsyncIterator[DomainEvent]:
+        """Stream every stored event."""
+        async with self.db_connection.get_connection() as connection:
+            async for event in connection[self.collection_name].find({}):
+                event.pop('_id', None)
+                yield DomainEvent.parse_obj(event)
+
+    async def get_events_between(
+        self, event_name: str, start: datetime, end: datetime
+    ) -> AsyncIterator[DomainEvent]:
+        """Stream the events named ``event_name`` that happened between ``start`` and ``end``.
+
+        Event times are stored as ISO strings, which sort like the times they hold.
+        """
+        query = {
+            'event_name': str(event_name),
+            'datetime': {'$gte': start.isoformat(), '$lt': end.isoformat()},
+        }
+        async with self.db_connection.get_connection() as connection:
+            async for event in connection[self.collection_name].find(query):
+                event.pop('_id', None)
+                yield DomainEvent.parse_obj(event)
+
     async def get_last_event_version_from_entity(self, order_id: OrderId) -> DomainEvent | None:
         """Return the most recent event for a given aggregate id."""
         async with self.db_connection.get_connection() as connection:
@@ -71,6 +208,7 @@ class OrderEventStoreRepository(OrderEventStoreRepositoryInterface):
                 {'aggregate.id': str(order_id)},
                 sort=[('version', -1)],
                 limit=1,
+                session=current_session(),
             )
             events_list = await cursor.to_list(length=None)
             if not events_list:
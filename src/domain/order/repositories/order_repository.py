@@ -1,55 +1,178 @@
-from typing import Annotated
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Any
 
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from adapters.mongo_db_connector_adapter import after_commit, current_session
+from adapters.mongo_index_adapter import MongoIndex
 from domain.order.exceptions.order_exceptions import EntityOutdated, PersistenceError
 from domain.order.model.entities import Order
-from domain.order.model.value_objects import OrderId
+from domain.order.model.value_objects import OrderId, OrderStatusEnum
 from domain.order.ports.order_repository_interface import OrderRepositoryInterface
 from utils.logger import get_logger
 
 logger = get_logger()
 
+DUPLICATE_KEY = 11000
+
 
 class OrderRepository(OrderRepositoryInterface):
     """Repository for storing and retrieving order aggregates."""
 
+    INDEXES = (MongoIndex('status_id', (('status', ASCENDING), ('_id', ASCENDING))),)
+
     def _key(self, order_id: OrderId | str) -> str:
         """Normalize the aggregate identifier."""
         return str(order_id)
 
+    def _version_key(self, order_id: OrderId | str) -> str:
+        """Cache key holding only the aggregate version."""
+        return f"{self._key(order_id)}:version"
+
+    def _view_key(self, order_id: OrderId | str, version: int) -> str:
+        """Cache key holding the serialized read view of one aggregate version."""
+        return f"{self._key(order_id)}:view:{version}"
+
+    def _reader(self) -> AbstractAsyncContextManager[AsyncIOMotorDatabase]:
+        if self.query_reads:
+            return self.db_connection.read_connection()
+        return self.db_connection.get_connection()
+
+    async def _cache_read(self, key: str, data: dict[str, Any]) -> None:
+        """Cache a document read from the database.
+
+        A secondary may lag behind, so what a query read there never replaces an entry
+        a write has already refreshed.
+        """
+        if self.query_reads:
+            await self.cache_adapter.add(key=key, data=data)
+        else:
+            await self.cache_adapter.set(key=key, data=data)
+
     async def from_id(self, order_id: OrderId) -> Order | None:
         """Load an order aggregate by id."""
         key = self._key(order_id)
         if order_result := await self.cache_adapter.get(key=key):
             return Order.model_validate(order_result)
 
-        async with self.db_connection.get_connection() as connection:
-            document = await connection[self.collection_name].find_one({'_id': key})
+        async with self._reader() as connection:
+            document = await connection[self.collection_name].find_one(
+                {'_id': key}, session=current_session()
+            )
             if not document:
                 return None
             order = Order.model_validate(document)
-            await self.cache_adapter.set(key=key, data=order.model_dump(mode='json'))
+            await self._cache_read(key, order.model_dump(mode='json'))
             return order
 
-    async def save(self, order: Order) -> None:
-        """Persist an order aggregate with optimistic concurrency."""
-        key = self._key(order.id)
-        current = await self.from_id(order.id)
-        if current and order.version < current.version:
-            raise EntityOutdated(detail='incoming aggregate version is outdated')
+    async def version_from_id(self, order_id: OrderId) -> int | None:
+        """Return the current aggregate version without loading the full document."""
+        key = self._key(order_id)
+        if cached := await self.cache_adapter.get(key=self._version_key(key)):
+            return int(cached['version'])
 
-        if current:
-            order.version = current.version
+        async with self._reader() as connection:
+            document = await connection[self.collection_name].find_one(
+                {'_id': key}, projection={'_id': 0, 'version': 1}, session=current_session()
+            )
+            if not document:
+                return None
+            await self._cache_read(self._version_key(key), {'version': document['version']})
+            return int(document['version'])
 
-        order.increase_version()
+    async def view_from_id(self, order_id: OrderId, version: int) -> str | None:
+        """Return the cached serialized view of an order version, if any."""
+        return await self.cache_adapter.get_raw(key=self._view_key(order_id, version))
+
+    async def save_view(self, order_id: OrderId, version: int, view: str) -> None:
+        """Cache the serialized view of an order version."""
+        await self.cache_adapter.set_raw(key=self._view_key(order_id, version), value=view)
+
+    async def from_status(
+        self, status: OrderStatusEnum, page_size: int = 1_000
+    ) -> AsyncIterator[Order]:
+        """Stream the orders currently in ``status``.
+
+        Pages of ``page_size`` follow the ``(status, _id)`` index from the last id read,
+        so a long scan holds no server cursor open between pages.
+        """
+        query: dict[str, Any] = {'status': str(status)}
+        while True:
+            async with self.db_connection.get_connection() as connection:
+                cursor = connection[self.collection_name].find(
+                    query, sort=[('_id', ASCENDING)], limit=page_size
+                )
+                documents = await cursor.to_list(length=page_size)
+            for document in documents:
+                yield Order.model_validate(document)
+            if len(documents) < page_size:
+                return
+            query['_id'] = {'$gt': documents[-1]['_id']}
+
+    async def claim_payments(
+        self, order_ids: Sequence[OrderId], claimant: str, ttl: float
+    ) -> dict[str, str]:
+        """Claim the payment verification of pending orders for ``ttl`` seconds.
+
+        One conditional update claims the orders of the batch not claimed by someone else
+        (or whose claim expired); the claim is dropped with the rest of the document when
+        the order is saved. Returns the claimant of every order still pending payment.
+        """
+        now = datetime.now(UTC)
+        pending = {
+            '_id': {'$in': [self._key(order_id) for order_id in order_ids]},
+            'status': str(OrderStatusEnum.PAYMENT_PENDING),
+        }
+        claimable = {
+            '$or': [
+                {'payment_claim.until': {'$not': {'$gt': now}}},
+                {'payment_claim.claimant': claimant},
+            ]
+        }
+        claim = {'claimant': claimant, 'until': now + timedelta(seconds=ttl)}
+        async with self.db_connection.get_connection() as connection:
+            collection = connection[self.collection_name]
+            await collection.update_many(pending | claimable, {'$set': {'payment_claim': claim}})
+            cursor = collection.find(pending, {'payment_claim.claimant': True})
+            documents = await cursor.to_list(None)
+        return {document['_id']: document['payment_claim']['claimant'] for document in documents}
+
+    async def save(self, order: Order) -> None:
+        """Persist an order aggregate with optimistic concurrency.
+
+        The write only applies while the stored version still equals the version the
+        aggregate was loaded with (new aggregates have version 0 and are upserted), so the
+        check and the write are one atomic operation and need no prior read. Inside a
+        transaction the cache is only refreshed once it commits.
+        """
+        key = self._key(order.id)
+        expected_version = order.version
+        document = order.model_dump(mode='json') | {'version': expected_version + 1}
 
         async with self.db_connection.get_connection() as connection:
             try:
                 await connection[self.collection_name].replace_one(
-                    {'_id': key},
-                    order.model_dump(mode='json'),
+                    {'_id': key, 'version': expected_version},
+                    document,
                     upsert=True,
+                    session=current_session(),
                 )
+            except DuplicateKeyError as exc:
+                # the filter missed the stored document: a newer version was saved meanwhile
+                await self.cache_adapter.delete(key=key)
+                raise EntityOutdated(
+                    detail=f"aggregate version {expected_version} is outdated"
+                ) from exc
             except Exception as exc:
+                if isinstance(exc, PyMongoError) and exc.has_error_label(
+                    'TransientTransactionError'
+                ):
+                    raise  # the surrounding transaction retries it
                 await logger.exception(
                     'Failed to persist order',
                     order_id=str(order.id),
@@ -57,11 +180,102 @@ class OrderRepository(OrderRepositoryInterface):
                 )
                 raise PersistenceError(detail='failed to persist order') from exc
 
-        await self.cache_adapter.set(key=key, data=order.model_dump(mode='json'))
+        order.increase_version()
+        await after_commit(lambda: self._refresh_cache(key, document))
+
+    async def save_many(self, orders: Sequence[Order]) -> list[Order]:
+        """Persist many aggregates in one unordered bulk write, with the checks of ``save``.
+
+        Orders whose stored version moved on are skipped rather than raised, so one
+        concurrent change does not fail the batch; the saved orders are returned. A write
+        error aborts a transaction, so inside one the outdated orders are found by reading
+        the stored versions first and left out of the bulk.
+        """
+        if not orders:
+            return []
+        documents = [
+            order.model_dump(mode='json') | {'version': order.version + 1} for order in orders
+        ]
+        session = current_session()
+        async with self.db_connection.get_connection() as connection:
+            collection = connection[self.collection_name]
+            outdated: set[int] = set()
+            if session is not None and session.in_transaction:
+                outdated = await self._outdated(collection, orders)
+            positions = [index for index in range(len(orders)) if index not in outdated]
+            requests = [
+                ReplaceOne(
+                    {'_id': self._key(orders[index].id), 'version': orders[index].version},
+                    documents[index],
+                    upsert=True,
+                )
+                for index in positions
+            ]
+            try:
+                if requests:
+                    await collection.bulk_write(requests, ordered=False, session=session)
+            except BulkWriteError as exc:
+                errors = exc.details.get('writeErrors', [])
+                if any(error['code'] != DUPLICATE_KEY for error in errors):
+                    await logger.exception(
+                        'Failed to persist orders', collection=self.collection_name
+                    )
+                    raise PersistenceError(detail='failed to persist orders') from exc
+                outdated |= {positions[error['index']] for error in errors}
+            except Exception as exc:
+                if isinstance(exc, PyMongoError) and exc.has_error_label(
+                    'TransientTransactionError'
+                ):
+                    raise  # the surrounding transaction retries it
+                await logger.exception('Failed to persist orders', collection=self.collection_name)
+                raise PersistenceError(detail='failed to persist orders') from exc
+
+        saved, refreshed = [], []
+        for index, (order, document) in enumerate(zip(orders, documents)):
+            if index in outdated:
+                await self.cache_adapter.delete(key=self._key(order.id))
+                continue
+            order.increase_version()
+            saved.append(order)
+            refreshed.append((self._key(order.id), document))
+
+        async def refresh_caches() -> None:
+            await asyncio.gather(*(self._refresh_cache(*entry) for entry in refreshed))
+
+        await after_commit(refresh_caches)
+        return saved
+
+    async def _outdated(
+        self, collection: AsyncIOMotorCollection, orders: Sequence[Order]
+    ) -> set[int]:
+        """Positions of the orders whose stored version is not the one they were loaded with."""
+        cursor = collection.find(
+            {'_id': {'$in': [self._key(order.id) for order in orders]}},
+            projection={'version': 1},
+            session=current_session(),
+        )
+        stored = {document['_id']: document['version'] for document in await cursor.to_list(None)}
+        return {
+            index
+            for index, order in enumerate(orders)
+            if stored.get(self._key(order.id), order.version) != order.version
+        }
+
+    async def _refresh_cache(self, key: str, document: dict[str, Any]) -> None:
+        """Cache a freshly written document and drop the view of its previous version."""
+        await self.cache_adapter.set(key=key, data=document)
+        await self.cache_adapter.set(
+            key=self._version_key(key), data={'version': document['version']}
+        )
+        if previous_version := document['version'] - 1:
+            await self.cache_adapter.delete(key=self._view_key(key, previous_version))
 
     async def delete(self, order_id: Annotated[str, OrderId]) -> None:
         """Delete an order aggregate by id."""
         key = self._key(order_id)
+        if (version := await self.version_from_id(key)) is not None:
+            await self.cache_adapter.delete(key=self._view_key(key, version))
         await self.cache_adapter.delete(key=key)
+        await self.cache_adapter.delete(key=self._version_key(key))
         async with self.db_connection.get_connection() as connection:
             await connection[self.collection_name].delete_one({'_id': key})
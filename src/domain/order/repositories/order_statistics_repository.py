@@ -0,0 +1,156 @@
+from collections import Counter, defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from bson.decimal128 import Decimal128
+from pymongo import UpdateOne
+
+from adapters.mongo_db_connector_adapter import current_session
+from domain.base.event import DomainEvent
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderEventName
+from domain.order.model.value_objects import (
+    BuyerId,
+    OrderRevenueCounters,
+    OrderStatistics,
+    OrderStatusCounters,
+)
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+from domain.order.ports.order_statistics_repository_interface import (
+    OrderStatisticsRepositoryInterface,
+)
+from utils.logger import get_logger
+
+logger = get_logger()
+
+STATUS_DOCUMENT_ID = 'status'
+
+Increments = dict[str, dict[str, int | Decimal]]
+
+
+def day_document_id(day: date) -> str:
+    """Identifier of the per-day counters document."""
+    return f"day:{day.isoformat()}"
+
+
+def buyer_document_id(buyer_id: BuyerId | str) -> str:
+    """Identifier of the per-buyer counters document."""
+    return f"buyer:{buyer_id}"
+
+
+def order_statistics_increments(event: DomainEvent) -> Increments:
+    """Translate an order event into the counter increments of each statistics document."""
+    order = Order.model_validate(event.aggregate)
+    day_id = day_document_id(event.datetime.date())
+    buyer_id = buyer_document_id(order.buyer_id)
+
+    if event.event_name == OrderEventName.CREATED:
+        return {
+            STATUS_DOCUMENT_ID: {'waiting': 1},
+            day_id: {'orders': 1},
+            buyer_id: {'orders': 1},
+        }
+    if event.event_name == OrderEventName.PAID:
+        return {
+            STATUS_DOCUMENT_ID: {'waiting': -1, 'paid': 1},
+            day_id: {'paid': 1, 'revenue': order.total_cost.to_decimal()},
+            buyer_id: {'paid': 1, 'revenue': order.total_cost.to_decimal()},
+        }
+    if event.event_name == OrderEventName.CANCELLED:
+        return {
+            STATUS_DOCUMENT_ID: {'waiting': -1, 'cancelled': 1},
+            day_id: {'cancelled': 1},
+            buyer_id: {'cancelled': 1},
+        }
+    return {}
+
+
+def _to_bson(fields: dict[str, Any]) -> dict[str, Any]:
+    return {
+        name: Decimal128(value) if isinstance(value, Decimal) else value
+        for name, value in fields.items()
+    }
+
+
+def _from_bson(document: dict[str, Any]) -> dict[str, Any]:
+    return {
+        name: value.to_decimal() if isinstance(value, Decimal128) else value
+        for name, value in document.items()
+        if name != '_id'
+    }
+
+
+class OrderStatisticsRepository(OrderStatisticsRepositoryInterface):
+    """Order statistics projection kept up to date with atomic ``$inc`` counters."""
+
+    async def publish(self, event: DomainEvent) -> None:
+        """Apply a stored order event to the counters in a single bulk write."""
+        increments = order_statistics_increments(event)
+        if not increments:
+            return
+
+        async with self.db_connection.get_connection() as connection:
+            await connection[self.collection_name].bulk_write(
+                [
+                    UpdateOne({'_id': document_id}, {'$inc': _to_bson(fields)}, upsert=True)
+                    for document_id, fields in increments.items()
+                ],
+                ordered=False,
+            )
+
+    async def get_statistics(
+        self, day: date | None = None, buyer_id: BuyerId | None = None
+    ) -> OrderStatistics:
+        """Read the status document plus the requested day/buyer documents in one query."""
+        document_ids = [STATUS_DOCUMENT_ID]
+        if day:
+            document_ids.append(day_document_id(day))
+        if buyer_id:
+            document_ids.append(buyer_document_id(buyer_id))
+
+        # the projection is eventually consistent anyway, so it is read where the
+        # read preference points
+        async with self.db_connection.read_connection() as connection:
+            cursor = connection[self.collection_name].find(
+                {'_id': {'$in': document_ids}}, session=current_session()
+            )
+            documents = {
+                document['_id']: _from_bson(document)
+                for document in await cursor.to_list(length=len(document_ids))
+            }
+
+        return OrderStatistics(
+            status=OrderStatusCounters(**documents.get(STATUS_DOCUMENT_ID, {})),
+            day=OrderRevenueCounters(**documents.get(day_document_id(day), {})) if day else None,
+            buyer=(
+                OrderRevenueCounters(**documents.get(buyer_document_id(buyer_id), {}))
+                if buyer_id
+                else None
+            ),
+        )
+
+    async def rebuild(self, event_store: OrderEventStoreRepositoryInterface) -> int:
+        """Recompute every counter from the event store and replace the read model."""
+        totals: defaultdict[str, Counter] = defaultdict(Counter)
+        applied = 0
+        async for event in event_store.get_all_events():
+            for document_id, fields in order_statistics_increments(event).items():
+                totals[document_id].update(fields)
+            applied += 1
+
+        async with self.db_connection.get_connection() as connection:
+            collection = connection[self.collection_name]
+            await collection.delete_many({})
+            if totals:
+                await collection.insert_many(
+                    [
+                        {'_id': document_id, **_to_bson(dict(fields))}
+                        for document_id, fields in totals.items()
+                    ]
+                )
+
+        await logger.info('Order statistics rebuilt', events=applied, documents=len(totals))
+        return applied
@@ -0,0 +1,95 @@
+from collections.abc import Awaitable, Callable
+from typing import Annotated, TypeVar
+
+from adapters.mongo_db_connector_adapter import MongoDBAdapterException
+from domain.base.event import DomainEvent
+from domain.order.model.entities import Order
+from domain.order.model.value_objects import OrderId
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+from domain.order.ports.order_unit_of_work_interface import OrderUnitOfWorkInterface
+
+T = TypeVar('T')
+
+
+async def run_in_order_transaction(
+    repository: OrderRepositoryInterface,
+    event_store: OrderEventStoreRepositoryInterface,
+    callback: Callable[[], Awaitable[T]],
+) -> T:
+    """Run the aggregate and event writes of ``callback`` in one Mongo transaction."""
+    connection = repository.db_connection
+    if not connection.shares_cluster_with(event_store.db_connection):
+        raise MongoDBAdapterException(
+            'Order transactions need the aggregates and events on the same cluster.'
+        )
+    return await connection.run_in_transaction(callback)
+
+
+class OrderUnitOfWork(OrderUnitOfWorkInterface):
+    """Unit of work keeping an identity map of loaded orders for one command.
+
+    With ``transactional`` the aggregate and event writes commit in one Mongo transaction,
+    so a crash can no longer leave an aggregate ahead of its events. Without it (the fast
+    path) they are written in order, aggregate first, saving the transaction round trips.
+    """
+
+    def __init__(
+        self,
+        repository: OrderRepositoryInterface,
+        event_store: OrderEventStoreRepositoryInterface,
+        transactional: bool = False,
+    ) -> None:
+        super().__init__(repository, event_store)
+        self.transactional = transactional
+        self.identity_map: dict[str, Order] = {}
+        self.dirty: dict[str, Order] = {}
+        self.events: list[DomainEvent] = []
+
+    async def get(self, order_id: Annotated[str, OrderId]) -> Order | None:
+        key = str(order_id)
+        if key not in self.identity_map:
+            if not (order := await self.repository.from_id(key)):
+                return None
+            self.identity_map[key] = order
+        return self.identity_map[key]
+
+    def add(self, order: Order) -> None:
+        key = str(order.id)
+        self.identity_map[key] = order
+        self.dirty[key] = order
+
+    def record(self, event: DomainEvent) -> None:
+        self.events.append(event)
+
+    async def commit(self) -> None:
+        if self.transactional:
+            await self._commit_in_transaction()
+        else:
+            await self._flush()
+        self.dirty.clear()
+        self.events.clear()
+
+    async def _flush(self) -> None:
+        # events reference their aggregate, so they are appended with the saved version
+        for order in self.dirty.values():
+            await self.repository.save(order)
+        for event in self.events:
+            await self.event_store.save(event)
+
+    async def _commit_in_transaction(self) -> None:
+        loaded_versions = {key: order.version for key, order in self.dirty.items()}
+
+        async def flush() -> None:
+            # a retried attempt must write from the versions the aggregates were loaded with
+            for key, order in self.dirty.items():
+                order.version = loaded_versions[key]
+            await self._flush()
+
+        await run_in_order_transaction(self.repository, self.event_store, flush)
+
+    def rollback(self) -> None:
+        self.dirty.clear()
+        self.events.clear()
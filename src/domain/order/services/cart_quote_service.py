@@ -0,0 +1,55 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from domain.base.value_object import Money
+from domain.delivery.ports.cost_calculator_interface import DeliveryCostCalculatorAdapterInterface
+from domain.order.model.value_objects import Cart, CartQuote
+from domain.product.ports.product_adapter_interface import ProductAdapterInterface
+
+
+class CartQuoteService:
+    """Quote the product and delivery cost of many carts in one pass.
+
+    Prices are resolved once per distinct product and totals summed with array
+    operations; delivery costs come from one ``calculate_costs`` batch, which looks up
+    each distinct destination at most once. Prices are integer cents, so the array sums
+    are exact and each quote equals what ``total_price`` and ``calculate_cost`` return
+    for that cart.
+    """
+
+    def __init__(
+        self,
+        product_service: ProductAdapterInterface,
+        delivery_service: DeliveryCostCalculatorAdapterInterface,
+    ) -> None:
+        self.product_service = product_service
+        self.delivery_service = delivery_service
+
+    async def quote(self, carts: Sequence[Cart]) -> list[CartQuote]:
+        if not carts:
+            return []
+        product_ids = sorted({item.product_id for cart in carts for item in cart.items})
+        prices = await self.product_service.prices(product_ids)
+
+        unit_prices = np.array([prices[product_id] for product_id in product_ids], dtype=np.int64)
+        position = {product_id: index for index, product_id in enumerate(product_ids)}
+        items = [item for cart in carts for item in cart.items]
+        product_index = np.fromiter(
+            (position[item.product_id] for item in items), dtype=np.intp, count=len(items)
+        )
+        counts = np.fromiter((item.amount for item in items), dtype=np.int64, count=len(items))
+        lengths = np.fromiter((len(cart.items) for cart in carts), dtype=np.int64, count=len(carts))
+
+        # per-cart sums as differences of one running total; empty carts sum to zero
+        running = np.concatenate(([0], np.cumsum(unit_prices[product_index] * counts)))
+        ends = np.cumsum(lengths)
+        totals = [Money(total) for total in (running[ends] - running[ends - lengths]).tolist()]
+
+        delivery = await self.delivery_service.calculate_costs(
+            totals, [cart.destination for cart in carts]
+        )
+        return [
+            CartQuote(product_cost=total, delivery_cost=cost)
+            for total, cost in zip(totals, delivery)
+        ]
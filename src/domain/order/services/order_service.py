@@ -1,14 +1,28 @@
-from typing import Annotated
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, TypeVar
 
 from domain.maps.model.value_objects import Address
+from domain.order.exceptions.order_exceptions import ExternalServiceTimeout
 from domain.order.model.entities import Order
-from domain.order.model.events import OrderCancelled, OrderCreated, OrderPaid
+from domain.order.model.events import (
+    OrderCancelled,
+    OrderCreated,
+    OrderPaid,
+    OrderPaymentRejected,
+    OrderPaymentRequested,
+)
 from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
 from domain.order.ports.order_service_interface import OrderServiceInterface
+from domain.order.ports.order_unit_of_work_interface import OrderUnitOfWorkInterface
+from domain.order.repositories.order_unit_of_work import OrderUnitOfWork
+from utils.deadline import deadline_after
 from utils.logger import get_logger
 
 logger = get_logger()
 
+T = TypeVar('T')
+
 
 class OrderService(OrderServiceInterface):
     """Application service responsible for orchestrating order operations."""
@@ -19,21 +33,51 @@ class OrderService(OrderServiceInterface):
         items: list[OrderItem],
         destination: Address,
     ) -> OrderId:
-        """Create a new order with payment, product and delivery costs, then publish an event."""
-        product_counts = [(item.product_id, int(item.amount)) for item in items]
-        total_product_cost = await self.product_service.total_price(product_counts)
-        payment_id = await self.payment_service.new_payment(total_product_cost)
-        delivery_cost = await self.delivery_service.calculate_cost(total_product_cost, destination)
+        """Create a new order with payment, product and delivery costs, then publish an event.
+
+        Payment creation and delivery costing only depend on the product total, so they
+        run concurrently; if either fails or times out the other one is cancelled.
+        """
+        product_counts = [(item.product_id, item.amount) for item in items]
+        total_product_cost = await self._call(
+            'product', self.product_timeout, self.product_service.total_price, product_counts
+        )
+        try:
+            async with asyncio.TaskGroup() as group:
+                payment = group.create_task(
+                    self._call(
+                        'payment',
+                        self.payment_timeout,
+                        self.payment_service.new_payment,
+                        total_product_cost,
+                    )
+                )
+                delivery = group.create_task(
+                    self._call(
+                        'delivery',
+                        self.delivery_timeout,
+                        self.delivery_service.calculate_cost,
+                        total_product_cost,
+                        destination,
+                    )
+                )
+        except ExceptionGroup as group_error:
+            # surface the original failure so the HTTP error mapping keeps working
+            raise group_error.exceptions[0] from None
+        payment_id, delivery_cost = payment.result(), delivery.result()
 
         order = Order(
             buyer_id=buyer_id,
             items=items,
-            product_cost=float(total_product_cost),
-            delivery_cost=float(delivery_cost),
+            product_cost=total_product_cost,
+            delivery_cost=delivery_cost,
             payment_id=payment_id,
+            destination=destination,
         )
-        await self.repository.save(order)
-        await self.event_store.save(OrderCreated(aggregate=order))
+        async with self.unit_of_work() as unit_of_work:
+            unit_of_work.add(order)
+            unit_of_work.record(OrderCreated(aggregate=order))
+            await unit_of_work.commit()
         await logger.info(
             'Order created',
             order_id=str(order.id),
@@ -42,23 +86,88 @@ class OrderService(OrderServiceInterface):
         )
         return OrderId(order.id)
 
+    async def _call(
+        self, service: str, timeout: float, call: Callable[..., Awaitable[T]], *args: Any
+    ) -> T:
+        """Await an external call, failing with ExternalServiceTimeout after ``timeout``.
+
+        The call also sees ``timeout`` as its deadline, so outbound HTTP attempts and
+        retries are sized to the time it has left.
+        """
+        try:
+            with deadline_after(timeout):
+                async with asyncio.timeout(timeout):
+                    return await call(*args)
+        except TimeoutError as exc:
+            await logger.warning('External call timed out', service=service, timeout=timeout)
+            raise ExternalServiceTimeout(
+                detail=f"{service} service did not answer within {timeout}s"
+            ) from exc
+
+    def unit_of_work(self) -> OrderUnitOfWorkInterface:
+        """Start a unit of work over the aggregate store and the event store."""
+        return OrderUnitOfWork(self.repository, self.event_store, self.transactional)
+
     async def pay_order(self, order_id: Annotated[str, OrderId]) -> None:
         """Verify payment and mark the order as paid, then publish an event."""
-        order = await self.repository.from_id(order_id=order_id)
-        is_payment_verified = await self.payment_service.verify_payment(payment_id=order.payment_id)
-        await self._pay_order_tnx(order_id, is_payment_verified)
+        async with self.unit_of_work() as unit_of_work:
+            order = await unit_of_work.get(order_id)
+            is_payment_verified = await self.payment_service.verify_payment(
+                payment_id=order.payment_id
+            )
+            await self._pay_order_tnx(unit_of_work, order_id, is_payment_verified)
+            await unit_of_work.commit()
         await logger.info(
             'Order paid',
             order_id=str(order_id),
             payment_verified=is_payment_verified,
         )
 
+    async def request_payment(self, order_id: Annotated[str, OrderId]) -> None:
+        """Mark the order payment-pending; verification happens in the background."""
+        async with self.unit_of_work() as unit_of_work:
+            order = await unit_of_work.get(order_id)
+            if order.is_payment_pending():
+                return  # already queued for verification
+            order.request_payment()
+            unit_of_work.add(order)
+            unit_of_work.record(OrderPaymentRequested(aggregate=order))
+            await unit_of_work.commit()
+        await logger.info('Order payment requested', order_id=str(order_id))
+
+    async def complete_payment(
+        self, order_id: Annotated[str, OrderId], is_payment_verified: bool
+    ) -> None:
+        """Pay a pending order, or return it to waiting when verification failed."""
+        async with self.unit_of_work() as unit_of_work:
+            order = await unit_of_work.get(order_id)
+            if not order.is_payment_pending():
+                # e.g. completed by another worker or by the reconciliation command
+                await logger.warning(
+                    'Payment outcome ignored', order_id=str(order_id), status=order.status
+                )
+                return
+            if is_payment_verified:
+                await self._pay_order_tnx(unit_of_work, order_id, is_payment_verified)
+            else:
+                order.reject_payment()
+                unit_of_work.add(order)
+                unit_of_work.record(OrderPaymentRejected(aggregate=order))
+            await unit_of_work.commit()
+        await logger.info(
+            'Order payment completed',
+            order_id=str(order_id),
+            payment_verified=is_payment_verified,
+        )
+
     async def cancel_order(self, order_id: Annotated[str, OrderId]) -> None:
         """Cancel an order and publish an event."""
-        order = await self.repository.from_id(order_id)
-        order.cancel()
-        await self.repository.save(order)
-        await self.event_store.save(OrderCancelled(aggregate=order))
+        async with self.unit_of_work() as unit_of_work:
+            order = await unit_of_work.get(order_id)
+            order.cancel()
+            unit_of_work.add(order)
+            unit_of_work.record(OrderCancelled(aggregate=order))
+            await unit_of_work.commit()
         await logger.info(
             'Order cancelled',
             order_id=str(order_id),
@@ -66,16 +175,13 @@ class OrderService(OrderServiceInterface):
         )
 
     async def _pay_order_tnx(
-        self, order_id: Annotated[str, OrderId], is_payment_verified: bool
+        self,
+        unit_of_work: OrderUnitOfWorkInterface,
+        order_id: Annotated[str, OrderId],
+        is_payment_verified: bool,
     ) -> None:
-        """Transaction helper for paying an order and publishing an event."""
-        order = await self.repository.from_id(order_id=order_id)
+        """Transaction helper marking the order paid and queueing its event."""
+        order = await unit_of_work.get(order_id)
         order.pay(is_payment_verified=is_payment_verified)
-        await self.repository.save(order)
-        await self.event_store.save(OrderPaid(aggregate=order))
-
-    async def get_order_from_id(self, order_id: Annotated[str, OrderId]) -> Order:
-        """Retrieve an order by its identifier."""
-        order = await self.repository.from_id(order_id)
-        await logger.info('Order retrieved', order_id=order_id)
-        return order
+        unit_of_work.add(order)
+        unit_of_work.record(OrderPaid(aggregate=order))
@@ -0,0 +1,193 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+from domain.base.bus import CommandBus
+from domain.base.event import DomainEvent
+from domain.base.ports.event_adapter_interface import DomainEventPublisher
+from domain.order.model.commands import CompleteOrderPayment
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderEventName
+from domain.order.model.value_objects import OrderId, OrderStatusEnum
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+from domain.payment.model.value_objects import PaymentId
+from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class PendingPayment:
+    """Order whose payment awaits verification."""
+
+    order_id: OrderId
+    payment_id: PaymentId
+
+
+class PaymentRequestQueue(DomainEventPublisher):
+    """Event store subscriber queueing the orders whose payment was requested."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[PendingPayment] = asyncio.Queue()
+
+    async def publish(self, event: DomainEvent) -> None:
+        if event.event_name == OrderEventName.PAYMENT_REQUESTED:
+            self.put(Order.model_validate(event.aggregate))
+
+    def put(self, order: Order) -> None:
+        self.queue.put_nowait(PendingPayment(OrderId(order.id), order.payment_id))
+
+
+class PaymentProcessManager:
+    """Verify requested payments in batches on a pool of workers.
+
+    Each worker takes up to ``batch_size`` requests (waiting at most ``batch_wait``
+    seconds for a batch to fill), asks the provider about all of them in one
+    ``verify_payments`` call and dispatches one ``CompleteOrderPayment`` per outcome.
+    Verifications that fail or time out are queued again after ``retry_delay``; orders
+    left pending by a restart are reloaded from the aggregate store on ``start``.
+
+    Every process reloads every pending order, so a batch is claimed in the aggregate
+    store for ``claim_ttl`` seconds before the provider is asked: orders claimed by
+    another process are looked at again once that claim expires, in case the process
+    died, and orders no longer pending are dropped.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        requests: PaymentRequestQueue,
+        command_bus: CommandBus,
+        payment_service: PaymentAdapterInterface,
+        repository: OrderRepositoryInterface,
+        workers: int = 4,
+        batch_size: int = 50,
+        batch_wait: float = 0.05,
+        verify_timeout: float = 5.0,
+        retry_delay: float = 5.0,
+        claim_ttl: float = 60.0,
+    ) -> None:
+        self.requests = requests
+        self.command_bus = command_bus
+        self.payment_service = payment_service
+        self.repository = repository
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.verify_timeout = verify_timeout
+        self.retry_delay = retry_delay
+        self.claim_ttl = claim_ttl
+        self.claimant = uuid.uuid4().hex
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Requeue orders left pending, then start the workers."""
+        async for order in self.repository.from_status(OrderStatusEnum.PAYMENT_PENDING):
+            self.requests.put(order)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"payment-worker-{index}")
+            for index in range(self.workers)
+        ]
+        await logger.info(
+            'Payment process manager started',
+            workers=self.workers,
+            pending=self.requests.queue.qsize(),
+        )
+
+    async def stop(self) -> None:
+        """Cancel the workers; unfinished requests stay pending and are recovered on start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def next_batch(self) -> list[PendingPayment]:
+        """Wait for one request, then take whatever else arrives within ``batch_wait``."""
+        queue = self.requests.queue
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.batch_wait
+        try:
+            async with asyncio.timeout_at(deadline):
+                while len(batch) < self.batch_size:
+                    batch.append(await queue.get())
+        except TimeoutError:
+            pass
+        return batch
+
+    async def process(self, batch: list[PendingPayment]) -> None:
+        """Verify a batch of payments and apply each outcome to its order."""
+        if not (batch := await self._claim(batch)):
+            return
+        metrics.observe('payment_verification_batch_size', len(batch))
+        outcomes = await self._verify(batch)
+        for pending in batch:
+            if (verified := outcomes.get(pending.payment_id)) is None:
+                self._retry(pending, self.retry_delay)
+                continue
+            try:
+                await self.command_bus.dispatch(
+                    CompleteOrderPayment(order_id=pending.order_id, payment_verified=verified)
+                )
+            except Exception:
+                await logger.exception('Payment completion failed', order_id=str(pending.order_id))
+
+    async def _claim(self, batch: list[PendingPayment]) -> list[PendingPayment]:
+        """The requests of ``batch`` this process holds the claim of."""
+        try:
+            claimants = await self.repository.claim_payments(
+                [pending.order_id for pending in batch], self.claimant, self.claim_ttl
+            )
+        except Exception as exc:
+            await logger.warning(
+                'Payment claim failed, retrying later', size=len(batch), error=type(exc).__name__
+            )
+            for pending in batch:
+                self._retry(pending, self.retry_delay)
+            return []
+        claimed = []
+        for pending in batch:
+            claimant = claimants.get(str(pending.order_id))
+            if claimant == self.claimant:
+                claimed.append(pending)
+            elif claimant is not None:
+                self._retry(pending, self.claim_ttl)
+        metrics.increment('payment_claims_total', len(claimed), outcome='claimed')
+        metrics.increment('payment_claims_total', len(batch) - len(claimed), outcome='skipped')
+        return claimed
+
+    def _retry(self, pending: PendingPayment, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self.requests.queue.put_nowait, pending)
+
+    async def _verify(self, batch: list[PendingPayment]) -> dict[PaymentId, bool]:
+        """Outcomes of one batch status call; empty when it failed or timed out."""
+        try:
+            async with asyncio.timeout(self.verify_timeout):
+                outcomes = await self.payment_service.verify_payments(
+                    [pending.payment_id for pending in batch]
+                )
+        except Exception as exc:
+            metrics.increment('payment_verifications_total', len(batch), outcome='error')
+            await logger.warning(
+                'Payment verification failed, retrying later',
+                size=len(batch),
+                error=type(exc).__name__,
+            )
+            return {}
+        verified = sum(outcomes.values())
+        metrics.increment('payment_verifications_total', verified, outcome='verified')
+        metrics.increment(
+            'payment_verifications_total', len(outcomes) - verified, outcome='rejected'
+        )
+        return outcomes
+
+    async def _work(self) -> None:
+        while True:
+            batch = await self.next_batch()
+            try:
+                await self.process(batch)
+            except Exception:
+                await logger.exception('Payment batch failed', size=len(batch))
+            finally:
+                for _ in batch:
+                    self.requests.queue.task_done()
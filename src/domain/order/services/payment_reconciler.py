@@ -0,0 +1,134 @@
+import asyncio
+from dataclasses import dataclass
+
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderPaid
+from domain.order.model.value_objects import OrderStatusEnum
+from domain.order.ports.order_event_store_repository_interface import (
+    OrderEventStoreRepositoryInterface,
+)
+from domain.order.ports.order_repository_interface import OrderRepositoryInterface
+from domain.order.repositories.order_unit_of_work import run_in_order_transaction
+from domain.payment.model.value_objects import PaymentId
+from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger()
+
+
+@dataclass
+class ReconciliationReport:
+    """Outcome counts of one reconciliation run."""
+
+    scanned: int = 0
+    paid: int = 0
+    unpaid: int = 0
+    outdated: int = 0  # changed by a command meanwhile; left to the next run
+    failed: int = 0
+
+
+class PaymentReconciler:
+    """Pay the waiting orders whose payment the provider reports as completed.
+
+    Waiting orders are scanned through the status index in chunks of ``chunk_size``,
+    the provider's batch limit. Up to ``concurrency`` chunks are verified at a time,
+    each with one ``verify_payments`` call, and the verified orders of a chunk are paid
+    with one bulk aggregate write followed by one bulk event insert. With
+    ``transactional`` both commit in one transaction, as commands do, so a failed event
+    insert leaves no order paid without its event.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        repository: OrderRepositoryInterface,
+        event_store: OrderEventStoreRepositoryInterface,
+        payment_service: PaymentAdapterInterface,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        verify_timeout: float = 5.0,
+        transactional: bool = False,
+    ) -> None:
+        self.repository = repository
+        self.event_store = event_store
+        self.payment_service = payment_service
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.verify_timeout = verify_timeout
+        self.transactional = transactional
+
+    async def run(self) -> ReconciliationReport:
+        report = ReconciliationReport()
+        slots = asyncio.Semaphore(self.concurrency)
+        async with asyncio.TaskGroup() as group:
+            chunk: list[Order] = []
+            async for order in self.repository.from_status(
+                OrderStatusEnum.WAITING, page_size=self.chunk_size * self.concurrency
+            ):
+                chunk.append(order)
+                if len(chunk) == self.chunk_size:
+                    await slots.acquire()
+                    group.create_task(self._reconcile(chunk, report, slots))
+                    chunk = []
+            if chunk:
+                await slots.acquire()
+                group.create_task(self._reconcile(chunk, report, slots))
+        await logger.info('Payments reconciled', **vars(report))
+        return report
+
+    async def _reconcile(
+        self, chunk: list[Order], report: ReconciliationReport, slots: asyncio.Semaphore
+    ) -> None:
+        report.scanned += len(chunk)
+        unsettled = len(chunk)
+        try:
+            if (outcomes := await self._verify(chunk)) is None:
+                return
+            verified = [order for order in chunk if outcomes.get(order.payment_id)]
+            self._count(report, 'unpaid', len(chunk) - len(verified))
+            unsettled = len(verified)
+            for order in verified:
+                order.pay(is_payment_verified=True)
+            saved = await self._save(verified)
+            self._count(report, 'paid', len(saved))
+            self._count(report, 'outdated', len(verified) - len(saved))
+            unsettled = 0
+        except Exception:
+            await logger.exception('Payment reconciliation chunk failed', size=len(chunk))
+        finally:
+            if unsettled:
+                self._count(report, 'failed', unsettled)
+            slots.release()
+
+    async def _save(self, orders: list[Order]) -> list[Order]:
+        """Write the paid orders and their events; return the orders that were saved."""
+        loaded_versions = [order.version for order in orders]
+
+        async def write() -> list[Order]:
+            # a retried transaction must write from the versions the orders were loaded with
+            for order, version in zip(orders, loaded_versions):
+                order.version = version
+            saved = await self.repository.save_many(orders)
+            await self.event_store.save_many([OrderPaid(aggregate=order) for order in saved])
+            return saved
+
+        if self.transactional:
+            return await run_in_order_transaction(self.repository, self.event_store, write)
+        return await write()
+
+    async def _verify(self, chunk: list[Order]) -> dict[PaymentId, bool] | None:
+        try:
+            async with asyncio.timeout(self.verify_timeout):
+                return await self.payment_service.verify_payments(
+                    [order.payment_id for order in chunk]
+                )
+        except Exception as exc:
+            await logger.warning(
+                'Payment verification failed', size=len(chunk), error=type(exc).__name__
+            )
+            return None
+
+    @staticmethod
+    def _count(report: ReconciliationReport, outcome: str, value: int) -> None:
+        setattr(report, outcome, getattr(report, outcome) + value)
+        metrics.increment('payment_reconciliation_orders_total', value, outcome=outcome)
@@ -1,5 +1,7 @@
 import uuid
+from collections.abc import Sequence
 
+from domain.base.value_object import Money
 from domain.payment.model.value_objects import PaymentId
 from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
 
@@ -7,10 +9,14 @@ from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterfa
 class PayPalPaymentAdapter(PaymentAdapterInterface):
     """Mock PayPal adapter for demonstration purposes."""
 
-    async def new_payment(self, total_price: float) -> PaymentId:
+    async def new_payment(self, total_price: Money) -> PaymentId:
         """Simulate creation of a new PayPal payment."""
         return PaymentId(str(uuid.uuid4()))
 
     async def verify_payment(self, payment_id: PaymentId) -> bool:
         """Simulate verification of a PayPal payment."""
         return True
+
+    async def verify_payments(self, payment_ids: Sequence[PaymentId]) -> dict[PaymentId, bool]:
+        """Simulate one call to the batch payment status API."""
+        return dict.fromkeys(payment_ids, True)
@@ -0,0 +1,31 @@
+from collections.abc import Sequence
+
+from domain.base.resilience import Resilience
+from domain.base.value_object import Money
+from domain.payment.model.value_objects import PaymentId
+from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
+
+
+class ResilientPaymentAdapter(PaymentAdapterInterface):
+    """Call another payment adapter behind a circuit breaker.
+
+    Verifications are hedged; payment creation is not, since a second attempt would
+    create a second payment. There is no fallback: nothing else can take a payment.
+    """
+
+    def __init__(self, payment_service: PaymentAdapterInterface, resilience: Resilience) -> None:
+        self.payment_service = payment_service
+        self.resilience = resilience
+
+    async def new_payment(self, total_price: Money) -> PaymentId:
+        return await self.resilience.call(self.payment_service.new_payment, total_price)
+
+    async def verify_payment(self, payment_id: PaymentId) -> bool:
+        return await self.resilience.call(
+            self.payment_service.verify_payment, payment_id, hedge=True
+        )
+
+    async def verify_payments(self, payment_ids: Sequence[PaymentId]) -> dict[PaymentId, bool]:
+        return await self.resilience.call(
+            self.payment_service.verify_payments, payment_ids, hedge=True
+        )
@@ -0,0 +1,41 @@
+import asyncio
+import itertools
+from collections.abc import Sequence
+
+from domain.base.value_object import Money
+from domain.payment.model.value_objects import PaymentId
+from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
+
+
+class StubPaymentAdapter(PaymentAdapterInterface):
+    """In-memory payment provider for tests and local runs.
+
+    Payments start unsettled and verify once ``settle`` marks them paid. Batch calls
+    take at most ``max_batch_size`` ids, like real batch status APIs, each answered
+    after ``latency`` seconds; their sizes are kept in ``batches``.
+    """
+
+    def __init__(self, max_batch_size: int = 100, latency: float = 0.0) -> None:
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.payments: dict[PaymentId, bool] = {}
+        self.batches: list[int] = []
+        self._ids = itertools.count(1)
+
+    async def new_payment(self, total_price: Money) -> PaymentId:
+        payment_id = PaymentId(f"stub-{next(self._ids)}")
+        self.payments[payment_id] = False
+        return payment_id
+
+    def settle(self, payment_id: PaymentId, verified: bool = True) -> None:
+        self.payments[payment_id] = verified
+
+    async def verify_payment(self, payment_id: PaymentId) -> bool:
+        return (await self.verify_payments([payment_id]))[payment_id]
+
+    async def verify_payments(self, payment_ids: Sequence[PaymentId]) -> dict[PaymentId, bool]:
+        if len(payment_ids) > self.max_batch_size:
+            raise ValueError(f"at most {self.max_batch_size} payments per call")
+        self.batches.append(len(payment_ids))
+        await asyncio.sleep(self.latency)
+        return {payment_id: self.payments.get(payment_id, False) for payment_id in payment_ids}
@@ -1,5 +1,8 @@
 import abc
+import asyncio
+from collections.abc import Sequence
 
+from domain.base.value_object import Money
 from domain.payment.model.value_objects import PaymentId
 
 
@@ -7,7 +10,7 @@ class PaymentAdapterInterface(abc.ABC):
     """Abstraction for payment provider integration."""
 
     @abc.abstractmethod
-    async def new_payment(self, total_price: float) -> PaymentId:
+    async def new_payment(self, total_price: Money) -> PaymentId:
         """Create a new payment for the given total price."""
         raise NotImplementedError()
 
@@ -15,3 +18,10 @@ class PaymentAdapterInterface(abc.ABC):
     async def verify_payment(self, payment_id: PaymentId) -> bool:
         """Verify whether a payment has been successfully completed."""
         raise NotImplementedError()
+
+    async def verify_payments(self, payment_ids: Sequence[PaymentId]) -> dict[PaymentId, bool]:
+        """Verify many payments; adapters of providers with a batch status API override this."""
+        outcomes = await asyncio.gather(
+            *(self.verify_payment(payment_id=payment_id) for payment_id in payment_ids)
+        )
+        return dict(zip(payment_ids, outcomes))
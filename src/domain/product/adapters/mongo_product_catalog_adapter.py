@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+from bson.decimal128 import Decimal128
+
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from domain.base.value_object import Money
+from domain.product.exceptions.product_exceptions import ProductNotFound
+from domain.product.model.entities import Product
+from domain.product.model.value_objects import ProductId
+from domain.product.ports.product_adapter_interface import ProductAdapterInterface
+from utils.logger import get_logger
+
+logger = get_logger()
+
+PROJECTION = {'price': 1, 'updated_at': 1, 'active': 1}
+
+
+def _product(document: dict[str, Any]) -> Product:
+    price = document['price']
+    return Product(
+        product_id=str(document['_id']),
+        price=Money.from_decimal(price.to_decimal() if isinstance(price, Decimal128) else price),
+    )
+
+
+class MongoProductCatalogAdapter(ProductAdapterInterface):
+    """Product prices read from the catalog collection and served from memory.
+
+    Catalog documents look like ``{'_id': product_id, 'price': Decimal128,
+    'updated_at': datetime, 'active': bool}``. ``refresh`` loads the whole catalog once,
+    then only the documents updated since the newest ``updated_at`` it has seen;
+    inactive products leave the index. Ids still missing from the index (e.g. created
+    since the last poll) are fetched together in one ``$in`` query, so pricing an
+    order never costs a query per item; those loads leave the watermark alone, or a
+    recently updated product would skip the older updates the next refresh still owes.
+    """
+
+    def __init__(
+        self,
+        db_connection: AsyncMongoDBConnectorAdapter,
+        collection_name: str,
+        refresh_interval: float = 30.0,
+    ) -> None:
+        self.db_connection = db_connection
+        self.collection_name = collection_name
+        self.refresh_interval = refresh_interval
+        self.index: dict[str, Money] = {}
+        self.watermark: datetime | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Load the catalog, then keep the index current in the background."""
+        await self.refresh()
+        self._task = asyncio.create_task(self._poll(), name='product-catalog-refresh')
+        await logger.info('Product catalog loaded', products=len(self.index))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> int:
+        """Apply the documents changed since the last refresh; return how many."""
+        # ``$gte``: documents sharing the newest timestamp may have been written after it
+        query = {} if self.watermark is None else {'updated_at': {'$gte': self.watermark}}
+        loaded, newest = await self._load(query)
+        if newest and (self.watermark is None or newest > self.watermark):
+            self.watermark = newest
+        return loaded
+
+    async def prices(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Money]:
+        wanted = {str(product_id) for product_id in product_ids}
+        if missing := [product_id for product_id in wanted if product_id not in self.index]:
+            await self._load({'_id': {'$in': missing}})
+        if unknown := sorted(wanted - self.index.keys()):
+            raise ProductNotFound(detail=f"unknown products: {', '.join(unknown)}")
+        return {ProductId(product_id): self.index[product_id] for product_id in wanted}
+
+    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> Money:
+        prices = await self.prices(product_id for product_id, _ in product_counts)
+        return Money(sum(prices[product_id] * count for product_id, count in product_counts))
+
+    async def _load(self, query: dict[str, Any]) -> tuple[int, datetime | None]:
+        """Apply the matching documents; return how many and the newest ``updated_at``."""
+        loaded, newest = 0, None
+        async with self.db_connection.get_connection() as connection:
+            cursor = connection[self.collection_name].find(
+                query, projection=PROJECTION, sort=[('updated_at', 1)]
+            )
+            async for document in cursor:
+                self._apply(document)
+                loaded += 1
+                newest = document.get('updated_at') or newest
+        return loaded, newest
+
+    def _apply(self, document: dict[str, Any]) -> None:
+        product_id = str(document['_id'])
+        if document.get('active', True):
+            self.index[product_id] = _product(document).price
+        else:
+            self.index.pop(product_id, None)
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                if changed := await self.refresh():
+                    await logger.info('Product catalog refreshed', changed=changed)
+            except Exception:
+                await logger.exception('Product catalog refresh failed')
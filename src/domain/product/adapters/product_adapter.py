@@ -1,12 +1,19 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
+from domain.base.value_object import Money
 from domain.product.model.value_objects import ProductId
 from domain.product.ports.product_adapter_interface import ProductAdapterInterface
 
+UNIT_PRICE = Money(1_200)
+
 
 class ProductAdapter(ProductAdapterInterface):
     """Mock product adapter for calculating total price."""
 
-    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> float:
+    async def prices(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Money]:
+        """Every product costs the same."""
+        return {product_id: UNIT_PRICE for product_id in product_ids}
+
+    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> Money:
         """Return total price given a sequence of product/count tuples."""
-        return float(sum(12.0 * count for _, count in product_counts))
+        return Money(UNIT_PRICE * sum(count for _, count in product_counts))
@@ -0,0 +1,41 @@
+from collections.abc import Iterable, Sequence
+
+from domain.base.resilience import Resilience
+from domain.base.value_object import Money
+from domain.product.model.value_objects import ProductId
+from domain.product.ports.product_adapter_interface import ProductAdapterInterface
+
+
+class ResilientProductAdapter(ProductAdapterInterface):
+    """Call another product adapter behind a circuit breaker, hedging its price reads.
+
+    When the breaker is open or a lookup fails, ``fallback`` (e.g. a local copy of the
+    catalog) answers if given.
+    """
+
+    def __init__(
+        self,
+        product_service: ProductAdapterInterface,
+        resilience: Resilience,
+        fallback: ProductAdapterInterface | None = None,
+    ) -> None:
+        self.product_service = product_service
+        self.resilience = resilience
+        self.fallback = fallback
+
+    async def prices(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Money]:
+        # a hedge reads the ids again
+        return await self.resilience.call(
+            self.product_service.prices,
+            tuple(product_ids),
+            hedge=True,
+            fallback=self.fallback.prices if self.fallback else None,
+        )
+
+    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> Money:
+        return await self.resilience.call(
+            self.product_service.total_price,
+            product_counts,
+            hedge=True,
+            fallback=self.fallback.total_price if self.fallback else None,
+        )
@@ -0,0 +1,11 @@
+from fastapi import status
+
+from exceptions import OrderingServiceException
+
+
+class ProductNotFound(OrderingServiceException):
+    """Raised when an order references products missing from the catalog."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    name = 'PRODUCT_NOT_FOUND'
+    message = 'product not found'
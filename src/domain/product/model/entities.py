@@ -1,6 +1,5 @@
-from decimal import Decimal
-
 from domain.base.entity import Entity
+from domain.base.value_object import Money
 from domain.product.model.value_objects import ProductId
 
 
@@ -8,4 +7,4 @@ class Product(Entity):
     """Entity representing a product."""
 
     product_id: ProductId
-    price: Decimal
+    price: Money
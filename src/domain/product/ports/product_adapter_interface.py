@@ -1,6 +1,7 @@
 import abc
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
+from domain.base.value_object import Money
 from domain.product.model.value_objects import ProductId
 
 
@@ -8,6 +9,11 @@ class ProductAdapterInterface(abc.ABC):
     """Abstraction for product provider integration."""
 
     @abc.abstractmethod
-    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> float:
+    async def prices(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Money]:
+        """Return the unit price of every given product in one lookup."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def total_price(self, product_counts: Sequence[tuple[ProductId, int]]) -> Money:
         """Calculate the total price for a sequence of product/count tuples."""
         raise NotImplementedError()
@@ -57,3 +57,35 @@ async def http_exception_handler(request: Request, exc: OrderingServiceException
     }
 
     return JSONResponse(content=response_data, status_code=exc.status_code, headers=headers)
+
+
+class IdempotencyKeyInProgress(OrderingServiceException):
+    """Raised when a request with the same Idempotency-Key is still being processed."""
+
+    status_code = status.HTTP_409_CONFLICT
+    name = 'IDEMPOTENCY_KEY_IN_PROGRESS'
+    message = 'a request with this idempotency key is still in progress'
+
+
+class IdempotencyKeyReused(OrderingServiceException):
+    """Raised when an Idempotency-Key is reused with a different request."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    name = 'IDEMPOTENCY_KEY_REUSED'
+    message = 'idempotency key was already used for a different request'
+
+
+class LockUnavailable(OrderingServiceException):
+    """Raised when a keyed lock cannot be acquired in time."""
+
+    status_code = status.HTTP_409_CONFLICT
+    name = 'RESOURCE_LOCKED'
+    message = 'resource is locked by another request'
+
+
+class DependencyUnavailable(OrderingServiceException):
+    """Raised when the circuit breaker of an external dependency is open."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    name = 'DEPENDENCY_UNAVAILABLE'
+    message = 'external dependency is unavailable'
@@ -18,6 +18,21 @@ class CacheInterface(abc.ABC):
         """Set a value in the cache with a time-to-live (ttl)."""
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    async def add(self, key: str, data: dict[str, Any], ttl: int) -> bool:
+        """Set a value only if the key does not exist yet; return whether it was set."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def get_raw(self, key: str) -> str | None:
+        """Retrieve a pre-serialized value from the cache by key."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def set_raw(self, key: str, value: str, ttl: int) -> None:
+        """Store a pre-serialized value as-is with a time-to-live (ttl)."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def delete(self, key: str) -> None:
         """Delete a value from the cache by key."""
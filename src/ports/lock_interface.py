@@ -0,0 +1,11 @@
+import abc
+from contextlib import AbstractAsyncContextManager
+
+
+class LockInterface(abc.ABC):
+    """Abstraction for keyed mutual exclusion between concurrent commands."""
+
+    @abc.abstractmethod
+    def lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        """Return an async context manager holding the lock for ``key``."""
+        raise NotImplementedError()
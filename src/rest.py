@@ -1,8 +1,29 @@
-from fastapi import FastAPI, Request, status
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from exceptions import OrderingServiceException, http_exception_handler
+from settings import REQUEST_DEADLINE
+from utils.deadline import deadline_after
+from utils.metrics import metrics
+
+REQUEST_TIMEOUT_HEADER = 'x-request-timeout'
+
+
+async def request_deadline(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Bound the request by ``REQUEST_DEADLINE`` or the shorter timeout the caller sent."""
+    seconds = REQUEST_DEADLINE
+    try:
+        seconds = min(seconds, float(request.headers.get(REQUEST_TIMEOUT_HEADER, seconds)))
+    except ValueError:
+        pass
+    with deadline_after(seconds):
+        return await call_next(request)
 
 
 def init_middlewares(app: FastAPI) -> None:
@@ -14,6 +35,7 @@ def init_middlewares(app: FastAPI) -> None:
         allow_methods=['*'],
         allow_headers=['*'],
     )
+    app.middleware('http')(request_deadline)
 
 
 def init_routes(app: FastAPI, controllers: list[object]) -> None:
@@ -23,6 +45,10 @@ def init_routes(app: FastAPI, controllers: list[object]) -> None:
     async def health_check() -> dict[str, int]:
         return {'status': status.HTTP_200_OK}
 
+    @app.get('/metrics', status_code=status.HTTP_200_OK, include_in_schema=False)
+    async def metrics_snapshot() -> dict[str, list[dict[str, Any]]]:
+        return metrics.snapshot()
+
     for controller in controllers:
         app.include_router(controller.router)
 
@@ -0,0 +1,116 @@
+"""Explain the queries of the indexed repositories on a live MongoDB.
+
+Set ``MONGO_TEST_URL`` to run them; a throwaway database is created and dropped.
+"""
+
+# pylint: disable=redefined-outer-name
+import os
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from adapters.mongo_index_adapter import MongoIndexRegistry, index_served, plan_stages
+from domain.delivery.repositories.route_repository import DeliveryRouteRepository
+from domain.order.model.events import OrderEventName
+from domain.order.model.value_objects import OrderId, OrderStatusEnum
+from domain.order.repositories.order_event_store_repository import OrderEventStoreRepository
+from domain.order.repositories.order_repository import OrderRepository
+
+MONGO_TEST_URL = os.getenv('MONGO_TEST_URL')
+
+pytestmark = pytest.mark.skipif(not MONGO_TEST_URL, reason='MONGO_TEST_URL is not set')
+
+
+@pytest.fixture
+async def db_connection():
+    connection = AsyncMongoDBConnectorAdapter(MONGO_TEST_URL, f"index_plans_{uuid4().hex[:8]}")
+    yield connection
+    async with connection.get_connection() as database:
+        await database.client.drop_database(database.name)
+    await connection.close()
+
+
+@pytest.fixture
+async def repositories(db_connection):
+    orders = OrderRepository(InMemoryCacheAdapter(), db_connection, 'orders')
+    events = OrderEventStoreRepository(db_connection, 'order_events')
+    routes = DeliveryRouteRepository(db_connection, 'delivery_routes')
+    reports = await MongoIndexRegistry([orders, events, routes]).apply()
+    assert all(report.ok for report in reports)
+
+    # the explained queries match none of these, only the plans are of interest
+    async with db_connection.get_connection() as database:
+        await database['orders'].insert_many(
+            [{'_id': f"o{i}", 'status': ('paid', 'cancelled')[i % 2]} for i in range(200)]
+        )
+        await database['order_events'].insert_many(
+            [
+                {'aggregate': {'id': f"o{i // 4}"}, 'version': i % 4 + 1, 'tracker_id': f"t{i}"}
+                for i in range(800)
+            ]
+        )
+    return orders, events, routes
+
+
+async def explain_finds(call) -> list[dict]:
+    """Run a repository call and explain every ``find`` it sent."""
+    finds = []
+    original = AsyncIOMotorCollection.find
+
+    def spy(collection, *args, **kwargs):
+        finds.append((collection, args, kwargs))
+        return original(collection, *args, **kwargs)
+
+    with patch.object(AsyncIOMotorCollection, 'find', spy):
+        await call()
+    assert finds, 'the call sent no query'
+    plans = []
+    for collection, args, kwargs in finds:
+        kwargs.pop('session', None)
+        plans.append(await original(collection, *args, **kwargs).explain())
+    return plans
+
+
+async def consume(iterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'call',
+    [
+        lambda orders, events, routes: events.from_id(OrderId('missing')),
+        lambda orders, events, routes: events.get_last_event_version_from_entity(
+            OrderId('missing')
+        ),
+        lambda orders, events, routes: events.get_all_events_by_tracker_id('missing'),
+        lambda orders, events, routes: consume(orders.from_status(OrderStatusEnum.WAITING)),
+        lambda orders, events, routes: consume(
+            events.get_events_between(
+                OrderEventName.PAID, datetime(2024, 1, 1), datetime(2024, 1, 2)
+            )
+        ),
+        lambda orders, events, routes: routes.from_window(datetime(2024, 1, 1)),
+        lambda orders, events, routes: routes.routed_order_ids(
+            datetime(2024, 1, 1), datetime(2024, 1, 2)
+        ),
+    ],
+    ids=[
+        'from_id',
+        'last_event',
+        'by_tracker',
+        'from_status',
+        'paid_between',
+        'from_window',
+        'routed_order_ids',
+    ],
+)
+async def test_queries_are_index_served(repositories, call):
+    for plan in await explain_finds(lambda: call(*repositories)):
+        assert index_served(plan), plan_stages(plan)
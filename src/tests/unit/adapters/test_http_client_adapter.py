@@ -0,0 +1,194 @@
+import asyncio
+from collections import defaultdict, deque
+
+import httpx
+import pytest
+
+from adapters.http_client_adapter import (
+    BulkheadFull,
+    DeadlineExceeded,
+    HttpClientAdapter,
+    HttpClientException,
+    HttpProvider,
+)
+from utils.deadline import deadline_after
+from utils.retry import RetryPolicy
+
+RETRY = RetryPolicy(attempts=3, backoff=0.001, max_backoff=0.002)
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server answering each path with scripted responses."""
+
+    def __init__(self) -> None:
+        self.responses: defaultdict[str, deque[tuple[int, float]]] = defaultdict(deque)
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+
+    def script(self, path: str, *responses: tuple[int, float]) -> None:
+        """Queue (status, delay) answers for ``path``; it answers 200 once they run out."""
+        self.responses[path].extend(responses)
+
+    @property
+    def url(self) -> str:
+        assert self.server is not None, 'start the server first'
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+
+    async def stop(self) -> None:
+        assert self.server is not None, 'start the server first'
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                method, path, _ = request_line.decode().split(' ', 2)
+                length = 0
+                while (line := await reader.readline()) not in (b'\r\n', b''):
+                    name, _, value = line.decode().partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                await reader.readexactly(length)
+                self.requests.append((method, path))
+                status, delay = self.responses[path].popleft() if self.responses[path] else (200, 0)
+                await asyncio.sleep(delay)
+                body = b'{}'
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\ncontent-type: application/json\r\n"
+                    f"content-length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def server():
+    stub = StubServer()
+    await stub.start()
+    yield stub
+    await stub.stop()
+
+
+@pytest.fixture
+async def adapter(server):
+    client = HttpClientAdapter(
+        [HttpProvider('stub', server.url, timeout=1.0, max_concurrency=2, retry=RETRY)]
+    )
+    yield client
+    await client.close()
+
+
+async def test_connections_are_kept_alive(adapter, server):
+    for _ in range(5):
+        response = await adapter.request('stub', 'GET', '/products')
+        assert response.status_code == 200
+
+    assert len(server.requests) == 5
+    assert server.connections == 1
+
+
+async def test_idempotent_request_is_retried_on_unavailable(adapter, server):
+    server.script('/products', (503, 0), (503, 0))
+
+    response = await adapter.request('stub', 'GET', '/products')
+
+    assert response.status_code == 200
+    assert server.requests == [('GET', '/products')] * 3
+
+
+async def test_retries_stop_after_the_policy_attempts(adapter, server):
+    server.script('/products', (503, 0), (503, 0), (503, 0), (503, 0))
+
+    response = await adapter.request('stub', 'GET', '/products')
+
+    assert response.status_code == 503
+    assert len(server.requests) == RETRY.attempts
+
+
+async def test_post_is_not_retried_after_reaching_the_provider(adapter, server):
+    server.script('/payments', (503, 0))
+
+    response = await adapter.request('stub', 'POST', '/payments', json={'value': 1})
+
+    assert response.status_code == 503
+    assert server.requests == [('POST', '/payments')]
+
+
+async def test_post_marked_idempotent_is_retried(adapter, server):
+    server.script('/payments', (503, 0))
+
+    response = await adapter.request('stub', 'POST', '/payments', idempotent=True)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+
+
+async def test_attempt_timeout_follows_the_request_deadline(adapter, server):
+    server.script('/slow', (200, 0.5))
+
+    with deadline_after(0.05), pytest.raises(httpx.TimeoutException):
+        await adapter.request('stub', 'GET', '/slow')
+
+    assert len(server.requests) == 1
+
+
+async def test_expired_deadline_fails_without_calling(adapter, server):
+    with deadline_after(0), pytest.raises(DeadlineExceeded):
+        await adapter.request('stub', 'GET', '/products')
+
+    assert not server.requests
+
+
+async def test_bulkhead_rejects_calls_beyond_the_provider_concurrency(adapter, server):
+    server.script('/slow', (200, 0.2), (200, 0.2))
+    busy = [asyncio.create_task(adapter.request('stub', 'GET', '/slow')) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    with deadline_after(0.05), pytest.raises(BulkheadFull):
+        await adapter.request('stub', 'GET', '/products')
+
+    assert [response.status_code for response in await asyncio.gather(*busy)] == [200, 200]
+
+
+async def test_expired_deadline_is_reported_as_such_when_the_bulkhead_is_full(adapter, server):
+    server.script('/slow', (200, 0.2), (200, 0.2))
+    busy = [asyncio.create_task(adapter.request('stub', 'GET', '/slow')) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    with deadline_after(0), pytest.raises(DeadlineExceeded):
+        await adapter.request('stub', 'GET', '/products')
+
+    await asyncio.gather(*busy)
+
+
+async def test_unknown_provider():
+    adapter = HttpClientAdapter()
+
+    with pytest.raises(HttpClientException):
+        await adapter.request('missing', 'GET', '/')
+
+
+def test_provider_registered_once():
+    adapter = HttpClientAdapter([HttpProvider('stub', 'http://stub')])
+
+    with pytest.raises(HttpClientException):
+        adapter.register(HttpProvider('stub', 'http://other'))
+
+
+async def test_close_drops_the_pools(adapter, server):
+    await adapter.request('stub', 'GET', '/products')
+    client = adapter.client('stub')
+
+    await adapter.close()
+
+    assert client.is_closed
+    assert adapter.client('stub') is not client
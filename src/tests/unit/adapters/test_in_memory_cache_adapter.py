@@ -0,0 +1,36 @@
+import pytest
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+
+
+@pytest.mark.asyncio
+async def test_set_and_get():
+    cache = InMemoryCacheAdapter()
+    await cache.set('key', {'foo': 'bar'}, ttl=60)
+
+    assert await cache.get('key') == {'foo': 'bar'}
+    assert await cache.get_raw('key') == '{"foo": "bar"}'
+    assert await cache.get('missing') is None
+
+
+@pytest.mark.asyncio
+async def test_values_expire(monkeypatch):
+    cache = InMemoryCacheAdapter()
+    monkeypatch.setattr('adapters.in_memory_cache_adapter.time.monotonic', lambda: 100.0)
+    await cache.set_raw('key', 'value', ttl=10)
+
+    monkeypatch.setattr('adapters.in_memory_cache_adapter.time.monotonic', lambda: 110.0)
+    assert await cache.get_raw('key') is None
+    assert 'key' not in cache.values
+
+
+@pytest.mark.asyncio
+async def test_add_only_sets_missing_keys():
+    cache = InMemoryCacheAdapter()
+
+    assert await cache.add('key', {'n': 1}, ttl=60) is True
+    assert await cache.add('key', {'n': 2}, ttl=60) is False
+    assert await cache.get('key') == {'n': 1}
+
+    await cache.delete('key')
+    assert await cache.add('key', {'n': 3}, ttl=60) is True
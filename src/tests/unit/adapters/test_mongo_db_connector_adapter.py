@@ -1,14 +1,21 @@
-# pylint: disable=redefined-outer-name, protected-access, unnecessary-dunder-call
-import asyncio
+# pylint: disable=redefined-outer-name, protected-access
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from bson import Timestamp
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.errors import AutoReconnect, ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.read_preferences import Primary, SecondaryPreferred
 
 from adapters.mongo_db_connector_adapter import (
     AsyncMongoDBConnectorAdapter,
+    MongoClientPool,
     MongoDBAdapterException,
+    after_commit,
+    available_compressors,
+    current_session,
+    make_read_preference,
+    operation_token,
 )
 
 
@@ -39,92 +46,295 @@ async def test_get_connection_success(connection_str, database_name, fake_client
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize('error', [ServerSelectionTimeoutError(), ConnectionFailure()])
-async def test_get_connection_raises_and_resets(error, connection_str, database_name):
-    with patch('motor.motor_asyncio.AsyncIOMotorClient') as mock_client_cls:
-        mock_client = MagicMock()
-        mock_client.__getitem__.side_effect = error
-        mock_client.close = AsyncMock()
-        mock_client_cls.return_value = mock_client
+async def test_get_connection_raises_and_keeps_the_shared_client(
+    error, connection_str, database_name, fake_client
+):
+    fake_client.__getitem__.side_effect = error
+    pool = MongoClientPool()
+    pool.clients[connection_str] = fake_client
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, pool=pool)
+
+    with pytest.raises(MongoDBAdapterException):
+        async with adapter.get_connection():
+            pass
+
+    fake_client.close.assert_not_called()
+    assert pool.clients == {connection_str: fake_client}
 
-        adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name)
 
-        with pytest.raises(MongoDBAdapterException) as exc_info:
+@pytest.mark.asyncio
+async def test_close_closes_only_a_private_pool(connection_str, database_name, fake_client):
+    shared = MongoClientPool()
+    shared.clients[connection_str] = fake_client
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, pool=shared)
+    async with adapter.get_connection():
+        pass
+
+    await adapter.close()
+    fake_client.close.assert_not_called()
+
+    private = AsyncMongoDBConnectorAdapter(connection_str, database_name)
+    private.pool.clients[connection_str] = fake_client
+    await private.close()
+    fake_client.close.assert_called_once_with()
+    assert private._client is None
+
+
+@pytest.mark.asyncio
+async def test_connectors_of_one_connection_string_share_a_client(connection_str):
+    with patch(
+        'adapters.mongo_db_connector_adapter.AsyncIOMotorClient',
+        side_effect=lambda *_, **__: MagicMock(),
+    ) as mock_client_cls:
+        pool = MongoClientPool(max_pool_size=50, min_pool_size=5, compressors=('zlib',))
+        orders = AsyncMongoDBConnectorAdapter(connection_str, 'orders', pool=pool)
+        events = AsyncMongoDBConnectorAdapter(connection_str, 'events', pool=pool)
+        other = AsyncMongoDBConnectorAdapter('mongodb://elsewhere:27017', 'events', pool=pool)
+
+        for adapter in (orders, events, events, other):
             async with adapter.get_connection():
                 pass
 
-        assert 'has been reset' in str(exc_info.value)
-        mock_client.close.assert_awaited_once()
-        assert adapter._client is None
-        assert adapter._database is None
+        assert mock_client_cls.call_count == 2
+        mock_client_cls.assert_any_call(
+            connection_str,
+            maxPoolSize=50,
+            minPoolSize=5,
+            connectTimeoutMS=5_000,
+            serverSelectionTimeoutMS=15_000,
+            uuidRepresentation='standard',
+            compressors='zlib',
+        )
+        assert orders._client is events._client is not other._client
 
 
 @pytest.mark.asyncio
-async def test_close_and_reset_connection(connection_str, database_name, fake_client):
-    fake_client.close = AsyncMock()
-    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=fake_client)
+async def test_reuses_same_connection_instance(connection_str, database_name, fake_client):
+    pool = MongoClientPool()
+    pool.clients[connection_str] = fake_client
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, pool=pool)
 
-    await adapter.close()
+    async with adapter.get_connection() as db1:
+        pass
+    async with adapter.get_connection() as db2:
+        pass
 
-    fake_client.close.assert_awaited_once()
-    assert adapter._client is None
-    assert adapter._database is None
+    fake_client.__getitem__.assert_called_once_with(database_name)
+    assert db1 is db2
 
 
-def test_ensure_connection_creates_client(connection_str, database_name):
-    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name)
+def test_available_compressors_skip_missing_libraries():
+    with patch('importlib.util.find_spec', side_effect=lambda name: name != 'snappy' or None):
+        assert available_compressors(['zstd', 'snappy', 'zlib']) == ['zstd', 'zlib']
 
-    with patch('motor.motor_asyncio.AsyncIOMotorClient') as mock_client_cls:
-        mock_client = MagicMock()
-        mock_client.__getitem__.return_value = MagicMock()
-        mock_client_cls.return_value = mock_client
 
-        adapter._ensure_connection()
-        mock_client_cls.assert_called_once()
-        assert adapter._client is not None
-        assert adapter._database is not None
+@pytest.mark.asyncio
+async def test_open_pings_each_deployment_once(connection_str):
+    pool = MongoClientPool()
+    reachable, unreachable = MagicMock(), MagicMock()
+    reachable.admin.command = AsyncMock(return_value={'ok': 1})
+    unreachable.admin.command = AsyncMock(side_effect=ServerSelectionTimeoutError())
+    pool.clients = {connection_str: reachable, 'mongodb://down:27017': unreachable}
 
+    await pool.open([connection_str, connection_str, 'mongodb://down:27017'])
 
-def test_del_with_event_loop_running(connection_str, database_name):
-    fake_client = MagicMock()
-    fake_client.close = AsyncMock()
-    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=fake_client)
+    reachable.admin.command.assert_awaited_once_with('ping')
+    unreachable.admin.command.assert_awaited_once_with('ping')
 
-    loop = asyncio.get_event_loop()
-    with (
-        patch.object(loop, 'is_running', return_value=True),
-        patch.object(loop, 'create_task') as mock_task,
-    ):
-        adapter.__del__()
-        mock_task.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_open_without_warmup_does_not_ping(connection_str):
+    pool = MongoClientPool()
+    client = MagicMock()
+    client.admin.command = AsyncMock()
+    pool.clients[connection_str] = client
 
-def test_del_event_loop_not_running(connection_str, database_name):
-    fake_client = MagicMock()
-    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=fake_client)
+    await pool.open([connection_str], warmup=False)
+
+    client.admin.command.assert_not_called()
+
+
+def test_pool_close(connection_str, fake_client):
+    pool = MongoClientPool()
+    pool.clients[connection_str] = fake_client
+
+    pool.close()
+
+    fake_client.close.assert_called_once_with()
+    assert not pool.clients
+
+
+def transactional_client(attempts: int = 1) -> MagicMock:
+    """Client whose session runs the transaction callback ``attempts`` times, like a retry."""
+    session = MagicMock()
+    session.client = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+
+    async def with_transaction(callback, **_):
+        for _attempt in range(attempts):
+            result = await callback(session)
+        return result
 
-    with patch('asyncio.get_event_loop', side_effect=RuntimeError):
-        adapter.__del__()
+    session.with_transaction = AsyncMock(side_effect=with_transaction)
+    client = MagicMock(spec=AsyncIOMotorClient)
+    client.start_session = AsyncMock(return_value=session)
+    return client
 
 
 @pytest.mark.asyncio
-async def test_reuses_same_connection_instance(connection_str, database_name):
-    with patch('motor.motor_asyncio.AsyncIOMotorClient') as mock_client_cls:
-        mock_client = MagicMock()
-        mock_database = MagicMock()
-        mock_client.__getitem__.return_value = mock_database
-        mock_client_cls.return_value = mock_client
+async def test_run_in_transaction_binds_session_to_every_adapter(connection_str, database_name):
+    client = transactional_client()
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=client)
+    other = AsyncMongoDBConnectorAdapter(connection_str, 'events', client=MagicMock())
+    session = client.start_session.return_value
+    seen = {}
 
-        adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name)
+    async def work():
+        seen['session'] = current_session()
+        async with other.get_connection() as connection:
+            seen['connection'] = connection
+        return 'done'
 
-        async with adapter.get_connection() as db1:
-            pass
-        async with adapter.get_connection() as db2:
-            pass
+    assert await adapter.run_in_transaction(work) == 'done'
+    assert seen == {'session': session, 'connection': session.client['events']}
+    session.client.__getitem__.assert_called_with('events')
+    assert current_session() is None
 
-        mock_client_cls.assert_called_once_with(
-            connection_str,
-            serverSelectionTimeoutMS=15000,
-            uuidRepresentation='standard',
-        )
-        mock_client.__getitem__.assert_called_once_with(database_name)
-        assert db1 is db2
+
+@pytest.mark.asyncio
+async def test_transient_errors_reach_the_transaction_retry_unchanged(
+    connection_str, database_name
+):
+    client = transactional_client()
+    session = client.start_session.return_value
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=client)
+    attempts: list[int] = []
+
+    async def with_transaction(callback, **_):
+        # the driver re-runs the callback while it fails with a transient label
+        while True:
+            try:
+                return await callback(session)
+            except AutoReconnect as exc:
+                if not exc.has_error_label('TransientTransactionError'):
+                    raise
+
+    session.with_transaction.side_effect = with_transaction
+
+    async def work():
+        attempts.append(len(attempts))
+        async with adapter.get_connection():
+            if len(attempts) == 1:
+                error = AutoReconnect('primary stepped down')
+                error._add_error_label('TransientTransactionError')
+                raise error
+        return 'done'
+
+    assert await adapter.run_in_transaction(work) == 'done'
+    assert attempts == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_is_deferred_and_reset_on_retry(connection_str, database_name):
+    adapter = AsyncMongoDBConnectorAdapter(
+        connection_str, database_name, client=transactional_client(attempts=2)
+    )
+    log = []
+
+    async def work():
+        log.append('write')
+        await after_commit(AsyncMock(side_effect=lambda: log.append('committed')))
+
+    await adapter.run_in_transaction(work)
+
+    assert log == ['write', 'write', 'committed']
+
+
+@pytest.mark.asyncio
+async def test_after_commit_runs_immediately_outside_transaction():
+    callback = AsyncMock()
+    await after_commit(callback)
+    callback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_read_connection_follows_the_read_preference(connection_str, database_name):
+    client = MagicMock()
+    adapter = AsyncMongoDBConnectorAdapter(
+        connection_str,
+        database_name,
+        client=client,
+        read_preference='secondaryPreferred',
+        max_staleness=90,
+    )
+
+    async with adapter.read_connection() as reader, adapter.get_connection() as writer:
+        assert reader is client.get_database.return_value
+        assert writer is client[database_name]
+    client.get_database.assert_called_once_with(
+        database_name, read_preference=SecondaryPreferred(max_staleness=90)
+    )
+
+
+def test_make_read_preference():
+    assert make_read_preference('primary') == Primary()
+    assert make_read_preference('secondaryPreferred', 90) == SecondaryPreferred(max_staleness=90)
+    with pytest.raises(MongoDBAdapterException):
+        make_read_preference('anywhere')
+
+
+def test_operation_token():
+    session = MagicMock(operation_time=Timestamp(1700000000, 7))
+    assert operation_token(session) == '1700000000.7'
+    assert operation_token(MagicMock(operation_time=None)) is None
+
+
+@pytest.mark.asyncio
+async def test_causal_session_reads_after_the_token(connection_str, database_name):
+    client = transactional_client()
+    session = client.start_session.return_value
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=client)
+
+    async with adapter.causal_session('1700000000.7') as outer:
+        async with adapter.causal_session() as inner:
+            assert outer is inner is session is current_session()
+
+    assert current_session() is None
+    client.start_session.assert_awaited_once_with(causal_consistency=True)
+    session.advance_operation_time.assert_called_once_with(Timestamp(1700000000, 7))
+
+
+@pytest.mark.asyncio
+async def test_causal_session_ignores_a_malformed_token(connection_str, database_name):
+    client = transactional_client()
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=client)
+
+    async with adapter.causal_session('not-a-token'):
+        pass
+
+    client.start_session.return_value.advance_operation_time.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_in_transaction_reuses_the_causal_session(connection_str, database_name):
+    client = transactional_client()
+    session = client.start_session.return_value
+    session.client = client
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name, client=client)
+
+    async def work():
+        return current_session()
+
+    async with adapter.causal_session():
+        assert await adapter.run_in_transaction(work) is session
+
+    client.start_session.assert_awaited_once_with(causal_consistency=True)
+
+
+def test_shares_cluster_with(connection_str, database_name):
+    adapter = AsyncMongoDBConnectorAdapter(connection_str, database_name)
+    assert adapter.shares_cluster_with(AsyncMongoDBConnectorAdapter(connection_str, 'events'))
+    assert not adapter.shares_cluster_with(
+        AsyncMongoDBConnectorAdapter('mongodb://elsewhere:27017', 'events')
+    )
@@ -0,0 +1,135 @@
+# pylint: disable=redefined-outer-name
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from adapters.mongo_index_adapter import (
+    MongoIndex,
+    MongoIndexRegistry,
+    ensure_indexes,
+    index_served,
+    plan_stages,
+)
+
+STATUS = MongoIndex('status_id', (('status', 1), ('_id', 1)))
+TRACKER = MongoIndex('tracker_id', (('tracker_id', 1),))
+
+
+def fake_collection(existing: dict) -> MagicMock:
+    collection = MagicMock()
+    collection.database.name = 'test_db'
+    collection.name = 'orders'
+    collection.index_information = AsyncMock(
+        return_value={'_id_': {'key': [('_id', 1)]}} | existing
+    )
+    collection.create_indexes = AsyncMock()
+    collection.drop_index = AsyncMock()
+    return collection
+
+
+def created(collection: MagicMock) -> list[str]:
+    (models,) = collection.create_indexes.await_args.args
+    return [model.document['name'] for model in models]
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_only_missing_indexes():
+    collection = fake_collection({'status_id': {'key': [('status', 1), ('_id', 1)]}})
+
+    report = await ensure_indexes(collection, [STATUS, TRACKER])
+
+    assert created(collection) == ['tracker_id']
+    assert (report.created, report.unchanged, report.ok) == (['tracker_id'], ['status_id'], True)
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_is_idempotent():
+    collection = fake_collection({'by_tracker': {'key': [('tracker_id', 1)]}})
+    collection.index_information.return_value['status_id'] = {'key': [('status', 1), ('_id', 1)]}
+
+    report = await ensure_indexes(collection, [STATUS, TRACKER])
+
+    collection.create_indexes.assert_not_awaited()
+    assert report.unchanged == ['status_id', 'tracker_id']
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_reports_conflicts_unless_replacing():
+    collection = fake_collection({'status_id': {'key': [('status', 1)]}})
+
+    report = await ensure_indexes(collection, [STATUS])
+
+    collection.drop_index.assert_not_awaited()
+    collection.create_indexes.assert_not_awaited()
+    assert (report.conflicting, report.ok) == (['status_id'], False)
+
+    report = await ensure_indexes(collection, [STATUS], replace=True)
+
+    collection.drop_index.assert_awaited_once_with('status_id')
+    assert created(collection) == ['status_id']
+    assert (report.replaced, report.created, report.ok) == (['status_id'], [], True)
+
+
+@pytest.mark.asyncio
+async def test_registry_applies_every_declaring_repository_and_reports_failures():
+    def repository(collection_name, indexes):
+        db_connection = MagicMock(database_name='test_db')
+        connection = db_connection.get_connection.return_value.__aenter__.return_value
+        connection.__getitem__.return_value = fake_collection({})
+        return MagicMock(
+            INDEXES=indexes, db_connection=db_connection, collection_name=collection_name
+        )
+
+    orders = repository('orders', [STATUS])
+    events = repository('events', [TRACKER])
+    events.db_connection.get_connection.side_effect = OperationFailure('unauthorized')
+    registry = MongoIndexRegistry([orders, events, repository('statistics', ())])
+
+    reports = await registry.apply()
+
+    assert len(registry.repositories) == 2
+    assert reports[0].created == ['status_id']
+    assert reports[1].collection == 'test_db.events'
+    assert reports[1].error.startswith('OperationFailure')
+
+
+def test_plan_stages_walks_the_winning_plan():
+    explain = {
+        'queryPlanner': {
+            'winningPlan': {
+                'stage': 'LIMIT',
+                'inputStage': {
+                    'stage': 'FETCH',
+                    'inputStage': {'stage': 'IXSCAN', 'indexName': 'aggregate_id_version'},
+                },
+            }
+        }
+    }
+    assert plan_stages(explain) == ['LIMIT', 'FETCH', 'IXSCAN']
+    assert index_served(explain)
+
+
+def test_plan_stages_of_slot_based_and_aggregation_plans():
+    slot_based = {
+        'queryPlanner': {'winningPlan': {'queryPlan': {'stage': 'COLLSCAN'}, 'slotBasedPlan': {}}}
+    }
+    aggregation = {
+        'stages': [
+            {
+                '$cursor': {
+                    'queryPlanner': {
+                        'winningPlan': {
+                            'stage': 'SORT',
+                            'inputStage': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}},
+                        }
+                    }
+                }
+            },
+            {'$group': {}},
+        ]
+    }
+    assert plan_stages(slot_based) == ['COLLSCAN']
+    assert not index_served(slot_based)
+    assert plan_stages(aggregation) == ['SORT', 'FETCH', 'IXSCAN']
+    assert not index_served(aggregation)
@@ -33,6 +33,32 @@ async def test_get_returns_none():
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_set_and_get_raw():
+    mock_client = AsyncMock()
+    mock_client.get.return_value = '{"foo": "bar"}'
+    adapter = RedisAdapter()
+    adapter.client = mock_client
+
+    await adapter.set_raw('key', '{"foo": "bar"}', ttl=60)
+    result = await adapter.get_raw('key')
+
+    mock_client.set.assert_awaited_once_with('key', '{"foo": "bar"}', ex=60)
+    assert result == '{"foo": "bar"}'
+
+
+@pytest.mark.asyncio
+async def test_add_sets_only_missing_keys():
+    mock_client = AsyncMock()
+    mock_client.set.side_effect = [True, None]
+    adapter = RedisAdapter()
+    adapter.client = mock_client
+
+    assert await adapter.add('key', {'foo': 'bar'}, ttl=30) is True
+    assert await adapter.add('key', {'foo': 'bar'}, ttl=30) is False
+    mock_client.set.assert_awaited_with('key', '{"foo": "bar"}', ex=30, nx=True)
+
+
 @pytest.mark.asyncio
 async def test_delete():
     mock_client = AsyncMock()
@@ -0,0 +1,85 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from adapters.redis_adapter import RedisAdapter
+from adapters.redis_lock_adapter import EXTEND_SCRIPT, RELEASE_SCRIPT, RedisLockAdapter
+from exceptions import LockUnavailable
+
+
+@pytest.fixture
+def redis() -> RedisAdapter:
+    adapter = MagicMock(spec=RedisAdapter)
+    adapter.client = AsyncMock()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_lock_acquires_and_releases_lease(redis):
+    redis.client.set.return_value = True
+    redis.client.eval.return_value = 1
+    locks = RedisLockAdapter(redis, lease_ttl=2.5)
+
+    async with locks.lock('order_1'):
+        _, kwargs = redis.client.set.call_args
+        assert kwargs == {'px': 2500, 'nx': True}
+
+    key, token = redis.client.set.call_args.args
+    assert key == 'lock:order_1'
+    redis.client.eval.assert_awaited_once_with(RELEASE_SCRIPT, 1, 'lock:order_1', token)
+
+
+@pytest.mark.asyncio
+async def test_lock_waits_for_lease(redis):
+    redis.client.set.side_effect = [None, None, True]
+    locks = RedisLockAdapter(redis, retry_interval=0)
+
+    async with locks.lock('order_1'):
+        pass
+
+    assert redis.client.set.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_lock_times_out(redis):
+    redis.client.set.return_value = None
+    locks = RedisLockAdapter(redis, acquire_timeout=0.01, retry_interval=0.001)
+
+    with pytest.raises(LockUnavailable):
+        async with locks.lock('order_1'):
+            pass
+    redis.client.eval.assert_not_awaited()
+    assert not locks.local.stripe('order_1').locked()
+
+
+@pytest.mark.asyncio
+async def test_lease_is_extended_while_the_lock_is_held(redis):
+    redis.client.set.return_value = True
+    redis.client.eval.return_value = 1
+    locks = RedisLockAdapter(redis, lease_ttl=0.03)
+
+    async with locks.lock('order_1'):
+        await asyncio.sleep(0.05)
+
+    _, token = redis.client.set.call_args.args
+    scripts = [call.args for call in redis.client.eval.await_args_list]
+    assert scripts[0] == (EXTEND_SCRIPT, 1, 'lock:order_1', token, 30)
+    assert scripts[-1] == (RELEASE_SCRIPT, 1, 'lock:order_1', token)
+    assert len(scripts) >= 3
+
+
+@pytest.mark.asyncio
+async def test_lease_renewal_stops_once_the_lease_was_lost(redis):
+    redis.client.set.return_value = True
+    redis.client.eval.return_value = 0
+    locks = RedisLockAdapter(redis, lease_ttl=0.03)
+
+    async with locks.lock('order_1'):
+        await asyncio.sleep(0.05)
+
+    assert [call.args[0] for call in redis.client.eval.await_args_list] == [
+        EXTEND_SCRIPT,
+        RELEASE_SCRIPT,
+    ]
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from adapters.striped_lock_adapter import StripedLockAdapter
+
+
+def test_same_key_maps_to_same_stripe():
+    locks = StripedLockAdapter(stripes=16)
+    assert locks.stripe('order_1') is locks.stripe('order_1')
+    assert len(locks.stripes) == 16
+
+
+@pytest.mark.asyncio
+async def test_lock_serializes_same_key():
+    locks = StripedLockAdapter()
+    active = 0
+    peak = 0
+
+    async def critical_section():
+        nonlocal active, peak
+        async with locks.lock('order_1'):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+
+    await asyncio.gather(*(critical_section() for _ in range(10)))
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_on_error():
+    locks = StripedLockAdapter()
+    with pytest.raises(RuntimeError):
+        async with locks.lock('order_1'):
+            raise RuntimeError('boom')
+    assert not locks.stripe('order_1').locked()
@@ -0,0 +1,181 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from adapters.striped_lock_adapter import StripedLockAdapter
+from domain.base.bus import (
+    CommandBus,
+    LockMiddleware,
+    MessageBusException,
+    Middleware,
+    RetryMiddleware,
+    TimingMiddleware,
+)
+from domain.base.message import Command
+from utils.metrics import metrics
+from utils.retry import RetryPolicy
+
+
+@dataclass(frozen=True, slots=True)
+class Echo(Command):
+    value: str
+
+
+class FlakyError(Exception):
+    pass
+
+
+class Recorder(Middleware):
+    def __init__(self, name: str, calls: list[str]) -> None:
+        self.name = name
+        self.calls = calls
+
+    async def __call__(self, message, call_next):
+        self.calls.append(self.name)
+        return await call_next(message)
+
+
+async def echo(command: Echo) -> str:
+    return command.value
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_middlewares_in_order():
+    calls: list[str] = []
+    bus = CommandBus(middlewares=[Recorder('bus', calls)])
+    bus.register(Echo, echo, middlewares=[Recorder('first', calls), Recorder('second', calls)])
+
+    assert await bus.dispatch(Echo('hi')) == 'hi'
+    assert calls == ['bus', 'first', 'second']
+
+
+@pytest.mark.asyncio
+async def test_dispatch_without_handler():
+    with pytest.raises(MessageBusException):
+        await CommandBus().dispatch(Echo('hi'))
+
+
+def test_register_twice():
+    bus = CommandBus()
+    bus.register(Echo, echo)
+    with pytest.raises(MessageBusException):
+        bus.register(Echo, echo)
+
+
+@pytest.mark.asyncio
+async def test_timing_middleware_records_outcome():
+    async def failing(_):
+        raise FlakyError()
+
+    bus = CommandBus(middlewares=[TimingMiddleware('command_seconds')])
+    bus.register(Echo, failing)
+
+    with pytest.raises(FlakyError):
+        await bus.dispatch(Echo('hi'))
+
+    assert metrics.counter('command_seconds_total', message='Echo', outcome='error') == 1
+    assert metrics.percentile('command_seconds', 0.5, message='Echo') is not None
+
+
+@pytest.mark.asyncio
+async def test_retry_middleware_retries_until_success():
+    attempts = []
+
+    async def flaky(command):
+        attempts.append(command)
+        if len(attempts) < 3:
+            raise FlakyError()
+        return command.value
+
+    bus = CommandBus()
+    bus.register(
+        Echo,
+        flaky,
+        middlewares=[RetryMiddleware((FlakyError,), RetryPolicy(attempts=3, backoff=0))],
+    )
+
+    assert await bus.dispatch(Echo('hi')) == 'hi'
+    assert len(attempts) == 3
+    assert metrics.counter('message_retries_total', message='Echo', error='FlakyError') == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_middleware_gives_up():
+    attempts = []
+
+    async def failing(command):
+        attempts.append(command)
+        raise FlakyError()
+
+    bus = CommandBus()
+    retry = RetryMiddleware((FlakyError,), RetryPolicy(attempts=2, backoff=0))
+    bus.register(Echo, failing, middlewares=[retry])
+
+    with pytest.raises(FlakyError):
+        await bus.dispatch(Echo('hi'))
+    assert len(attempts) == 2
+    assert (
+        metrics.counter('message_retries_exhausted_total', message='Echo', error='FlakyError') == 1
+    )
+
+
+@pytest.mark.parametrize('attempt', [1, 2, 5, 10])
+def test_retry_policy_delay_is_jittered_and_capped(attempt):
+    policy = RetryPolicy(backoff=0.01, max_backoff=0.05)
+    cap = min(0.05, 0.01 * 2 ** (attempt - 1))
+
+    delays = [policy.delay(attempt) for _ in range(50)]
+
+    assert all(0 <= delay <= cap for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_retry_middleware_sleeps_between_attempts(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr('domain.base.bus.asyncio.sleep', fake_sleep)
+    monkeypatch.setattr('utils.retry.random.uniform', lambda low, high: high)
+
+    async def failing(_):
+        raise FlakyError()
+
+    bus = CommandBus()
+    retry = RetryMiddleware((FlakyError,), RetryPolicy(attempts=4, backoff=0.01, max_backoff=0.03))
+    bus.register(Echo, failing, middlewares=[retry])
+
+    with pytest.raises(FlakyError):
+        await bus.dispatch(Echo('hi'))
+    assert sleeps == [0.01, 0.02, 0.03]
+
+
+@pytest.mark.asyncio
+async def test_lock_middleware_serializes_messages_with_the_same_key():
+    active = {'a': 0, 'b': 0}
+    peak = {'a': 0, 'b': 0}
+
+    async def handler(command):
+        active[command.value] += 1
+        peak[command.value] = max(peak[command.value], active[command.value])
+        await asyncio.sleep(0.001)
+        active[command.value] -= 1
+
+    bus = CommandBus()
+    lock = LockMiddleware(StripedLockAdapter(), key_of=lambda command: command.value)
+    bus.register(Echo, handler, middlewares=[lock])
+
+    await asyncio.gather(*(bus.dispatch(Echo(value)) for value in 'abababab'))
+
+    assert peak == {'a': 1, 'b': 1}
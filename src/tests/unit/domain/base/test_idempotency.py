@@ -0,0 +1,158 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+from domain.base.bus import CommandBus
+from domain.base.idempotency import IdempotencyMiddleware, command_fingerprint
+from domain.base.message import Command
+from exceptions import IdempotencyKeyInProgress, IdempotencyKeyReused
+
+
+@dataclass(frozen=True, slots=True)
+class PlaceThing(Command):
+    name: str
+
+
+class Handler:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, command: PlaceThing) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('boom')
+        return f"{command.name}-{self.calls}"
+
+
+@pytest.fixture
+def cache() -> InMemoryCacheAdapter:
+    return InMemoryCacheAdapter()
+
+
+def build_bus(cache, handler, **kwargs) -> CommandBus:
+    bus = CommandBus(middlewares=[IdempotencyMiddleware(cache, poll_interval=0.001, **kwargs)])
+    bus.register(PlaceThing, handler)
+    return bus
+
+
+def test_fingerprint_ignores_idempotency_key():
+    assert command_fingerprint(PlaceThing('a', idempotency_key='k1')) == command_fingerprint(
+        PlaceThing('a', idempotency_key='k2')
+    )
+    assert command_fingerprint(PlaceThing('a')) != command_fingerprint(PlaceThing('b'))
+
+
+@pytest.mark.asyncio
+async def test_commands_without_key_always_run(cache):
+    handler = Handler()
+    bus = build_bus(cache, handler)
+
+    assert await bus.dispatch(PlaceThing('a')) == 'a-1'
+    assert await bus.dispatch(PlaceThing('a')) == 'a-2'
+    assert not cache.values
+
+
+@pytest.mark.asyncio
+async def test_duplicate_replays_stored_result(cache):
+    handler = Handler()
+    bus = build_bus(cache, handler)
+
+    first = await bus.dispatch(PlaceThing('a', idempotency_key='k'))
+    second = await bus.dispatch(PlaceThing('a', idempotency_key='k'))
+
+    assert first == second == 'a-1'
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_the_first(cache):
+    handler = Handler(delay=0.02)
+    bus = build_bus(cache, handler)
+
+    results = await asyncio.gather(
+        *(bus.dispatch(PlaceThing('a', idempotency_key='k')) for _ in range(5))
+    )
+
+    assert results == ['a-1'] * 5
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_payload(cache):
+    bus = build_bus(cache, Handler())
+    await bus.dispatch(PlaceThing('a', idempotency_key='k'))
+
+    with pytest.raises(IdempotencyKeyReused):
+        await bus.dispatch(PlaceThing('b', idempotency_key='k'))
+
+
+@pytest.mark.asyncio
+async def test_failure_releases_the_key(cache):
+    handler = Handler(fail=True)
+    bus = build_bus(cache, handler)
+
+    with pytest.raises(RuntimeError):
+        await bus.dispatch(PlaceThing('a', idempotency_key='k'))
+    handler.fail = False
+
+    assert await bus.dispatch(PlaceThing('a', idempotency_key='k')) == 'a-2'
+
+
+@pytest.mark.asyncio
+async def test_gives_up_waiting_on_a_stuck_request(cache):
+    command = PlaceThing('a', idempotency_key='k')
+    await cache.add(
+        IdempotencyMiddleware.cache_key(command),
+        {'status': 'in_progress', 'fingerprint': command_fingerprint(command)},
+        ttl=30,
+    )
+    handler = Handler()
+    bus = build_bus(cache, handler, wait_timeout=0.01)
+
+    with pytest.raises(IdempotencyKeyInProgress):
+        await bus.dispatch(command)
+    assert handler.calls == 0
+
+
+class DownCache(InMemoryCacheAdapter):
+    """A silent cache adapter during an outage."""
+
+    async def add(self, key, data, ttl=300):
+        return False
+
+    async def get(self, key):
+        return False
+
+
+class FailingCache(InMemoryCacheAdapter):
+    async def add(self, key, data, ttl=300):
+        raise ConnectionError('redis down')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('unavailable', [DownCache, FailingCache])
+async def test_commands_run_without_deduplication_when_the_cache_is_down(unavailable):
+    handler = Handler()
+    bus = build_bus(unavailable(), handler, wait_timeout=1.0)
+
+    assert await asyncio.wait_for(bus.dispatch(PlaceThing('a', idempotency_key='k')), 0.5) == 'a-1'
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_in_progress_record_outlives_its_ttl_while_the_command_runs(cache):
+    handler = Handler(delay=0.1)
+    bus = build_bus(cache, handler, lock_ttl=0.03, wait_timeout=1.0)
+
+    first = asyncio.create_task(bus.dispatch(PlaceThing('a', idempotency_key='k')))
+    await asyncio.sleep(0.06)  # twice the ttl: only the refresh keeps the claim
+    second = await bus.dispatch(PlaceThing('a', idempotency_key='k'))
+
+    assert await first == second == 'a-1'
+    assert handler.calls == 1
@@ -0,0 +1,221 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+import time
+
+import pytest
+
+from domain.base.resilience import BreakerState, CircuitBreaker, Resilience
+from exceptions import DependencyUnavailable
+from utils.deadline import DeadlineExceeded, deadline_after
+from utils.metrics import metrics
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Unavailable(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+async def ok(value):
+    return value
+
+
+async def failing(_):
+    raise Unavailable()
+
+
+async def fallback(value):
+    return f"fallback {value}"
+
+
+def test_breaker_opens_after_consecutive_failures_and_half_opens():
+    clock = Clock()
+    breaker = CircuitBreaker('maps', failure_threshold=2, reset_timeout=10.0, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow()
+    assert metrics.gauge('circuit_breaker_state', dependency='maps') == BreakerState.OPEN
+
+    clock.now = 10.0
+    assert breaker.allow()
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert not breaker.allow()  # a single probe at a time
+
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+    assert metrics.gauge('circuit_breaker_state', dependency='maps') == BreakerState.CLOSED
+    assert metrics.counter('circuit_breaker_transitions_total', dependency='maps', state='open')
+
+
+def test_failed_probe_opens_the_breaker_again():
+    clock = Clock()
+    breaker = CircuitBreaker('maps', failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == BreakerState.OPEN
+    clock.now = 15.0
+    assert not breaker.allow()
+
+
+def test_cancelled_probe_frees_its_slot():
+    clock = Clock()
+    breaker = CircuitBreaker('maps', failure_threshold=1, reset_timeout=1.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 1.0
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow()
+
+
+async def test_open_breaker_rejects_calls():
+    resilience = Resilience('product', CircuitBreaker('product', failure_threshold=1))
+
+    with pytest.raises(Unavailable):
+        await resilience.call(failing, 1)
+    with pytest.raises(DependencyUnavailable):
+        await resilience.call(ok, 1)
+
+    assert metrics.counter('dependency_calls_total', dependency='product', outcome='rejected') == 1
+
+
+async def test_fallback_answers_failed_and_rejected_calls():
+    resilience = Resilience('maps', CircuitBreaker('maps', failure_threshold=1))
+
+    assert await resilience.call(failing, 1, fallback=fallback) == 'fallback 1'
+    assert await resilience.call(ok, 2, fallback=fallback) == 'fallback 2'
+
+    assert metrics.counter('dependency_fallbacks_total', dependency='maps', reason='error') == 1
+    assert metrics.counter('dependency_fallbacks_total', dependency='maps', reason='open') == 1
+
+
+async def test_ignored_errors_do_not_trip_the_breaker():
+    async def not_found(_):
+        raise NotFound()
+
+    resilience = Resilience('maps', CircuitBreaker('maps', failure_threshold=1), ignore=(NotFound,))
+
+    for _ in range(3):
+        with pytest.raises(NotFound):
+            await resilience.call(not_found, 1, fallback=fallback)
+
+    assert resilience.breaker.state == BreakerState.CLOSED
+
+
+async def hanging(_):
+    await asyncio.sleep(1)
+
+
+async def test_calls_running_past_their_timeout_count_as_failures():
+    resilience = Resilience('payment', CircuitBreaker('payment', failure_threshold=1), timeout=0.01)
+
+    with pytest.raises(TimeoutError) as error:
+        await resilience.call(hanging, 1)
+
+    assert not isinstance(error.value, DeadlineExceeded)
+    assert resilience.breaker.state == BreakerState.OPEN
+
+
+async def test_calls_cut_short_by_the_deadline_leave_the_breaker_closed():
+    resilience = Resilience('payment', CircuitBreaker('payment', failure_threshold=1), timeout=1.0)
+
+    for _ in range(5):
+        with deadline_after(0.001), pytest.raises(DeadlineExceeded):
+            await resilience.call(hanging, 1, fallback=fallback)
+
+    assert resilience.breaker.state == BreakerState.CLOSED
+    assert resilience.breaker.failures == 0
+    assert metrics.counter('dependency_calls_total', dependency='payment', outcome='deadline') == 5
+    assert await resilience.call(ok, 1) == 1
+
+
+async def test_calls_after_the_deadline_leave_the_breaker_alone():
+    called = []
+
+    async def record(value):
+        called.append(value)
+        return value
+
+    resilience = Resilience('payment', CircuitBreaker('payment', failure_threshold=1))
+
+    with deadline_after(0):
+        for _ in range(3):
+            with pytest.raises(DeadlineExceeded):
+                await resilience.call(record, 1, fallback=record)
+
+    assert not called
+    assert resilience.breaker.state == BreakerState.CLOSED
+    assert resilience.breaker.failures == 0
+    assert metrics.counter('dependency_calls_total', dependency='payment', outcome='deadline') == 3
+
+
+async def test_no_hedge_before_enough_samples():
+    resilience = Resilience('product', hedge_min_samples=5)
+
+    await resilience.call(ok, 1, hedge=True)
+
+    assert resilience.hedge_delay() is None
+
+
+async def test_slow_attempt_is_hedged():
+    calls = []
+
+    async def first_call_stalls(value):
+        calls.append(value)
+        if len(calls) == 6:
+            await asyncio.sleep(1)
+        return value
+
+    resilience = Resilience('product', hedge_min_samples=5, hedge_min_delay=0.01)
+    for value in range(5):
+        await resilience.call(first_call_stalls, value, hedge=True)
+    assert resilience.hedge_delay() == 0.01
+
+    started = time.perf_counter()
+    assert await resilience.call(first_call_stalls, 'slow', hedge=True) == 'slow'
+
+    assert time.perf_counter() - started < 0.5
+    assert calls[-2:] == ['slow', 'slow']
+    assert metrics.counter('dependency_hedges_total', dependency='product') == 1
+    assert metrics.counter('dependency_hedges_won_total', dependency='product') == 1
+
+
+async def test_hedged_call_fails_when_both_attempts_fail():
+    resilience = Resilience('product', hedge_min_samples=1, hedge_min_delay=0.01)
+    await resilience.call(ok, 1, hedge=True)
+
+    async def slow_failure(_):
+        await asyncio.sleep(0.02)
+        raise Unavailable()
+
+    with pytest.raises(Unavailable):
+        await resilience.call(slow_failure, 1, hedge=True)
+
+    assert metrics.counter('dependency_hedges_total', dependency='product') == 1
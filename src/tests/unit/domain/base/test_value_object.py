@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from domain.base.value_object import Money, MoneyUnits, StoredMoney
+
+
+class Priced(BaseModel):
+    price: Money
+
+
+class Stored(BaseModel):
+    price: StoredMoney
+
+
+class Shown(BaseModel):
+    price: MoneyUnits
+
+
+def test_money_arithmetic_is_exact_int_arithmetic():
+    assert Money(1_999) * 3 + Money(1) == 5_998
+    assert Money(10) + Money(20) == Money(30)
+    assert Money(1_500) * 2.5 == 3_750.0
+    assert repr(Money(1_999)) == 'Money(1999)'
+
+
+@pytest.mark.parametrize(
+    ('value', 'cents'),
+    [
+        ('19.99', 1_999),
+        (Decimal('0.005'), 1),
+        (42.42, 4_242),
+        ('-0.005', -1),
+        (Decimal(500), 50_000),
+    ],
+)
+def test_money_from_decimal_rounds_half_up(value, cents):
+    assert Money.from_decimal(value) == cents
+
+
+def test_money_from_cents_matches_float_rounding():
+    assert Money.from_cents(1_500 * 2.3456) == 3_518
+    assert Money.from_cents(0.5) == 1
+    assert Money.from_cents(-0.5) == 0
+
+
+def test_money_to_decimal():
+    assert Money(1_999).to_decimal() == Decimal('19.99')
+    assert str(Money(5).to_decimal()) == '0.05'
+
+
+def test_money_serializes_as_cents():
+    priced = Priced(price=Money(1_999))
+    assert priced.model_dump() == {'price': 1_999}
+    assert priced.model_dump_json() == '{"price":1999}'
+    assert Priced.model_json_schema()['properties']['price']['type'] == 'integer'
+
+
+def test_money_validates_cents_only():
+    assert Priced.model_validate({'price': 1_999}).price == Money(1_999)
+    assert isinstance(Priced.model_validate({'price': 1}).price, Money)
+
+
+def test_stored_money_reads_legacy_decimal_strings_as_units():
+    assert Stored.model_validate({'price': '19.99'}).price == Money(1_999)
+    assert Stored.model_validate({'price': 1_999}).price == Money(1_999)
+    with pytest.raises(ValidationError):
+        Stored.model_validate({'price': 19.99})
+
+
+def test_money_units_serialize_as_decimal_strings():
+    shown = Shown(price=Money(1_990))
+    assert shown.model_dump_json() == '{"price":"19.90"}'
+    assert Shown.model_json_schema(mode='serialization')['properties']['price']['type'] == 'string'
+
+
+@pytest.mark.parametrize(
+    'value', [True, None, 'nan', 'abc', '19.99', 19.99, 1_999.0, Decimal('19.99')]
+)
+def test_money_rejects_non_amounts(value):
+    with pytest.raises(ValidationError):
+        Priced.model_validate({'price': value})
@@ -1,8 +1,10 @@
 # pylint: disable=redefined-outer-name
 from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
 
+from domain.base.value_object import Money
 from domain.delivery.adapters.cost_calculator_adapter import (
     BASE_PRICE,
     FLAT_PRICE,
@@ -11,7 +13,9 @@ from domain.delivery.adapters.cost_calculator_adapter import (
     ORDER_PRICE_THRESHOLD,
     PRICE_PER_EXTRA_DISTANCE,
     DeliveryCostCalculatorAdapter,
+    delivery_costs,
 )
+from domain.delivery.model.tariffs import DeliveryTariffs, TariffTable
 from domain.maps.model.value_objects import Address, StatesEnum
 
 
@@ -67,8 +71,7 @@ async def test_small_order_with_extra_distance(mock_address):
     adapter = DeliveryCostCalculatorAdapter(maps_service)
 
     result = await adapter.calculate_cost(ORDER_PRICE_THRESHOLD - 1, mock_address)
-    expected = BASE_PRICE + PRICE_PER_EXTRA_DISTANCE * (distance - FREE_DISTANCE_THRESHOLD)
-    assert result == expected
+    assert result == BASE_PRICE + 5 * PRICE_PER_EXTRA_DISTANCE
 
 
 @pytest.mark.asyncio
@@ -89,3 +92,85 @@ async def test_small_order_exactly_at_threshold_distance(mock_address):
 
     result = await adapter.calculate_cost(ORDER_PRICE_THRESHOLD - 100, mock_address)
     assert result == BASE_PRICE
+
+
+@pytest.mark.asyncio
+async def test_delivery_costs_match_scalar_path(mock_address):
+    totals = [0, 49_999, 50_000, 50_001, 123_456]  # cents, around the 500.00 threshold
+    distances = [0.0, 29.9, 30.0, 30.1, 47.3, 1234.5678]
+    maps_service = AsyncMock()
+    adapter = DeliveryCostCalculatorAdapter(maps_service)
+
+    expected = []
+    for total in totals:
+        for distance in distances:
+            maps_service.calculate_distance_from_warehouses.return_value = distance
+            expected.append(await adapter.calculate_cost(Money(total), mock_address))
+
+    grid_totals: np.ndarray
+    grid_distances: np.ndarray
+    grid_totals, grid_distances = np.meshgrid(totals, distances, indexing='ij')
+    result = delivery_costs(grid_totals.ravel(), grid_distances.ravel())
+
+    assert result.tolist() == expected
+
+
+@pytest.mark.asyncio
+async def test_calculate_costs_matches_calculate_cost(mock_address):
+    distances = [0.0, 31.7, 45.0, 30.0]
+    totals = [Money(100), Money(60_000), Money(49_999), Money(50_000)]
+    destinations = [
+        mock_address.model_copy(update={'house_number': str(index)}) for index in range(4)
+    ]
+    maps_service = AsyncMock()
+    maps_service.calculate_distances.return_value = distances
+    adapter = DeliveryCostCalculatorAdapter(maps_service)
+
+    costs = await adapter.calculate_costs(totals, destinations)
+
+    expected = []
+    for total, distance in zip(totals, distances):
+        maps_service.calculate_distance_from_warehouses.return_value = distance
+        expected.append(await adapter.calculate_cost(total, mock_address))
+    assert costs == expected
+    assert all(isinstance(cost, Money) for cost in costs)
+    maps_service.calculate_distances.assert_awaited_once_with(destinations)
+
+
+@pytest.mark.asyncio
+async def test_calculate_costs_looks_up_each_destination_once(mock_address):
+    maps_service = AsyncMock()
+    maps_service.calculate_distances.return_value = [45.0]
+    adapter = DeliveryCostCalculatorAdapter(maps_service)
+
+    costs = await adapter.calculate_costs([Money(100), Money(60_000)], [mock_address] * 2)
+
+    assert costs == [BASE_PRICE + 15 * PRICE_PER_EXTRA_DISTANCE, FLAT_PRICE]
+    maps_service.calculate_distances.assert_awaited_once_with([mock_address])
+
+
+@pytest.mark.asyncio
+async def test_tariffs_answer_without_a_maps_call(mock_address):
+    maps_service = AsyncMock()
+    tariffs = DeliveryTariffs(small=TariffTable(['12345'], [7_777]), large=TariffTable([], []))
+    adapter = DeliveryCostCalculatorAdapter(maps_service, tariffs)
+
+    assert await adapter.calculate_cost(Money(100), mock_address) == Money(7_777)
+    maps_service.calculate_distance_from_warehouses.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_tariff_misses_fall_back_to_live_distances(mock_address):
+    maps_service = AsyncMock()
+    maps_service.calculate_distance_from_warehouses.return_value = 40.0
+    maps_service.calculate_distances.return_value = [40.0]
+    tariffs = DeliveryTariffs(small=TariffTable(['12345'], [7_777]), large=TariffTable([], []))
+    adapter = DeliveryCostCalculatorAdapter(maps_service, tariffs)
+
+    assert await adapter.calculate_cost(ORDER_PRICE_THRESHOLD, mock_address) == FLAT_PRICE
+    costs = await adapter.calculate_costs(
+        [Money(100), ORDER_PRICE_THRESHOLD, ORDER_PRICE_THRESHOLD], [mock_address] * 3
+    )
+
+    assert costs == [Money(7_777), FLAT_PRICE, FLAT_PRICE]
+    maps_service.calculate_distances.assert_awaited_once_with([mock_address])
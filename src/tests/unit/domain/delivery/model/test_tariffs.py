@@ -0,0 +1,36 @@
+from domain.base.value_object import Money
+from domain.delivery.model.tariffs import DeliveryTariffs, TariffTable
+
+
+def make_table() -> TariffTable:
+    return TariffTable(['91755$', '918', '01310100$', '8801'], [7_250, 5_000, 0, 6_125])
+
+
+def test_lookup_matches_region_prefix_or_whole_postcode():
+    table = make_table()
+    assert table.lookup('91800-000') == Money(5_000)
+    assert table.lookup('91755') == Money(7_250)
+    assert table.lookup('01310-100') == Money(0)
+    assert table.lookup('88015-200') == Money(6_125)
+
+
+def test_lookup_misses_outside_the_table():
+    table = make_table()
+    assert table.lookup('01310-101') is None
+    assert table.lookup('9175') is None
+    assert table.lookup('00000-000') is None
+    assert TariffTable([], []).lookup('91755-720') is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    tariffs = DeliveryTariffs(small=make_table(), large=TariffTable(['9'], [0]))
+    path = tmp_path / 'tariffs.npz'
+
+    tariffs.save(path)
+    loaded = DeliveryTariffs.load(path)
+
+    assert loaded.small.prefixes == make_table().prefixes
+    assert loaded.small.costs == make_table().costs
+    assert loaded.lookup('91755-720', large=True) == Money(0)
+    assert loaded.lookup('91801-720', large=False) == Money(5_000)
+    assert loaded.lookup('91755-720', large=False) is None
@@ -0,0 +1,88 @@
+# pylint: disable=redefined-outer-name
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.delivery.model.routes import DeliveryRoute
+from domain.delivery.repositories.route_repository import DeliveryRouteRepository
+
+WINDOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def repository() -> DeliveryRouteRepository:
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[])
+    collection.find.return_value = cursor
+
+    connection_cm = AsyncMock()
+    connection_cm.__aenter__.return_value = {'routes': collection}
+    connection_cm.__aexit__.return_value = None
+
+    db_connection = MagicMock()
+    db_connection.get_connection.return_value = connection_cm
+    return DeliveryRouteRepository(db_connection=db_connection, collection_name='routes')
+
+
+def collection_of(repository):
+    return repository.db_connection.get_connection.return_value.__aenter__.return_value['routes']
+
+
+def make_route() -> DeliveryRoute:
+    return DeliveryRoute(warehouse=1, window_start=WINDOW, order_ids=('o1', 'o2'), distance=12.5)
+
+
+@pytest.mark.asyncio
+async def test_save_inserts_one_document_per_route(repository):
+    await repository.save([make_route(), make_route()])
+
+    documents = collection_of(repository).insert_many.await_args.args[0]
+    assert len(documents) == 2
+    assert documents[0] == {
+        'warehouse': 1,
+        'window_start': WINDOW,
+        'order_ids': ('o1', 'o2'),
+        'distance': 12.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_save_skips_empty_windows(repository):
+    await repository.save([])
+    collection_of(repository).insert_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_from_window(repository):
+    cursor = collection_of(repository).find.return_value
+    cursor.to_list.return_value = [
+        {'warehouse': 1, 'window_start': WINDOW, 'order_ids': ['o1', 'o2'], 'distance': 12.5}
+    ]
+
+    assert await repository.from_window(WINDOW) == [make_route()]
+    collection_of(repository).find.assert_called_once_with({'window_start': WINDOW}, {'_id': False})
+
+
+@pytest.mark.asyncio
+async def test_routed_order_ids(repository):
+    cursor = collection_of(repository).find.return_value
+    cursor.to_list.return_value = [{'order_ids': ['o1', 'o2']}, {'order_ids': ['o3']}]
+    end = datetime(2026, 10, 19, 13, 0)
+
+    assert await repository.routed_order_ids(WINDOW, end) == {'o1', 'o2', 'o3'}
+    collection_of(repository).find.assert_called_once_with(
+        {'window_start': {'$gte': WINDOW, '$lt': end}}, {'_id': False, 'order_ids': True}
+    )
+
+
+@pytest.mark.asyncio
+async def test_last_window_start(repository):
+    collection = collection_of(repository)
+    collection.find_one = AsyncMock(return_value={'window_start': WINDOW})
+    assert await repository.last_window_start() == WINDOW
+
+    collection.find_one.return_value = None
+    assert await repository.last_window_start() is None
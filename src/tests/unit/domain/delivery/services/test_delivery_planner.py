@@ -0,0 +1,173 @@
+# pylint: disable=redefined-outer-name
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from domain.delivery.repositories.route_repository import DeliveryRouteRepository
+from domain.delivery.services.delivery_planner import DeliveryPlanner
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderPaid
+from domain.order.model.value_objects import OrderStatusEnum
+
+# Porto Alegre and São Paulo
+WAREHOUSES = [(-30.0346, -51.2177), (-23.5505, -46.6333)]
+POSTCODES = {
+    '91755-720': (-30.1120, -51.1690),
+    '90010-000': (-30.0300, -51.2300),
+    '01310-100': (-23.5614, -46.6559),
+}
+PAID_AT = datetime(2026, 10, 19, 12, 10)
+LATER = datetime(2026, 10, 19, 12, 35)  # the window of PAID_AT has closed
+
+
+def make_address(postcode: str) -> Address:
+    return Address(
+        house_number='70',
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state=StatesEnum.RS,
+        postcode=postcode,
+        country='Brasil',
+    )
+
+
+def make_order(postcode: str | None = '91755-720') -> Order:
+    return Order(
+        buyer_id='b1',
+        items=[],
+        product_cost=10_000,
+        delivery_cost=1_000,
+        payment_id='p1',
+        destination=make_address(postcode) if postcode else None,
+        status=OrderStatusEnum.PAID,
+    )
+
+
+class FakeEventStore:
+    """Event store holding the OrderPaid events of the tests."""
+
+    def __init__(self) -> None:
+        self.events: list[OrderPaid] = []
+
+    async def get_events_between(self, event_name, start, end):
+        for event in self.events:
+            if event.event_name == event_name and start <= event.datetime < end:
+                yield event
+
+
+@pytest.fixture
+def planner() -> DeliveryPlanner:
+    repository = AsyncMock(spec=DeliveryRouteRepository)
+    repository.routed_order_ids.return_value = set()
+    repository.last_window_start.return_value = None
+    return DeliveryPlanner(
+        events=FakeEventStore(),
+        maps=LocalMapsAdapter.from_coordinates(POSTCODES, WAREHOUSES),
+        repository=repository,
+        window=1_800.0,
+        max_stops=2,
+        time_budget=1.0,
+        poll_interval=0.01,
+    )
+
+
+def pay(planner: DeliveryPlanner, order_id: str, postcode: str | None, paid_at=PAID_AT) -> None:
+    order = make_order(postcode).model_copy(update={'id': order_id})
+    planner.events.events.append(OrderPaid(aggregate=order, datetime=paid_at))
+
+
+def test_window_start(planner):
+    assert planner.window_start(PAID_AT) == datetime(2026, 10, 19, 12, 0)
+    assert planner.window_start(datetime(2026, 10, 19, 12, 30)) == datetime(2026, 10, 19, 12, 30)
+
+
+@pytest.mark.asyncio
+async def test_flush_plans_only_closed_windows(planner):
+    pay(planner, 'o1', '91755-720')
+    pay(planner, 'o2', '90010-000', paid_at=datetime(2026, 10, 19, 12, 40))
+
+    routes = await planner.flush(datetime(2026, 10, 19, 12, 35))
+
+    assert [route.order_ids for route in routes] == [('o1',)]
+    assert routes[0].window_start == datetime(2026, 10, 19, 12, 0)
+    planner.repository.save.assert_awaited_once_with(routes)
+    planner.repository.routed_order_ids.assert_awaited_once_with(
+        datetime(2026, 10, 19, 12, 0), datetime(2026, 10, 19, 12, 30)
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_leaves_out_routed_orders_and_orders_without_destination(planner):
+    pay(planner, 'o1', '91755-720')
+    pay(planner, 'o2', '90010-000')
+    pay(planner, 'o3', None)
+    planner.repository.routed_order_ids.return_value = {'o1'}
+
+    routes = await planner.flush(LATER)
+
+    assert [route.order_ids for route in routes] == [('o2',)]
+    assert planner.unroutable == {'o3'}
+
+
+@pytest.mark.asyncio
+async def test_flush_resumes_from_the_last_poll_and_rereads_the_lookback(planner):
+    await planner.flush(LATER)
+    assert planner.since == datetime(2026, 10, 19, 12, 0)
+
+    await planner.flush(datetime(2026, 10, 19, 14, 5))
+
+    planner.repository.routed_order_ids.assert_awaited_with(
+        datetime(2026, 10, 19, 12, 0), datetime(2026, 10, 19, 14, 0)
+    )
+    assert planner.since == datetime(2026, 10, 19, 13, 30)
+
+
+@pytest.mark.asyncio
+async def test_orders_go_to_their_nearest_warehouse(planner):
+    for order_id, postcode in (('o1', '91755-720'), ('o2', '01310-100'), ('o3', '90010-000')):
+        pay(planner, order_id, postcode)
+
+    routes = await planner.flush(LATER)
+
+    by_warehouse = {route.warehouse: set(route.order_ids) for route in routes}
+    assert by_warehouse == {0: {'o1', 'o3'}, 1: {'o2'}}
+    assert all(route.distance > 0 for route in routes)
+
+
+@pytest.mark.asyncio
+async def test_unknown_postcodes_are_left_out_and_not_retried(planner):
+    pay(planner, 'o1', '91755-720')
+    pay(planner, 'o2', '00000-000')
+
+    routes = await planner.flush(LATER)
+
+    assert [route.order_ids for route in routes] == [('o1',)]
+    assert planner.unroutable == {'o2'}
+
+
+@pytest.mark.asyncio
+async def test_failed_save_reads_the_window_again(planner):
+    planner.repository.save.side_effect = RuntimeError('down')
+    pay(planner, 'o1', '91755-720')
+
+    with pytest.raises(RuntimeError):
+        await planner.flush(LATER)
+
+    assert planner.since is None
+    planner.repository.save.side_effect = None
+    routes = await planner.flush(LATER)
+    assert [route.order_ids for route in routes] == [('o1',)]
+
+
+@pytest.mark.asyncio
+async def test_start_resumes_from_the_last_planned_window(planner):
+    planner.repository.last_window_start.return_value = datetime(2026, 10, 19, 11, 0)
+
+    await planner.start()
+    await planner.stop()
+
+    assert planner.since == datetime(2026, 10, 19, 11, 0)
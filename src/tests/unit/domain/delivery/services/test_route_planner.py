@@ -0,0 +1,112 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from domain.delivery.services.route_planner import (
+    distance_matrix,
+    nearest_neighbour_tour,
+    plan_routes,
+    route,
+    sweep,
+    two_opt,
+)
+from domain.maps.adapters.local_maps_adapter import unit_vectors
+
+
+def vectors(coordinates) -> np.ndarray:
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    return unit_vectors(coordinates[:, 0], coordinates[:, 1])
+
+
+def tour_length(distances, tour) -> float:
+    return float(distances[tour, np.roll(tour, -1)].sum())
+
+
+def random_stops(count: int, seed: int = 7) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    return vectors(
+        np.column_stack((generator.uniform(-31, -29, count), generator.uniform(-52, -50, count)))
+    )
+
+
+def test_sweep_groups_stops_by_bearing():
+    depot = vectors([(-30.0, -51.0)])[0]
+    # two stops north, two south of the depot
+    stops = vectors([(-29.0, -51.0), (-31.0, -51.1), (-29.1, -50.9), (-31.1, -50.9)])
+
+    groups = sweep(depot, stops, max_stops=2)
+
+    assert sorted(sorted(group.tolist()) for group in groups) == [[0, 2], [1, 3]]
+
+
+def test_sweep_cuts_even_groups():
+    groups = sweep(vectors([(-30.0, -51.0)])[0], random_stops(81), max_stops=40)
+    assert [len(group) for group in groups] == [27, 27, 27]
+    assert sorted(np.concatenate(groups).tolist()) == list(range(81))
+
+
+def test_two_opt_untangles_a_crossing():
+    # corners of a square visited in a crossing order
+    points = vectors([(0.0, 0.0), (1.0, 1.0), (0.0, 1.0), (1.0, 0.0)])
+    distances = distance_matrix(points)
+
+    tour = two_opt(distances, np.array([0, 1, 2, 3]))
+
+    assert tour[0] == 0
+    assert tour_length(distances, tour) < tour_length(distances, np.array([0, 1, 2, 3]))
+    assert sorted(tour.tolist()) == [0, 1, 2, 3]
+
+
+def test_two_opt_reaches_the_optimum_of_a_small_tour():
+    distances = distance_matrix(random_stops(8))
+    best = min(
+        tour_length(distances, np.array((0, *order)))
+        for order in itertools.permutations(range(1, 8))
+    )
+    tour = two_opt(distances, nearest_neighbour_tour(distances))
+    # 2-opt is a local search, but on a handful of points it should be within a few percent
+    assert tour_length(distances, tour) <= best * 1.05
+
+
+def test_two_opt_stops_at_the_deadline():
+    distances = distance_matrix(random_stops(30))
+    tour = nearest_neighbour_tour(distances)
+    assert np.array_equal(two_opt(distances, tour, deadline=0.0), tour)
+
+
+def test_route_visits_every_stop_and_counts_the_way_back():
+    depot = vectors([(-30.0, -51.0)])[0]
+    stops = vectors([(-30.0, -50.0)])
+
+    order, length = route(depot, stops)
+
+    assert order.tolist() == [0]
+    assert length == pytest.approx(2 * distance_matrix(np.vstack((depot, stops)))[0, 1])
+
+
+def test_plan_routes_covers_each_stop_once_from_its_nearest_warehouse():
+    warehouses = vectors([(-30.0, -52.0), (-30.0, -50.0)])
+    stops = random_stops(500)
+
+    plans = plan_routes(warehouses, stops, max_stops=40, time_budget=5.0)
+
+    visited = np.concatenate([plan.stops for plan in plans])
+    assert sorted(visited.tolist()) == list(range(500))
+    assert all(len(plan.stops) <= 40 for plan in plans)
+    nearest = np.argmax(stops @ warehouses.T, axis=1)
+    assert all((nearest[plan.stops] == plan.warehouse).all() for plan in plans)
+
+
+def test_plan_routes_improves_on_nearest_neighbour_within_budget():
+    warehouses = vectors([(-30.0, -51.0)])
+    stops = random_stops(400)
+
+    unimproved = plan_routes(warehouses, stops, max_stops=40, time_budget=0.0)
+    improved = plan_routes(warehouses, stops, max_stops=40, time_budget=5.0)
+
+    assert sum(plan.distance for plan in improved) < sum(plan.distance for plan in unimproved)
+
+
+def test_plan_routes_without_stops():
+    assert not plan_routes(vectors([(-30.0, -51.0)]), np.empty((0, 3)), 40, 1.0)
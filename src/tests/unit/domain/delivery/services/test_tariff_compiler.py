@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from domain.base.value_object import Money
+from domain.delivery.adapters.cost_calculator_adapter import ORDER_PRICE_THRESHOLD, delivery_costs
+from domain.delivery.services.tariff_compiler import (
+    compile_from_maps,
+    compile_table,
+    compile_tariffs,
+)
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+
+
+def test_uniform_regions_collapse_to_one_prefix():
+    postcodes = ['12300001', '12300002', '12301000', '12400000', '12400001']
+    costs = np.array([5_000, 5_000, 5_000, 5_000, 6_000])
+
+    table = compile_table(postcodes, costs, min_prefix=3)
+
+    assert table.prefixes == ['123', '12400000', '12400001']
+    assert table.lookup('123-99999') == Money(5_000)
+
+
+def test_min_prefix_bounds_region_size():
+    postcodes = ['12300001', '45600001']
+    table = compile_table(postcodes, np.array([5_000, 5_000]), min_prefix=5)
+    assert table.prefixes == ['12300', '45600']
+    assert table.lookup('12399-000') is None
+
+
+def test_postcodes_ending_inside_a_region_stay_exact():
+    table = compile_table(['123', '1234', '1235'], np.array([1, 2, 3]), min_prefix=1)
+    assert [table.lookup(code) for code in ('123', '1234', '1235', '1236')] == [1, 2, 3, None]
+
+
+@pytest.mark.parametrize('min_prefix', [0, 3, 8])
+def test_compiled_tariffs_reproduce_every_live_cost(min_prefix):
+    generator = np.random.default_rng(3)
+    postcodes = [f"{code:08d}" for code in generator.choice(10**8, 2_000, replace=False)]
+    distances = generator.choice([0.0, 12.0, 29.9, 30.0, 31.5, 80.25], len(postcodes))
+
+    tariffs = compile_tariffs(postcodes, distances.tolist(), min_prefix)
+
+    small = delivery_costs(np.zeros(len(postcodes), dtype=np.int64), distances)
+    large = delivery_costs(np.full(len(postcodes), ORDER_PRICE_THRESHOLD), distances)
+    for postcode, small_cost, large_cost in zip(postcodes, small.tolist(), large.tolist()):
+        assert tariffs.lookup(postcode, large=False) == small_cost
+        assert tariffs.lookup(postcode, large=True) == large_cost
+    if min_prefix < 8:
+        assert len(tariffs.large) < len(postcodes)
+
+
+def test_compile_from_maps_covers_known_postcodes():
+    maps = LocalMapsAdapter.from_coordinates(
+        {'91755-720': (-30.11, -51.17), '01310-100': (-23.56, -46.66)}, [(-30.03, -51.22)]
+    )
+    tariffs = compile_from_maps(maps, min_prefix=8)
+    assert tariffs.lookup('91755720', large=True) == Money(0)
+    assert tariffs.lookup('01310-100', large=True) == Money(5_000)
@@ -0,0 +1,149 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from adapters.in_memory_cache_adapter import InMemoryCacheAdapter
+from domain.maps.adapters.cached_maps_adapter import CachedMapsAdapter, address_key
+from domain.maps.model.value_objects import Address, StatesEnum
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+
+
+def make_address(house_number='70', road='Rua Padre Emilio Hartmann', postcode='91755-720'):
+    return Address(
+        house_number=house_number,
+        road=road,
+        sub_district='Hípica',
+        district='Porto Alegre',
+        state=StatesEnum.RS,
+        postcode=postcode,
+        country='Brazil',
+    )
+
+
+@pytest.fixture
+def maps_service():
+    return AsyncMock(
+        spec=MapsAdapterInterface, **{'calculate_distance_from_warehouses.return_value': 12.5}
+    )
+
+
+@pytest.fixture
+def adapter(maps_service) -> CachedMapsAdapter:
+    return CachedMapsAdapter(maps_service, InMemoryCacheAdapter(), max_entries=2, ttl=60)
+
+
+def test_address_key_normalizes_equivalent_addresses():
+    assert address_key(make_address()) == address_key(
+        make_address(
+            house_number='70/101', road='  rua padre  Emílio hartmann', postcode='91755720'
+        )
+    )
+    assert address_key(make_address()) != address_key(make_address(house_number='71'))
+
+
+@pytest.mark.asyncio
+async def test_distance_is_memoized_in_process(adapter, maps_service):
+    assert await adapter.calculate_distance_from_warehouses(make_address()) == 12.5
+    assert await adapter.calculate_distance_from_warehouses(make_address('70/2')) == 12.5
+    maps_service.calculate_distance_from_warehouses.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_distance_is_shared_through_the_cache(adapter, maps_service):
+    await adapter.calculate_distance_from_warehouses(make_address())
+    other_process = CachedMapsAdapter(AsyncMock(spec=MapsAdapterInterface), adapter.cache_adapter)
+
+    assert await other_process.calculate_distance_from_warehouses(make_address()) == 12.5
+    other_process.maps_service.calculate_distance_from_warehouses.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used(adapter):
+    first, second, third = make_address('1'), make_address('2'), make_address('3')
+    for address in (first, second, first, third):
+        await adapter.calculate_distance_from_warehouses(address)
+
+    assert list(adapter.distances) == [address_key(first), address_key(third)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_coalesced(adapter, maps_service):
+    release = asyncio.Event()
+
+    async def slow_distance(_):
+        await release.wait()
+        return 7.0
+
+    maps_service.calculate_distance_from_warehouses.side_effect = slow_distance
+    lookups = [
+        asyncio.create_task(adapter.calculate_distance_from_warehouses(make_address()))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*lookups) == [7.0] * 5
+    maps_service.calculate_distance_from_warehouses.assert_awaited_once()
+    assert not adapter._loading  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_failed_lookup_is_not_cached(adapter, maps_service):
+    maps_service.calculate_distance_from_warehouses.side_effect = [RuntimeError('down'), 3.0]
+
+    with pytest.raises(RuntimeError):
+        await adapter.calculate_distance_from_warehouses(make_address())
+
+    assert await adapter.calculate_distance_from_warehouses(make_address()) == 3.0
+
+
+@pytest.mark.asyncio
+async def test_batch_sends_only_misses_in_one_call(adapter, maps_service):
+    maps_service.calculate_distances.side_effect = lambda destinations: [
+        float(destination.house_number) for destination in destinations
+    ]
+    await adapter.calculate_distances([make_address('1')])
+    maps_service.calculate_distances.reset_mock()
+
+    distances = await adapter.calculate_distances(
+        [make_address('1'), make_address('2'), make_address('2/5'), make_address('3')]
+    )
+
+    assert distances == [1.0, 2.0, 2.0, 3.0]
+    [sent] = maps_service.calculate_distances.await_args.args
+    assert [destination.house_number for destination in sent] == ['2', '3']
+
+
+@pytest.mark.asyncio
+async def test_batch_joins_lookups_in_flight(adapter, maps_service):
+    release = asyncio.Event()
+
+    async def slow_distance(_):
+        await release.wait()
+        return 7.0
+
+    maps_service.calculate_distance_from_warehouses.side_effect = slow_distance
+    maps_service.calculate_distances.return_value = [4.0]
+    single = asyncio.create_task(adapter.calculate_distance_from_warehouses(make_address('1')))
+    await asyncio.sleep(0)
+    batch = asyncio.create_task(adapter.calculate_distances([make_address('1'), make_address('4')]))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await batch == [7.0, 4.0]
+    assert await single == 7.0
+    [sent] = maps_service.calculate_distances.await_args.args
+    assert [destination.house_number for destination in sent] == ['4']
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_caller_and_is_not_cached(adapter, maps_service):
+    maps_service.calculate_distances.side_effect = RuntimeError('down')
+
+    with pytest.raises(RuntimeError):
+        await adapter.calculate_distances([make_address('1')])
+
+    assert not adapter.distances
+    assert not adapter._loading  # pylint: disable=protected-access
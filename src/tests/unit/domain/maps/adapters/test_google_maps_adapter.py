@@ -54,3 +54,10 @@ async def test_calculate_distance_none_house_number_typeerror():
     destination = make_address(None)
     result = await adapter.calculate_distance_from_warehouses(destination)
     assert result == 0.0
+
+
+@pytest.mark.asyncio
+async def test_calculate_distances_keeps_order():
+    adapter = GoogleMapsAdapter()
+    destinations = [make_address(3), make_address('7/1'), make_address(3)]
+    assert await adapter.calculate_distances(destinations) == [3.0, 7.0, 3.0]
@@ -0,0 +1,98 @@
+# pylint: disable=redefined-outer-name
+import math
+
+import pytest
+
+from domain.maps.adapters.local_maps_adapter import EARTH_RADIUS_KM, LocalMapsAdapter
+from domain.maps.exceptions.maps_exceptions import DestinationNotFound
+from domain.maps.model.value_objects import Address, StatesEnum
+
+# Porto Alegre, São Paulo and Florianópolis
+WAREHOUSES = [(-30.0346, -51.2177), (-23.5505, -46.6333), (-27.5954, -48.5480)]
+POSTCODES = {
+    '91755-720': (-30.1120, -51.1690),
+    '01310-100': (-23.5614, -46.6559),
+    '88015-200': (-27.5900, -48.5500),
+}
+
+
+def haversine(first, second) -> float:
+    latitude_1, longitude_1, latitude_2, longitude_2 = map(math.radians, (*first, *second))
+    latitude_term = math.sin((latitude_2 - latitude_1) / 2) ** 2
+    longitude_term = math.sin((longitude_2 - longitude_1) / 2) ** 2
+    hav = latitude_term + math.cos(latitude_1) * math.cos(latitude_2) * longitude_term
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(hav))
+
+
+def make_address(postcode: str) -> Address:
+    return Address(
+        house_number='70',
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state=StatesEnum.RS,
+        postcode=postcode,
+        country='Brasil',
+    )
+
+
+@pytest.fixture
+def adapter() -> LocalMapsAdapter:
+    return LocalMapsAdapter.from_coordinates(POSTCODES, WAREHOUSES)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('postcode', list(POSTCODES))
+async def test_distance_to_nearest_warehouse_is_haversine(adapter, postcode):
+    expected = min(haversine(POSTCODES[postcode], warehouse) for warehouse in WAREHOUSES)
+
+    distance = await adapter.calculate_distance_from_warehouses(make_address(postcode))
+
+    assert distance == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_postcode_is_normalized(adapter):
+    assert await adapter.calculate_distance_from_warehouses(
+        make_address('91755720')
+    ) == await adapter.calculate_distance_from_warehouses(make_address('91755-720'))
+
+
+@pytest.mark.asyncio
+async def test_unknown_postcode_raises(adapter):
+    with pytest.raises(DestinationNotFound):
+        await adapter.calculate_distance_from_warehouses(make_address('00000-000'))
+
+
+@pytest.mark.asyncio
+async def test_from_files(tmp_path):
+    postcode_rows = [f"{code},{lat},{lon}" for code, (lat, lon) in POSTCODES.items()]
+    warehouse_rows = [f"w{index},{lat},{lon}" for index, (lat, lon) in enumerate(WAREHOUSES)]
+    postcodes = tmp_path / 'postcodes.csv'
+    postcodes.write_text('\n'.join(['postcode,latitude,longitude', *postcode_rows]), 'utf-8')
+    warehouses = tmp_path / 'warehouses.csv'
+    warehouses.write_text('\n'.join(['warehouse_id,latitude,longitude', *warehouse_rows]), 'utf-8')
+
+    adapter = LocalMapsAdapter.from_files(postcodes, warehouses)
+
+    distance = await adapter.calculate_distance_from_warehouses(make_address('88015-200'))
+    assert distance == pytest.approx(haversine(POSTCODES['88015-200'], WAREHOUSES[2]))
+
+
+@pytest.mark.asyncio
+async def test_batch_distances_match_single_lookups(adapter):
+    destinations = [make_address(postcode) for postcode in [*POSTCODES, '91755720']]
+
+    distances = await adapter.calculate_distances(destinations)
+
+    assert distances == pytest.approx(
+        [await adapter.calculate_distance_from_warehouses(item) for item in destinations]
+    )
+    assert adapter.distance_matrix(destinations).shape == (4, len(WAREHOUSES))
+    assert await adapter.calculate_distances([]) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_with_unknown_postcode_raises(adapter):
+    with pytest.raises(DestinationNotFound):
+        await adapter.calculate_distances([make_address('91755-720'), make_address('1')])
@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from domain.base.resilience import CircuitBreaker, Resilience
+from domain.maps.adapters.resilient_maps_adapter import ResilientMapsAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+
+ADDRESS = Address(
+    house_number='70',
+    road='Rua Jacuí',
+    sub_district='Hípica',
+    district='Porto Alegre',
+    state=StatesEnum.RS,
+    postcode='91755-720',
+    country='Brazil',
+)
+
+
+@pytest.mark.asyncio
+async def test_distances_come_from_the_maps_service():
+    maps = AsyncMock(spec=MapsAdapterInterface)
+    maps.calculate_distances.return_value = [12.5]
+    adapter = ResilientMapsAdapter(maps, Resilience('maps'))
+
+    assert await adapter.calculate_distances([ADDRESS]) == [12.5]
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_while_the_maps_service_fails():
+    maps = AsyncMock(spec=MapsAdapterInterface)
+    maps.calculate_distance_from_warehouses.side_effect = ConnectionError()
+    fallback = AsyncMock(spec=MapsAdapterInterface)
+    fallback.calculate_distance_from_warehouses.return_value = 30.0
+    adapter = ResilientMapsAdapter(
+        maps, Resilience('maps', CircuitBreaker('maps', failure_threshold=1)), fallback=fallback
+    )
+
+    assert await adapter.calculate_distance_from_warehouses(ADDRESS) == 30.0
+    assert await adapter.calculate_distance_from_warehouses(ADDRESS) == 30.0
+    maps.calculate_distance_from_warehouses.assert_awaited_once_with(ADDRESS)
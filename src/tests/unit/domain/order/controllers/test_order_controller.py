@@ -1,20 +1,25 @@
 # pylint: disable=redefined-outer-name, protected-access
+import json
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from bson import Timestamp
 from fastapi import Request
 from pydantic import ValidationError
 
-from domain.delivery.adapters.cost_calculator_adapter import DeliveryCostCalculatorAdapter
+from domain.base.bus import CommandBus, QueryBus
 from domain.order.controllers.order_controller import OrderController
 from domain.order.dtos.order_dtos import (
     Address,
     OrderCreateRequest,
     OrderUpdateStatusRequest,
+    SerializedOrderDetail,
 )
 from domain.order.exceptions.order_exceptions import (
     CannotCancelAlreadyCancelled,
     CannotCancelAlreadyPaid,
+    CannotCancelPaymentPending,
     CannotPayAlreadyPaid,
     CannotPayCancelled,
     CannotUpdateToStatus,
@@ -22,35 +27,48 @@ from domain.order.exceptions.order_exceptions import (
     OrderAlreadyPaidException,
     OrderIdRequired,
     OrderNotFound,
+    OrderPaymentPendingException,
     PaymentNotVerifiedException,
     PaymentVerificationFailed,
 )
-from domain.order.model.entities import Order
-from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
-from domain.order.repositories.order_event_store_repository import (
-    OrderEventStoreRepository,
-)
-from domain.order.repositories.order_repository import OrderRepository
-from domain.order.services.order_service import OrderService
-from domain.payment.adapters.paypal_adapter import PayPalPaymentAdapter
-from domain.product.adapters.product_adapter import ProductAdapter
+from domain.order.model.commands import CancelOrder, CreateOrder, PayOrder, RequestOrderPayment
+from domain.order.model.queries import GetOrder, GetOrderVersion
+from domain.order.model.value_objects import OrderId, OrderItem
 
 
 @pytest.fixture
 def order_controller() -> OrderController:
-    order_service = OrderService(
-        repository=MagicMock(spec=OrderRepository),
-        payment_service=MagicMock(spec=PayPalPaymentAdapter),
-        product_service=MagicMock(spec=ProductAdapter),
-        delivery_service=MagicMock(spec=DeliveryCostCalculatorAdapter),
-        event_store=MagicMock(spec=OrderEventStoreRepository),
+    return OrderController(
+        command_bus=AsyncMock(spec=CommandBus), query_bus=AsyncMock(spec=QueryBus)
     )
-    return OrderController(order_service=order_service)
+
+
+def causal_sessions(operation_time=None) -> MagicMock:
+    """Connector whose causal sessions end at ``operation_time``; records the tokens."""
+    sessions = MagicMock()
+    sessions.after = []
+
+    @asynccontextmanager
+    async def causal_session(after=None):
+        sessions.after.append(after)
+        yield MagicMock(operation_time=operation_time)
+
+    sessions.causal_session = causal_session
+    return sessions
+
+
+def answer_queries(order_controller: OrderController, version, detail=None):
+    async def dispatch(query):
+        if isinstance(query, GetOrderVersion):
+            return version
+        return detail
+
+    order_controller.query_bus.dispatch.side_effect = dispatch
 
 
 @pytest.mark.asyncio
 async def test_create_order_success(order_controller: OrderController):
-    order_controller.order_service.create_new_order = AsyncMock(return_value=OrderId('o1'))
+    order_controller.command_bus.dispatch.return_value = OrderId('o1')
     req = Request(scope={'type': 'http'})
     order = OrderCreateRequest(
         buyer_id='b1',
@@ -67,33 +85,145 @@ async def test_create_order_success(order_controller: OrderController):
     )
     response = await order_controller.create_order(req, order)
     assert response.order_id == 'o1'
-    order_controller.order_service.create_new_order.assert_awaited()
+    command = order_controller.command_bus.dispatch.call_args.args[0]
+    assert isinstance(command, CreateOrder)
+    assert command.buyer_id == 'b1'
+    assert command.destination == order.destination
 
 
 @pytest.mark.asyncio
-async def test_get_order_success(order_controller: OrderController):
-    order = Order(
-        buyer_id=BuyerId('b1'),
+async def test_create_order_forwards_idempotency_key(order_controller: OrderController):
+    order_controller.command_bus.dispatch.return_value = OrderId('o1')
+    req = Request(scope={'type': 'http'})
+    order = OrderCreateRequest(
+        buyer_id='b1',
         items=[OrderItem(product_id='p1', amount=1)],
-        product_cost=100,
-        delivery_cost=10,
-        payment_id='pay123',
+        destination=Address(
+            house_number='S/N',
+            road='Rua A',
+            sub_district='Bairro X',
+            district='Cidade Y',
+            state='Rio Grande do Sul',
+            postcode='12345-678',
+            country='Brasil',
+        ),
+    )
+
+    await order_controller.create_order(req, order, idempotency_key='key-1')
+
+    command = order_controller.command_bus.dispatch.call_args.args[0]
+    assert command.idempotency_key == 'key-1'
+
+
+@pytest.mark.asyncio
+async def test_get_order_success(order_controller: OrderController):
+    answer_queries(
+        order_controller, 2, SerializedOrderDetail(version=2, content='{"order_id": "o1"}')
     )
-    order_controller.order_service.get_order_from_id = AsyncMock(return_value=order)
     req = Request(scope={'type': 'http'})
+
     result = await order_controller.get_order(req, 'o1')
-    assert result is not None
-    order_controller.order_service.get_order_from_id.assert_awaited_with(order_id='o1')
+
+    assert result.body == b'{"order_id": "o1"}'
+    assert result.media_type == 'application/json'
+    assert result.headers['ETag'] == '"o1-v2"'
+    order_controller.query_bus.dispatch.assert_awaited_with(GetOrder(order_id='o1', version=2))
+
+
+@pytest.mark.asyncio
+async def test_get_order_etag_follows_rendered_version(order_controller: OrderController):
+    answer_queries(order_controller, 2, SerializedOrderDetail(version=3, content='{}'))
+    req = Request(scope={'type': 'http'})
+
+    result = await order_controller.get_order(req, 'o1')
+
+    assert result.headers['ETag'] == '"o1-v3"'
+
+
+@pytest.mark.asyncio
+async def test_get_order_not_modified(order_controller: OrderController):
+    answer_queries(order_controller, 3)
+    req = Request(scope={'type': 'http'})
+
+    result = await order_controller.get_order(req, 'o1', if_none_match='"o1-v3"')
+
+    assert result.status_code == 304
+    assert result.headers['ETag'] == '"o1-v3"'
+    order_controller.query_bus.dispatch.assert_awaited_once_with(GetOrderVersion(order_id='o1'))
+
+
+@pytest.mark.asyncio
+async def test_get_order_modified_since_etag(order_controller: OrderController):
+    answer_queries(order_controller, 4, SerializedOrderDetail(version=4, content='{}'))
+    req = Request(scope={'type': 'http'})
+
+    result = await order_controller.get_order(req, 'o1', if_none_match='"o1-v3"')
+
+    assert result.status_code == 200
+    assert result.headers['ETag'] == '"o1-v4"'
 
 
 @pytest.mark.asyncio
 async def test_get_order_not_found(order_controller: OrderController):
-    order_controller.order_service.get_order_from_id = AsyncMock(return_value=None)
+    answer_queries(order_controller, None)
     req = Request(scope={'type': 'http'})
     with pytest.raises(OrderNotFound):
         await order_controller.get_order(req, 'o404')
 
 
+@pytest.mark.asyncio
+async def test_get_order_removed_after_version_lookup(order_controller: OrderController):
+    answer_queries(order_controller, 1, None)
+    req = Request(scope={'type': 'http'})
+    with pytest.raises(OrderNotFound):
+        await order_controller.get_order(req, 'o404')
+
+
+@pytest.mark.asyncio
+async def test_get_order_reads_after_the_token(order_controller: OrderController):
+    order_controller.sessions = causal_sessions()
+    answer_queries(order_controller, 2, SerializedOrderDetail(version=2, content='{}'))
+    req = Request(scope={'type': 'http'})
+
+    await order_controller.get_order(req, 'o1')
+    assert not order_controller.sessions.after
+
+    await order_controller.get_order(req, 'o1', read_after='1700000000.7')
+    assert order_controller.sessions.after == ['1700000000.7']
+
+
+@pytest.mark.asyncio
+async def test_commands_answer_with_a_read_after_token(order_controller: OrderController):
+    order_controller.sessions = causal_sessions(Timestamp(1700000000, 7))
+    order_controller.command_bus.dispatch.return_value = OrderId('o1')
+    order_controller._cancel_order = AsyncMock()
+    req = Request(scope={'type': 'http'})
+    order = OrderCreateRequest(
+        buyer_id='b1',
+        items=[OrderItem(product_id='p1', amount=1)],
+        destination=Address(
+            house_number='S/N',
+            road='Rua A',
+            sub_district='Bairro X',
+            district='Cidade Y',
+            state='Rio Grande do Sul',
+            postcode='12345-678',
+            country='Brasil',
+        ),
+    )
+
+    created = await order_controller.create_order(req, order)
+    updated = await order_controller.update_order(
+        req, 'o1', OrderUpdateStatusRequest(status='cancelled')
+    )
+
+    assert json.loads(created.body) == {'order_id': 'o1'}
+    assert json.loads(updated.body)['status'] == 'cancelled'
+    for response in (created, updated):
+        assert response.headers['X-Read-After'] == '1700000000.7'
+    assert order_controller.sessions.after == [None, None]
+
+
 @pytest.mark.asyncio
 async def test_update_order_blank_order_id(order_controller: OrderController):
     req = Request(scope={'type': 'http'})
@@ -121,7 +251,7 @@ async def test_update_order_paid_success(order_controller: OrderController):
     req = Request(scope={'type': 'http'})
     result = await order_controller.update_order(req, 'o1', OrderUpdateStatusRequest(status='paid'))
     assert result.status == 'paid'
-    order_controller._pay_order.assert_awaited_with('o1')
+    order_controller._pay_order.assert_awaited_with('o1', None)
 
 
 @pytest.mark.asyncio
@@ -132,7 +262,7 @@ async def test_update_order_cancelled_success(order_controller: OrderController)
         req, 'o1', OrderUpdateStatusRequest(status='cancelled')
     )
     assert result.status == 'cancelled'
-    order_controller._cancel_order.assert_awaited_with('o1')
+    order_controller._cancel_order.assert_awaited_with('o1', None)
 
 
 @pytest.mark.asyncio
@@ -142,54 +272,92 @@ async def test_update_order_invalid_transition(order_controller: OrderController
         await order_controller.update_order(req, 'o1', OrderUpdateStatusRequest(status='waiting'))
 
 
+@pytest.mark.asyncio
+async def test_update_order_paid_accepted_with_async_payments(order_controller: OrderController):
+    order_controller.async_payments = True
+    req = Request(scope={'type': 'http'})
+    response = await order_controller.update_order(
+        req, 'o1', OrderUpdateStatusRequest(status='paid'), idempotency_key='key-1'
+    )
+    assert response.status_code == 202
+    assert response.headers['Location'] == '/core/v1/orders/o1'
+    assert json.loads(response.body) == {'order_id': 'o1', 'status': 'payment_pending'}
+    order_controller.command_bus.dispatch.assert_awaited_once_with(
+        RequestOrderPayment(order_id='o1', idempotency_key='key-1')
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'error, expected',
+    [
+        (OrderAlreadyCancelledException(), CannotPayCancelled),
+        (OrderAlreadyPaidException(), CannotPayAlreadyPaid),
+    ],
+)
+async def test__request_payment_maps_errors(order_controller: OrderController, error, expected):
+    order_controller.command_bus.dispatch.side_effect = error
+    with pytest.raises(expected):
+        await order_controller._request_payment('o1')
+
+
 @pytest.mark.asyncio
 async def test__pay_order_success(order_controller: OrderController):
-    order_controller.order_service.pay_order = AsyncMock()
     await order_controller._pay_order('o1')
-    order_controller.order_service.pay_order.assert_awaited_with('o1')
+    order_controller.command_bus.dispatch.assert_awaited_with(PayOrder(order_id='o1'))
 
 
 @pytest.mark.asyncio
-async def test__pay_order_already_cancelled(order_controller: OrderController):
-    order_controller.order_service.pay_order = AsyncMock(
-        side_effect=OrderAlreadyCancelledException()
+async def test__pay_order_with_idempotency_key(order_controller: OrderController):
+    await order_controller._pay_order('o1', 'key-1')
+    order_controller.command_bus.dispatch.assert_awaited_with(
+        PayOrder(order_id='o1', idempotency_key='key-1')
     )
+
+
+@pytest.mark.asyncio
+async def test__pay_order_already_cancelled(order_controller: OrderController):
+    order_controller.command_bus.dispatch.side_effect = OrderAlreadyCancelledException()
     with pytest.raises(CannotPayCancelled):
         await order_controller._pay_order('o1')
 
 
 @pytest.mark.asyncio
 async def test__pay_order_already_paid(order_controller: OrderController):
-    order_controller.order_service.pay_order = AsyncMock(side_effect=OrderAlreadyPaidException())
+    order_controller.command_bus.dispatch.side_effect = OrderAlreadyPaidException()
     with pytest.raises(CannotPayAlreadyPaid):
         await order_controller._pay_order('o1')
 
 
 @pytest.mark.asyncio
 async def test__pay_order_not_verified(order_controller: OrderController):
-    order_controller.order_service.pay_order = AsyncMock(side_effect=PaymentNotVerifiedException())
+    order_controller.command_bus.dispatch.side_effect = PaymentNotVerifiedException()
     with pytest.raises(PaymentVerificationFailed):
         await order_controller._pay_order('o1')
 
 
 @pytest.mark.asyncio
 async def test__cancel_order_success(order_controller: OrderController):
-    order_controller.order_service.cancel_order = AsyncMock()
     await order_controller._cancel_order('o1')
-    order_controller.order_service.cancel_order.assert_awaited_with('o1')
+    order_controller.command_bus.dispatch.assert_awaited_with(CancelOrder(order_id='o1'))
 
 
 @pytest.mark.asyncio
 async def test__cancel_order_already_cancelled(order_controller: OrderController):
-    order_controller.order_service.cancel_order = AsyncMock(
-        side_effect=OrderAlreadyCancelledException()
-    )
+    order_controller.command_bus.dispatch.side_effect = OrderAlreadyCancelledException()
     with pytest.raises(CannotCancelAlreadyCancelled):
         await order_controller._cancel_order('o1')
 
 
 @pytest.mark.asyncio
 async def test__cancel_order_already_paid(order_controller: OrderController):
-    order_controller.order_service.cancel_order = AsyncMock(side_effect=OrderAlreadyPaidException())
+    order_controller.command_bus.dispatch.side_effect = OrderAlreadyPaidException()
     with pytest.raises(CannotCancelAlreadyPaid):
         await order_controller._cancel_order('o1')
+
+
+@pytest.mark.asyncio
+async def test__cancel_order_payment_pending(order_controller: OrderController):
+    order_controller.command_bus.dispatch.side_effect = OrderPaymentPendingException()
+    with pytest.raises(CannotCancelPaymentPending):
+        await order_controller._cancel_order('o1')
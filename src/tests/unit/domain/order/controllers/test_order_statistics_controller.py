@@ -0,0 +1,53 @@
+# pylint: disable=redefined-outer-name
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import Request
+
+from domain.base.bus import QueryBus
+from domain.order.controllers.order_statistics_controller import OrderStatisticsController
+from domain.order.dtos.order_dtos import OrderStatisticsDetail
+from domain.order.model.queries import GetOrderStatistics
+from domain.order.model.value_objects import (
+    OrderRevenueCounters,
+    OrderStatistics,
+    OrderStatusCounters,
+)
+
+
+@pytest.fixture
+def statistics_controller() -> OrderStatisticsController:
+    return OrderStatisticsController(query_bus=AsyncMock(spec=QueryBus))
+
+
+@pytest.mark.asyncio
+async def test_get_statistics(statistics_controller: OrderStatisticsController):
+    query_bus = statistics_controller.query_bus
+    query_bus.dispatch.return_value = OrderStatistics(
+        status=OrderStatusCounters(waiting=1, paid=2),
+        day=OrderRevenueCounters(orders=3, paid=2, revenue='220.00'),
+    )
+    req = Request(scope={'type': 'http'})
+
+    result = await statistics_controller.get_statistics(req, day=date(2026, 10, 19))
+
+    assert isinstance(result, OrderStatisticsDetail)
+    assert result.status.paid == 2
+    assert result.day.orders == 3
+    assert result.buyer is None
+    query_bus.dispatch.assert_awaited_once_with(
+        GetOrderStatistics(day=date(2026, 10, 19), buyer_id=None)
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_for_buyer(statistics_controller: OrderStatisticsController):
+    query_bus = statistics_controller.query_bus
+    query_bus.dispatch.return_value = OrderStatistics(buyer=OrderRevenueCounters(orders=1))
+    req = Request(scope={'type': 'http'})
+
+    result = await statistics_controller.get_statistics(req, buyer_id='b1')
+
+    assert result.buyer.orders == 1
+    query_bus.dispatch.assert_awaited_once_with(GetOrderStatistics(day=None, buyer_id='b1'))
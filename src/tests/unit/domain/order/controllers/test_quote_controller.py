@@ -0,0 +1,44 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from domain.base.bus import QueryBus
+from domain.base.value_object import Money
+from domain.order.controllers.quote_controller import QuoteController
+from domain.order.dtos.quote_dtos import CART_EXAMPLE, CartQuotesRequest
+from domain.order.model.queries import QuoteCarts
+from domain.order.model.value_objects import CartQuote
+from settings import QUOTE_MAX_CARTS
+
+
+@pytest.mark.asyncio
+async def test_quote_carts():
+    controller = QuoteController(query_bus=AsyncMock(spec=QueryBus))
+    controller.query_bus.dispatch.return_value = [
+        CartQuote(product_cost=Money(2_400), delivery_cost=Money(5_000))
+    ]
+    quote_request = CartQuotesRequest.model_validate({'carts': [CART_EXAMPLE]})
+
+    response = await controller.quote_carts(Request(scope={'type': 'http'}), quote_request)
+
+    query = controller.query_bus.dispatch.call_args.args[0]
+    assert isinstance(query, QuoteCarts)
+    assert query.carts == [quote_request.carts[0].to_cart()]
+    assert response.model_dump(mode='json') == {
+        'quotes': [{'product_cost': '24.00', 'delivery_cost': '50.00', 'total_cost': '74.00'}]
+    }
+
+
+def test_quote_requests_with_too_many_carts_are_rejected():
+    controller = QuoteController(query_bus=AsyncMock(spec=QueryBus))
+    app = FastAPI()
+    app.include_router(controller.router)
+
+    response = TestClient(app).post(
+        '/core/v1/quotes/', json={'carts': [CART_EXAMPLE] * (QUOTE_MAX_CARTS + 1)}
+    )
+
+    assert response.status_code == 422
+    controller.query_bus.dispatch.assert_not_awaited()
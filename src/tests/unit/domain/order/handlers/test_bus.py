@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from adapters.striped_lock_adapter import StripedLockAdapter
+from domain.order.exceptions.order_exceptions import EntityOutdated
+from domain.order.handlers.bus import (
+    build_order_command_bus,
+    build_order_query_bus,
+    order_lock_key,
+)
+from domain.order.model.commands import (
+    CancelOrder,
+    CompleteOrderPayment,
+    PayOrder,
+    RequestOrderPayment,
+)
+from domain.order.model.queries import GetOrderVersion, QuoteCarts
+from domain.order.model.value_objects import OrderId
+from domain.order.repositories.order_repository import OrderRepository
+from domain.order.repositories.order_statistics_repository import OrderStatisticsRepository
+from domain.order.services.cart_quote_service import CartQuoteService
+from domain.order.services.order_service import OrderService
+from utils.retry import RetryPolicy
+
+
+@pytest.mark.asyncio
+async def test_command_bus_retries_outdated_payments():
+    order_service = AsyncMock(spec=OrderService)
+    order_service.pay_order.side_effect = [EntityOutdated(), None]
+    bus = build_order_command_bus(
+        order_service, retry_policies={PayOrder: RetryPolicy(attempts=2, backoff=0)}
+    )
+
+    await bus.dispatch(PayOrder(order_id=OrderId('o1')))
+
+    assert order_service.pay_order.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_command_bus_gives_up_after_retry_attempts():
+    order_service = AsyncMock(spec=OrderService)
+    order_service.pay_order.side_effect = EntityOutdated()
+    bus = build_order_command_bus(
+        order_service, retry_policies={PayOrder: RetryPolicy(attempts=2, backoff=0)}
+    )
+
+    with pytest.raises(EntityOutdated):
+        await bus.dispatch(PayOrder(order_id=OrderId('o1')))
+    assert order_service.pay_order.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_command_bus_retry_policies_are_per_command():
+    order_service = AsyncMock(spec=OrderService)
+    order_service.pay_order.side_effect = EntityOutdated()
+    order_service.cancel_order.side_effect = EntityOutdated()
+    bus = build_order_command_bus(
+        order_service,
+        retry_policies={
+            PayOrder: RetryPolicy(attempts=1),
+            CancelOrder: RetryPolicy(attempts=4, backoff=0),
+        },
+    )
+
+    with pytest.raises(EntityOutdated):
+        await bus.dispatch(PayOrder(order_id=OrderId('o1')))
+    with pytest.raises(EntityOutdated):
+        await bus.dispatch(CancelOrder(order_id=OrderId('o1')))
+
+    assert order_service.pay_order.await_count == 1
+    assert order_service.cancel_order.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_query_bus_routes_queries():
+    repository = AsyncMock(spec=OrderRepository)
+    repository.version_from_id.return_value = 3
+    bus = build_order_query_bus(repository, AsyncMock(spec=OrderStatisticsRepository))
+
+    assert await bus.dispatch(GetOrderVersion(order_id=OrderId('o1'))) == 3
+
+
+@pytest.mark.asyncio
+async def test_query_bus_routes_quotes():
+    quote_service = AsyncMock(spec=CartQuoteService)
+    quote_service.quote.return_value = []
+    bus = build_order_query_bus(
+        AsyncMock(spec=OrderRepository),
+        AsyncMock(spec=OrderStatisticsRepository),
+        quote_service=quote_service,
+    )
+
+    assert await bus.dispatch(QuoteCarts(carts=[])) == []
+    quote_service.quote.assert_awaited_once_with([])
+
+
+def test_order_lock_key():
+    assert order_lock_key(CancelOrder(order_id=OrderId('o1'))) == 'order:o1'
+
+
+@pytest.mark.asyncio
+async def test_command_bus_serializes_commands_per_order():
+    active, peak = 0, 0
+
+    async def pay_order(order_id):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+
+    order_service = AsyncMock(spec=OrderService)
+    order_service.pay_order.side_effect = pay_order
+    order_service.cancel_order.side_effect = pay_order
+    bus = build_order_command_bus(order_service, lock=StripedLockAdapter())
+
+    await asyncio.gather(
+        bus.dispatch(PayOrder(order_id=OrderId('o1'))),
+        bus.dispatch(CancelOrder(order_id=OrderId('o1'))),
+        bus.dispatch(PayOrder(order_id=OrderId('o1'))),
+    )
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_command_bus_routes_background_payment_commands():
+    order_service = AsyncMock(spec=OrderService)
+    bus = build_order_command_bus(order_service)
+
+    await bus.dispatch(RequestOrderPayment(order_id=OrderId('o1')))
+    await bus.dispatch(CompleteOrderPayment(order_id=OrderId('o1'), payment_verified=False))
+
+    order_service.request_payment.assert_awaited_once_with('o1')
+    order_service.complete_payment.assert_awaited_once_with('o1', False)
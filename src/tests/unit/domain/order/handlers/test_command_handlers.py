@@ -0,0 +1,50 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from domain.maps.model.value_objects import Address
+from domain.order.handlers.command_handlers import (
+    CancelOrderHandler,
+    CreateOrderHandler,
+    PayOrderHandler,
+)
+from domain.order.model.commands import CancelOrder, CreateOrder, PayOrder
+from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
+from domain.order.services.order_service import OrderService
+
+
+@pytest.mark.asyncio
+async def test_create_order_handler():
+    order_service = AsyncMock(spec=OrderService)
+    order_service.create_new_order.return_value = OrderId('o1')
+    items = (OrderItem(product_id='p1', amount=1),)
+    destination = Address(
+        house_number='S/N',
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state='Rio Grande do Sul',
+        postcode='12345-678',
+        country='Brasil',
+    )
+
+    result = await CreateOrderHandler(order_service)(
+        CreateOrder(buyer_id=BuyerId('b1'), items=items, destination=destination)
+    )
+
+    assert result == 'o1'
+    order_service.create_new_order.assert_awaited_once_with('b1', list(items), destination)
+
+
+@pytest.mark.asyncio
+async def test_pay_order_handler():
+    order_service = AsyncMock(spec=OrderService)
+    await PayOrderHandler(order_service)(PayOrder(order_id=OrderId('o1')))
+    order_service.pay_order.assert_awaited_once_with('o1')
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_handler():
+    order_service = AsyncMock(spec=OrderService)
+    await CancelOrderHandler(order_service)(CancelOrder(order_id=OrderId('o1')))
+    order_service.cancel_order.assert_awaited_once_with('o1')
@@ -0,0 +1,92 @@
+import json
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+from domain.order.dtos.order_dtos import OrderDetail
+from domain.order.handlers.query_handlers import (
+    GetOrderHandler,
+    GetOrderStatisticsHandler,
+    GetOrderVersionHandler,
+)
+from domain.order.model.entities import Order
+from domain.order.model.queries import GetOrder, GetOrderStatistics, GetOrderVersion
+from domain.order.model.value_objects import BuyerId, OrderId, OrderItem, OrderStatistics
+from domain.order.repositories.order_repository import OrderRepository
+from domain.order.repositories.order_statistics_repository import OrderStatisticsRepository
+
+
+def make_order() -> Order:
+    return Order(
+        buyer_id=BuyerId('b1'),
+        items=[OrderItem(product_id='p1', amount=1)],
+        product_cost=100,
+        delivery_cost=10,
+        payment_id='pay123',
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_order_version_handler():
+    repository = AsyncMock(spec=OrderRepository)
+    repository.version_from_id.return_value = 7
+
+    result = await GetOrderVersionHandler(repository)(GetOrderVersion(order_id=OrderId('o4')))
+
+    assert result == 7
+    repository.version_from_id.assert_awaited_once_with('o4')
+
+
+@pytest.mark.asyncio
+async def test_get_order_handler_uses_cached_view():
+    repository = AsyncMock(spec=OrderRepository)
+    repository.view_from_id.return_value = '{}'
+
+    result = await GetOrderHandler(repository)(GetOrder(order_id=OrderId('o4'), version=2))
+
+    assert result.version == 2
+    assert result.content == '{}'
+    repository.view_from_id.assert_awaited_once_with('o4', 2)
+    repository.from_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_order_handler_renders_and_caches_view():
+    order = make_order()
+    repository = AsyncMock(spec=OrderRepository)
+    repository.view_from_id.return_value = None
+    repository.from_id.return_value = order
+
+    result = await GetOrderHandler(repository)(GetOrder(order_id=order.id, version=order.version))
+
+    assert result.version == order.version
+    assert json.loads(result.content) == OrderDetail.from_order(order).model_dump(mode='json')
+    repository.save_view.assert_awaited_once_with(order.id, order.version, result.content)
+
+
+@pytest.mark.asyncio
+async def test_get_order_handler_without_version_skips_view_lookup():
+    repository = AsyncMock(spec=OrderRepository)
+    repository.from_id.return_value = None
+
+    result = await GetOrderHandler(repository)(GetOrder(order_id=OrderId('o4')))
+
+    assert result is None
+    repository.view_from_id.assert_not_awaited()
+    repository.save_view.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_order_statistics_handler():
+    statistics_repository = AsyncMock(spec=OrderStatisticsRepository)
+    statistics_repository.get_statistics.return_value = OrderStatistics()
+
+    result = await GetOrderStatisticsHandler(statistics_repository)(
+        GetOrderStatistics(day=date(2026, 10, 19), buyer_id=BuyerId('b1'))
+    )
+
+    assert result == OrderStatistics()
+    statistics_repository.get_statistics.assert_awaited_once_with(
+        day=date(2026, 10, 19), buyer_id='b1'
+    )
@@ -4,7 +4,7 @@ from uuid import uuid4
 
 import pytest
 import pytest_asyncio
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from domain.base.event import DomainEvent
 from domain.order.exceptions.order_exceptions import EntityOutdated, PersistenceError
@@ -117,6 +117,28 @@ async def test_save_raises_persistence_error_on_duplicate(order_event_store_repo
         await repo.save(event)
 
 
+@pytest.mark.asyncio
+async def test_save_raises_entity_outdated_when_the_version_was_taken(
+    order_event_store_repository,
+):
+    repo = order_event_store_repository
+    repo.get_last_event_version_from_entity = AsyncMock(return_value=None)
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['events']
+    collection.insert_one.side_effect = DuplicateKeyError(
+        'dup', 11000, {'errmsg': 'E11000 duplicate key error index: aggregate_id_version dup key'}
+    )
+    order = Order(buyer_id='b5', items=[], product_cost=50, delivery_cost=25, payment_id='p5')
+    with pytest.raises(EntityOutdated):
+        await repo.save(make_event(order))
+
+
+def test_events_are_numbered_under_a_unique_index():
+    (index,) = [
+        index for index in OrderEventStoreRepository.INDEXES if index.name == 'aggregate_id_version'
+    ]
+    assert index.unique
+
+
 @pytest.mark.asyncio
 async def test_get_all_events_by_tracker_id_returns_events(order_event_store_repository):
     repo = order_event_store_repository
@@ -184,3 +206,116 @@ async def test_rebuild_aggregate_root_raises_persistence_error(order_event_store
     bad_event = DomainEvent(event_name='BadEvent', aggregate=FakeAgg(), tracker_id=uuid4())
     with pytest.raises(PersistenceError):
         await repo.rebuild_aggregate_root(bad_event, Order)
+
+
+@pytest.mark.asyncio
+async def test_save_notifies_subscribers(order_event_store_repository):
+    repo = order_event_store_repository
+    subscriber = AsyncMock()
+    repo.subscribers = (subscriber,)
+    repo.get_last_event_version_from_entity = AsyncMock(return_value=None)
+    order = Order(buyer_id='b9', items=[], product_cost=90, delivery_cost=45, payment_id='p9')
+    await repo.save(make_event(order))
+    published = subscriber.publish.call_args.args[0]
+    assert published.version == 1
+
+
+@pytest.mark.asyncio
+async def test_save_ignores_failing_subscriber(order_event_store_repository, caplog):
+    repo = order_event_store_repository
+    subscriber = AsyncMock()
+    subscriber.publish.side_effect = RuntimeError('projection down')
+    repo.subscribers = (subscriber,)
+    repo.get_last_event_version_from_entity = AsyncMock(return_value=None)
+    order = Order(buyer_id='b10', items=[], product_cost=10, delivery_cost=5, payment_id='p10')
+    await repo.save(make_event(order))
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['events']
+    collection.insert_one.assert_awaited_once()
+    assert 'Event subscriber failed' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_get_all_events_streams_events(order_event_store_repository):
+    repo = order_event_store_repository
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['events']
+    order = Order(buyer_id='b11', items=[], product_cost=10, delivery_cost=5, payment_id='p11')
+    document = make_event(order).model_dump(mode='json')
+    document['_id'] = 'ignore'
+
+    async def documents():
+        yield document
+
+    collection.find.return_value = documents()
+    result = [event async for event in repo.get_all_events()]
+    assert len(result) == 1
+    assert isinstance(result[0], DomainEvent)
+
+
+def latest_events(repo, documents):
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['events']
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=documents)
+    collection.aggregate.return_value = cursor
+    collection.insert_many = AsyncMock()
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_save_many_numbers_events_from_one_aggregation(order_event_store_repository):
+    repo = order_event_store_repository
+    subscriber = AsyncMock()
+    repo.subscribers = (subscriber,)
+    known = Order(buyer_id='b6', items=[], product_cost=60, delivery_cost=30, payment_id='p6')
+    known.version = 2
+    new = Order(buyer_id='b7', items=[], product_cost=70, delivery_cost=35, payment_id='p7')
+    tracker_id = uuid4()
+    collection = latest_events(
+        repo,
+        [
+            {
+                '_id': str(known.id),
+                'version': 3,
+                'tracker_id': str(tracker_id),
+                'aggregate_version': 1,
+            }
+        ],
+    )
+
+    await repo.save_many([make_event(known), make_event(new)])
+
+    collection.aggregate.assert_called_once()
+    documents = collection.insert_many.await_args.args[0]
+    assert [document['version'] for document in documents] == [4, 1]
+    assert documents[0]['tracker_id'] == str(tracker_id)
+    assert subscriber.publish.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_save_many_raises_entity_outdated(order_event_store_repository):
+    repo = order_event_store_repository
+    order = Order(buyer_id='b8', items=[], product_cost=80, delivery_cost=40, payment_id='p8')
+    collection = latest_events(
+        repo,
+        [{'_id': str(order.id), 'version': 5, 'tracker_id': str(uuid4()), 'aggregate_version': 5}],
+    )
+    with pytest.raises(EntityOutdated):
+        await repo.save_many([make_event(order)])
+    collection.insert_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_save_many_raises_entity_outdated_when_a_version_was_taken(
+    order_event_store_repository,
+):
+    repo = order_event_store_repository
+    order = Order(buyer_id='b9', items=[], product_cost=90, delivery_cost=45, payment_id='p9')
+    collection = latest_events(repo, [])
+    collection.insert_many.side_effect = BulkWriteError(
+        {
+            'writeErrors': [
+                {'index': 0, 'code': 11000, 'errmsg': 'E11000 index: aggregate_id_version'}
+            ]
+        }
+    )
+    with pytest.raises(EntityOutdated):
+        await repo.save_many([make_event(order)])
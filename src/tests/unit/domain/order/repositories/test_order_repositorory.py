@@ -1,9 +1,12 @@
 # pylint: disable=redefined-outer-name
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 
+from adapters.mongo_db_connector_adapter import MongoTransaction, _transaction
 from adapters.redis_adapter import RedisAdapter
 from domain.order.exceptions.order_exceptions import EntityOutdated, PersistenceError
 from domain.order.model.entities import Order
@@ -33,7 +36,7 @@ def order_repository():
 async def test_from_id_returns_from_cache(order_repository):
     repo = order_repository
     cache = repo.cache_adapter
-    order = Order(buyer_id='b1', items=[], product_cost=10.0, delivery_cost=5.0, payment_id='p1')
+    order = Order(buyer_id='b1', items=[], product_cost=1000, delivery_cost=500, payment_id='p1')
     cache.get.return_value = order.model_dump(mode='json')
     result = await repo.from_id(order.id)
     assert isinstance(result, Order)
@@ -46,7 +49,7 @@ async def test_from_id_fetches_from_db_and_sets_cache(order_repository):
     cache = repo.cache_adapter
     collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
     cache.get.return_value = None
-    order = Order(buyer_id='b2', items=[], product_cost=20.0, delivery_cost=10.0, payment_id='p2')
+    order = Order(buyer_id='b2', items=[], product_cost=2000, delivery_cost=1000, payment_id='p2')
     collection.find_one.return_value = order.model_dump(mode='json')
     result = await repo.from_id(order.id)
     assert isinstance(result, Order)
@@ -65,65 +68,323 @@ async def test_from_id_returns_none_if_not_found(order_repository):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_version_from_id_returns_from_cache(order_repository):
+    repo = order_repository
+    cache = repo.cache_adapter
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    cache.get.return_value = {'version': 3}
+    result = await repo.version_from_id('o1')
+    assert result == 3
+    cache.get.assert_awaited_once_with(key='o1:version')
+    collection.find_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_version_from_id_projects_version_from_db(order_repository):
+    repo = order_repository
+    cache = repo.cache_adapter
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    cache.get.return_value = None
+    collection.find_one.return_value = {'version': 2}
+    result = await repo.version_from_id('o1')
+    assert result == 2
+    collection.find_one.assert_awaited_once_with(
+        {'_id': 'o1'}, projection={'_id': 0, 'version': 1}, session=None
+    )
+    cache.set.assert_awaited_once_with(key='o1:version', data={'version': 2})
+
+
+@pytest.mark.asyncio
+async def test_query_reads_use_the_read_handle_and_never_replace_cached_writes(
+    order_repository,
+):
+    repo = order_repository
+    repo.query_reads = True
+    connection_cm = repo.db_connection.get_connection.return_value
+    repo.db_connection.read_connection.return_value = connection_cm
+    collection = connection_cm.__aenter__.return_value['orders']
+    repo.cache_adapter.get.return_value = None
+    collection.find_one.return_value = {'version': 2}
+
+    assert await repo.version_from_id('o1') == 2
+
+    repo.db_connection.read_connection.assert_called_once_with()
+    repo.db_connection.get_connection.assert_not_called()
+    repo.cache_adapter.add.assert_awaited_once_with(key='o1:version', data={'version': 2})
+    repo.cache_adapter.set.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_version_from_id_returns_none_if_not_found(order_repository):
+    repo = order_repository
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    repo.cache_adapter.get.return_value = None
+    collection.find_one.return_value = None
+    assert await repo.version_from_id('missing-id') is None
+
+
+@pytest.mark.asyncio
+async def test_view_from_id(order_repository):
+    repo = order_repository
+    repo.cache_adapter.get_raw.return_value = '{"order_id": "o1"}'
+    result = await repo.view_from_id('o1', 2)
+    assert result == '{"order_id": "o1"}'
+    repo.cache_adapter.get_raw.assert_awaited_once_with(key='o1:view:2')
+
+
+@pytest.mark.asyncio
+async def test_save_view(order_repository):
+    repo = order_repository
+    await repo.save_view('o1', 2, '{}')
+    repo.cache_adapter.set_raw.assert_awaited_once_with(key='o1:view:2', value='{}')
+
+
 @pytest.mark.asyncio
 async def test_save_inserts_new_order(order_repository):
     repo = order_repository
     cache = repo.cache_adapter
     collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
-    repo.from_id = AsyncMock(return_value=None)
-    collection.replace_one.return_value = MagicMock()
-    order = Order(buyer_id='b3', items=[], product_cost=15.0, delivery_cost=7.0, payment_id='p3')
+    order = Order(buyer_id='b3', items=[], product_cost=1500, delivery_cost=700, payment_id='p3')
     await repo.save(order)
-    collection.replace_one.assert_awaited_once()
-    cache.set.assert_awaited()
+    filter_, document = collection.replace_one.call_args.args
+    assert filter_ == {'_id': str(order.id), 'version': 0}
+    assert document['version'] == 1
+    assert collection.replace_one.call_args.kwargs == {'upsert': True, 'session': None}
+    assert order.version == 1
+    cache.set.assert_any_await(key=f'{order.id}:version', data={'version': 1})
+    cache.delete.assert_not_awaited()
+    collection.find_one.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_save_updates_existing_order(order_repository):
     repo = order_repository
     collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
-    existing_order = Order(
-        buyer_id='b4', items=[], product_cost=12.0, delivery_cost=6.0, payment_id='p4'
-    )
-    existing_order.version = 1
-    repo.from_id = AsyncMock(return_value=existing_order)
-    order = Order(buyer_id='b4', items=[], product_cost=12.0, delivery_cost=6.0, payment_id='p4')
+    order = Order(buyer_id='b4', items=[], product_cost=1200, delivery_cost=600, payment_id='p4')
     order.version = 1
     await repo.save(order)
-    collection.replace_one.assert_awaited_once()
+    filter_, document = collection.replace_one.call_args.args
+    assert filter_ == {'_id': str(order.id), 'version': 1}
+    assert document['version'] == 2
     assert order.version == 2
+    repo.cache_adapter.delete.assert_awaited_once_with(key=f'{order.id}:view:1')
+    repo.cache_adapter.get.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_save_raises_entity_outdated(order_repository):
     repo = order_repository
-    existing_order = Order(
-        buyer_id='b5', items=[], product_cost=30.0, delivery_cost=15.0, payment_id='p5'
-    )
-    existing_order.version = 5
-    repo.from_id = AsyncMock(return_value=existing_order)
-    order = Order(buyer_id='b5', items=[], product_cost=30.0, delivery_cost=15.0, payment_id='p5')
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    collection.replace_one.side_effect = DuplicateKeyError('E11000 duplicate key')
+    order = Order(buyer_id='b5', items=[], product_cost=3000, delivery_cost=1500, payment_id='p5')
     order.version = 1
     with pytest.raises(EntityOutdated):
         await repo.save(order)
+    assert order.version == 1
+    repo.cache_adapter.delete.assert_awaited_once_with(key=str(order.id))
+    repo.cache_adapter.set.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_save_raises_persistence_error(order_repository):
     repo = order_repository
     collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
-    repo.from_id = AsyncMock(return_value=None)
-    order = Order(buyer_id='b6', items=[], product_cost=50.0, delivery_cost=25.0, payment_id='p6')
+    order = Order(buyer_id='b6', items=[], product_cost=5000, delivery_cost=2500, payment_id='p6')
     collection.replace_one.side_effect = Exception('db failure')
     with pytest.raises(PersistenceError):
         await repo.save(order)
 
 
+@pytest.mark.asyncio
+async def test_save_in_transaction_defers_cache_until_commit(order_repository):
+    repo = order_repository
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    order = Order(buyer_id='b7', items=[], product_cost=5000, delivery_cost=500, payment_id='p7')
+    transaction = MongoTransaction(session=MagicMock())
+    token = _transaction.set(transaction)
+    try:
+        await repo.save(order)
+    finally:
+        _transaction.reset(token)
+
+    assert collection.replace_one.call_args.kwargs['session'] is transaction.session
+    assert order.version == 1
+    repo.cache_adapter.set.assert_not_awaited()
+    await transaction.after_commit[0]()
+    repo.cache_adapter.set.assert_any_await(key=f'{order.id}:version', data={'version': 1})
+
+
+@pytest.mark.asyncio
+async def test_save_reraises_transient_transaction_errors(order_repository):
+    repo = order_repository
+    collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    error = OperationFailure('WriteConflict', code=112)
+    error._add_error_label('TransientTransactionError')  # pylint: disable=protected-access
+    collection.replace_one.side_effect = error
+    order = Order(buyer_id='b8', items=[], product_cost=5000, delivery_cost=500, payment_id='p8')
+    with pytest.raises(OperationFailure):
+        await repo.save(order)
+
+
 @pytest.mark.asyncio
 async def test_delete(order_repository):
     repo = order_repository
     cache = repo.cache_adapter
     collection = repo.db_connection.get_connection.return_value.__aenter__.return_value['orders']
+    repo.version_from_id = AsyncMock(return_value=4)
     await repo.delete('some-id')
-    cache.delete.assert_awaited_once_with(key='some-id')
+    cache.delete.assert_any_await(key='some-id:view:4')
+    cache.delete.assert_any_await(key='some-id')
+    cache.delete.assert_any_await(key='some-id:version')
     collection.delete_one.assert_awaited_once_with({'_id': 'some-id'})
+
+
+def make_order(index: int = 0, version: int = 0) -> Order:
+    order = Order(
+        id=f"order_{index:03d}",
+        buyer_id='b1',
+        items=[],
+        product_cost=10,
+        delivery_cost=5,
+        payment_id=f"p{index}",
+    )
+    order.version = version
+    return order
+
+
+@pytest.mark.asyncio
+async def test_from_status_pages_through_the_status_index(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    documents = [
+        make_order(index).model_dump(mode='json') | {'_id': f"order_{index:03d}"}
+        for index in range(5)
+    ]
+    queries = []
+
+    def find(query, sort, limit):
+        queries.append(dict(query))
+        after = query.get('_id', {}).get('$gt', '')
+        cursor = MagicMock()
+        page = [document for document in documents if document['_id'] > after][:limit]
+        cursor.to_list = AsyncMock(return_value=page)
+        return cursor
+
+    collection.find = MagicMock(side_effect=find)
+
+    orders = [order async for order in order_repository.from_status('waiting', page_size=2)]
+
+    assert [order.id for order in orders] == [f"order_{index:03d}" for index in range(5)]
+    assert queries == [
+        {'status': 'waiting'},
+        {'status': 'waiting', '_id': {'$gt': 'order_001'}},
+        {'status': 'waiting', '_id': {'$gt': 'order_003'}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_claim_payments_claims_unclaimed_pending_orders(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(
+        return_value=[
+            {'_id': 'o1', 'payment_claim': {'claimant': 'me'}},
+            {'_id': 'o2', 'payment_claim': {'claimant': 'other'}},
+        ]
+    )
+    collection.find = MagicMock(return_value=cursor)
+
+    claimants = await order_repository.claim_payments(['o1', 'o2', 'o3'], 'me', 30.0)
+
+    assert claimants == {'o1': 'me', 'o2': 'other'}
+    (query, update), _ = collection.update_many.await_args
+    pending = {'_id': {'$in': ['o1', 'o2', 'o3']}, 'status': 'payment_pending'}
+    assert {key: query[key] for key in pending} == pending
+    assert query['$or'][1] == {'payment_claim.claimant': 'me'}
+    claim = update['$set']['payment_claim']
+    assert claim['claimant'] == 'me'
+    assert claim['until'] == query['$or'][0]['payment_claim.until']['$not']['$gt'] + timedelta(
+        seconds=30
+    )
+    collection.find.assert_called_once_with(pending, {'payment_claim.claimant': True})
+
+
+@pytest.mark.asyncio
+async def test_save_many_writes_one_bulk_and_skips_outdated_orders(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    collection.bulk_write.side_effect = BulkWriteError(
+        {'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'duplicate key'}]}
+    )
+    orders = [make_order(0, version=1), make_order(1, version=1), make_order(2, version=3)]
+
+    saved = await order_repository.save_many(orders)
+
+    assert [order.id for order in saved] == ['order_000', 'order_002']
+    assert [order.version for order in orders] == [2, 1, 4]
+    requests = collection.bulk_write.await_args.args[0]
+    assert [request._filter for request in requests] == [  # pylint: disable=protected-access
+        {'_id': 'order_000', 'version': 1},
+        {'_id': 'order_001', 'version': 1},
+        {'_id': 'order_002', 'version': 3},
+    ]
+    order_repository.cache_adapter.delete.assert_any_await(key='order_001')
+    order_repository.cache_adapter.set.assert_any_await(
+        key='order_002:version', data={'version': 4}
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_many_in_transaction_leaves_outdated_orders_out_of_the_bulk(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(
+        return_value=[{'_id': 'order_000', 'version': 1}, {'_id': 'order_001', 'version': 2}]
+    )
+    collection.find = MagicMock(return_value=cursor)
+    orders = [make_order(0, version=1), make_order(1, version=1), make_order(2, version=0)]
+    transaction = MongoTransaction(session=MagicMock(in_transaction=True))
+    token = _transaction.set(transaction)
+    try:
+        saved = await order_repository.save_many(orders)
+    finally:
+        _transaction.reset(token)
+
+    assert [order.id for order in saved] == ['order_000', 'order_002']
+    requests = collection.bulk_write.await_args.args[0]
+    assert [request._filter for request in requests] == [  # pylint: disable=protected-access
+        {'_id': 'order_000', 'version': 1},
+        {'_id': 'order_002', 'version': 0},
+    ]
+    assert collection.find.call_args.kwargs['session'] is transaction.session
+
+
+@pytest.mark.asyncio
+async def test_save_many_reraises_transient_transaction_errors(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    error = OperationFailure('WriteConflict', code=112)
+    error._add_error_label('TransientTransactionError')  # pylint: disable=protected-access
+    collection.bulk_write.side_effect = error
+    with pytest.raises(OperationFailure):
+        await order_repository.save_many([make_order()])
+
+
+@pytest.mark.asyncio
+async def test_save_many_raises_on_other_write_errors(order_repository):
+    collection = order_repository.db_connection.get_connection.return_value.__aenter__.return_value[
+        'orders'
+    ]
+    collection.bulk_write.side_effect = BulkWriteError(
+        {'writeErrors': [{'index': 0, 'code': 121, 'errmsg': 'validation failed'}]}
+    )
+    with pytest.raises(PersistenceError):
+        await order_repository.save_many([make_order()])
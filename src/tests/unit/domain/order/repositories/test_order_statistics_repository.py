@@ -0,0 +1,157 @@
+# pylint: disable=redefined-outer-name
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from bson.decimal128 import Decimal128
+
+from domain.base.event import DomainEvent
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderCancelled, OrderCreated, OrderPaid
+from domain.order.repositories.order_statistics_repository import (
+    STATUS_DOCUMENT_ID,
+    OrderStatisticsRepository,
+    order_statistics_increments,
+)
+
+DAY = datetime(2026, 10, 19, 12, 30)
+
+
+def make_order(**kwargs) -> Order:
+    return Order(
+        buyer_id=kwargs.get('buyer_id', 'b1'),
+        items=[],
+        product_cost=kwargs.get('product_cost', 10_000),
+        delivery_cost=kwargs.get('delivery_cost', 1_000),
+        payment_id='p1',
+    )
+
+
+@pytest_asyncio.fixture
+def statistics_repository():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock()
+    collection.delete_many = AsyncMock()
+    collection.insert_many = AsyncMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[])
+    collection.find.return_value = cursor
+
+    connection_cm = AsyncMock()
+    connection_cm.__aenter__.return_value = {'stats': collection}
+    connection_cm.__aexit__.return_value = None
+
+    db_connection = MagicMock()
+    db_connection.get_connection.return_value = connection_cm
+    db_connection.read_connection.return_value = connection_cm
+
+    return OrderStatisticsRepository(db_connection=db_connection, collection_name='stats')
+
+
+def collection_of(repository):
+    return repository.db_connection.get_connection.return_value.__aenter__.return_value['stats']
+
+
+def test_increments_for_created_event():
+    increments = order_statistics_increments(OrderCreated(aggregate=make_order(), datetime=DAY))
+    assert increments == {
+        STATUS_DOCUMENT_ID: {'waiting': 1},
+        'day:2026-10-19': {'orders': 1},
+        'buyer:b1': {'orders': 1},
+    }
+
+
+def test_increments_for_paid_event_counts_revenue():
+    increments = order_statistics_increments(OrderPaid(aggregate=make_order(), datetime=DAY))
+    assert increments[STATUS_DOCUMENT_ID] == {'waiting': -1, 'paid': 1}
+    assert increments['day:2026-10-19'] == {'paid': 1, 'revenue': Decimal(110)}
+    assert increments['buyer:b1'] == {'paid': 1, 'revenue': Decimal(110)}
+
+
+def test_increments_for_cancelled_event():
+    increments = order_statistics_increments(OrderCancelled(aggregate=make_order(), datetime=DAY))
+    assert increments[STATUS_DOCUMENT_ID] == {'waiting': -1, 'cancelled': 1}
+    assert increments['buyer:b1'] == {'cancelled': 1}
+
+
+def test_increments_accept_stored_aggregate_payload():
+    order = make_order()
+    event = DomainEvent.parse_obj(OrderPaid(aggregate=order).model_dump(mode='json'))
+    assert order_statistics_increments(event)['buyer:b1']['revenue'] == Decimal(110)
+
+
+def test_increments_ignore_unknown_events():
+    event = DomainEvent(event_name='something_else', aggregate=make_order())
+    assert not order_statistics_increments(event)
+
+
+@pytest.mark.asyncio
+async def test_publish_applies_inc_upserts(statistics_repository):
+    await statistics_repository.publish(OrderPaid(aggregate=make_order(), datetime=DAY))
+
+    operations = collection_of(statistics_repository).bulk_write.call_args.args[0]
+    assert len(operations) == 3
+    day_update = next(op for op in operations if op._filter == {'_id': 'day:2026-10-19'})
+    assert day_update._doc == {'$inc': {'paid': 1, 'revenue': Decimal128('110.00')}}
+    assert day_update._upsert is True
+
+
+@pytest.mark.asyncio
+async def test_publish_skips_unknown_events(statistics_repository):
+    await statistics_repository.publish(DomainEvent(event_name='other', aggregate=make_order()))
+    collection_of(statistics_repository).bulk_write.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_reads_requested_documents(statistics_repository):
+    collection = collection_of(statistics_repository)
+    collection.find.return_value.to_list.return_value = [
+        {'_id': STATUS_DOCUMENT_ID, 'waiting': 2, 'paid': 1},
+        {'_id': 'buyer:b1', 'orders': 3, 'paid': 1, 'revenue': Decimal128('110')},
+    ]
+
+    statistics = await statistics_repository.get_statistics(day=date(2026, 10, 19), buyer_id='b1')
+
+    collection.find.assert_called_once_with(
+        {'_id': {'$in': [STATUS_DOCUMENT_ID, 'day:2026-10-19', 'buyer:b1']}}, session=None
+    )
+    statistics_repository.db_connection.read_connection.assert_called_once_with()
+    assert statistics.status.waiting == 2
+    assert statistics.status.cancelled == 0
+    assert statistics.day.orders == 0
+    assert statistics.buyer.revenue == Decimal(110)
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_without_slices(statistics_repository):
+    statistics = await statistics_repository.get_statistics()
+    assert statistics.day is None
+    assert statistics.buyer is None
+
+
+@pytest.mark.asyncio
+async def test_rebuild_recomputes_from_event_store(statistics_repository):
+    order = make_order()
+
+    async def events():
+        for event in (
+            OrderCreated(aggregate=order, datetime=DAY),
+            OrderCreated(aggregate=make_order(buyer_id='b2'), datetime=DAY),
+            OrderPaid(aggregate=order, datetime=DAY),
+        ):
+            yield event
+
+    event_store = MagicMock()
+    event_store.get_all_events = events
+
+    applied = await statistics_repository.rebuild(event_store)
+
+    collection = collection_of(statistics_repository)
+    collection.delete_many.assert_awaited_once_with({})
+    documents = {doc['_id']: doc for doc in collection.insert_many.call_args.args[0]}
+    assert applied == 3
+    assert documents[STATUS_DOCUMENT_ID] == {'_id': STATUS_DOCUMENT_ID, 'waiting': 1, 'paid': 1}
+    assert documents['day:2026-10-19']['orders'] == 2
+    assert documents['buyer:b1']['revenue'] == Decimal128('110.00')
@@ -0,0 +1,129 @@
+# pylint: disable=redefined-outer-name
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+
+from adapters.mongo_db_connector_adapter import MongoDBAdapterException
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderCancelled
+from domain.order.repositories.order_event_store_repository import OrderEventStoreRepository
+from domain.order.repositories.order_repository import OrderRepository
+from domain.order.repositories.order_unit_of_work import OrderUnitOfWork
+
+
+@pytest.fixture
+def unit_of_work() -> OrderUnitOfWork:
+    return OrderUnitOfWork(
+        repository=AsyncMock(spec=OrderRepository),
+        event_store=AsyncMock(spec=OrderEventStoreRepository),
+    )
+
+
+def make_order() -> Order:
+    return Order(buyer_id='b1', items=[], product_cost=1000, delivery_cost=500, payment_id='p1')
+
+
+@pytest.mark.asyncio
+async def test_get_loads_each_aggregate_once(unit_of_work):
+    order = make_order()
+    unit_of_work.repository.from_id.return_value = order
+
+    first = await unit_of_work.get(order.id)
+    second = await unit_of_work.get(str(order.id))
+
+    assert first is second is order
+    unit_of_work.repository.from_id.assert_awaited_once_with(str(order.id))
+
+
+@pytest.mark.asyncio
+async def test_get_missing_aggregate(unit_of_work):
+    unit_of_work.repository.from_id.return_value = None
+    assert await unit_of_work.get('missing') is None
+
+
+@pytest.mark.asyncio
+async def test_get_returns_added_aggregate_without_loading(unit_of_work):
+    order = make_order()
+    unit_of_work.add(order)
+
+    assert await unit_of_work.get(order.id) is order
+    unit_of_work.repository.from_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_commit_writes_aggregates_before_events(unit_of_work):
+    order = make_order()
+    calls = AsyncMock()
+    unit_of_work.repository.save.side_effect = calls.save_order
+    unit_of_work.event_store.save.side_effect = calls.save_event
+    event = OrderCancelled(aggregate=order)
+
+    unit_of_work.add(order)
+    unit_of_work.add(order)
+    unit_of_work.record(event)
+    await unit_of_work.commit()
+
+    assert calls.mock_calls == [call.save_order(order), call.save_event(event)]
+    assert not unit_of_work.dirty
+    assert not unit_of_work.events
+
+
+@pytest.mark.asyncio
+async def test_leaving_without_commit_discards_changes(unit_of_work):
+    order = make_order()
+    with pytest.raises(RuntimeError):
+        async with unit_of_work:
+            unit_of_work.add(order)
+            unit_of_work.record(OrderCancelled(aggregate=order))
+            raise RuntimeError('boom')
+
+    assert not unit_of_work.dirty
+    assert not unit_of_work.events
+    unit_of_work.repository.save.assert_not_awaited()
+
+
+@pytest.fixture
+def transactional_unit_of_work(unit_of_work) -> OrderUnitOfWork:
+    unit_of_work.transactional = True
+    unit_of_work.repository.db_connection = MagicMock()
+    unit_of_work.event_store.db_connection = MagicMock()
+
+    async def run_twice(callback):
+        # the driver re-runs the callback after a TransientTransactionError
+        await callback()
+        return await callback()
+
+    unit_of_work.repository.db_connection.run_in_transaction = AsyncMock(side_effect=run_twice)
+    return unit_of_work
+
+
+@pytest.mark.asyncio
+async def test_transactional_commit_retries_from_loaded_versions(transactional_unit_of_work):
+    unit_of_work = transactional_unit_of_work
+    order = make_order()
+    saved_versions = []
+
+    async def save(saved):
+        saved_versions.append(saved.version)
+        saved.increase_version()
+
+    unit_of_work.repository.save.side_effect = save
+    unit_of_work.add(order)
+    unit_of_work.record(OrderCancelled(aggregate=order))
+    await unit_of_work.commit()
+
+    assert saved_versions == [0, 0]
+    assert order.version == 1
+    assert unit_of_work.event_store.save.await_count == 2
+    assert not unit_of_work.dirty
+
+
+@pytest.mark.asyncio
+async def test_transactional_commit_requires_one_cluster(transactional_unit_of_work):
+    unit_of_work = transactional_unit_of_work
+    unit_of_work.repository.db_connection.shares_cluster_with.return_value = False
+    unit_of_work.add(make_order())
+
+    with pytest.raises(MongoDBAdapterException):
+        await unit_of_work.commit()
+    unit_of_work.repository.save.assert_not_awaited()
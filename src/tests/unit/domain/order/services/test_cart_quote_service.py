@@ -0,0 +1,107 @@
+# pylint: disable=redefined-outer-name
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from domain.base.value_object import Money
+from domain.delivery.adapters.cost_calculator_adapter import DeliveryCostCalculatorAdapter
+from domain.maps.model.value_objects import Address, StatesEnum
+from domain.maps.ports.maps_adapter_interface import MapsAdapterInterface
+from domain.order.model.value_objects import Cart, OrderItem
+from domain.order.services.cart_quote_service import CartQuoteService
+from domain.product.ports.product_adapter_interface import ProductAdapterInterface
+
+PRICES = {'p1': Money(10), 'p2': Money(1_999), 'p3': Money(12_000), 'p4': Money(750)}
+
+
+class CatalogStub(ProductAdapterInterface):
+    async def prices(self, product_ids):
+        return {product_id: PRICES[product_id] for product_id in product_ids}
+
+    async def total_price(self, product_counts):
+        return Money(sum(PRICES[product_id] * count for product_id, count in product_counts))
+
+
+def address(house_number: int) -> Address:
+    return Address(
+        house_number=house_number,
+        road='Rua A',
+        sub_district='Bairro X',
+        district='Cidade Y',
+        state=StatesEnum.RS,
+        postcode='12345-678',
+        country='Brasil',
+    )
+
+
+class DistanceStub(MapsAdapterInterface):
+    async def calculate_distance_from_warehouses(self, destination: Address) -> float:
+        return float(destination.house_number) / 3
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = CatalogStub()
+    monkeypatch.setattr(catalog, 'prices', AsyncMock(side_effect=catalog.prices))
+    return catalog
+
+
+@pytest.fixture
+def maps_service():
+    maps_service = DistanceStub()
+    maps_service.calculate_distances = AsyncMock(side_effect=maps_service.calculate_distances)
+    return maps_service
+
+
+@pytest.fixture
+def quote_service(catalog, maps_service) -> CartQuoteService:
+    return CartQuoteService(catalog, DeliveryCostCalculatorAdapter(maps_service))
+
+
+def random_carts(count: int) -> list[Cart]:
+    generator = random.Random(7)
+    return [
+        Cart(
+            items=tuple(
+                OrderItem(product_id=generator.choice(list(PRICES)), amount=generator.randint(0, 9))
+                for _ in range(generator.randint(0, 6))
+            ),
+            destination=address(generator.choice([10, 90, 91, 300, 2000])),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_quotes_match_scalar_path(quote_service, catalog):
+    carts = random_carts(300)
+
+    quotes = await quote_service.quote(carts)
+
+    for cart, quote in zip(carts, quotes, strict=True):
+        product_cost = await catalog.total_price(
+            [(item.product_id, int(item.amount)) for item in cart.items]
+        )
+        delivery_cost = await quote_service.delivery_service.calculate_cost(
+            product_cost, cart.destination
+        )
+        assert quote.product_cost == product_cost
+        assert float(quote.delivery_cost) == delivery_cost
+
+
+@pytest.mark.asyncio
+async def test_resolves_each_product_and_destination_once(quote_service, catalog, maps_service):
+    await quote_service.quote(random_carts(300))
+
+    catalog.prices.assert_awaited_once_with(['p1', 'p2', 'p3', 'p4'])
+    maps_service.calculate_distances.assert_awaited_once()
+    assert len(maps_service.calculate_distances.call_args.args[0]) == 5
+
+
+@pytest.mark.asyncio
+async def test_empty_cart_and_empty_batch(quote_service):
+    assert await quote_service.quote([]) == []
+    [quote] = await quote_service.quote([Cart(items=(), destination=address(10))])
+    assert quote.product_cost == 0
+    assert quote.delivery_cost == Money(5_000)
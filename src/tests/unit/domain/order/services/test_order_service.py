@@ -1,4 +1,5 @@
 # pylint: disable=redefined-outer-name, protected-access
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -8,13 +9,20 @@ from domain.delivery.adapters.cost_calculator_adapter import (
 )
 from domain.maps.model.value_objects import Address
 from domain.order.exceptions.order_exceptions import (
+    ExternalServiceTimeout,
     OrderAlreadyCancelledException,
     OrderAlreadyPaidException,
+    OrderPaymentPendingException,
     PaymentNotVerifiedException,
 )
 from domain.order.model.entities import Order
-from domain.order.model.events import OrderCancelled, OrderPaid
-from domain.order.model.value_objects import BuyerId, OrderId, OrderItem
+from domain.order.model.events import (
+    OrderCancelled,
+    OrderPaid,
+    OrderPaymentRejected,
+    OrderPaymentRequested,
+)
+from domain.order.model.value_objects import BuyerId, OrderId, OrderItem, OrderStatusEnum
 from domain.order.repositories.order_event_store_repository import (
     OrderEventStoreRepository,
 )
@@ -66,16 +74,124 @@ async def test_create_new_order(order_service):
     assert isinstance(order_id, OrderId)
 
 
+DESTINATION = Address(
+    house_number='S/N',
+    road='Rua A',
+    sub_district='Bairro X',
+    district='Cidade Y',
+    state='Rio Grande do Sul',
+    postcode='12345-678',
+    country='Brasil',
+)
+
+
+@pytest.mark.asyncio
+async def test_create_new_order_runs_payment_and_delivery_concurrently(order_service):
+    running = set()
+    overlapped = []
+
+    async def slow(name, result):
+        running.add(name)
+        await asyncio.sleep(0.01)
+        overlapped.append(set(running))
+        running.discard(name)
+        return result
+
+    order_service.product_service.total_price.return_value = 100
+
+    async def new_payment(_):
+        return await slow('payment', 'pay123')
+
+    async def calculate_cost(*_):
+        return await slow('delivery', 10)
+
+    order_service.payment_service.new_payment.side_effect = new_payment
+    order_service.delivery_service.calculate_cost.side_effect = calculate_cost
+
+    await order_service.create_new_order(
+        buyer_id=BuyerId('b1'),
+        items=[OrderItem(product_id='p1', amount=1)],
+        destination=DESTINATION,
+    )
+
+    assert {'payment', 'delivery'} in overlapped
+    saved_order = order_service.repository.save.call_args.args[0]
+    assert saved_order.payment_id == 'pay123'
+    assert saved_order.delivery_cost == 10
+    assert saved_order.destination == DESTINATION
+
+
+@pytest.mark.asyncio
+async def test_create_new_order_timeout_cancels_sibling(order_service):
+    cancelled = asyncio.Event()
+
+    async def hang(_):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def never_answers(*_):
+        await asyncio.sleep(10)
+
+    order_service.delivery_timeout = 0.01
+    order_service.product_service.total_price.return_value = 100
+    order_service.payment_service.new_payment.side_effect = hang
+    order_service.delivery_service.calculate_cost.side_effect = never_answers
+
+    with pytest.raises(ExternalServiceTimeout):
+        await order_service.create_new_order(
+            buyer_id=BuyerId('b1'),
+            items=[OrderItem(product_id='p1', amount=1)],
+            destination=DESTINATION,
+        )
+
+    assert cancelled.is_set()
+    order_service.repository.save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_new_order_reraises_original_failure(order_service):
+    order_service.product_service.total_price.return_value = 100
+    order_service.payment_service.new_payment.side_effect = PaymentNotVerifiedException()
+
+    with pytest.raises(PaymentNotVerifiedException):
+        await order_service.create_new_order(
+            buyer_id=BuyerId('b1'),
+            items=[OrderItem(product_id='p1', amount=1)],
+            destination=DESTINATION,
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_new_order_product_timeout(order_service):
+    async def never_answers(_):
+        await asyncio.sleep(10)
+
+    order_service.product_timeout = 0.01
+    order_service.product_service.total_price.side_effect = never_answers
+
+    with pytest.raises(ExternalServiceTimeout):
+        await order_service.create_new_order(
+            buyer_id=BuyerId('b1'),
+            items=[OrderItem(product_id='p1', amount=1)],
+            destination=DESTINATION,
+        )
+    order_service.payment_service.new_payment.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_pay_order(order_service):
     fake_order = MagicMock(spec=Order)
+    fake_order.id = 'o1'
     fake_order.payment_id = 'pay123'
     order_service.repository.from_id.return_value = fake_order
     order_service.payment_service.verify_payment.return_value = True
 
     await order_service.pay_order(order_id=OrderId('o1'))
 
-    order_service.repository.from_id.assert_awaited_with(order_id='o1')
+    order_service.repository.from_id.assert_awaited_once_with('o1')
     order_service.payment_service.verify_payment.assert_awaited_with(payment_id='pay123')
     order_service.repository.save.assert_awaited()
     order_service.event_store.save.assert_awaited()
@@ -86,13 +202,15 @@ async def test_pay_order(order_service):
 @pytest.mark.asyncio
 async def test_cancel_order(order_service):
     fake_order = MagicMock(spec=Order)
+    fake_order.id = 'o2'
     fake_order.status = 'cancelled'
     order_service.repository.from_id.return_value = fake_order
 
     await order_service.cancel_order(order_id=OrderId('o2'))
 
     fake_order.cancel.assert_called_once()
-    order_service.repository.save.assert_awaited_with(fake_order)
+    order_service.repository.from_id.assert_awaited_once_with('o2')
+    order_service.repository.save.assert_awaited_once_with(fake_order)
     stored_event = order_service.event_store.save.call_args.args[0]
     assert isinstance(stored_event, OrderCancelled)
 
@@ -100,25 +218,16 @@ async def test_cancel_order(order_service):
 @pytest.mark.asyncio
 async def test__pay_order_tnx(order_service):
     fake_order = MagicMock(spec=Order)
+    fake_order.id = 'o3'
     order_service.repository.from_id.return_value = fake_order
+    unit_of_work = order_service.unit_of_work()
 
-    await order_service._pay_order_tnx(order_id=OrderId('o3'), is_payment_verified=True)
+    await order_service._pay_order_tnx(unit_of_work, OrderId('o3'), is_payment_verified=True)
 
     fake_order.pay.assert_called_once_with(is_payment_verified=True)
-    order_service.repository.save.assert_awaited_with(fake_order)
-    stored_event = order_service.event_store.save.call_args.args[0]
-    assert isinstance(stored_event, OrderPaid)
-
-
-@pytest.mark.asyncio
-async def test_get_order_from_id(order_service):
-    fake_order = MagicMock(spec=Order)
-    order_service.repository.from_id.return_value = fake_order
-
-    result = await order_service.get_order_from_id(order_id=OrderId('o4'))
-
-    order_service.repository.from_id.assert_awaited_with('o4')
-    assert result is fake_order
+    assert unit_of_work.dirty == {'o3': fake_order}
+    assert isinstance(unit_of_work.events[0], OrderPaid)
+    order_service.repository.save.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -134,7 +243,9 @@ async def test__pay_order_tnx_raises_if_order_already_cancelled(order_service):
     order_service.repository.from_id.return_value = order
 
     with pytest.raises(OrderAlreadyCancelledException):
-        await order_service._pay_order_tnx(order_id=order.id, is_payment_verified=True)
+        await order_service._pay_order_tnx(
+            order_service.unit_of_work(), order.id, is_payment_verified=True
+        )
 
 
 @pytest.mark.asyncio
@@ -150,7 +261,9 @@ async def test__pay_order_tnx_raises_if_order_already_paid(order_service):
     order_service.repository.from_id.return_value = order
 
     with pytest.raises(OrderAlreadyPaidException):
-        await order_service._pay_order_tnx(order_id=order.id, is_payment_verified=True)
+        await order_service._pay_order_tnx(
+            order_service.unit_of_work(), order.id, is_payment_verified=True
+        )
 
 
 @pytest.mark.asyncio
@@ -165,7 +278,9 @@ async def test__pay_order_tnx_raises_if_payment_not_verified(order_service):
     order_service.repository.from_id.return_value = order
 
     with pytest.raises(PaymentNotVerifiedException):
-        await order_service._pay_order_tnx(order_id=order.id, is_payment_verified=False)
+        await order_service._pay_order_tnx(
+            order_service.unit_of_work(), order.id, is_payment_verified=False
+        )
 
 
 @pytest.mark.asyncio
@@ -198,3 +313,84 @@ async def test_cancel_order_raises_if_already_paid(order_service):
 
     with pytest.raises(OrderAlreadyPaidException):
         await order_service.cancel_order(order_id=order.id)
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_raises_while_payment_is_pending(order_service):
+    order_service.repository.from_id.return_value = make_order(OrderStatusEnum.PAYMENT_PENDING)
+
+    with pytest.raises(OrderPaymentPendingException):
+        await order_service.cancel_order(order_id=OrderId('o1'))
+
+    order_service.repository.save.assert_not_awaited()
+
+
+def make_order(status: OrderStatusEnum = OrderStatusEnum.WAITING) -> Order:
+    return Order(
+        buyer_id=BuyerId('b1'),
+        items=[OrderItem(product_id='p1', amount=1)],
+        product_cost=100,
+        delivery_cost=10,
+        payment_id='pay123',
+        status=status,
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_payment_marks_order_pending(order_service):
+    order = make_order()
+    order_service.repository.from_id.return_value = order
+
+    await order_service.request_payment(order_id=order.id)
+
+    assert order.status is OrderStatusEnum.PAYMENT_PENDING
+    order_service.payment_service.verify_payment.assert_not_called()
+    assert isinstance(order_service.event_store.save.call_args.args[0], OrderPaymentRequested)
+
+
+@pytest.mark.asyncio
+async def test_request_payment_is_a_no_op_while_pending(order_service):
+    order_service.repository.from_id.return_value = make_order(OrderStatusEnum.PAYMENT_PENDING)
+
+    await order_service.request_payment(order_id=OrderId('o1'))
+
+    order_service.repository.save.assert_not_awaited()
+    order_service.event_store.save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_request_payment_raises_if_already_cancelled(order_service):
+    order_service.repository.from_id.return_value = make_order(OrderStatusEnum.CANCELLED)
+
+    with pytest.raises(OrderAlreadyCancelledException):
+        await order_service.request_payment(order_id=OrderId('o1'))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'verified, status, event_type',
+    [
+        (True, OrderStatusEnum.PAID, OrderPaid),
+        (False, OrderStatusEnum.WAITING, OrderPaymentRejected),
+    ],
+)
+async def test_complete_payment(order_service, verified, status, event_type):
+    order = make_order(OrderStatusEnum.PAYMENT_PENDING)
+    order_service.repository.from_id.return_value = order
+
+    await order_service.complete_payment(order.id, is_payment_verified=verified)
+
+    assert order.status is status
+    order_service.repository.save.assert_awaited_once_with(order)
+    assert isinstance(order_service.event_store.save.call_args.args[0], event_type)
+
+
+@pytest.mark.asyncio
+async def test_complete_payment_ignores_orders_no_longer_pending(order_service):
+    order = make_order(OrderStatusEnum.CANCELLED)
+    order_service.repository.from_id.return_value = order
+
+    await order_service.complete_payment(order.id, is_payment_verified=True)
+
+    assert order.is_cancelled()
+    order_service.repository.save.assert_not_awaited()
@@ -0,0 +1,181 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.base.bus import CommandBus
+from domain.order.model.commands import CompleteOrderPayment
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderCreated, OrderPaymentRequested
+from domain.order.model.value_objects import OrderStatusEnum
+from domain.order.repositories.order_repository import OrderRepository
+from domain.order.services.payment_process_manager import (
+    PaymentProcessManager,
+    PaymentRequestQueue,
+    PendingPayment,
+)
+from domain.payment.adapters.stub_payment_adapter import StubPaymentAdapter
+
+
+def make_order(payment_id: str = 'pay1') -> Order:
+    return Order(
+        buyer_id='b1',
+        items=[],
+        product_cost=10,
+        delivery_cost=1,
+        payment_id=payment_id,
+        status=OrderStatusEnum.PAYMENT_PENDING,
+    )
+
+
+async def no_orders(_):
+    orders: list[Order] = []
+    for order in orders:
+        yield order
+
+
+async def claim_all(order_ids, claimant, ttl):
+    return {str(order_id): claimant for order_id in order_ids}
+
+
+@pytest.fixture
+def manager() -> PaymentProcessManager:
+    repository = MagicMock(spec=OrderRepository)
+    repository.from_status.side_effect = no_orders
+    repository.claim_payments.side_effect = claim_all
+    return PaymentProcessManager(
+        requests=PaymentRequestQueue(),
+        command_bus=AsyncMock(spec=CommandBus),
+        payment_service=StubPaymentAdapter(),
+        repository=repository,
+        workers=2,
+        batch_size=3,
+        batch_wait=0.01,
+        verify_timeout=0.05,
+        retry_delay=0.01,
+        claim_ttl=0.02,
+    )
+
+
+@pytest.mark.asyncio
+async def test_queue_only_takes_payment_requests():
+    requests = PaymentRequestQueue()
+    order = make_order()
+
+    await requests.publish(OrderCreated(aggregate=order))
+    await requests.publish(OrderPaymentRequested(aggregate=order))
+
+    assert requests.queue.qsize() == 1
+    assert requests.queue.get_nowait() == PendingPayment(order.id, 'pay1')
+
+
+@pytest.mark.asyncio
+async def test_next_batch_is_bounded_by_size(manager):
+    for index in range(5):
+        manager.requests.put(make_order(f"pay{index}"))
+
+    first = await manager.next_batch()
+    second = await manager.next_batch()
+
+    assert [pending.payment_id for pending in first] == ['pay0', 'pay1', 'pay2']
+    assert [pending.payment_id for pending in second] == ['pay3', 'pay4']
+
+
+@pytest.mark.asyncio
+async def test_process_dispatches_each_outcome(manager):
+    accepted, declined = make_order('ok'), make_order('ko')
+    manager.payment_service.settle('ok')
+
+    await manager.process([PendingPayment(accepted.id, 'ok'), PendingPayment(declined.id, 'ko')])
+
+    assert manager.payment_service.batches == [2]
+
+    manager.command_bus.dispatch.assert_any_await(
+        CompleteOrderPayment(order_id=accepted.id, payment_verified=True)
+    )
+    manager.command_bus.dispatch.assert_any_await(
+        CompleteOrderPayment(order_id=declined.id, payment_verified=False)
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_requeues_unanswered_verifications(manager):
+    manager.payment_service.latency = 1
+    pending = PendingPayment(make_order().id, 'pay1')
+
+    await manager.process([pending])
+
+    manager.command_bus.dispatch.assert_not_awaited()
+    assert await asyncio.wait_for(manager.requests.queue.get(), 1) == pending
+
+
+@pytest.mark.asyncio
+async def test_start_recovers_pending_orders_and_stop_cancels_workers(manager):
+    order = make_order()
+
+    async def pending_orders(status):
+        assert status is OrderStatusEnum.PAYMENT_PENDING
+        yield order
+
+    manager.repository.from_status.side_effect = pending_orders
+    manager.payment_service.settle('pay1')
+
+    await manager.start()
+    await asyncio.wait_for(manager.requests.queue.join(), 1)
+    await manager.stop()
+
+    manager.command_bus.dispatch.assert_awaited_once_with(
+        CompleteOrderPayment(order_id=order.id, payment_verified=True)
+    )
+    assert not manager._tasks  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_call_requeues_the_whole_batch(manager):
+    manager.payment_service.max_batch_size = 1
+    batch = [PendingPayment(make_order().id, 'pay1'), PendingPayment(make_order().id, 'pay2')]
+
+    await manager.process(batch)
+
+    manager.command_bus.dispatch.assert_not_awaited()
+    requeued = [await asyncio.wait_for(manager.requests.queue.get(), 1) for _ in batch]
+    assert sorted(pending.payment_id for pending in requeued) == ['pay1', 'pay2']
+
+
+@pytest.mark.asyncio
+async def test_process_verifies_only_the_orders_it_claimed(manager):
+    mine, theirs, done = make_order('mine'), make_order('theirs'), make_order('done')
+    manager.repository.claim_payments.side_effect = None
+    manager.repository.claim_payments.return_value = {
+        str(mine.id): manager.claimant,
+        str(theirs.id): 'other-worker',
+    }
+    manager.payment_service.settle('mine')
+    batch = [PendingPayment(order.id, order.payment_id) for order in (mine, theirs, done)]
+
+    await manager.process(batch)
+
+    manager.repository.claim_payments.assert_awaited_once_with(
+        [mine.id, theirs.id, done.id], manager.claimant, 0.02
+    )
+    assert manager.payment_service.batches == [1]
+    manager.command_bus.dispatch.assert_awaited_once_with(
+        CompleteOrderPayment(order_id=mine.id, payment_verified=True)
+    )
+    # looked at again once the other claim expires, in case its worker died
+    assert await asyncio.wait_for(manager.requests.queue.get(), 1) == batch[1]
+    await asyncio.sleep(0.05)
+    assert manager.requests.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_failed_claim_requeues_the_whole_batch(manager):
+    manager.repository.claim_payments.side_effect = RuntimeError('down')
+    batch = [PendingPayment(make_order().id, 'pay1'), PendingPayment(make_order().id, 'pay2')]
+
+    await manager.process(batch)
+
+    assert manager.payment_service.batches == []
+    requeued = [await asyncio.wait_for(manager.requests.queue.get(), 1) for _ in batch]
+    assert sorted(pending.payment_id for pending in requeued) == ['pay1', 'pay2']
@@ -0,0 +1,179 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.order.exceptions.order_exceptions import EntityOutdated
+from domain.order.model.entities import Order
+from domain.order.model.events import OrderEventName
+from domain.order.model.value_objects import OrderStatusEnum
+from domain.order.repositories.order_event_store_repository import OrderEventStoreRepository
+from domain.order.repositories.order_repository import OrderRepository
+from domain.order.services.payment_reconciler import PaymentReconciler, ReconciliationReport
+from domain.payment.adapters.stub_payment_adapter import StubPaymentAdapter
+
+
+def make_orders(count: int) -> list[Order]:
+    return [
+        Order(buyer_id='b1', items=[], product_cost=10, delivery_cost=1, payment_id=f"pay{index}")
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def reconciler() -> PaymentReconciler:
+    repository = MagicMock(spec=OrderRepository)
+    repository.save_many = AsyncMock(side_effect=lambda orders: list(orders))
+    return PaymentReconciler(
+        repository=repository,
+        event_store=AsyncMock(spec=OrderEventStoreRepository),
+        payment_service=StubPaymentAdapter(max_batch_size=3),
+        chunk_size=3,
+        concurrency=2,
+        verify_timeout=0.5,
+    )
+
+
+def waiting(reconciler: PaymentReconciler, orders: list[Order]) -> None:
+    async def from_status(status, page_size):
+        assert status is OrderStatusEnum.WAITING
+        for order in orders:
+            yield order
+
+    reconciler.repository.from_status.side_effect = from_status
+
+
+@pytest.mark.asyncio
+async def test_run_pays_verified_orders_in_bulk(reconciler):
+    orders = make_orders(7)
+    waiting(reconciler, orders)
+    for order in orders[::2]:
+        reconciler.payment_service.settle(order.payment_id)
+
+    report = await reconciler.run()
+
+    assert report == ReconciliationReport(scanned=7, paid=4, unpaid=3)
+    assert reconciler.payment_service.batches == [3, 3, 1]
+    paid = [
+        order for call in reconciler.repository.save_many.await_args_list for order in call.args[0]
+    ]
+    assert {order.id for order in paid} == {order.id for order in orders[::2]}
+    assert all(order.is_paid() for order in paid)
+    events = [
+        event for call in reconciler.event_store.save_many.await_args_list for event in call.args[0]
+    ]
+    assert {event.event_name for event in events} == {OrderEventName.PAID}
+    assert len(events) == 4
+
+
+@pytest.mark.asyncio
+async def test_run_bounds_concurrent_verifications(reconciler):
+    waiting(reconciler, make_orders(12))
+    in_flight, peak = 0, 0
+    verify = reconciler.payment_service.verify_payments
+
+    async def tracked(payment_ids):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await verify(payment_ids)
+
+    reconciler.payment_service.verify_payments = tracked
+
+    await reconciler.run()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_outdated_orders_are_left_for_the_next_run(reconciler):
+    orders = make_orders(3)
+    waiting(reconciler, orders)
+    for order in orders:
+        reconciler.payment_service.settle(order.payment_id)
+    reconciler.repository.save_many.side_effect = lambda batch: list(batch)[:1]
+
+    report = await reconciler.run()
+
+    assert report == ReconciliationReport(scanned=3, paid=1, outdated=2)
+    assert len(reconciler.event_store.save_many.await_args.args[0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_do_not_stop_the_run(reconciler):
+    orders = make_orders(6)
+    waiting(reconciler, orders)
+    reconciler.payment_service.settle(orders[4].payment_id)
+    verify = reconciler.payment_service.verify_payments
+
+    async def flaky(payment_ids):
+        if orders[0].payment_id in payment_ids:
+            raise ConnectionError('provider down')
+        return await verify(payment_ids)
+
+    reconciler.payment_service.verify_payments = flaky
+
+    report = await reconciler.run()
+
+    assert report == ReconciliationReport(scanned=6, paid=1, unpaid=2, failed=3)
+
+
+@pytest.mark.asyncio
+async def test_transactional_run_commits_orders_and_events_together(reconciler):
+    orders = make_orders(3)
+    waiting(reconciler, orders)
+    for order in orders:
+        reconciler.payment_service.settle(order.payment_id)
+    reconciler.transactional = True
+    connection = MagicMock()
+    connection.shares_cluster_with.return_value = True
+
+    async def run_in_transaction(callback):
+        # the first attempt is aborted after the orders were written, then retried
+        await callback()
+        return await callback()
+
+    async def save_many(batch):
+        for order in batch:
+            order.version += 1
+        return list(batch)
+
+    connection.run_in_transaction = AsyncMock(side_effect=run_in_transaction)
+    reconciler.repository.db_connection = connection
+    reconciler.repository.save_many.side_effect = save_many
+    reconciler.event_store.db_connection = MagicMock()
+
+    report = await reconciler.run()
+
+    assert report == ReconciliationReport(scanned=3, paid=3)
+    assert [order.version for order in orders] == [1, 1, 1]
+    assert reconciler.event_store.save_many.await_count == 2
+    connection.run_in_transaction.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_transactional_run_fails_the_chunk_when_the_events_fail(reconciler):
+    orders = make_orders(3)
+    waiting(reconciler, orders)
+    for order in orders:
+        reconciler.payment_service.settle(order.payment_id)
+    reconciler.transactional = True
+
+    async def run_in_transaction(callback):
+        return await callback()
+
+    reconciler.repository.db_connection = MagicMock()
+    reconciler.repository.db_connection.run_in_transaction = AsyncMock(
+        side_effect=run_in_transaction
+    )
+    reconciler.event_store.db_connection = MagicMock()
+    reconciler.event_store.save_many.side_effect = EntityOutdated(detail='behind')
+
+    report = await reconciler.run()
+
+    assert report == ReconciliationReport(scanned=3, failed=3)
+    reconciler.repository.db_connection.run_in_transaction.assert_awaited_once()
+    reconciler.event_store.save_many.assert_awaited()
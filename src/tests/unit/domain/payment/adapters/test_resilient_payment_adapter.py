@@ -0,0 +1,17 @@
+import pytest
+
+from domain.base.resilience import Resilience
+from domain.payment.adapters.resilient_payment_adapter import ResilientPaymentAdapter
+from domain.payment.adapters.stub_payment_adapter import StubPaymentAdapter
+
+
+@pytest.mark.asyncio
+async def test_payments_go_through_to_the_provider():
+    provider = StubPaymentAdapter()
+    adapter = ResilientPaymentAdapter(provider, Resilience('payment'))
+    payment_id = await adapter.new_payment(100)
+    provider.settle(payment_id)
+
+    assert await adapter.verify_payment(payment_id) is True
+    assert await adapter.verify_payments([payment_id]) == {payment_id: True}
+    assert adapter.resilience.attempts == 3
@@ -0,0 +1,44 @@
+import pytest
+
+from domain.payment.adapters.paypal_adapter import PayPalPaymentAdapter
+from domain.payment.adapters.stub_payment_adapter import StubPaymentAdapter
+from domain.payment.ports.payment_adapter_interface import PaymentAdapterInterface
+
+
+@pytest.mark.asyncio
+async def test_payments_verify_once_settled():
+    adapter = StubPaymentAdapter()
+    settled, open_payment = await adapter.new_payment(100), await adapter.new_payment(200)
+    adapter.settle(settled)
+
+    assert await adapter.verify_payments([settled, open_payment, 'unknown']) == {
+        settled: True,
+        open_payment: False,
+        'unknown': False,
+    }
+    assert await adapter.verify_payment(settled) is True
+    assert adapter.batches == [3, 1]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_bounded():
+    adapter = StubPaymentAdapter(max_batch_size=2)
+    with pytest.raises(ValueError):
+        await adapter.verify_payments(['a', 'b', 'c'])
+
+
+@pytest.mark.asyncio
+async def test_default_batch_verifies_each_payment():
+    class SingleCallAdapter(PaymentAdapterInterface):
+        async def new_payment(self, total_price):
+            raise NotImplementedError()
+
+        async def verify_payment(self, payment_id):
+            return payment_id == 'ok'
+
+    assert await SingleCallAdapter().verify_payments(['ok', 'ko']) == {'ok': True, 'ko': False}
+
+
+@pytest.mark.asyncio
+async def test_paypal_batch_verification():
+    assert await PayPalPaymentAdapter().verify_payments(['p1', 'p2']) == {'p1': True, 'p2': True}
@@ -0,0 +1,142 @@
+# pylint: disable=redefined-outer-name
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from bson.decimal128 import Decimal128
+
+from domain.base.value_object import Money
+from domain.product.adapters.mongo_product_catalog_adapter import MongoProductCatalogAdapter
+from domain.product.exceptions.product_exceptions import ProductNotFound
+from domain.product.model.value_objects import ProductId
+
+T0 = datetime(2024, 1, 1)
+
+
+class FakeCatalog:
+    """Products collection answering the two query shapes the adapter issues."""
+
+    def __init__(self, *documents: dict[str, Any]) -> None:
+        self.documents = {document['_id']: document for document in documents}
+        self.queries: list[dict[str, Any]] = []
+
+    def find(self, query: dict[str, Any], **_: Any) -> AsyncIterator[dict[str, Any]]:
+        self.queries.append(query)
+        documents = sorted(self.documents.values(), key=lambda document: document['updated_at'])
+        if '_id' in query:
+            documents = [
+                document for document in documents if document['_id'] in query['_id']['$in']
+            ]
+        if 'updated_at' in query:
+            since = query['updated_at']['$gte']
+            documents = [document for document in documents if document['updated_at'] >= since]
+
+        async def cursor():
+            for document in documents:
+                yield document
+
+        return cursor()
+
+    def __getitem__(self, _: str) -> 'FakeCatalog':
+        return self
+
+    @asynccontextmanager
+    async def get_connection(self):
+        yield self
+
+
+def product(product_id: str, price: str, minutes: int = 0, **fields: Any) -> dict[str, Any]:
+    return {
+        '_id': product_id,
+        'price': Decimal128(price),
+        'updated_at': T0 + timedelta(minutes=minutes),
+        **fields,
+    }
+
+
+@pytest.fixture
+def catalog() -> FakeCatalog:
+    return FakeCatalog(product('p1', '0.10'), product('p2', '19.99', minutes=1))
+
+
+@pytest.fixture
+def adapter(catalog) -> MongoProductCatalogAdapter:
+    return MongoProductCatalogAdapter(db_connection=catalog, collection_name='products')
+
+
+@pytest.mark.asyncio
+async def test_total_price_sums_cents_exactly(adapter, catalog):
+    await adapter.refresh()
+    catalog.queries.clear()
+
+    total = await adapter.total_price([(ProductId('p1'), 3), (ProductId('p2'), 2)])
+
+    assert total == Money(4_028)
+    assert not catalog.queries
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_reads_documents_since_watermark(adapter, catalog):
+    assert await adapter.refresh() == 2
+    catalog.documents['p1'] = product('p1', '0.25', minutes=5)
+    catalog.documents['p3'] = product('p3', '1.00', minutes=6, active=False)
+
+    # the newest document seen is re-read because of ``$gte``
+    assert await adapter.refresh() == 3
+    assert catalog.queries[-1] == {'updated_at': {'$gte': T0 + timedelta(minutes=1)}}
+    assert adapter.index == {'p1': Money(25), 'p2': Money(1_999)}
+    assert adapter.watermark == T0 + timedelta(minutes=6)
+
+
+@pytest.mark.asyncio
+async def test_inactive_products_leave_the_index(adapter, catalog):
+    await adapter.refresh()
+    catalog.documents['p2'] = product('p2', '19.99', minutes=2, active=False)
+
+    await adapter.refresh()
+
+    with pytest.raises(ProductNotFound):
+        await adapter.prices([ProductId('p2')])
+
+
+@pytest.mark.asyncio
+async def test_missing_ids_are_fetched_in_one_query(adapter, catalog):
+    prices = await adapter.prices([ProductId('p1'), ProductId('p2'), ProductId('p1')])
+
+    assert prices == {'p1': Money(10), 'p2': Money(1_999)}
+    assert len(catalog.queries) == 1
+    assert sorted(catalog.queries[0]['_id']['$in']) == ['p1', 'p2']
+
+
+@pytest.mark.asyncio
+async def test_on_demand_loads_leave_the_watermark_to_refresh(adapter, catalog):
+    await adapter.refresh()
+    catalog.documents['p1'] = product('p1', '0.25', minutes=5)
+    catalog.documents['p3'] = product('p3', '1.00', minutes=10)
+
+    await adapter.prices([ProductId('p3')])
+    assert adapter.watermark == T0 + timedelta(minutes=1)
+
+    await adapter.refresh()
+    assert catalog.queries[-1] == {'updated_at': {'$gte': T0 + timedelta(minutes=1)}}
+    assert adapter.index['p1'] == Money(25)
+    assert adapter.watermark == T0 + timedelta(minutes=10)
+
+
+@pytest.mark.asyncio
+async def test_unknown_products_raise(adapter):
+    with pytest.raises(ProductNotFound) as exc_info:
+        await adapter.total_price([(ProductId('p1'), 1), (ProductId('nope'), 1)])
+    assert 'nope' in exc_info.value.detail
+
+
+@pytest.mark.asyncio
+async def test_start_loads_catalog_and_stop_cancels_refresh(adapter):
+    await adapter.start()
+    assert set(adapter.index) == {'p1', 'p2'}
+    assert adapter._task is not None  # pylint: disable=protected-access
+
+    await adapter.stop()
+    assert adapter._task is None  # pylint: disable=protected-access
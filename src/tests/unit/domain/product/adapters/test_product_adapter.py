@@ -1,5 +1,6 @@
 import pytest
 
+from domain.base.value_object import Money
 from domain.product.adapters.product_adapter import ProductAdapter
 from domain.product.model.value_objects import ProductId
 
@@ -8,14 +9,15 @@ from domain.product.model.value_objects import ProductId
 async def test_total_price_empty_list():
     adapter = ProductAdapter()
     result = await adapter.total_price([])
-    assert result == 0.0
+    assert result == 0
 
 
 @pytest.mark.asyncio
 async def test_total_price_single_product():
     adapter = ProductAdapter()
     result = await adapter.total_price([(ProductId('p1'), 3)])
-    assert result == 36.0
+    assert result == Money(3_600)
+    assert isinstance(result, Money)
 
 
 @pytest.mark.asyncio
@@ -23,7 +25,7 @@ async def test_total_price_multiple_products():
     adapter = ProductAdapter()
     products = [(ProductId('p1'), 2), (ProductId('p2'), 5), (ProductId('p3'), 1)]
     result = await adapter.total_price(products)
-    assert result == 96.0
+    assert result == Money(9_600)
 
 
 @pytest.mark.asyncio
@@ -31,4 +33,10 @@ async def test_total_price_zero_quantity():
     adapter = ProductAdapter()
     products = [(ProductId('p1'), 0), (ProductId('p2'), 4)]
     result = await adapter.total_price(products)
-    assert result == 48.0
+    assert result == Money(4_800)
+
+
+@pytest.mark.asyncio
+async def test_prices():
+    adapter = ProductAdapter()
+    assert await adapter.prices([ProductId('p1')]) == {'p1': Money(1_200)}
@@ -0,0 +1,21 @@
+import pytest
+
+from domain.base.resilience import Resilience
+from domain.product.adapters.product_adapter import UNIT_PRICE, ProductAdapter
+from domain.product.adapters.resilient_product_adapter import ResilientProductAdapter
+
+
+@pytest.mark.asyncio
+async def test_prices_read_the_ids_once():
+    adapter = ResilientProductAdapter(ProductAdapter(), Resilience('product'))
+
+    prices = await adapter.prices(product_id for product_id in ('a', 'b'))
+
+    assert prices == {'a': UNIT_PRICE, 'b': UNIT_PRICE}
+
+
+@pytest.mark.asyncio
+async def test_total_price():
+    adapter = ResilientProductAdapter(ProductAdapter(), Resilience('product'))
+
+    assert await adapter.total_price([('a', 2)]) == UNIT_PRICE * 2
@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import cli
+from domain.delivery.model.tariffs import DeliveryTariffs
+
+
+def test_build_parser_selects_command():
+    args = cli.build_parser().parse_args(['rebuild-order-statistics'])
+    assert args.handler is cli.rebuild_order_statistics
+
+
+def test_build_parser_requires_command():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args([])
+
+
+@pytest.mark.asyncio
+async def test_rebuild_order_statistics():
+    container = MagicMock()
+    statistics_repository = container.order_statistics_repository.return_value
+    statistics_repository.rebuild = AsyncMock(return_value=3)
+
+    await cli.rebuild_order_statistics(container, MagicMock())
+
+    statistics_repository.rebuild.assert_awaited_once_with(
+        container.order_event_store_repository.return_value
+    )
+
+
+def test_build_parser_compile_delivery_tariffs():
+    args = cli.build_parser().parse_args(
+        ['compile-delivery-tariffs', '--output', 'out.npz', '--min-prefix', '3']
+    )
+    assert args.handler is cli.compile_delivery_tariffs
+    assert (args.output, args.min_prefix) == ('out.npz', 3)
+
+
+@pytest.mark.asyncio
+async def test_compile_delivery_tariffs(tmp_path, monkeypatch):
+    postcodes = tmp_path / 'postcodes.csv'
+    postcodes.write_text('postcode,latitude,longitude\n91755-720,-30.11,-51.17\n', 'utf-8')
+    warehouses = tmp_path / 'warehouses.csv'
+    warehouses.write_text('warehouse_id,latitude,longitude\nw1,-30.03,-51.22\n', 'utf-8')
+    monkeypatch.setattr(cli.settings, 'MAPS_POSTCODES_FILE', str(postcodes))
+    monkeypatch.setattr(cli.settings, 'MAPS_WAREHOUSES_FILE', str(warehouses))
+    output = tmp_path / 'tariffs.npz'
+
+    await cli.compile_delivery_tariffs(
+        MagicMock(),
+        cli.build_parser().parse_args(['compile-delivery-tariffs', '--output', str(output)]),
+    )
+
+    assert DeliveryTariffs.load(output).lookup('91755-720', large=True) == 0
+
+
+def test_build_parser_reconcile_payments():
+    args = cli.build_parser().parse_args(
+        ['reconcile-payments', '--chunk-size', '50', '--concurrency', '2']
+    )
+    assert args.handler is cli.reconcile_payments
+    assert (args.chunk_size, args.concurrency) == (50, 2)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_payments():
+    container = MagicMock()
+    registry = container.mongo_indexes.return_value
+    registry.apply = AsyncMock(return_value=[])
+    reconciler = container.payment_reconciler.return_value
+    reconciler.run = AsyncMock()
+
+    await cli.reconcile_payments(
+        container, cli.build_parser().parse_args(['reconcile-payments', '--chunk-size', '50'])
+    )
+
+    registry.apply.assert_awaited_once_with()
+    container.payment_reconciler.assert_called_once_with(chunk_size=50, concurrency=4)
+    reconciler.run.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_fails_when_an_index_was_not_applied():
+    container = MagicMock()
+    registry = container.mongo_indexes.return_value
+    registry.apply = AsyncMock(
+        return_value=[MagicMock(ok=True), MagicMock(ok=False, collection='db.events')]
+    )
+    args = cli.build_parser().parse_args(['ensure-indexes', '--replace'])
+
+    with pytest.raises(SystemExit, match='db.events'):
+        await cli.ensure_indexes(container, args)
+
+    registry.apply.assert_awaited_once_with(replace=True)
+
+
+@pytest.mark.asyncio
+async def test_run_closes_mongo_clients_after_a_failed_command():
+    container = MagicMock()
+    handler = AsyncMock(side_effect=RuntimeError())
+
+    with pytest.raises(RuntimeError):
+        await cli.run(handler, container, MagicMock())
+
+    container.mongo_clients.return_value.close.assert_called_once_with()
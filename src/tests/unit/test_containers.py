@@ -1,14 +1,33 @@
+from dependency_injector import providers
+
+from adapters.http_client_adapter import HttpClientAdapter
 from adapters.mongo_db_connector_adapter import AsyncMongoDBConnectorAdapter
+from adapters.mongo_index_adapter import MongoIndexRegistry
 from adapters.redis_adapter import RedisAdapter
+from adapters.striped_lock_adapter import StripedLockAdapter
+from domain.base.bus import CommandBus, QueryBus
+from domain.base.idempotency import IdempotencyMiddleware
 from domain.delivery.adapters.cost_calculator_adapter import DeliveryCostCalculatorAdapter
+from domain.delivery.repositories.route_repository import DeliveryRouteRepository
+from domain.maps.adapters.cached_maps_adapter import CachedMapsAdapter
 from domain.maps.adapters.google_maps_adapter import GoogleMapsAdapter
+from domain.maps.adapters.local_maps_adapter import LocalMapsAdapter
+from domain.maps.adapters.resilient_maps_adapter import ResilientMapsAdapter
 from domain.order.controllers.order_controller import OrderController
+from domain.order.controllers.order_statistics_controller import OrderStatisticsController
+from domain.order.model.commands import CancelOrder, PayOrder
 from domain.order.repositories.order_event_store_repository import OrderEventStoreRepository
 from domain.order.repositories.order_repository import OrderRepository
+from domain.order.repositories.order_statistics_repository import OrderStatisticsRepository
 from domain.order.services.order_service import OrderService
+from domain.order.services.payment_process_manager import PaymentProcessManager
+from domain.order.services.payment_reconciler import PaymentReconciler
 from domain.payment.adapters.paypal_adapter import PayPalPaymentAdapter
+from domain.payment.adapters.resilient_payment_adapter import ResilientPaymentAdapter
 from domain.product.adapters.product_adapter import ProductAdapter
+from domain.product.adapters.resilient_product_adapter import ResilientProductAdapter
 from src.containers import AppContainer
+from utils.retry import RetryPolicy
 
 
 def test_container_initialization():
@@ -26,7 +45,12 @@ def test_cache_adapter_provider():
 def test_maps_adapter_provider():
     container = AppContainer()
     maps = container.maps_adapter()
-    assert isinstance(maps, GoogleMapsAdapter)
+    assert isinstance(maps, ResilientMapsAdapter)
+    assert maps.resilience is container.maps_resilience()
+    assert maps.fallback is None
+    assert isinstance(maps.maps_service, CachedMapsAdapter)
+    assert isinstance(maps.maps_service.maps_service, GoogleMapsAdapter)
+    assert maps.maps_service.cache_adapter is container.cache_adapter()
 
 
 def test_order_event_store_connection_provider():
@@ -64,8 +88,9 @@ def test_order_service_provider():
     service = container.order_service()
     assert isinstance(service, OrderService)
     assert isinstance(service.repository, OrderRepository)
-    assert isinstance(service.payment_service, PayPalPaymentAdapter)
-    assert isinstance(service.product_service, ProductAdapter)
+    assert isinstance(service.payment_service, ResilientPaymentAdapter)
+    assert isinstance(service.payment_service.payment_service, PayPalPaymentAdapter)
+    assert isinstance(service.product_service, ResilientProductAdapter)
     assert isinstance(service.delivery_service, DeliveryCostCalculatorAdapter)
     assert isinstance(service.event_store, OrderEventStoreRepository)
 
@@ -74,4 +99,150 @@ def test_order_controller_provider():
     container = AppContainer()
     controller = container.order_controller()
     assert isinstance(controller, OrderController)
-    assert isinstance(controller.order_service, OrderService)
+    assert isinstance(controller.command_bus, CommandBus)
+    assert isinstance(controller.query_bus, QueryBus)
+
+
+def test_mongo_indexes_cover_the_indexed_repositories():
+    registry = AppContainer().mongo_indexes()
+    assert isinstance(registry, MongoIndexRegistry)
+    assert [type(repository) for repository in registry.repositories] == [
+        OrderRepository,
+        OrderEventStoreRepository,
+        DeliveryRouteRepository,
+    ]
+
+
+def test_order_reads_are_routed_and_causal():
+    container = AppContainer()
+    assert container.order_query_repository().query_reads
+    assert not container.order_repository().query_reads
+    assert container.order_controller().sessions is container.order_repository_connection()
+
+
+def test_command_bus_uses_idempotency_middleware():
+    container = AppContainer()
+    middleware = container.idempotency_middleware()
+    assert isinstance(middleware, IdempotencyMiddleware)
+    assert isinstance(middleware.cache, RedisAdapter)
+    assert middleware in container.command_bus().middlewares
+
+
+def test_order_lock_defaults_to_local_stripes():
+    container = AppContainer()
+    assert isinstance(container.order_lock(), StripedLockAdapter)
+    assert container.order_lock() is container.local_lock()
+
+
+def test_command_bus_retry_policies():
+    container = AppContainer()
+    policies = container.command_bus.kwargs['retry_policies']()
+    assert isinstance(policies[PayOrder], RetryPolicy)
+    assert isinstance(policies[CancelOrder], RetryPolicy)
+
+
+def test_bus_providers_are_singletons():
+    container = AppContainer()
+    assert container.command_bus() is container.command_bus()
+    assert container.query_bus() is container.query_bus()
+
+
+def test_order_statistics_repository_provider():
+    container = AppContainer()
+    repo = container.order_statistics_repository()
+    assert isinstance(repo, OrderStatisticsRepository)
+
+
+def test_order_event_store_repository_notifies_statistics():
+    container = AppContainer()
+    repo = container.order_event_store_repository()
+    assert any(isinstance(sub, OrderStatisticsRepository) for sub in repo.subscribers)
+
+
+def test_order_statistics_controller_provider():
+    container = AppContainer()
+    controller = container.order_statistics_controller()
+    assert isinstance(controller, OrderStatisticsController)
+    assert isinstance(controller.query_bus, QueryBus)
+
+
+def test_payment_process_manager_consumes_event_store_requests():
+    container = AppContainer()
+    manager = container.payment_process_manager()
+    repo = container.order_event_store_repository()
+    assert isinstance(manager, PaymentProcessManager)
+    assert manager.requests in repo.subscribers
+    assert manager.command_bus is container.command_bus()
+
+
+def test_product_adapter_defaults_to_stub():
+    container = AppContainer()
+    assert isinstance(container.order_service().product_service.product_service, ProductAdapter)
+
+
+def test_delivery_cost_calculator_without_tariffs_by_default():
+    container = AppContainer()
+    calculator = container.delivery_cost_calculator()
+    assert calculator.tariffs is None
+    assert isinstance(calculator.maps_service, ResilientMapsAdapter)
+
+
+def test_delivery_costs_missing_from_the_tariffs_use_the_local_maps():
+    container = AppContainer()
+    local_maps = LocalMapsAdapter.from_coordinates(
+        {'01310-100': (-23.56, -46.65)}, [(-23.55, -46.63)]
+    )
+    container.local_maps_adapter.override(local_maps)
+    selector = container.delivery_maps.selector
+    assert isinstance(selector, providers.Object)
+    selector.override('file')
+
+    assert container.delivery_cost_calculator().maps_service is local_maps
+
+
+def test_delivery_planner_reads_paid_orders_from_the_event_store():
+    container = AppContainer()
+    container.local_maps_adapter.override(
+        LocalMapsAdapter.from_coordinates({'01310-100': (-23.56, -46.65)}, [(-23.55, -46.63)])
+    )
+    planner = container.delivery_planner()
+    assert isinstance(planner.events, OrderEventStoreRepository)
+    assert isinstance(planner.repository, DeliveryRouteRepository)
+
+
+def test_payment_reconciler_provider():
+    container = AppContainer()
+    reconciler = container.payment_reconciler()
+    assert isinstance(reconciler, PaymentReconciler)
+    assert reconciler.payment_service is container.payment_adapter()
+
+
+def test_http_client_is_shared_with_a_bulkhead_per_provider():
+    container = AppContainer()
+    client = container.http_client()
+    assert isinstance(client, HttpClientAdapter)
+    assert container.http_client() is client
+    assert set(client.providers) == {'product', 'payment', 'maps'}
+
+
+def test_each_dependency_has_its_own_breaker():
+    container = AppContainer()
+    breakers = {
+        container.product_adapter().resilience.breaker,
+        container.payment_adapter().resilience.breaker,
+        container.maps_adapter().resilience.breaker,
+    }
+    assert {breaker.name for breaker in breakers} == {'product', 'payment', 'maps'}
+    assert container.order_service().payment_service is container.payment_adapter()
+
+
+def test_mongo_connections_share_one_pool():
+    container = AppContainer()
+    pool = container.mongo_clients()
+    connections = (
+        container.order_repository_connection(),
+        container.order_event_store_connection(),
+        container.product_catalog_connection(),
+    )
+    assert all(connection.pool is pool for connection in connections)
+    assert not any(connection.owns_pool for connection in connections)
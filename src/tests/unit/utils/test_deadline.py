@@ -0,0 +1,32 @@
+import pytest
+
+from utils.deadline import deadline_after, remaining
+
+
+def test_no_deadline():
+    assert remaining() is None
+    assert remaining(2.0) == 2.0
+
+
+def test_remaining_within_deadline():
+    with deadline_after(5.0):
+        assert 4.9 < remaining() <= 5.0
+
+    assert remaining() is None
+
+
+def test_inner_deadline_cannot_extend_outer():
+    with deadline_after(1.0) as outer:
+        with deadline_after(10.0) as inner:
+            assert inner == outer
+            assert remaining() <= 1.0
+        with deadline_after(0.5):
+            assert remaining() <= 0.5
+
+
+async def test_deadline_follows_awaited_calls():
+    async def left():
+        return remaining()
+
+    with deadline_after(1.0):
+        assert await left() == pytest.approx(1.0, abs=0.1)
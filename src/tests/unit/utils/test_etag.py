@@ -0,0 +1,20 @@
+import pytest
+
+from utils.etag import etag_matches, make_etag
+
+
+def test_make_etag():
+    assert make_etag('order_1', 3) == '"order_1-v3"'
+
+
+@pytest.mark.parametrize(
+    'if_none_match',
+    ['"order_1-v3"', 'W/"order_1-v3"', '"other", "order_1-v3"', '*'],
+)
+def test_etag_matches(if_none_match):
+    assert etag_matches(if_none_match, make_etag('order_1', 3))
+
+
+@pytest.mark.parametrize('if_none_match', ['"order_1-v2"', '"order_2-v3"', ''])
+def test_etag_does_not_match(if_none_match):
+    assert not etag_matches(if_none_match, make_etag('order_1', 3))
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from utils.kd_tree import KDTree
+
+
+def test_nearest_matches_brute_force():
+    generator = np.random.default_rng(7)
+    points = generator.normal(size=(200, 3))
+    tree = KDTree(points)
+
+    for query in generator.normal(size=(500, 3)):
+        distances = np.linalg.norm(points - query, axis=1)
+        index, distance = tree.nearest(query.tolist())
+        assert index == int(np.argmin(distances))
+        assert distance == pytest.approx(distances.min())
+
+
+def test_single_point_and_duplicates():
+    assert KDTree(np.array([[1.0, 2.0]])).nearest([0.0, 0.0]) == (0, pytest.approx(5**0.5))
+    index, distance = KDTree(np.array([[1.0, 1.0], [1.0, 1.0], [3.0, 3.0]])).nearest([1.0, 1.0])
+    assert index in (0, 1)
+    assert distance == 0
+
+
+def test_rejects_empty_point_set():
+    with pytest.raises(ValueError):
+        KDTree(np.empty((0, 3)))
@@ -0,0 +1,57 @@
+from utils.metrics import MetricsRegistry
+
+
+def test_increment_and_counter():
+    registry = MetricsRegistry()
+    registry.increment('requests', route='a')
+    registry.increment('requests', 2, route='a')
+    registry.increment('requests', route='b')
+
+    assert registry.counter('requests', route='a') == 3
+    assert registry.counter('requests', route='b') == 1
+    assert registry.counter('requests', route='c') == 0
+
+
+def test_percentile():
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.observe('latency', value / 1000, route='a')
+
+    assert registry.percentile('latency', 0.5, route='a') == 0.051
+    assert registry.percentile('latency', 0.99, route='a') == 0.1
+    assert registry.percentile('latency', 0.5, route='b') is None
+
+
+def test_observations_are_bounded():
+    registry = MetricsRegistry(reservoir_size=10)
+    for value in range(100):
+        registry.observe('latency', value)
+
+    assert registry.snapshot()['observations'][0]['count'] == 10
+    assert registry.percentile('latency', 0.0) == 90
+
+
+def test_snapshot_and_reset():
+    registry = MetricsRegistry()
+    registry.increment('requests', route='a')
+    registry.observe('latency', 0.2, route='a')
+
+    snapshot = registry.snapshot()
+
+    assert snapshot['counters'] == [{'name': 'requests', 'labels': {'route': 'a'}, 'value': 1}]
+    assert snapshot['observations'][0]['p99'] == 0.2
+    registry.reset()
+    assert registry.snapshot() == {'counters': [], 'gauges': [], 'observations': []}
+
+
+def test_gauge():
+    registry = MetricsRegistry()
+    assert registry.gauge('state', dependency='maps') is None
+
+    registry.set('state', 2, dependency='maps')
+    registry.set('state', 0, dependency='maps')
+
+    assert registry.gauge('state', dependency='maps') == 0
+    assert registry.snapshot()['gauges'] == [
+        {'name': 'state', 'labels': {'dependency': 'maps'}, 'value': 0}
+    ]
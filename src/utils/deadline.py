@@ -0,0 +1,36 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# absolute time.monotonic() by which the current request must be answered
+_deadline: ContextVar[float | None] = ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request deadline passed before a call could start or finish."""
+
+
+@contextmanager
+def deadline_after(seconds: float) -> Iterator[float]:
+    """Give the enclosed work at most ``seconds``, never extending an outer deadline.
+
+    The deadline follows the context into awaited calls and tasks, so outbound calls
+    can size their timeouts to what the request has left.
+    """
+    outer = _deadline.get()
+    deadline = time.monotonic() + seconds
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(default: float | None = None) -> float | None:
+    """Seconds left before the current deadline, ``default`` when there is none."""
+    if (deadline := _deadline.get()) is None:
+        return default
+    return deadline - time.monotonic()
@@ -0,0 +1,15 @@
+def make_etag(resource_id: str, version: int) -> str:
+    """Build a strong entity tag from a resource identifier and its version."""
+    return f'"{resource_id}-v{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return True if an If-None-Match header value matches the given entity tag.
+
+    Uses the weak comparison required for If-None-Match (RFC 9110, section 13.1.2).
+    """
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return any(
+        candidate == '*' or candidate.removeprefix('W/') == etag.removeprefix('W/')
+        for candidate in candidates
+    )
@@ -0,0 +1,62 @@
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class KDTree:
+    """Static k-d tree for nearest-neighbour queries over a fixed set of points.
+
+    Nodes split the widest axis at its median, so the tree stays balanced. A query
+    walks it in plain Python: for one point this beats any NumPy pass, which pays an
+    array allocation per call.
+    """
+
+    def __init__(self, points: np.ndarray) -> None:
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim != 2 or not len(self.points):
+            raise ValueError('expected a non-empty (n, k) array of points')
+        self._coordinates = [tuple(point) for point in self.points.tolist()]
+        self._point: list[int] = []
+        self._axis: list[int] = []
+        self._children: list[tuple[int, int]] = []
+        self._root = self._build(np.arange(len(self.points)))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, indices: np.ndarray) -> int:
+        if not len(indices):
+            return -1
+        points = self.points[indices]
+        axis = int(np.argmax(np.ptp(points, axis=0)))
+        middle = len(indices) // 2
+        ordered = indices[np.argpartition(points[:, axis], middle)]
+        node = len(self._point)
+        self._point.append(int(ordered[middle]))
+        self._axis.append(axis)
+        self._children.append((-1, -1))
+        self._children[node] = (self._build(ordered[:middle]), self._build(ordered[middle + 1 :]))
+        return node
+
+    def nearest(self, point: Sequence[float]) -> tuple[int, float]:
+        """Index of the point nearest to ``point`` and its Euclidean distance."""
+        best, best_distance = -1, math.inf
+        pending = [(self._root, 0.0)]
+        while pending:
+            node, bound = pending.pop()
+            if node < 0 or bound >= best_distance:
+                continue
+            index = self._point[node]
+            coordinates = self._coordinates[index]
+            distance = math.dist(point, coordinates)
+            if distance < best_distance:
+                best, best_distance = index, distance
+            axis = self._axis[node]
+            gap = point[axis] - coordinates[axis]
+            left, right = self._children[node]
+            near, far = (left, right) if gap < 0 else (right, left)
+            # the far side can only hold a closer point if the splitting plane is closer
+            pending.append((far, abs(gap)))
+            pending.append((near, 0.0))
+        return best, best_distance
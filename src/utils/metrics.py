@@ -0,0 +1,83 @@
+from collections import defaultdict, deque
+from typing import Any
+
+Labels = tuple[tuple[str, str], ...]
+MetricKey = tuple[str, Labels]
+
+
+def _key(name: str, labels: dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and latency observations, exposed through ``snapshot``."""
+
+    def __init__(self, reservoir_size: int = 1024) -> None:
+        self.reservoir_size = reservoir_size
+        self._counters: defaultdict[MetricKey, float] = defaultdict(float)
+        self._gauges: dict[MetricKey, float] = {}
+        self._observations: dict[MetricKey, deque[float]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add ``value`` to a counter."""
+        self._counters[_key(name, labels)] += value
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Return the current value of a counter."""
+        return self._counters.get(_key(name, labels), 0.0)
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value (e.g. a state or a queue length)."""
+        self._gauges[_key(name, labels)] = value
+
+    def gauge(self, name: str, **labels: Any) -> float | None:
+        """Return the current value of a gauge, if it was ever set."""
+        return self._gauges.get(_key(name, labels))
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation (e.g. a latency in seconds) in a bounded reservoir."""
+        key = _key(name, labels)
+        if key not in self._observations:
+            self._observations[key] = deque(maxlen=self.reservoir_size)
+        self._observations[key].append(value)
+
+    def percentile(self, name: str, quantile: float, **labels: Any) -> float | None:
+        """Return the given quantile (0..1) of the recent observations, if any."""
+        observations = self._observations.get(_key(name, labels))
+        if not observations:
+            return None
+        ordered = sorted(observations)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Return every metric as JSON-serializable data."""
+        return {
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in self._counters.items()
+            ],
+            'gauges': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in self._gauges.items()
+            ],
+            'observations': [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': len(values),
+                    'p50': self.percentile(name, 0.50, **dict(labels)),
+                    'p95': self.percentile(name, 0.95, **dict(labels)),
+                    'p99': self.percentile(name, 0.99, **dict(labels)),
+                }
+                for (name, labels), values in self._observations.items()
+            ],
+        }
+
+    def reset(self) -> None:
+        """Drop every recorded metric."""
+        self._counters.clear()
+        self._gauges.clear()
+        self._observations.clear()
+
+
+metrics = MetricsRegistry()